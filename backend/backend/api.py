@@ -14,7 +14,9 @@ from starlette.requests import Request
 from starlette.responses import Response
 
 from backend.app_config import build_frontend_settings
-from backend.db import get_mongo_client
+from backend.db import ensure_indexes, get_mongo_client
+from backend.models.user import User
+from backend.routes.auth import PRINCIPAL_CACHE_TTL_SECONDS
 from backend.routes.auth import router as auth_router
 from backend.routes.contact import router as contact_router
 from backend.routes.events import router as events_router
@@ -22,8 +24,20 @@ from backend.routes.geocode import router as geocode_router
 from backend.routes.users import UPLOAD_DIR
 from backend.routes.users import router as users_router
 from backend.seed import ensure_required_startup_users
+from backend.services.attendance import migrate_attendance_if_unindexed
+from backend.services.cache import LocalTTLCache, ResponseCache
+from backend.services.capacity import (
+    CapacityLedger,
+    UnavailableCapacityLedger,
+    capacity_ledger_enabled,
+)
+from backend.services.event_search import backfill_event_search_fields
+from backend.services.event_totals import EventTotalsCache
+from backend.services.http_clients import create_http_clients
+from backend.services.locks import MongoEventUserLocks, create_event_user_locks
 from backend.services.notifications.arq import create_arq_client
 from backend.services.notifications.email import create_email_notification_service
+from backend.services.user_event_index import backfill_user_event_index
 
 _logger = logging.getLogger(__name__)
 
@@ -33,19 +47,40 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     db_client = get_mongo_client()
     app.state.db_client = db_client
     app.state.db = db_client["evently"]
+    http_clients = create_http_clients()
+    app.state.http_clients = http_clients
     arq = None
     try:
+        index_report = await ensure_indexes(app.state.db)
+        await migrate_attendance_if_unindexed(app.state.db, index_report)
+        await backfill_event_search_fields(app.state.db)
+        await backfill_user_event_index(app.state.db)
         await ensure_required_startup_users(app.state.db)
 
         try:
             arq = await create_arq_client()
             app.state.arq = arq
+            app.state.event_detail_cache = ResponseCache(
+                "event_detail", redis=arq.redis
+            )
+            if capacity_ledger_enabled():
+                app.state.capacity_ledger = CapacityLedger(redis=arq.redis)
         except Exception:
             _logger.exception(
                 "Redis/Arq is not reachable; API will run without background "
                 "reminders. Set REDIS_URL (e.g. in SSM for EC2) to enable them."
             )
             app.state.arq = None
+            if capacity_ledger_enabled():
+                _logger.error(
+                    "CAPACITY_LEDGER=redis but Redis is not reachable; this process "
+                    "refuses registrations until it is restarted with Redis."
+                )
+                app.state.capacity_ledger = UnavailableCapacityLedger()
+
+        app.state.event_user_locks = create_event_user_locks(
+            redis=arq.redis if arq is not None else None
+        )
 
         email_notification_service = create_email_notification_service(
             allow_missing=True
@@ -58,6 +93,7 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         yield
     finally:
         await db_client.close()
+        await http_clients.aclose()
         if arq is not None:
             await arq.close()
 
@@ -71,6 +107,13 @@ def create_app() -> FastAPI:
         return {"status": "ok"}
 
     app.state.frontend_settings = build_frontend_settings(getenv("FRONTEND_URL"))
+    app.state.event_totals = EventTotalsCache()
+    app.state.event_detail_cache = ResponseCache("event_detail")
+    app.state.capacity_ledger = CapacityLedger()
+    app.state.event_user_locks = MongoEventUserLocks()
+    app.state.principal_cache = LocalTTLCache[User](
+        ttl_seconds=PRINCIPAL_CACHE_TTL_SECONDS
+    )
     frontend_origin = app.state.frontend_settings.primary_origin or ""
     session_https_only = frontend_origin.startswith("https://")
 
@@ -15,6 +15,9 @@ class CommandLineArguments:
     log_level: str
     host: str
     port: int
+    command: str = "serve"
+    check_only: bool = False
+    dry_run: bool = False
 
 
 def parse_args(argv: Sequence[str] | None = None) -> CommandLineArguments:
@@ -45,6 +48,48 @@ def parse_args(argv: Sequence[str] | None = None) -> CommandLineArguments:
         help="Port to bind the server to. Defaults to 8000.",
     )
 
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    subparsers.add_parser(
+        "serve",
+        help="Run the API server. This is the default when no command is given.",
+    )
+    indexes_parser = subparsers.add_parser(
+        "indexes",
+        help="Create missing MongoDB indexes and report drift, then exit.",
+    )
+    indexes_parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report missing or drifted indexes; do not create anything.",
+    )
+    subparsers.add_parser(
+        "reconcile-counters",
+        help="Recompute denormalized event and user counters, repair drift, then exit.",
+    )
+
+    migrate_parser = subparsers.add_parser(
+        "migrate-attendance",
+        help=(
+            "Collapse attendance to one document per event and user, archive "
+            "older rows in attendance_history, and build the unique index."
+        ),
+    )
+    migrate_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only report how many rows would be archived; do not write anything.",
+    )
+
+    subparsers.add_parser(
+        "rebuild-user-events",
+        help="Recompute the per-user index behind GET /users/me/events, then exit.",
+    )
+
+    subparsers.add_parser(
+        "backfill-activity",
+        help="Seed the user activity log from existing events and attendance.",
+    )
+
     args = parser.parse_args(argv)
 
     return CommandLineArguments(
@@ -52,4 +97,7 @@ def parse_args(argv: Sequence[str] | None = None) -> CommandLineArguments:
         log_level=args.log_level.upper(),
         host=args.host,
         port=args.port,
+        command=args.command or "serve",
+        check_only=getattr(args, "check", False),
+        dry_run=getattr(args, "dry_run", False),
     )
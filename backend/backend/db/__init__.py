@@ -1,4 +1,5 @@
 from .client import get_database, get_mongo_client
 from .dependency import get_db
+from .indexes import ensure_indexes
 
-__all__ = ["get_database", "get_db", "get_mongo_client"]
+__all__ = ["ensure_indexes", "get_database", "get_db", "get_mongo_client"]
@@ -0,0 +1,337 @@
+"""Declarative MongoDB index registry.
+
+Every index the routes and the notification worker rely on is declared in
+``INDEX_SPECS``. ``ensure_indexes`` is idempotent: it creates whatever is
+missing, leaves matching indexes alone, and reports drift (indexes whose
+definition no longer matches the registry, or indexes nobody declared) without
+dropping anything, so a deploy never silently loses an index.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
+
+from pymongo import ASCENDING, DESCENDING
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import OperationFailure
+
+_logger = logging.getLogger(__name__)
+
+# Mirrors the OAuth token max age enforced in ``routes/auth.py`` so Mongo
+# expires abandoned session tokens on its own.
+OAUTH_TOKEN_TTL = timedelta(days=30)
+# Finished calendar sync jobs only matter while the client is polling.
+CALENDAR_SYNC_JOB_TTL = timedelta(days=7)
+# Reminder fan-out checkpoints only matter while a reminder job may be retried.
+REMINDER_PROGRESS_TTL = timedelta(days=7)
+# Sent outbox emails are kept for a while to answer "was it sent?".
+EMAIL_OUTBOX_SENT_TTL = timedelta(days=7)
+
+IndexKey = tuple[tuple[str, int | str], ...]
+
+
+@dataclass(frozen=True, slots=True)
+class IndexSpec:
+    collection: str
+    name: str
+    keys: IndexKey
+    unique: bool = False
+    partial_filter: Mapping[str, Any] | None = None
+    expire_after_seconds: int | None = None
+
+    def create_kwargs(self) -> dict[str, Any]:
+        kwargs: dict[str, Any] = {"name": self.name}
+        if self.unique:
+            kwargs["unique"] = True
+        if self.partial_filter is not None:
+            kwargs["partialFilterExpression"] = dict(self.partial_filter)
+        if self.expire_after_seconds is not None:
+            kwargs["expireAfterSeconds"] = self.expire_after_seconds
+        return kwargs
+
+    def matches(self, info: Mapping[str, Any]) -> bool:
+        """Return whether an ``index_information()`` entry matches this spec."""
+        if _normalized_keys(info.get("key", ())) != self.keys:
+            return False
+        if bool(info.get("unique", False)) != self.unique:
+            return False
+        partial = info.get("partialFilterExpression")
+        if (dict(partial) if partial is not None else None) != (
+            dict(self.partial_filter) if self.partial_filter is not None else None
+        ):
+            return False
+        expire_after = info.get("expireAfterSeconds")
+        return (
+            int(expire_after) if expire_after is not None else None
+        ) == self.expire_after_seconds
+
+
+@dataclass(slots=True)
+class IndexReport:
+    created: list[str] = field(default_factory=list)
+    missing: list[str] = field(default_factory=list)
+    conflicting: list[str] = field(default_factory=list)
+    unmanaged: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+
+    @property
+    def has_drift(self) -> bool:
+        return bool(self.missing or self.conflicting or self.failed)
+
+
+def _normalized_keys(raw_keys: object) -> IndexKey:
+    if isinstance(raw_keys, Mapping):
+        items = list(raw_keys.items())
+    elif isinstance(raw_keys, Sequence):
+        items = [(item[0], item[1]) for item in raw_keys]
+    else:
+        return ()
+    return tuple(
+        (
+            str(key),
+            int(direction) if isinstance(direction, int | float) else str(direction),
+        )
+        for key, direction in items
+    )
+
+
+INDEX_SPECS: tuple[IndexSpec, ...] = (
+    # events
+    IndexSpec("events", "events_id_unique", (("id", ASCENDING),), unique=True),
+    IndexSpec(
+        "events",
+        "events_status_start_time",
+        (("status", ASCENDING), ("start_time", ASCENDING)),
+    ),
+    # keyset pagination of ``GET /events/``: one (sort key, id) index per sort
+    IndexSpec(
+        "events",
+        "events_start_time_id",
+        (("start_time", ASCENDING), ("id", ASCENDING)),
+    ),
+    IndexSpec("events", "events_price_id", (("price", ASCENDING), ("id", ASCENDING))),
+    IndexSpec("events", "events_title_id", (("title", ASCENDING), ("id", ASCENDING))),
+    IndexSpec(
+        "events",
+        "events_organizer_start_time",
+        (("organizer_user_id", ASCENDING), ("start_time", DESCENDING)),
+    ),
+    # multikey inverted index behind ``GET /events/?q=``
+    IndexSpec("events", "events_search_terms", (("search_terms", ASCENDING),)),
+    # attendance: one current-state document per (event, user); on an older
+    # database this needs ``migrate_attendance`` first, which the API runs
+    IndexSpec(
+        "attendance",
+        "attendance_event_user_unique",
+        (("event_id", ASCENDING), ("user_id", ASCENDING)),
+        unique=True,
+    ),
+    IndexSpec(
+        "attendance",
+        "attendance_event_status",
+        (("event_id", ASCENDING), ("status", ASCENDING)),
+    ),
+    IndexSpec(
+        "attendance",
+        "attendance_user_latest",
+        (("user_id", ASCENDING), ("_id", DESCENDING)),
+    ),
+    IndexSpec(
+        "attendance",
+        "attendance_user_status",
+        (("user_id", ASCENDING), ("status", ASCENDING)),
+    ),
+    # waitlist heads: FIFO by join time among an event's waitlisted rows
+    IndexSpec(
+        "attendance",
+        "attendance_event_waitlist",
+        (("event_id", ASCENDING), ("waitlisted_at", ASCENDING), ("_id", ASCENDING)),
+        partial_filter={"status": "waitlisted"},
+    ),
+    # attendance_history: append-only; see services/attendance.py
+    IndexSpec(
+        "attendance_history",
+        "attendance_history_event_user_recorded_at",
+        (("event_id", ASCENDING), ("user_id", ASCENDING), ("recorded_at", ASCENDING)),
+    ),
+    # user_event_index: "my events" memberships; see services/user_event_index.py
+    IndexSpec(
+        "user_event_index",
+        "user_event_index_user_kind_event_unique",
+        (("user_id", ASCENDING), ("kind", ASCENDING), ("event_id", ASCENDING)),
+        unique=True,
+    ),
+    IndexSpec(
+        "user_event_index",
+        "user_event_index_user_kind_sort_at",
+        (
+            ("user_id", ASCENDING),
+            ("kind", ASCENDING),
+            ("sort_at", DESCENDING),
+            ("event_id", DESCENDING),
+        ),
+    ),
+    # user_activity: append-only feed; see services/user_activity.py
+    IndexSpec(
+        "user_activity",
+        "user_activity_user_ts",
+        (("user_id", ASCENDING), ("ts", DESCENDING), ("_id", DESCENDING)),
+    ),
+    # event_favorites
+    IndexSpec(
+        "event_favorites",
+        "event_favorites_event_user_unique",
+        (("event_id", ASCENDING), ("user_id", ASCENDING)),
+        unique=True,
+    ),
+    # user calendar
+    IndexSpec(
+        "user_calendar_entries",
+        "user_calendar_entries_user_event_unique",
+        (("user_id", ASCENDING), ("event_id", ASCENDING)),
+        unique=True,
+    ),
+    IndexSpec(
+        "user_calendar_entries",
+        "user_calendar_entries_user_added_at",
+        (("user_id", ASCENDING), ("added_at", DESCENDING)),
+    ),
+    IndexSpec(
+        "user_calendar_syncs",
+        "user_calendar_syncs_user_unique",
+        (("user_id", ASCENDING),),
+        unique=True,
+    ),
+    # background calendar sync jobs: one in flight per user, kept for a week
+    IndexSpec(
+        "calendar_sync_jobs",
+        "calendar_sync_jobs_user_active_unique",
+        (("user_id", ASCENDING),),
+        unique=True,
+        partial_filter={"active": True},
+    ),
+    IndexSpec(
+        "calendar_sync_jobs",
+        "calendar_sync_jobs_created_at_ttl",
+        (("created_at", ASCENDING),),
+        expire_after_seconds=int(CALENDAR_SYNC_JOB_TTL.total_seconds()),
+    ),
+    # reminder fan-out checkpoints; see services/notifications/reminders.py
+    IndexSpec(
+        "reminder_progress",
+        "reminder_progress_updated_at_ttl",
+        (("updated_at", ASCENDING),),
+        expire_after_seconds=int(REMINDER_PROGRESS_TTL.total_seconds()),
+    ),
+    # email outbox: claim due emails, expire sent ones; see
+    # services/notifications/outbox.py
+    IndexSpec(
+        "email_outbox",
+        "email_outbox_status_next_attempt_at",
+        (("status", ASCENDING), ("next_attempt_at", ASCENDING)),
+    ),
+    IndexSpec(
+        "email_outbox",
+        "email_outbox_sent_at_ttl",
+        (("sent_at", ASCENDING),),
+        expire_after_seconds=int(EMAIL_OUTBOX_SENT_TTL.total_seconds()),
+    ),
+    # event user locks expire on their own; see services/locks.py
+    IndexSpec(
+        "event_user_locks",
+        "event_user_locks_expires_at_ttl",
+        (("expires_at", ASCENDING),),
+        expire_after_seconds=0,
+    ),
+    # users
+    IndexSpec("users", "users_id_unique", (("id", ASCENDING),), unique=True),
+    IndexSpec("users", "users_email_unique", (("email", ASCENDING),), unique=True),
+    IndexSpec(
+        "users", "users_username_unique", (("username", ASCENDING),), unique=True
+    ),
+    IndexSpec(
+        "users",
+        "users_google_sub_unique",
+        (("google_sub", ASCENDING),),
+        unique=True,
+        partial_filter={"google_sub": {"$type": "string"}},
+    ),
+    # oauth tokens
+    IndexSpec(
+        "oauth_tokens",
+        "oauth_tokens_updated_at_ttl",
+        (("updated_at", ASCENDING),),
+        expire_after_seconds=int(OAUTH_TOKEN_TTL.total_seconds()),
+    ),
+)
+
+
+async def ensure_indexes(
+    db: AsyncDatabase[dict[str, Any]],
+    *,
+    create: bool = True,
+    specs: Sequence[IndexSpec] = INDEX_SPECS,
+) -> IndexReport:
+    """Create missing registry indexes and report drift.
+
+    With ``create=False`` nothing is written; missing indexes are only reported,
+    which is what the offline ``backend indexes --check`` command uses.
+    """
+    report = IndexReport()
+    specs_by_collection: dict[str, list[IndexSpec]] = {}
+    for spec in specs:
+        specs_by_collection.setdefault(spec.collection, []).append(spec)
+
+    for collection_name, collection_specs in specs_by_collection.items():
+        collection = db[collection_name]
+        existing: Mapping[str, Mapping[str, Any]] = await collection.index_information()
+        declared = {spec.name for spec in collection_specs}
+
+        for spec in collection_specs:
+            qualified = f"{collection_name}.{spec.name}"
+            info = existing.get(spec.name)
+            if info is not None:
+                if not spec.matches(info):
+                    report.conflicting.append(qualified)
+                continue
+
+            if not create:
+                report.missing.append(qualified)
+                continue
+
+            try:
+                await collection.create_index(list(spec.keys), **spec.create_kwargs())
+            except OperationFailure as exc:
+                _logger.error("Could not create index %s: %s", qualified, exc)
+                report.failed.append(qualified)
+                continue
+            report.created.append(qualified)
+
+        report.unmanaged.extend(
+            f"{collection_name}.{name}"
+            for name in existing
+            if name != "_id_" and name not in declared
+        )
+
+    _log_report(report)
+    return report
+
+
+def _log_report(report: IndexReport) -> None:
+    if report.created:
+        _logger.info("Created indexes: %s", ", ".join(report.created))
+    if report.missing:
+        _logger.warning("Missing indexes: %s", ", ".join(report.missing))
+    if report.conflicting:
+        _logger.warning(
+            "Indexes differ from the registry (drop and re-run to rebuild): %s",
+            ", ".join(report.conflicting),
+        )
+    if report.unmanaged:
+        _logger.info(
+            "Indexes not declared in the registry: %s", ", ".join(report.unmanaged)
+        )
@@ -1,10 +1,53 @@
+import asyncio
 import logging
 import os
+import sys
 from collections.abc import Sequence
 
 import uvicorn
 
 from .cli import parse_args
+from .db import ensure_indexes, get_database
+from .services.attendance import migrate_attendance
+from .services.counters import reconcile_event_counters, reconcile_user_counters
+from .services.user_activity import backfill_user_activity
+from .services.user_event_index import rebuild_user_event_index
+
+
+async def _run_index_bootstrap(database_url: str, *, check_only: bool) -> int:
+    async with get_database(database_url) as db:
+        report = await ensure_indexes(db, create=not check_only)
+    return 1 if report.has_drift else 0
+
+
+async def _run_counter_reconcile(database_url: str) -> int:
+    async with get_database(database_url) as db:
+        repaired_events = await reconcile_event_counters(db)
+        repaired_users = await reconcile_user_counters(db)
+    logging.getLogger(__name__).info(
+        "Reconciled counters; repaired %d events and %d users",
+        repaired_events,
+        repaired_users,
+    )
+    return 0
+
+
+async def _run_attendance_migration(database_url: str, *, dry_run: bool) -> int:
+    async with get_database(database_url) as db:
+        report = await migrate_attendance(db, dry_run=dry_run)
+    return 0 if dry_run or report.index_ready else 1
+
+
+async def _run_user_event_index_rebuild(database_url: str) -> int:
+    async with get_database(database_url) as db:
+        await rebuild_user_event_index(db)
+    return 0
+
+
+async def _run_activity_backfill(database_url: str) -> int:
+    async with get_database(database_url) as db:
+        await backfill_user_activity(db)
+    return 0
 
 
 def cli(argv: Sequence[str] | None = None) -> None:
@@ -17,6 +60,33 @@ def cli(argv: Sequence[str] | None = None) -> None:
         level=cli_args.log_level,
     )
 
+    if cli_args.command == "indexes":
+        sys.exit(
+            asyncio.run(
+                _run_index_bootstrap(
+                    cli_args.database_url, check_only=cli_args.check_only
+                )
+            )
+        )
+
+    if cli_args.command == "reconcile-counters":
+        sys.exit(asyncio.run(_run_counter_reconcile(cli_args.database_url)))
+
+    if cli_args.command == "migrate-attendance":
+        sys.exit(
+            asyncio.run(
+                _run_attendance_migration(
+                    cli_args.database_url, dry_run=cli_args.dry_run
+                )
+            )
+        )
+
+    if cli_args.command == "rebuild-user-events":
+        sys.exit(asyncio.run(_run_user_event_index_rebuild(cli_args.database_url)))
+
+    if cli_args.command == "backfill-activity":
+        sys.exit(asyncio.run(_run_activity_backfill(cli_args.database_url)))
+
     logging.getLogger(__name__).info(
         "Starting Evently API on %s:%d", cli_args.host, cli_args.port
     )
@@ -8,6 +8,14 @@ class AttendanceStatus(StrEnum):
     Going = "going"
     Cancelled = "cancelled"
     CheckedIn = "checked_in"
+    Waitlisted = "waitlisted"
+
+
+# Statuses that hold a seat; ``waitlisted`` rows wait for one.
+REGISTERED_ATTENDANCE_STATUSES = (
+    AttendanceStatus.Going.value,
+    AttendanceStatus.CheckedIn.value,
+)
 
 
 class EventAttendance(BaseModel):
@@ -15,6 +23,7 @@ class EventAttendance(BaseModel):
     user_id: int
     status: AttendanceStatus = AttendanceStatus.Going
     checked_in_at: DateTime | None = None
+    waitlisted_at: DateTime | None = None
 
     @model_validator(mode="after")
     def checked_in_at_required_for_checked_in(self) -> "EventAttendance":
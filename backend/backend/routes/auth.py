@@ -1,20 +1,13 @@
 import logging
 import re
 import uuid
-from base64 import urlsafe_b64encode
 from collections.abc import Mapping
-from datetime import UTC, datetime, timedelta
 from functools import lru_cache
-from hashlib import sha256
-from json import dumps, loads
 from os import getenv
-from time import time
 from typing import Annotated, Any, Protocol, TypeGuard, cast
 from urllib.parse import urlsplit, urlunsplit
 
-import httpx
 from authlib.integrations.starlette_client import OAuth, OAuthError
-from cryptography.fernet import Fernet, InvalidToken
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 from pymongo import ReturnDocument
@@ -27,13 +20,21 @@ from starlette.responses import RedirectResponse
 from backend.app_config import get_frontend_settings
 from backend.db import get_db
 from backend.models.user import GlobalRole, User, UserProfile
+from backend.services.cache import LocalTTLCache
+from backend.services.http_clients import get_http_clients
+from backend.services.oauth_tokens import (
+    GOOGLE_CALENDAR_SCOPE,
+    OAUTH_NOT_CONFIGURED,
+    OAUTH_TOKEN_COLLECTION,
+    decoded_oauth_token,
+    google_calendar_access_token,
+    serialized_oauth_token,
+    write_oauth_token,
+)
 
 CONF_URL = "https://accounts.google.com/.well-known/openid-configuration"
-GOOGLE_CALENDAR_SCOPE = "https://www.googleapis.com/auth/calendar.events"
 GOOGLE_OAUTH_SCOPE = f"openid email profile {GOOGLE_CALENDAR_SCOPE}"
-GOOGLE_TOKEN_REFRESH_URL = "https://oauth2.googleapis.com/token"
 
-OAUTH_NOT_CONFIGURED = "Google OAuth is not configured"
 OAUTH_INVALID_IDENTITY = "Google account is missing required verified identity claims"
 USERNAME_SANITIZER = re.compile(r"[^a-z0-9_]+")
 
@@ -42,8 +43,9 @@ _OAUTH_TOKEN_SESSION_ID_KEY = "oauth_token_session_id"
 _EVENTLY_USER_SESSION_KEY = "evently_user_id"
 _POST_AUTH_REDIRECT_KEY = "post_auth_redirect"
 _PENDING_SIGNUP_SESSION_KEY = "pending_signup"
-_OAUTH_TOKEN_COLLECTION = "oauth_tokens"
-_OAUTH_TOKEN_MAX_AGE = timedelta(days=30)
+# Principals are cached per process; writes in this process invalidate them and
+# the TTL bounds how long another process can serve a stale profile.
+PRINCIPAL_CACHE_TTL_SECONDS = 30.0
 
 DbDep = Annotated[AsyncDatabase[dict[str, Any]], Depends(get_db)]
 
@@ -189,14 +191,6 @@ def _session_token_store_id(request: Request) -> str:
     return session_id
 
 
-@lru_cache(maxsize=1)
-def _oauth_token_cipher() -> Fernet:
-    if not (session_secret_key := getenv("SESSION_SECRET_KEY")):
-        raise RuntimeError("SESSION_SECRET_KEY environment variable is not set")
-    digest = sha256(session_secret_key.encode("utf-8")).digest()
-    return Fernet(urlsafe_b64encode(digest))
-
-
 def _bool_value(value: object) -> bool | None:
     if isinstance(value, bool):
         return value
@@ -209,149 +203,10 @@ def _bool_value(value: object) -> bool | None:
     return None
 
 
-def _utc_datetime_value(value: object) -> datetime | None:
-    if not isinstance(value, datetime):
-        return None
-    if value.tzinfo is None:
-        return value.replace(tzinfo=UTC)
-    return value.astimezone(UTC)
-
-
 def _normalized_email(value: str) -> str:
     return value.strip().strip("\"'").lower()
 
 
-def _serialized_oauth_token(
-    token: Mapping[str, object], *, previous: Mapping[str, object] | None = None
-) -> dict[str, object] | None:
-    access_token = _string_value(token.get("access_token"))
-    if access_token is None:
-        return None
-
-    serialized: dict[str, object] = {"access_token": access_token}
-
-    if previous is None:
-        previous = {}
-
-    if token_type := (
-        _string_value(token.get("token_type"))
-        or _string_value(previous.get("token_type"))
-    ):
-        serialized["token_type"] = token_type
-
-    if scope := _string_value(token.get("scope")) or _string_value(
-        previous.get("scope")
-    ):
-        serialized["scope"] = scope
-
-    if refresh_token := _string_value(token.get("refresh_token")) or _string_value(
-        previous.get("refresh_token")
-    ):
-        serialized["refresh_token"] = refresh_token
-
-    expires_at = token.get("expires_at")
-    if isinstance(expires_at, int | float):
-        serialized["expires_at"] = int(expires_at)
-    else:
-        expires_in = token.get("expires_in")
-        if isinstance(expires_in, int | float):
-            serialized["expires_at"] = int(time()) + int(expires_in)
-        elif isinstance(previous_expires_at := previous.get("expires_at"), int | float):
-            serialized["expires_at"] = int(previous_expires_at)
-
-    return serialized
-
-
-def _stored_oauth_token(value: object) -> Mapping[str, object] | None:
-    if not isinstance(value, Mapping):
-        return None
-    access_token = value.get("access_token")
-    if not isinstance(access_token, str) or not access_token.strip():
-        return None
-    return value
-
-
-def _oauth_token_has_scope(token: Mapping[str, object], required_scope: str) -> bool:
-    scope = _string_value(token.get("scope"))
-    if scope is None:
-        return True
-    return required_scope in scope.split()
-
-
-def _oauth_token_needs_refresh(token: Mapping[str, object]) -> bool:
-    expires_at = token.get("expires_at")
-    if not isinstance(expires_at, int | float):
-        return False
-    return time() >= float(expires_at) - 60
-
-
-async def _refresh_oauth_token(token: Mapping[str, object]) -> dict[str, object]:
-    refresh_token = _string_value(token.get("refresh_token"))
-    if refresh_token is None:
-        raise HTTPException(
-            status_code=403,
-            detail="Google Calendar access has expired. Please sign in again.",
-        )
-
-    client_id = getenv("OAUTH_CLIENT_ID")
-    client_secret = getenv("OAUTH_CLIENT_SECRET")
-    if not client_id or not client_secret:
-        raise HTTPException(status_code=503, detail=OAUTH_NOT_CONFIGURED)
-
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(
-                GOOGLE_TOKEN_REFRESH_URL,
-                data={
-                    "client_id": client_id,
-                    "client_secret": client_secret,
-                    "grant_type": "refresh_token",
-                    "refresh_token": refresh_token,
-                },
-            )
-    except httpx.HTTPError as exc:
-        logging.getLogger(__name__).error("Google token refresh failed: %s", exc)
-        raise HTTPException(
-            status_code=502,
-            detail="Could not refresh Google Calendar access.",
-        ) from exc
-
-    if response.status_code in {400, 401}:
-        raise HTTPException(
-            status_code=403,
-            detail="Google Calendar access has expired. Please sign in again.",
-        )
-
-    if not response.is_success:
-        raise HTTPException(
-            status_code=502,
-            detail="Could not refresh Google Calendar access.",
-        )
-
-    try:
-        payload = response.json()
-    except ValueError as exc:
-        raise HTTPException(
-            status_code=502,
-            detail="Could not refresh Google Calendar access.",
-        ) from exc
-
-    if not isinstance(payload, Mapping):
-        raise HTTPException(
-            status_code=502,
-            detail="Could not refresh Google Calendar access.",
-        )
-
-    refreshed = _serialized_oauth_token(payload, previous=token)
-    if refreshed is None:
-        raise HTTPException(
-            status_code=502,
-            detail="Could not refresh Google Calendar access.",
-        )
-
-    return refreshed
-
-
 async def _store_oauth_token(
     db: AsyncDatabase[dict[str, Any]],
     request: Request,
@@ -359,64 +214,34 @@ async def _store_oauth_token(
     *,
     previous: Mapping[str, object] | None = None,
 ) -> None:
-    serialized = _serialized_oauth_token(token, previous=previous)
+    serialized = serialized_oauth_token(token, previous=previous)
     if serialized is None:
         await _clear_oauth_token(db, request)
         return
+    await write_oauth_token(db, _session_token_store_id(request), serialized)
 
-    session_id = _session_token_store_id(request)
-    encrypted_token = (
-        _oauth_token_cipher()
-        .encrypt(dumps(dict(serialized)).encode("utf-8"))
-        .decode("utf-8")
-    )
-    now = datetime.now(tz=UTC)
-    await db[_OAUTH_TOKEN_COLLECTION].update_one(
-        {"_id": session_id},
-        {
-            "$set": {
-                "encrypted_token": encrypted_token,
-                "updated_at": now,
-                "expires_at": serialized.get("expires_at"),
-            }
-        },
-        upsert=True,
-    )
+
+def oauth_token_session_id(request: Request) -> str | None:
+    """Id of the stored OAuth token for this session, if it has one."""
+    session_id = request.session.get(_OAUTH_TOKEN_SESSION_ID_KEY)
+    if not isinstance(session_id, str) or not session_id.strip():
+        return None
+    return session_id
 
 
 async def _load_oauth_token(
     db: AsyncDatabase[dict[str, Any]], request: Request
 ) -> Mapping[str, object] | None:
-    session_id = request.session.get(_OAUTH_TOKEN_SESSION_ID_KEY)
-    if not isinstance(session_id, str) or not session_id.strip():
+    session_id = oauth_token_session_id(request)
+    if session_id is None:
         return None
-    stored = await db[_OAUTH_TOKEN_COLLECTION].find_one({"_id": session_id})
+    stored = await db[OAUTH_TOKEN_COLLECTION].find_one({"_id": session_id})
     if not isinstance(stored, Mapping):
         return None
-    updated_at = _utc_datetime_value(stored.get("updated_at"))
-    if (
-        updated_at is not None
-        and updated_at < datetime.now(tz=UTC) - _OAUTH_TOKEN_MAX_AGE
-    ):
-        await _clear_oauth_token(db, request)
-        return None
-
-    encrypted_token = stored.get("encrypted_token")
-    if not isinstance(encrypted_token, str) or not encrypted_token.strip():
-        await _clear_oauth_token(db, request)
-        return None
-
-    try:
-        decrypted = _oauth_token_cipher().decrypt(encrypted_token.encode("utf-8"))
-        payload = loads(decrypted.decode("utf-8"))
-    except (InvalidToken, UnicodeDecodeError, TypeError, ValueError):
-        await _clear_oauth_token(db, request)
-        return None
-
-    if not isinstance(payload, Mapping):
+    token = decoded_oauth_token(stored)
+    if token is None:
         await _clear_oauth_token(db, request)
-        return None
-    return _stored_oauth_token(payload)
+    return token
 
 
 async def _clear_oauth_token(
@@ -424,36 +249,17 @@ async def _clear_oauth_token(
 ) -> None:
     session_id = request.session.pop(_OAUTH_TOKEN_SESSION_ID_KEY, None)
     if isinstance(session_id, str) and session_id.strip():
-        await db[_OAUTH_TOKEN_COLLECTION].delete_one({"_id": session_id})
+        await db[OAUTH_TOKEN_COLLECTION].delete_one({"_id": session_id})
 
 
 async def get_google_calendar_access_token(request: Request) -> str:
     db = cast(AsyncDatabase[dict[str, Any]], request.app.state.db)
     stored_token = await _load_oauth_token(db, request)
-    if stored_token is None:
-        raise HTTPException(
-            status_code=403,
-            detail="Google Calendar access is not available for this session. Please sign in again.",
-        )
-
-    if not _oauth_token_has_scope(stored_token, GOOGLE_CALENDAR_SCOPE):
-        raise HTTPException(
-            status_code=403,
-            detail="Google Calendar permission has not been granted. Please sign in again.",
-        )
-
-    if _oauth_token_needs_refresh(stored_token):
-        refreshed = await _refresh_oauth_token(stored_token)
+    access_token, refreshed = await google_calendar_access_token(
+        stored_token, client=get_http_clients(request).google_oauth
+    )
+    if refreshed is not None:
         await _store_oauth_token(db, request, refreshed, previous=stored_token)
-        stored_token = refreshed
-
-    access_token = _string_value(stored_token.get("access_token"))
-    if access_token is None:
-        raise HTTPException(
-            status_code=403,
-            detail="Google Calendar access is not available for this session. Please sign in again.",
-        )
-
     return access_token
 
 
@@ -720,6 +526,41 @@ async def _sync_user_roles(db: AsyncDatabase[dict[str, Any]], user: User) -> Use
     return user.model_copy(update={"roles": expected_roles})
 
 
+def get_principal_cache(request: Request) -> LocalTTLCache[User]:
+    """Return the app's cache of role-synced ``User`` records keyed by user id."""
+    principals: LocalTTLCache[User] | None = getattr(
+        request.app.state, "principal_cache", None
+    )
+    if principals is None:
+        principals = LocalTTLCache[User](ttl_seconds=PRINCIPAL_CACHE_TTL_SECONDS)
+        request.app.state.principal_cache = principals
+    return principals
+
+
+def remember_principal(request: Request, user: User) -> None:
+    get_principal_cache(request).set(str(user.id), user)
+
+
+def invalidate_principal(request: Request, user_id: int) -> None:
+    """Drop a cached principal after a write to its ``users`` document."""
+    get_principal_cache(request).delete(str(user_id))
+
+
+async def _load_session_user(
+    db: AsyncDatabase[dict[str, Any]], request: Request, user_id: int
+) -> User | None:
+    principals = get_principal_cache(request)
+    if (cached := principals.get(str(user_id))) is not None:
+        return cached
+
+    existing = await db["users"].find_one({"id": user_id})
+    if existing is None:
+        return None
+    user = await _sync_user_roles(db, User(**existing))
+    principals.set(str(user_id), user)
+    return user
+
+
 async def _get_authenticated_user(
     db: AsyncDatabase[dict[str, Any]], request: Request
 ) -> AuthSessionUser | None:
@@ -734,9 +575,8 @@ async def _get_authenticated_user(
 
     local_user_id = request.session.get(_EVENTLY_USER_SESSION_KEY)
     if isinstance(local_user_id, int):
-        existing = await db["users"].find_one({"id": local_user_id})
-        if existing is not None:
-            user = await _sync_user_roles(db, User(**existing))
+        user = await _load_session_user(db, request, local_user_id)
+        if user is not None:
             if oauth_identity is None:
                 if is_google_userinfo(oauth_user):
                     request.session.pop(_OAUTH_USER_SESSION_KEY, None)
@@ -760,6 +600,7 @@ async def _get_authenticated_user(
                     {"id": user.id}, {"$set": {"google_sub": oauth_subject}}
                 )
                 user = user.model_copy(update={"google_sub": oauth_subject})
+                remember_principal(request, user)
                 picture = None
                 if is_google_userinfo(oauth_user):
                     picture = _string_value(oauth_user.get("picture"))
@@ -775,6 +616,7 @@ async def _get_authenticated_user(
         local_user = await _resolve_existing_local_user(db, oauth_user)
         if local_user is None:
             return None
+        remember_principal(request, local_user)
         request.session[_EVENTLY_USER_SESSION_KEY] = local_user.id
         request.session.pop(_PENDING_SIGNUP_SESSION_KEY, None)
         return _build_auth_session_user(
@@ -787,6 +629,7 @@ async def _get_authenticated_user(
         request.session.pop(_OAUTH_USER_SESSION_KEY, None)
         return None
 
+    remember_principal(request, local_user)
     request.session[_EVENTLY_USER_SESSION_KEY] = local_user.id
     request.session.pop(_PENDING_SIGNUP_SESSION_KEY, None)
     return _build_auth_session_user(
@@ -863,6 +706,7 @@ async def auth(request: Request, db: DbDep) -> RedirectResponse:
         request.session[_PENDING_SIGNUP_SESSION_KEY] = True
         return RedirectResponse(url=_complete_signup_redirect_target(request))
 
+    remember_principal(request, local_user)
     request.session.pop(_PENDING_SIGNUP_SESSION_KEY, None)
     request.session[_EVENTLY_USER_SESSION_KEY] = local_user.id
     redirect_to = request.session.pop(_POST_AUTH_REDIRECT_KEY, "/")
@@ -933,6 +777,7 @@ async def complete_signup(
         raise HTTPException(status_code=401, detail="No signup session found")
 
     local_user = await _create_local_user_from_oauth(db, oauth_user, body)
+    remember_principal(request, local_user)
     request.session[_EVENTLY_USER_SESSION_KEY] = local_user.id
     request.session.pop(_PENDING_SIGNUP_SESSION_KEY, None)
 
@@ -1,12 +1,15 @@
+import asyncio
 import logging
 import os
 import re
 import uuid
+from collections.abc import Awaitable, Callable
 from contextlib import suppress
 from datetime import UTC, datetime, timedelta
-from typing import Annotated, Any, Literal
+from typing import Annotated, Any, Literal, Self
 
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, field_validator, model_validator
 from pymongo import ASCENDING, DESCENDING, ReturnDocument
 from pymongo.asynchronous.database import AsyncDatabase
@@ -15,7 +18,10 @@ from starlette.requests import Request
 
 from backend.app_config import get_frontend_settings
 from backend.db import get_db
-from backend.models.attendance import AttendanceStatus
+from backend.models.attendance import (
+    REGISTERED_ATTENDANCE_STATUSES,
+    AttendanceStatus,
+)
 from backend.models.event import (
     Event,
     EventCategory,
@@ -29,16 +35,74 @@ from backend.routes.auth import (
     get_google_calendar_access_token,
     require_authenticated_user,
 )
+from backend.services.attendance import find_attendance, record_attendance_transition
+from backend.services.cache import ResponseCache, get_event_detail_cache
 from backend.services.calendar_sync import (
     create_google_calendar_event,
     delete_google_calendar_event,
     google_calendar_event_payload,
 )
-from backend.services.notifications.arq import ArqClient, get_arq, utc_naive_datetime
-from backend.services.notifications.email import (
-    REMINDER_LEAD_TIME_MINUTES,
-    EmailNotificationService,
-    get_email_notif_service,
+from backend.services.capacity import CapacityLedger, get_capacity_ledger
+from backend.services.check_in import (
+    MAX_CHECK_IN_BATCH_SIZE,
+    CheckInScan,
+    check_in_batch,
+)
+from backend.services.counters import (
+    FAVORITES_COUNT_FIELD,
+    REGISTERED_COUNT_FIELD,
+    USER_ATTENDED_COUNT_FIELD,
+    USER_CREATED_COUNT_FIELD,
+    ensure_event_counters,
+    ensure_event_counters_by_id,
+    increment_user_counters,
+)
+from backend.services.event_search import (
+    SEARCH_FIELDS_PROJECTION,
+    SEARCH_SCORE_FIELD,
+    event_search_fields,
+    relevance_score_expression,
+    search_filter,
+)
+from backend.services.event_totals import EventTotalsCache, get_event_totals
+from backend.services.http_clients import get_http_clients
+from backend.services.locks import EventUserLocks, HeldLock, get_event_user_locks
+from backend.services.notifications.arq import (
+    ArqClient,
+    get_arq,
+    get_optional_arq,
+    utc_naive_datetime,
+)
+from backend.services.notifications.outbox import (
+    enqueue_email,
+    outbox_dedup_key,
+    outbox_depth,
+)
+from backend.services.notifications.throttle import read_email_metrics
+from backend.services.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    keyset_filter,
+)
+from backend.services.roster import (
+    DEFAULT_ROSTER_PAGE_SIZE,
+    MAX_ROSTER_PAGE_SIZE,
+    RosterFormat,
+    RosterStatus,
+    decode_roster_cursor,
+    export_roster,
+    iter_roster,
+    roster_page,
+)
+from backend.services.user_activity import log_event_created
+from backend.services.user_event_index import index_created_event
+from backend.services.waitlist import (
+    fill_open_seats,
+    join_waitlist,
+    notify_promoted,
+    release_seat_to_waitlist,
+    waitlist_position,
 )
 
 router = APIRouter()
@@ -47,15 +111,17 @@ DbDep = Annotated[AsyncDatabase[dict[str, Any]], Depends(get_db)]
 AuthUserDep = Annotated[AuthSessionUser, Depends(require_authenticated_user)]
 USER_CALENDAR_COLLECTION = "user_calendar_entries"
 USER_CALENDAR_SYNC_COLLECTION = "user_calendar_syncs"
-EVENT_USER_LOCK_COLLECTION = "event_user_locks"
-EVENT_USER_LOCK_STALE_AFTER = timedelta(minutes=5)
 CALENDAR_REMOVAL_STARTED_AT_FIELD = "removal_started_at"
 UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "uploads")
 ALLOWED_EVENT_IMAGE_TYPES = {"image/jpeg", "image/png", "image/gif"}
 ALLOWED_EVENT_IMAGE_EXTENSIONS = {"jpg", "jpeg", "png", "gif"}
 MAX_EVENT_IMAGE_SIZE = 5 * 1024 * 1024
 ArqDep = Annotated[ArqClient, Depends(get_arq)]
-EmailNotifDep = Annotated[EmailNotificationService, Depends(get_email_notif_service)]
+OptionalArqDep = Annotated[ArqClient | None, Depends(get_optional_arq)]
+EventTotalsDep = Annotated[EventTotalsCache, Depends(get_event_totals)]
+EventDetailCacheDep = Annotated[ResponseCache, Depends(get_event_detail_cache)]
+CapacityLedgerDep = Annotated[CapacityLedger, Depends(get_capacity_ledger)]
+EventUserLocksDep = Annotated[EventUserLocks, Depends(get_event_user_locks)]
 
 # ---------------------------------------------------------------------------
 # Response schemas
@@ -102,9 +168,17 @@ class EventListItem(BaseModel):
 
 class PaginatedEvents(BaseModel):
     items: list[EventListItem]
-    total: int = Field(..., description="Total matching events")
+    total: int = Field(
+        ..., description="Total matching events, capped when `total_is_estimate`"
+    )
+    total_is_estimate: bool = Field(
+        False, description="True when more events match than `total` reports"
+    )
     page: int = Field(..., description="Current page number (1-indexed)")
     page_size: int = Field(..., description="Number of items per page")
+    next_cursor: str | None = Field(
+        None, description="Pass as `cursor` to fetch the next page; null at the end"
+    )
 
 
 class EventDetail(BaseModel):
@@ -164,15 +238,26 @@ class FavoriteRemoveResponse(BaseModel):
 class AttendanceStatusResponse(BaseModel):
     event_id: int
     user_id: int
-    status: Literal["going", "checked_in", "cancelled"] | None
+    status: Literal["going", "checked_in", "cancelled", "waitlisted"] | None
 
 
 class AttendanceRegisterResponse(BaseModel):
     event_id: int
     user_id: int
-    status: Literal["going"] = "going"
+    status: Literal["going", "waitlisted"] = "going"
     in_calendar: bool = True
     google_synced: bool = False
+    waitlist_position: int | None = None
+
+    @classmethod
+    def waitlisted(cls, event_id: int, user_id: int, position: int) -> Self:
+        return cls(
+            event_id=event_id,
+            user_id=user_id,
+            status="waitlisted",
+            in_calendar=False,
+            waitlist_position=position,
+        )
 
 
 class AttendanceCancelResponse(BaseModel):
@@ -189,6 +274,19 @@ class AppCalendarStatusResponse(BaseModel):
     google_sync_enabled: bool = False
 
 
+class ViewerStateResponse(BaseModel):
+    """Everything the event page shows the signed-in viewer, in one response."""
+
+    event: EventDetail
+    attendance_status: (
+        Literal["going", "checked_in", "cancelled", "waitlisted"] | None
+    ) = None
+    waitlist_position: int | None = None
+    in_calendar: bool = False
+    google_sync_enabled: bool = False
+    favorited: bool = False
+
+
 class AppCalendarMutationResponse(BaseModel):
     event_id: int
     status: Literal["added", "removed"]
@@ -245,7 +343,11 @@ class EventAttendeesResponse(BaseModel):
     total_capacity: int
     going_count: int
     checked_in_count: int
+    waitlist_count: int = 0
     attendees: list[EventAttendeeItem]
+    next_cursor: str | None = Field(
+        None, description="Pass as `cursor` to fetch the next page; null at the end"
+    )
 
 
 class CheckInResponse(BaseModel):
@@ -255,6 +357,41 @@ class CheckInResponse(BaseModel):
     checked_in_at: datetime
 
 
+class CheckInBatchItem(BaseModel):
+    user_id: int | None = None
+    ticket_id: int | None = None
+    scanned_at: datetime | None = None
+
+    @model_validator(mode="after")
+    def exactly_one_identifier(self) -> "CheckInBatchItem":
+        if (self.user_id is None) == (self.ticket_id is None):
+            raise ValueError("Provide exactly one of user_id or ticket_id")
+        return self
+
+
+class CheckInBatchRequest(BaseModel):
+    items: list[CheckInBatchItem] = Field(
+        min_length=1, max_length=MAX_CHECK_IN_BATCH_SIZE
+    )
+    # Offline sync: record each scan's device time as its check-in time.
+    sync: bool = False
+
+
+class CheckInBatchResultItem(BaseModel):
+    user_id: int | None
+    ticket_id: int | None
+    result: Literal[
+        "checked_in", "already_checked_in", "not_registered", "unknown_ticket"
+    ]
+    checked_in_at: datetime | None
+
+
+class CheckInBatchResponse(BaseModel):
+    event_id: int
+    checked_in_count: int
+    results: list[CheckInBatchResultItem]
+
+
 class UndoCheckInResponse(BaseModel):
     event_id: int
     user_id: int
@@ -405,13 +542,11 @@ async def _read_valid_event_image(file: UploadFile) -> tuple[bytes, str]:
 
 
 async def _event_counts(
-    db: AsyncDatabase[dict[str, Any]], event_id: int
+    db: AsyncDatabase[dict[str, Any]], raw_event: dict[str, Any]
 ) -> tuple[int, int]:
-    attending = await db["attendance"].count_documents(
-        {"event_id": event_id, "status": {"$ne": "cancelled"}}
-    )
-    favorites = await db["event_favorites"].count_documents({"event_id": event_id})
-    return attending, favorites
+    """Return ``(attending, favorites)`` from the event's maintained counters."""
+    await ensure_event_counters(db, [raw_event])
+    return raw_event[REGISTERED_COUNT_FIELD], raw_event[FAVORITES_COUNT_FIELD]
 
 
 def _event_with_updates(event: Event, updates: dict[str, Any]) -> Event:
@@ -421,92 +556,27 @@ def _event_with_updates(event: Event, updates: dict[str, Any]) -> Event:
 
 
 async def _attending_counts(
-    db: AsyncDatabase[dict[str, Any]], event_ids: list[int]
+    db: AsyncDatabase[dict[str, Any]], raw_events: list[dict[str, Any]]
 ) -> dict[int, int]:
     """Return {event_id: count} for active attendees."""
-    if not event_ids:
-        return {}
-    pipeline: list[dict[str, Any]] = [
-        {"$match": {"event_id": {"$in": event_ids}, "status": {"$ne": "cancelled"}}},
-        {"$group": {"_id": "$event_id", "count": {"$sum": 1}}},
-    ]
-    counts: dict[int, int] = {}
-    cursor = await db["attendance"].aggregate(pipeline)
-    async for doc in cursor:
-        counts[doc["_id"]] = doc["count"]
-    return counts
-
-
-async def _ensure_registered_count(
-    db: AsyncDatabase[dict[str, Any]], event_id: int
-) -> None:
-    raw_event = await db["events"].find_one(
-        {"id": event_id}, {"_id": 1, "registered_count": 1}
-    )
-    if raw_event is None or "registered_count" in raw_event:
-        return
-
-    active_count = await db["attendance"].count_documents(
-        {"event_id": event_id, "status": {"$ne": AttendanceStatus.Cancelled.value}}
-    )
-    await db["events"].update_one(
-        {"_id": raw_event["_id"], "registered_count": {"$exists": False}},
-        {"$set": {"registered_count": active_count}},
-    )
-
-
-async def _reserve_event_slot(db: AsyncDatabase[dict[str, Any]], event_id: int) -> bool:
-    reserved = await db["events"].find_one_and_update(
-        {
-            "id": event_id,
-            "$expr": {"$lt": ["$registered_count", "$total_capacity"]},
-        },
-        {"$inc": {"registered_count": 1}},
-        return_document=ReturnDocument.AFTER,
-    )
-    return reserved is not None
-
-
-async def _release_event_slot(db: AsyncDatabase[dict[str, Any]], event_id: int) -> None:
-    await db["events"].update_one(
-        {"id": event_id, "registered_count": {"$gt": 0}},
-        {"$inc": {"registered_count": -1}},
-    )
-
-
-def _event_user_lock_id(*, event_id: int, user_id: int) -> str:
-    return f"{event_id}:{user_id}"
+    await ensure_event_counters(db, raw_events)
+    return {raw["id"]: raw[REGISTERED_COUNT_FIELD] for raw in raw_events}
 
 
 async def _acquire_event_user_lock(
-    db: AsyncDatabase[dict[str, Any]], *, event_id: int, user_id: int
-) -> str:
-    lock_id = _event_user_lock_id(event_id=event_id, user_id=user_id)
-    now = datetime.now(tz=UTC)
-    await db[EVENT_USER_LOCK_COLLECTION].delete_one(
-        {"_id": lock_id, "acquired_at": {"$lt": now - EVENT_USER_LOCK_STALE_AFTER}}
-    )
-    try:
-        await db[EVENT_USER_LOCK_COLLECTION].insert_one(
-            {
-                "_id": lock_id,
-                "event_id": event_id,
-                "user_id": user_id,
-                "acquired_at": now,
-            }
-        )
-    except DuplicateKeyError as exc:
+    locks: EventUserLocks,
+    db: AsyncDatabase[dict[str, Any]],
+    *,
+    event_id: int,
+    user_id: int,
+) -> HeldLock:
+    lock = await locks.acquire(db, event_id=event_id, user_id=user_id)
+    if lock is None:
         raise HTTPException(
             status_code=409,
             detail="This event registration is already being updated. Please try again.",
-        ) from exc
-    return lock_id
-
-
-async def _release_event_user_lock(
-    db: AsyncDatabase[dict[str, Any]], lock_id: str
-) -> None:
-    await db[EVENT_USER_LOCK_COLLECTION].delete_one({"_id": lock_id})
+        )
+    return lock
 
 
 def _resolve_date_preset(preset: str) -> tuple[datetime, datetime]:
@@ -580,15 +650,32 @@ async def _calendar_entry_for_user(
 async def _attendance_status_for_user(
     db: AsyncDatabase[dict[str, Any]], *, user_id: int, event_id: int
 ) -> str | None:
-    attendance = await db["attendance"].find_one(
-        {"event_id": event_id, "user_id": user_id},
-        sort=[("_id", DESCENDING)],
-    )
+    attendance = await find_attendance(db, event_id=event_id, user_id=user_id)
     if attendance is None:
         return None
     return _string_value(attendance.get("status"))
 
 
+async def _backfill_registered_calendar_entry(
+    db: AsyncDatabase[dict[str, Any]],
+    *,
+    user_id: int,
+    event_id: int,
+    attendance_status: str | None,
+) -> bool:
+    """Save a registered event missing from the user's calendar.
+
+    Returns whether the event is now in the calendar.
+    """
+    if attendance_status not in REGISTERED_ATTENDANCE_STATUSES:
+        return False
+    with suppress(DuplicateKeyError):
+        await db[USER_CALENDAR_COLLECTION].insert_one(
+            {"user_id": user_id, "event_id": event_id, "added_at": datetime.now(tz=UTC)}
+        )
+    return True
+
+
 async def _create_google_calendar_sync_fields(
     request: Request, event: Event
 ) -> tuple[str, dict[str, object]]:
@@ -600,6 +687,7 @@ async def _create_google_calendar_sync_fields(
                 event,
                 event_url=_frontend_event_url(request, event.id),
             ),
+            client=get_http_clients(request).google_calendar,
         )
     except HTTPException:
         raise
@@ -632,7 +720,9 @@ async def _delete_google_calendar_sync_if_present(
         return False
 
     access_token = await get_google_calendar_access_token(request)
-    await delete_google_calendar_event(access_token, google_event_id)
+    await delete_google_calendar_event(
+        access_token, google_event_id, client=get_http_clients(request).google_calendar
+    )
     return True
 
 
@@ -644,6 +734,7 @@ async def _ensure_event_in_app_calendar(
     event: Event,
 ) -> bool:
     existing = await _calendar_entry_for_user(db, user_id=user_id, event_id=event.id)
+    calendar_client = get_http_clients(request).google_calendar
     google_synced = False
 
     if existing is None:
@@ -663,7 +754,9 @@ async def _ensure_event_in_app_calendar(
             except DuplicateKeyError:
                 try:
                     await delete_google_calendar_event(
-                        access_token, str(sync_fields["google_calendar_event_id"])
+                        access_token,
+                        str(sync_fields["google_calendar_event_id"]),
+                        client=calendar_client,
                     )
                 except Exception:
                     logging.getLogger(__name__).exception(
@@ -680,7 +773,9 @@ async def _ensure_event_in_app_calendar(
             except Exception:
                 try:
                     await delete_google_calendar_event(
-                        access_token, str(sync_fields["google_calendar_event_id"])
+                        access_token,
+                        str(sync_fields["google_calendar_event_id"]),
+                        client=calendar_client,
                     )
                 except Exception:
                     logging.getLogger(__name__).exception(
@@ -721,7 +816,9 @@ async def _ensure_event_in_app_calendar(
             )
             if result.matched_count != 1:
                 await delete_google_calendar_event(
-                    access_token, str(sync_fields["google_calendar_event_id"])
+                    access_token,
+                    str(sync_fields["google_calendar_event_id"]),
+                    client=calendar_client,
                 )
                 concurrent = await _calendar_entry_for_user(
                     db, user_id=user_id, event_id=event.id
@@ -734,7 +831,9 @@ async def _ensure_event_in_app_calendar(
         except Exception:
             try:
                 await delete_google_calendar_event(
-                    access_token, str(sync_fields["google_calendar_event_id"])
+                    access_token,
+                    str(sync_fields["google_calendar_event_id"]),
+                    client=calendar_client,
                 )
             except Exception:
                 logging.getLogger(__name__).exception(
@@ -780,6 +879,42 @@ async def _remove_event_from_app_calendar_if_present(
     return True, google_synced
 
 
+# The cursor value is fed straight into a MongoDB filter, so it must be a plain
+# value of the sort field's type, never a document such as ``{"$ne": null}``.
+_EVENT_LIST_CURSOR_VALUE_TYPES: dict[str, tuple[type, ...]] = {
+    "start_time": (datetime,),
+    "price": (int, float),
+    "title": (str,),
+}
+
+
+def _decode_event_list_cursor(
+    cursor: str, *, sort_key: str, sort_order: str
+) -> tuple[Any, int]:
+    """Return the ``(sort value, id)`` a listing cursor resumes after."""
+    try:
+        payload = decode_cursor(cursor)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+    last_id = payload.get("id")
+    if (
+        payload.get("sort_by") != sort_key
+        or payload.get("sort_order") != sort_order
+        or not isinstance(last_id, int)
+        or "value" not in payload
+    ):
+        raise HTTPException(
+            status_code=400, detail="Cursor does not match the requested sort"
+        )
+    last_value = payload["value"]
+    if isinstance(last_value, bool) or not isinstance(
+        last_value, _EVENT_LIST_CURSOR_VALUE_TYPES[sort_key]
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return last_value, last_id
+
+
 # ---------------------------------------------------------------------------
 # GET /events/  — List with filters, search, sort, pagination
 # ---------------------------------------------------------------------------
@@ -788,9 +923,15 @@ async def _remove_event_from_app_calendar_if_present(
 @router.get("/", response_model=PaginatedEvents)
 async def list_events(
     db: DbDep,
+    totals: EventTotalsDep,
     q: Annotated[
         str | None,
-        Query(description="Free-text search across title and about."),
+        Query(
+            description=(
+                "Free-text search across title and about. Every word must match; "
+                "title words also match by prefix."
+            )
+        ),
     ] = None,
     category: Annotated[
         EventCategory | None,
@@ -821,8 +962,13 @@ async def list_events(
         Query(description="Events starting at or before this datetime."),
     ] = None,
     sort_by: Annotated[
-        Literal["start_time", "price", "title"],
-        Query(description="Field to sort by."),
+        Literal["start_time", "price", "title", "relevance"],
+        Query(
+            description=(
+                "Field to sort by. `relevance` ranks title matches for `q` first "
+                "and falls back to start time when `q` is empty."
+            )
+        ),
     ] = "start_time",
     sort_order: Annotated[
         Literal["asc", "desc"],
@@ -830,6 +976,15 @@ async def list_events(
     ] = "asc",
     page: Annotated[int, Query(ge=1)] = 1,
     page_size: Annotated[int, Query(ge=1, le=100)] = 12,
+    cursor: Annotated[
+        str | None,
+        Query(
+            description=(
+                "Opaque `next_cursor` from a previous page. Takes precedence over "
+                "`page`; not supported with `sort_by=relevance`."
+            )
+        ),
+    ] = None,
 ) -> PaginatedEvents:
     """List events with filtering, search, sorting, and pagination."""
     collection = db["events"]
@@ -843,15 +998,7 @@ async def list_events(
     ]
 
     if q:
-        escaped_q = re.escape(q)
-        conditions.append(
-            {
-                "$or": [
-                    {"title": {"$regex": escaped_q, "$options": "i"}},
-                    {"about": {"$regex": escaped_q, "$options": "i"}},
-                ]
-            }
-        )
+        conditions.append(search_filter(q))
 
     if category is not None:
         conditions.append({"category": category.value})
@@ -886,20 +1033,74 @@ async def list_events(
     )
 
     sort_direction = ASCENDING if sort_order == "asc" else DESCENDING
-    sort_key = {"start_time": "start_time", "price": "price", "title": "title"}[sort_by]
+    rank_by_relevance = sort_by == "relevance" and bool(q)
+    sort_key = "start_time" if sort_by == "relevance" else sort_by
     skip = (page - 1) * page_size
+    page_filters = filters
+    if cursor is not None:
+        if rank_by_relevance:
+            raise HTTPException(
+                status_code=400,
+                detail="cursor is not supported with sort_by=relevance",
+            )
+        last_value, last_id = _decode_event_list_cursor(
+            cursor, sort_key=sort_key, sort_order=sort_order
+        )
+        page_filters = {
+            "$and": [
+                filters,
+                keyset_filter(sort_key, sort_direction, last_value, last_id),
+            ]
+        }
+        skip = 0
+
+    async def count_matching(limit: int) -> int:
+        return await collection.count_documents(filters, limit=limit)
+
+    async def fetch_page() -> list[dict[str, Any]]:
+        if rank_by_relevance and q:
+            pipeline: list[dict[str, Any]] = [
+                {"$match": filters},
+                {"$addFields": {SEARCH_SCORE_FIELD: relevance_score_expression(q)}},
+                {
+                    "$sort": {
+                        SEARCH_SCORE_FIELD: DESCENDING,
+                        "start_time": ASCENDING,
+                        "id": ASCENDING,
+                    }
+                },
+                {"$skip": skip},
+                {"$limit": page_size},
+                {"$project": {**SEARCH_FIELDS_PROJECTION, SEARCH_SCORE_FIELD: 0}},
+            ]
+            return await (await collection.aggregate(pipeline)).to_list(
+                length=page_size
+            )
+        return await (
+            collection.find(page_filters, SEARCH_FIELDS_PROJECTION)
+            .sort([(sort_key, sort_direction), ("id", sort_direction)])
+            .skip(skip)
+            .limit(page_size + 1)
+            .to_list(length=page_size + 1)
+        )
 
-    total = await collection.count_documents(filters)
-    cursor = (
-        collection.find(filters)
-        .sort(sort_key, sort_direction)
-        .skip(skip)
-        .limit(page_size)
+    total, raw_events = await asyncio.gather(
+        totals.get_or_count(filters, count_matching), fetch_page()
     )
-    raw_events = await cursor.to_list(length=page_size)
+    next_cursor: str | None = None
+    if len(raw_events) > page_size:
+        raw_events = raw_events[:page_size]
+        last = raw_events[-1]
+        next_cursor = encode_cursor(
+            {
+                "sort_by": sort_key,
+                "sort_order": sort_order,
+                "value": last.get(sort_key),
+                "id": last["id"],
+            }
+        )
 
-    event_ids = [r["id"] for r in raw_events]
-    counts = await _attending_counts(db, event_ids)
+    counts = await _attending_counts(db, raw_events)
 
     items: list[EventListItem] = []
     for raw in raw_events:
@@ -908,7 +1109,14 @@ async def list_events(
             EventListItem.from_event(event, attending_count=counts.get(event.id, 0))
         )
 
-    return PaginatedEvents(items=items, total=total, page=page, page_size=page_size)
+    return PaginatedEvents(
+        items=items,
+        total=total.count,
+        total_is_estimate=total.is_estimate,
+        page=page,
+        page_size=page_size,
+        next_cursor=next_cursor,
+    )
 
 
 @router.get("/pending", response_model=list[PendingEventListItem])
@@ -930,19 +1138,47 @@ async def list_pending_events(
 # ---------------------------------------------------------------------------
 
 
+@router.get("/cache-stats")
+async def get_event_cache_stats(
+    current_user: AuthUserDep, detail_cache: EventDetailCacheDep
+) -> dict[str, dict[str, int | float]]:
+    """Hit/miss counters for this process's event caches. Admin only."""
+    _require_admin(current_user)
+    return {"event_detail": detail_cache.stats.as_dict()}
+
+
+@router.get("/email-stats")
+async def get_email_stats(
+    current_user: AuthUserDep, db: DbDep, arq: ArqDep
+) -> dict[str, Any]:
+    """Email outbox depth and each worker's send metrics. Admin only."""
+    _require_admin(current_user)
+    return {
+        "outbox": await outbox_depth(db),
+        "workers": await read_email_metrics(arq.redis),
+    }
+
+
 @router.get("/{event_id}", response_model=EventDetail)
-async def get_event(db: DbDep, event_id: int) -> EventDetail:
+async def get_event(
+    db: DbDep, event_id: int, detail_cache: EventDetailCacheDep
+) -> Response:
     """Retrieve full details for a single event."""
-    raw = await db["events"].find_one(_public_event_visibility_filter(event_id))
-    if raw is None:
-        raise HTTPException(status_code=404, detail="Event not found")
 
-    event = Event(**raw)
-    attending, favorites = await _event_counts(db, event_id)
+    async def build() -> bytes | None:
+        raw = await db["events"].find_one(_public_event_visibility_filter(event_id))
+        if raw is None:
+            return None
+        attending, favorites = await _event_counts(db, raw)
+        detail = EventDetail.from_event(
+            Event(**raw), attending_count=attending, favorites_count=favorites
+        )
+        return detail.model_dump_json().encode()
 
-    return EventDetail.from_event(
-        event, attending_count=attending, favorites_count=favorites
-    )
+    body = await detail_cache.get_or_build(event_id, build)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/{event_id}/manage", response_model=EventManageDetail)
@@ -956,7 +1192,7 @@ async def get_event_for_management(
 
     event = Event(**raw)
     _require_organizer_or_admin(current_user, event)
-    attending, favorites = await _event_counts(db, event_id)
+    attending, favorites = await _event_counts(db, raw)
     return EventManageDetail.from_event(
         event, attending_count=attending, favorites_count=favorites
     )
@@ -964,7 +1200,14 @@ async def get_event_for_management(
 
 @router.patch("/{event_id}", response_model=EventManageDetail)
 async def update_event(
-    db: DbDep, event_id: int, body: EventUpdate, current_user: AuthUserDep
+    db: DbDep,
+    event_id: int,
+    body: EventUpdate,
+    current_user: AuthUserDep,
+    totals: EventTotalsDep,
+    detail_cache: EventDetailCacheDep,
+    capacity: CapacityLedgerDep,
+    arq: OptionalArqDep,
 ) -> EventManageDetail:
     """Update an event. Restricted to the organizer or an admin."""
     raw = await db["events"].find_one({"id": event_id})
@@ -989,11 +1232,44 @@ async def update_event(
 
     if updates:
         updated_event = _event_with_updates(event, updates)
-        await db["events"].update_one({"id": event_id}, {"$set": updates})
+        stored_updates = dict(updates)
+        if "title" in updates or "about" in updates:
+            stored_updates.update(
+                event_search_fields(updated_event.title, updated_event.about)
+            )
+        await db["events"].update_one({"id": event_id}, {"$set": stored_updates})
+        totals.invalidate()
+        await detail_cache.invalidate(event_id)
+        if "start_time" in updates:
+            await index_created_event(
+                db,
+                event_id=event_id,
+                organizer_user_id=event.organizer_user_id,
+                start_time=updates["start_time"],
+            )
+            if event.status == EventStatus.Approved:
+                start_time = updates["start_time"]
+                await _sync_event_reminder(
+                    arq,
+                    event_id,
+                    lambda client: client.replace_event_reminder(event_id, start_time),
+                )
+        if "total_capacity" in updates:
+            # The edit is saved; a ledger outage must not turn it into an error.
+            try:
+                await capacity.set_capacity(event_id, updated_event.total_capacity)
+                if updated_event.total_capacity > event.total_capacity:
+                    await fill_open_seats(db, capacity, updated_event)
+            except HTTPException:
+                logging.getLogger(__name__).warning(
+                    "Failed to apply capacity change for event %s to the ledger",
+                    event_id,
+                    exc_info=True,
+                )
     else:
         updated_event = event
 
-    attending, favorites = await _event_counts(db, event_id)
+    attending, favorites = await _event_counts(db, raw)
     return EventManageDetail.from_event(
         updated_event, attending_count=attending, favorites_count=favorites
     )
@@ -1015,10 +1291,7 @@ async def get_my_attendance(
     if event is None:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    attendance = await db["attendance"].find_one(
-        {"event_id": event_id, "user_id": current_user.id},
-        sort=[("_id", DESCENDING)],
-    )
+    attendance = await find_attendance(db, event_id=event_id, user_id=current_user.id)
 
     return AttendanceStatusResponse(
         event_id=event_id,
@@ -1047,27 +1320,84 @@ async def get_my_calendar_status(
         attendance_status = await _attendance_status_for_user(
             db, user_id=current_user.id, event_id=event_id
         )
-        if (
-            attendance_status is not None
-            and attendance_status != AttendanceStatus.Cancelled.value
-        ):
-            with suppress(DuplicateKeyError):
-                await db[USER_CALENDAR_COLLECTION].insert_one(
-                    {
-                        "user_id": current_user.id,
-                        "event_id": event_id,
-                        "added_at": datetime.now(tz=UTC),
-                    }
-                )
-            existing = {"user_id": current_user.id, "event_id": event_id}
+        in_calendar = await _backfill_registered_calendar_entry(
+            db,
+            user_id=current_user.id,
+            event_id=event_id,
+            attendance_status=attendance_status,
+        )
+    else:
+        in_calendar = True
 
     return AppCalendarStatusResponse(
         event_id=event_id,
-        in_calendar=existing is not None,
+        in_calendar=in_calendar,
         google_sync_enabled=await _google_sync_enabled(db, current_user.id),
     )
 
 
+# ---------------------------------------------------------------------------
+# GET /events/{event_id}/viewer-state  — Event page bootstrap for the viewer
+# ---------------------------------------------------------------------------
+
+
+@router.get("/{event_id}/viewer-state", response_model=ViewerStateResponse)
+async def get_viewer_state(
+    db: DbDep, event_id: int, current_user: AuthUserDep
+) -> ViewerStateResponse:
+    """Return the event with the viewer's attendance, calendar and favorite state.
+
+    Replaces separate calls to the event, attendance, calendar and favorites
+    endpoints: the event is read once and the per-user lookups run concurrently.
+    """
+    raw_event = await db["events"].find_one(_public_event_visibility_filter(event_id))
+    if raw_event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    (
+        (attending, favorites),
+        attendance,
+        calendar_entry,
+        favorite,
+        google_sync_enabled,
+    ) = await asyncio.gather(
+        _event_counts(db, raw_event),
+        find_attendance(db, event_id=event_id, user_id=current_user.id),
+        _calendar_entry_for_user(db, user_id=current_user.id, event_id=event_id),
+        db["event_favorites"].find_one(
+            {"event_id": event_id, "user_id": current_user.id}, {"_id": 1}
+        ),
+        _google_sync_enabled(db, current_user.id),
+    )
+
+    attendance_status = attendance["status"] if attendance is not None else None
+    in_calendar = calendar_entry is not None or (
+        await _backfill_registered_calendar_entry(
+            db,
+            user_id=current_user.id,
+            event_id=event_id,
+            attendance_status=attendance_status,
+        )
+    )
+    position = (
+        await waitlist_position(db, attendance)
+        if attendance is not None
+        and attendance_status == AttendanceStatus.Waitlisted.value
+        else None
+    )
+
+    return ViewerStateResponse(
+        event=EventDetail.from_event(
+            Event(**raw_event), attending_count=attending, favorites_count=favorites
+        ),
+        attendance_status=attendance_status,
+        waitlist_position=position,
+        in_calendar=in_calendar,
+        google_sync_enabled=google_sync_enabled,
+        favorited=favorite is not None,
+    )
+
+
 # ---------------------------------------------------------------------------
 # POST /events/{event_id}/calendar  — Add event to user's app calendar
 # ---------------------------------------------------------------------------
@@ -1079,13 +1409,14 @@ async def add_event_to_app_calendar(
     request: Request,
     event_id: int,
     current_user: AuthUserDep,
+    locks: EventUserLocksDep,
 ) -> AppCalendarMutationResponse:
     raw_event = await db["events"].find_one(_public_event_visibility_filter(event_id))
     if raw_event is None:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    lock_id = await _acquire_event_user_lock(
-        db, event_id=event_id, user_id=current_user.id
+    lock = await _acquire_event_user_lock(
+        locks, db, event_id=event_id, user_id=current_user.id
     )
     try:
         google_synced = await _ensure_event_in_app_calendar(
@@ -1095,7 +1426,7 @@ async def add_event_to_app_calendar(
             event=Event(**raw_event),
         )
     finally:
-        await _release_event_user_lock(db, lock_id)
+        await locks.release(db, lock)
 
     return AppCalendarMutationResponse(
         event_id=event_id,
@@ -1115,13 +1446,14 @@ async def remove_event_from_app_calendar(
     request: Request,
     event_id: int,
     current_user: AuthUserDep,
+    locks: EventUserLocksDep,
 ) -> AppCalendarMutationResponse:
     raw_event = await db["events"].find_one(_public_event_visibility_filter(event_id))
     if raw_event is None:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    lock_id = await _acquire_event_user_lock(
-        db, event_id=event_id, user_id=current_user.id
+    lock = await _acquire_event_user_lock(
+        locks, db, event_id=event_id, user_id=current_user.id
     )
     try:
         removed, google_synced = await _remove_event_from_app_calendar_if_present(
@@ -1131,7 +1463,7 @@ async def remove_event_from_app_calendar(
             event_id=event_id,
         )
     finally:
-        await _release_event_user_lock(db, lock_id)
+        await locks.release(db, lock)
     if not removed:
         raise HTTPException(status_code=404, detail="Calendar entry not found")
 
@@ -1142,6 +1474,67 @@ async def remove_event_from_app_calendar(
     )
 
 
+async def _cancel_attendance_row(
+    db: AsyncDatabase[dict[str, Any]],
+    request: Request,
+    capacity: CapacityLedger,
+    existing: dict[str, Any],
+    *,
+    user_id: int,
+) -> tuple[dict[str, Any] | None, bool]:
+    """Cancel a live attendance row under its event user lock.
+
+    A registration's seat is handed to the waitlist only once the calendar entry
+    is gone, so a failed removal rolls back without touching the seat. Returns
+    the promoted attendance row, if any, and whether Google Calendar was synced.
+    """
+    event_id = existing["event_id"]
+    result = await db["attendance"].update_one(
+        {"_id": existing["_id"], "status": existing["status"]},
+        {
+            "$set": {
+                "status": AttendanceStatus.Cancelled.value,
+                "checked_in_at": None,
+            },
+            "$unset": {"waitlisted_at": ""},
+        },
+    )
+    if result.matched_count != 1:
+        raise HTTPException(status_code=409, detail="Registration state changed")
+    cancelled = {
+        **existing,
+        "status": AttendanceStatus.Cancelled.value,
+        "checked_in_at": None,
+    }
+    if existing["status"] == AttendanceStatus.Waitlisted.value:
+        await record_attendance_transition(db, cancelled)
+        return None, False
+
+    try:
+        _, google_synced = await _remove_event_from_app_calendar_if_present(
+            db,
+            request,
+            user_id=user_id,
+            event_id=event_id,
+        )
+    except Exception:
+        await db["attendance"].update_one(
+            {"_id": existing["_id"], "status": AttendanceStatus.Cancelled.value},
+            {
+                "$set": {
+                    "status": existing["status"],
+                    "checked_in_at": existing.get("checked_in_at"),
+                }
+            },
+        )
+        raise
+
+    await record_attendance_transition(db, cancelled)
+    if existing["status"] == AttendanceStatus.CheckedIn.value:
+        await increment_user_counters(db, USER_ATTENDED_COUNT_FIELD, {user_id: -1})
+    return await release_seat_to_waitlist(db, capacity, event_id), google_synced
+
+
 # ---------------------------------------------------------------------------
 # POST /events/{event_id}/attendance  — Register current user for an event
 # ---------------------------------------------------------------------------
@@ -1153,9 +1546,15 @@ async def register_attendance(
     request: Request,
     event_id: int,
     current_user: AuthUserDep,
-    email_notif: EmailNotifDep,
+    detail_cache: EventDetailCacheDep,
+    capacity: CapacityLedgerDep,
+    locks: EventUserLocksDep,
+    waitlist: bool = False,
 ) -> AttendanceRegisterResponse:
-    """Register the authenticated user for a given event."""
+    """Register the authenticated user for a given event.
+
+    With ``waitlist=true`` a sold-out event queues the user instead of failing.
+    """
     raw_event = await db["events"].find_one(_public_event_visibility_filter(event_id))
     if raw_event is None:
         raise HTTPException(status_code=404, detail="Event not found")
@@ -1166,14 +1565,18 @@ async def register_attendance(
             status_code=400, detail="Organizers cannot register for their own events"
         )
 
-    lock_id = await _acquire_event_user_lock(
-        db, event_id=event_id, user_id=current_user.id
+    lock = await _acquire_event_user_lock(
+        locks, db, event_id=event_id, user_id=current_user.id
     )
     try:
-        existing = await db["attendance"].find_one(
-            {"event_id": event_id, "user_id": current_user.id},
-            sort=[("_id", DESCENDING)],
-        )
+        existing = await find_attendance(db, event_id=event_id, user_id=current_user.id)
+        if (
+            existing is not None
+            and existing["status"] == AttendanceStatus.Waitlisted.value
+        ):
+            return AttendanceRegisterResponse.waitlisted(
+                event_id, current_user.id, await waitlist_position(db, existing)
+            )
         if (
             existing is not None
             and existing["status"] != AttendanceStatus.Cancelled.value
@@ -1190,28 +1593,46 @@ async def register_attendance(
                 google_synced=google_synced,
             )
 
-        await _ensure_registered_count(db, event_id)
-        if not await _reserve_event_slot(db, event_id):
-            raise HTTPException(status_code=400, detail="This event is sold out")
+        if not await capacity.reserve(db, event_id):
+            if not waitlist:
+                raise HTTPException(status_code=400, detail="This event is sold out")
+            queued = await join_waitlist(
+                db, event_id=event_id, user_id=current_user.id, existing=existing
+            )
+            if queued is None:
+                raise HTTPException(
+                    status_code=409, detail="Registration state changed"
+                )
+            return AttendanceRegisterResponse.waitlisted(
+                event_id, current_user.id, await waitlist_position(db, queued)
+            )
 
         inserted_attendance_id: object | None = None
-        calendar_preexisting = (
-            await _calendar_entry_for_user(
-                db, user_id=current_user.id, event_id=event_id
-            )
-            is not None
-        )
+        # Until the lookup succeeds there is no calendar entry of ours to undo.
+        calendar_preexisting = True
         try:
-            if existing is None:
-                insert_result = await db["attendance"].insert_one(
-                    {
-                        "event_id": event_id,
-                        "user_id": current_user.id,
-                        "status": AttendanceStatus.Going.value,
-                        "checked_in_at": None,
-                    }
+            calendar_preexisting = (
+                await _calendar_entry_for_user(
+                    db, user_id=current_user.id, event_id=event_id
                 )
+                is not None
+            )
+            registered: dict[str, Any] = {
+                "event_id": event_id,
+                "user_id": current_user.id,
+                "status": AttendanceStatus.Going.value,
+                "checked_in_at": None,
+                "registered_at": datetime.now(tz=UTC),
+            }
+            if existing is None:
+                try:
+                    insert_result = await db["attendance"].insert_one(registered)
+                except DuplicateKeyError as exc:
+                    raise HTTPException(
+                        status_code=409, detail="Registration state changed"
+                    ) from exc
                 inserted_attendance_id = insert_result.inserted_id
+                registered["_id"] = inserted_attendance_id
             else:
                 result = await db["attendance"].update_one(
                     {
@@ -1222,6 +1643,7 @@ async def register_attendance(
                         "$set": {
                             "status": AttendanceStatus.Going.value,
                             "checked_in_at": None,
+                            "registered_at": registered["registered_at"],
                         }
                     },
                 )
@@ -1229,6 +1651,7 @@ async def register_attendance(
                     raise HTTPException(
                         status_code=409, detail="Registration state changed"
                     )
+                registered["_id"] = existing["_id"]
 
             google_synced = await _ensure_event_in_app_calendar(
                 db,
@@ -1236,7 +1659,17 @@ async def register_attendance(
                 user_id=current_user.id,
                 event=event,
             )
-            await email_notif.send_registration_confirmation(current_user.email, event)
+            await enqueue_email(
+                db,
+                "registration_confirmation",
+                recipient=current_user.email,
+                event_id=event_id,
+                dedup_key=outbox_dedup_key(
+                    "registration_confirmation",
+                    registered["_id"],
+                    registered["registered_at"].isoformat(),
+                ),
+            )
         except Exception:
             if inserted_attendance_id is not None:
                 await db["attendance"].delete_one({"_id": inserted_attendance_id})
@@ -1250,7 +1683,9 @@ async def register_attendance(
                         }
                     },
                 )
-            await _release_event_slot(db, event_id)
+            promoted = await release_seat_to_waitlist(db, capacity, event_id)
+            if promoted is not None:
+                await notify_promoted(db, event, promoted)
             if not calendar_preexisting:
                 try:
                     await _remove_event_from_app_calendar_if_present(
@@ -1265,13 +1700,15 @@ async def register_attendance(
                     )
             raise
 
+        await record_attendance_transition(db, registered)
         return AttendanceRegisterResponse(
             event_id=event_id,
             user_id=current_user.id,
             google_synced=google_synced,
         )
     finally:
-        await _release_event_user_lock(db, lock_id)
+        await locks.release(db, lock)
+        await detail_cache.invalidate(event_id)
 
 
 # ---------------------------------------------------------------------------
@@ -1281,64 +1718,39 @@ async def register_attendance(
 
 @router.delete("/{event_id}/attendance", response_model=AttendanceCancelResponse)
 async def cancel_attendance(
-    db: DbDep, request: Request, event_id: int, current_user: AuthUserDep
+    db: DbDep,
+    request: Request,
+    event_id: int,
+    current_user: AuthUserDep,
+    detail_cache: EventDetailCacheDep,
+    capacity: CapacityLedgerDep,
+    locks: EventUserLocksDep,
 ) -> AttendanceCancelResponse:
-    """Cancel the authenticated user's registration for a given event."""
-    event = await db["events"].find_one(
-        _public_event_visibility_filter(event_id), {"_id": 1}
-    )
-    if event is None:
+    """Cancel the authenticated user's registration or waitlist place.
+
+    A freed seat goes to the head of the event's waitlist.
+    """
+    raw_event = await db["events"].find_one(_public_event_visibility_filter(event_id))
+    if raw_event is None:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    lock_id = await _acquire_event_user_lock(
-        db, event_id=event_id, user_id=current_user.id
+    lock = await _acquire_event_user_lock(
+        locks, db, event_id=event_id, user_id=current_user.id
     )
     try:
-        existing = await db["attendance"].find_one(
-            {"event_id": event_id, "user_id": current_user.id},
-            sort=[("_id", DESCENDING)],
-        )
+        existing = await find_attendance(db, event_id=event_id, user_id=current_user.id)
         if existing is None or existing["status"] == AttendanceStatus.Cancelled.value:
             raise HTTPException(status_code=404, detail="Registration not found")
 
-        result = await db["attendance"].update_one(
-            {"_id": existing["_id"], "status": existing["status"]},
-            {
-                "$set": {
-                    "status": AttendanceStatus.Cancelled.value,
-                    "checked_in_at": None,
-                }
-            },
+        promoted, google_synced = await _cancel_attendance_row(
+            db, request, capacity, existing, user_id=current_user.id
         )
-        if result.matched_count != 1:
-            raise HTTPException(status_code=409, detail="Registration state changed")
-
-        await _ensure_registered_count(db, event_id)
-        await _release_event_slot(db, event_id)
-
-        try:
-            _, google_synced = await _remove_event_from_app_calendar_if_present(
-                db,
-                request,
-                user_id=current_user.id,
-                event_id=event_id,
-            )
-        except Exception:
-            await db["attendance"].update_one(
-                {"_id": existing["_id"], "status": AttendanceStatus.Cancelled.value},
-                {
-                    "$set": {
-                        "status": existing["status"],
-                        "checked_in_at": existing.get("checked_in_at"),
-                    }
-                },
-            )
-            await db["events"].update_one(
-                {"id": event_id}, {"$inc": {"registered_count": 1}}
-            )
-            raise
     finally:
-        await _release_event_user_lock(db, lock_id)
+        await locks.release(db, lock)
+        await detail_cache.invalidate(event_id)
+
+    if promoted is not None:
+        await notify_promoted(db, Event(**raw_event), promoted)
 
     return AttendanceCancelResponse(
         event_id=event_id,
@@ -1354,9 +1766,27 @@ async def cancel_attendance(
 
 @router.get("/{event_id}/attendees", response_model=EventAttendeesResponse)
 async def get_event_attendees(
-    db: DbDep, event_id: int, current_user: AuthUserDep
+    db: DbDep,
+    event_id: int,
+    current_user: AuthUserDep,
+    status: Annotated[
+        RosterStatus | None, Query(description="Only attendees in this status.")
+    ] = None,
+    search: Annotated[
+        str | None,
+        Query(max_length=100, description="Match first name, last name or email."),
+    ] = None,
+    limit: Annotated[
+        int, Query(ge=1, le=MAX_ROSTER_PAGE_SIZE)
+    ] = DEFAULT_ROSTER_PAGE_SIZE,
+    cursor: Annotated[
+        str | None, Query(description="Opaque `next_cursor` from a previous page.")
+    ] = None,
 ) -> EventAttendeesResponse:
-    """Return all attendees for an event. Restricted to the organizer or an admin."""
+    """Return a page of attendees sorted by name. Organizer or admin only.
+
+    The counts always cover the whole roster, whatever the filters.
+    """
     raw_event = await db["events"].find_one({"id": event_id})
     if raw_event is None:
         raise HTTPException(status_code=404, detail="Event not found")
@@ -1364,63 +1794,71 @@ async def get_event_attendees(
     event = Event(**raw_event)
     _require_organizer_or_admin(current_user, event)
 
-    attendance_records = await (
-        db["attendance"]
-        .find({"event_id": event_id})
-        .sort("_id", ASCENDING)
-        .to_list(length=None)
-    )
-
-    # Deduplicate before filtering so a later cancellation hides older active rows.
-    latest_by_user: dict[int, dict[str, Any]] = {}
-    for record in attendance_records:
-        latest_by_user[record["user_id"]] = record
-    latest_by_user = {
-        user_id: record
-        for user_id, record in latest_by_user.items()
-        if record["status"] != AttendanceStatus.Cancelled.value
-    }
-
-    user_ids = list(latest_by_user.keys())
-    users_by_id: dict[int, dict[str, Any]] = {}
-    if user_ids:
-        async for raw_user in db["users"].find({"id": {"$in": user_ids}}):
-            users_by_id[raw_user["id"]] = raw_user
-
-    attendees: list[EventAttendeeItem] = []
-    for uid, record in latest_by_user.items():
-        user_raw = users_by_id.get(uid)
-        if user_raw is None:
-            continue
-        raw_checked_in_at = record.get("checked_in_at")
-        attendees.append(
-            EventAttendeeItem(
-                user_id=uid,
-                first_name=user_raw.get("first_name", ""),
-                last_name=user_raw.get("last_name", ""),
-                email=user_raw.get("email", ""),
-                profile_photo_url=user_raw.get("profile_photo_url"),
-                status=record["status"],
-                checked_in_at=raw_checked_in_at
-                if isinstance(raw_checked_in_at, datetime)
-                else None,
-            )
-        )
-
-    attendees.sort(key=lambda a: (a.last_name.lower(), a.first_name.lower()))
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_roster_cursor(cursor)
+        except InvalidCursorError as exc:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from exc
 
-    going_count = sum(1 for a in attendees if a.status == AttendanceStatus.Going.value)
-    checked_in_count = sum(
-        1 for a in attendees if a.status == AttendanceStatus.CheckedIn.value
+    rows, counts, next_cursor = await roster_page(
+        db, event_id, limit=limit, after=after, status=status, search=search
     )
+    attendees = [
+        EventAttendeeItem(
+            user_id=row["user_id"],
+            first_name=row["first_name"],
+            last_name=row["last_name"],
+            email=row["email"],
+            profile_photo_url=row["profile_photo_url"],
+            status=row["status"],
+            checked_in_at=row["checked_in_at"]
+            if isinstance(row.get("checked_in_at"), datetime)
+            else None,
+        )
+        for row in rows
+    ]
 
     return EventAttendeesResponse(
         event_id=event_id,
         event_title=event.title,
         total_capacity=event.total_capacity,
-        going_count=going_count,
-        checked_in_count=checked_in_count,
+        going_count=counts.get(AttendanceStatus.Going.value, 0),
+        checked_in_count=counts.get(AttendanceStatus.CheckedIn.value, 0),
+        waitlist_count=counts.get(AttendanceStatus.Waitlisted.value, 0),
         attendees=attendees,
+        next_cursor=next_cursor,
+    )
+
+
+# ---------------------------------------------------------------------------
+# GET /events/{event_id}/attendees/export  — Stream the roster (organizer/admin)
+# ---------------------------------------------------------------------------
+
+
+@router.get("/{event_id}/attendees/export")
+async def export_event_attendees(
+    db: DbDep,
+    event_id: int,
+    current_user: AuthUserDep,
+    fmt: Annotated[RosterFormat, Query(alias="format")] = "csv",
+    status: Annotated[RosterStatus | None, Query()] = None,
+    search: Annotated[str | None, Query(max_length=100)] = None,
+) -> StreamingResponse:
+    """Stream the full roster as CSV or NDJSON. Organizer or admin only."""
+    raw_event = await db["events"].find_one({"id": event_id})
+    if raw_event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    event = Event(**raw_event)
+    _require_organizer_or_admin(current_user, event)
+
+    media_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    filename = f"event_{event_id}_attendees.{fmt}"
+    return StreamingResponse(
+        export_roster(iter_roster(db, event_id, status=status, search=search), fmt),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
@@ -1431,7 +1869,11 @@ async def get_event_attendees(
 
 @router.post("/{event_id}/attendees/{user_id}/check-in", response_model=CheckInResponse)
 async def check_in_attendee(
-    db: DbDep, event_id: int, user_id: int, current_user: AuthUserDep
+    db: DbDep,
+    event_id: int,
+    user_id: int,
+    current_user: AuthUserDep,
+    locks: EventUserLocksDep,
 ) -> CheckInResponse:
     """Check in an attendee for an event. Restricted to the organizer or an admin."""
     raw_event = await db["events"].find_one({"id": event_id})
@@ -1441,17 +1883,10 @@ async def check_in_attendee(
     event = Event(**raw_event)
     _require_organizer_or_admin(current_user, event)
 
-    lock_id = await _acquire_event_user_lock(db, event_id=event_id, user_id=user_id)
+    lock = await _acquire_event_user_lock(locks, db, event_id=event_id, user_id=user_id)
     try:
-        existing = await db["attendance"].find_one(
-            {
-                "event_id": event_id,
-                "user_id": user_id,
-                "status": {"$ne": AttendanceStatus.Cancelled.value},
-            },
-            sort=[("_id", DESCENDING)],
-        )
-        if existing is None:
+        existing = await find_attendance(db, event_id=event_id, user_id=user_id)
+        if existing is None or existing["status"] not in REGISTERED_ATTENDANCE_STATUSES:
             raise HTTPException(status_code=404, detail="Attendee not found")
 
         if existing["status"] == AttendanceStatus.CheckedIn.value:
@@ -1471,14 +1906,77 @@ async def check_in_attendee(
         )
         if result.matched_count != 1:
             raise HTTPException(status_code=409, detail="Registration state changed")
+        await record_attendance_transition(
+            db,
+            {
+                **existing,
+                "status": AttendanceStatus.CheckedIn.value,
+                "checked_in_at": checked_in_at,
+            },
+        )
+        await increment_user_counters(db, USER_ATTENDED_COUNT_FIELD, {user_id: 1})
     finally:
-        await _release_event_user_lock(db, lock_id)
+        await locks.release(db, lock)
 
     return CheckInResponse(
         event_id=event_id, user_id=user_id, checked_in_at=checked_in_at
     )
 
 
+# ---------------------------------------------------------------------------
+# POST /events/{event_id}/attendees/check-in:batch  — Batch check-in
+# ---------------------------------------------------------------------------
+
+
+@router.post(
+    "/{event_id}/attendees/check-in:batch", response_model=CheckInBatchResponse
+)
+async def check_in_attendees_batch(
+    db: DbDep,
+    event_id: int,
+    body: CheckInBatchRequest,
+    current_user: AuthUserDep,
+) -> CheckInBatchResponse:
+    """Check in many attendees at once, reporting a result per scan.
+
+    Restricted to the organizer or an admin. Safe to retry: attendees who are
+    already checked in are reported as such and keep their check-in time.
+    """
+    raw_event = await db["events"].find_one({"id": event_id})
+    if raw_event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+
+    event = Event(**raw_event)
+    _require_organizer_or_admin(current_user, event)
+
+    outcomes = await check_in_batch(
+        db,
+        event_id,
+        [
+            CheckInScan(
+                user_id=item.user_id,
+                ticket_id=item.ticket_id,
+                scanned_at=item.scanned_at,
+            )
+            for item in body.items
+        ],
+        use_scan_time=body.sync,
+    )
+    return CheckInBatchResponse(
+        event_id=event_id,
+        checked_in_count=sum(1 for o in outcomes if o.result == "checked_in"),
+        results=[
+            CheckInBatchResultItem(
+                user_id=outcome.user_id,
+                ticket_id=outcome.scan.ticket_id,
+                result=outcome.result,
+                checked_in_at=outcome.checked_in_at,
+            )
+            for outcome in outcomes
+        ],
+    )
+
+
 # ---------------------------------------------------------------------------
 # DELETE /events/{event_id}/attendees/{user_id}/check-in  — Undo check-in
 # ---------------------------------------------------------------------------
@@ -1488,7 +1986,11 @@ async def check_in_attendee(
     "/{event_id}/attendees/{user_id}/check-in", response_model=UndoCheckInResponse
 )
 async def undo_check_in_attendee(
-    db: DbDep, event_id: int, user_id: int, current_user: AuthUserDep
+    db: DbDep,
+    event_id: int,
+    user_id: int,
+    current_user: AuthUserDep,
+    locks: EventUserLocksDep,
 ) -> UndoCheckInResponse:
     """Undo a check-in for an attendee. Restricted to the organizer or an admin."""
     raw_event = await db["events"].find_one({"id": event_id})
@@ -1498,13 +2000,10 @@ async def undo_check_in_attendee(
     event = Event(**raw_event)
     _require_organizer_or_admin(current_user, event)
 
-    lock_id = await _acquire_event_user_lock(db, event_id=event_id, user_id=user_id)
+    lock = await _acquire_event_user_lock(locks, db, event_id=event_id, user_id=user_id)
     try:
-        existing = await db["attendance"].find_one(
-            {"event_id": event_id, "user_id": user_id},
-            sort=[("_id", DESCENDING)],
-        )
-        if existing is None or existing["status"] == AttendanceStatus.Cancelled.value:
+        existing = await find_attendance(db, event_id=event_id, user_id=user_id)
+        if existing is None or existing["status"] not in REGISTERED_ATTENDANCE_STATUSES:
             raise HTTPException(status_code=404, detail="Attendee not found")
 
         if existing["status"] == AttendanceStatus.Going.value:
@@ -1516,8 +2015,14 @@ async def undo_check_in_attendee(
         )
         if result.matched_count != 1:
             raise HTTPException(status_code=409, detail="Registration state changed")
+        await record_attendance_transition(
+            db,
+            {**existing, "status": AttendanceStatus.Going.value, "checked_in_at": None},
+            activity=False,
+        )
+        await increment_user_counters(db, USER_ATTENDED_COUNT_FIELD, {user_id: -1})
     finally:
-        await _release_event_user_lock(db, lock_id)
+        await locks.release(db, lock)
 
     return UndoCheckInResponse(event_id=event_id, user_id=user_id)
 
@@ -1534,6 +2039,9 @@ async def remove_attendee(
     event_id: int,
     user_id: int,
     current_user: AuthUserDep,
+    detail_cache: EventDetailCacheDep,
+    capacity: CapacityLedgerDep,
+    locks: EventUserLocksDep,
 ) -> RemoveAttendeeResponse:
     """Remove an attendee from an event. Restricted to the organizer or an admin."""
     raw_event = await db["events"].find_one({"id": event_id})
@@ -1543,53 +2051,21 @@ async def remove_attendee(
     event = Event(**raw_event)
     _require_organizer_or_admin(current_user, event)
 
-    lock_id = await _acquire_event_user_lock(db, event_id=event_id, user_id=user_id)
+    lock = await _acquire_event_user_lock(locks, db, event_id=event_id, user_id=user_id)
     try:
-        existing = await db["attendance"].find_one(
-            {"event_id": event_id, "user_id": user_id},
-            sort=[("_id", DESCENDING)],
-        )
+        existing = await find_attendance(db, event_id=event_id, user_id=user_id)
         if existing is None or existing["status"] == AttendanceStatus.Cancelled.value:
             raise HTTPException(status_code=404, detail="Attendee not found")
 
-        result = await db["attendance"].update_one(
-            {"_id": existing["_id"], "status": existing["status"]},
-            {
-                "$set": {
-                    "status": AttendanceStatus.Cancelled.value,
-                    "checked_in_at": None,
-                }
-            },
+        promoted, google_synced = await _cancel_attendance_row(
+            db, request, capacity, existing, user_id=user_id
         )
-        if result.matched_count != 1:
-            raise HTTPException(status_code=409, detail="Registration state changed")
-
-        await _ensure_registered_count(db, event_id)
-        await _release_event_slot(db, event_id)
-
-        try:
-            _, google_synced = await _remove_event_from_app_calendar_if_present(
-                db,
-                request,
-                user_id=user_id,
-                event_id=event_id,
-            )
-        except Exception:
-            await db["attendance"].update_one(
-                {"_id": existing["_id"], "status": AttendanceStatus.Cancelled.value},
-                {
-                    "$set": {
-                        "status": existing["status"],
-                        "checked_in_at": existing.get("checked_in_at"),
-                    }
-                },
-            )
-            await db["events"].update_one(
-                {"id": event_id}, {"$inc": {"registered_count": 1}}
-            )
-            raise
     finally:
-        await _release_event_user_lock(db, lock_id)
+        await locks.release(db, lock)
+        await detail_cache.invalidate(event_id)
+
+    if promoted is not None:
+        await notify_promoted(db, Event(**raw_event), promoted)
 
     return RemoveAttendeeResponse(
         event_id=event_id, user_id=user_id, google_synced=google_synced
@@ -1606,10 +2082,12 @@ async def create_event(
     db: DbDep,
     body: EventCreate,
     current_user: AuthUserDep,
-    arq: ArqDep,
-    email_notif: EmailNotifDep,
+    totals: EventTotalsDep,
 ) -> EventDetail:
-    """Create a new event and return its full detail."""
+    """Create a new event and return its full detail.
+
+    New events are pending; their reminder is scheduled once they are approved.
+    """
     new_id = await _next_event_id(db)
 
     event = Event(
@@ -1629,21 +2107,53 @@ async def create_event(
         location=body.location,
     )
 
-    await db["events"].insert_one({**event.model_dump(), "registered_count": 0})
-
-    reminder_time = utc_naive_datetime(event.start_time) - timedelta(
-        minutes=REMINDER_LEAD_TIME_MINUTES
+    inserted = await db["events"].insert_one(
+        {
+            **event.model_dump(),
+            **event_search_fields(event.title, event.about),
+            REGISTERED_COUNT_FIELD: 0,
+            FAVORITES_COUNT_FIELD: 0,
+        }
+    )
+    await index_created_event(
+        db,
+        event_id=event.id,
+        organizer_user_id=event.organizer_user_id,
+        start_time=event.start_time,
     )
-    if reminder_time > datetime.now(UTC).replace(tzinfo=None):
-        await arq.schedule_event_reminder(event.id, reminder_time)
-    await email_notif.send_event_creation_confirmation(current_user.email, event)
+    await log_event_created(
+        db,
+        event_id=event.id,
+        organizer_user_id=event.organizer_user_id,
+        created_at=inserted.inserted_id.generation_time,
+    )
+    await increment_user_counters(db, USER_CREATED_COUNT_FIELD, {current_user.id: 1})
+    totals.invalidate()
+
+    # The event exists now; a failed email must not invite a duplicate resubmit.
+    try:
+        await enqueue_email(
+            db,
+            "event_creation_confirmation",
+            recipient=current_user.email,
+            event_id=event.id,
+            dedup_key=outbox_dedup_key("event_creation_confirmation", event.id),
+        )
+    except Exception:
+        logging.getLogger(__name__).exception(
+            "Failed to queue the creation confirmation for event %s", event.id
+        )
 
     return EventDetail.from_event(event, attending_count=0, favorites_count=0)
 
 
 @router.post("/{event_id}/image", response_model=EventImageResponse)
 async def upload_event_image(
-    db: DbDep, event_id: int, file: UploadFile, current_user: AuthUserDep
+    db: DbDep,
+    event_id: int,
+    file: UploadFile,
+    current_user: AuthUserDep,
+    detail_cache: EventDetailCacheDep,
 ) -> EventImageResponse:
     """Upload or replace an event image. Restricted to the organizer or an admin."""
     raw_event = await db["events"].find_one({"id": event_id})
@@ -1671,6 +2181,7 @@ async def upload_event_image(
         if os.path.exists(filepath):
             os.remove(filepath)
         raise
+    await detail_cache.invalidate(event_id)
 
     if old_path and os.path.exists(old_path):
         os.remove(old_path)
@@ -1678,9 +2189,39 @@ async def upload_event_image(
     return EventImageResponse(event_id=event_id, image_url=image_url)
 
 
+async def _sync_event_reminder(
+    arq: ArqClient | None,
+    event_id: int,
+    sync: Callable[[ArqClient], Awaitable[object]],
+) -> None:
+    """Apply a reminder queue change after the event write has committed.
+
+    Failures are logged rather than raised: the change is already saved, and
+    the hourly ``schedule_upcoming_reminders`` top-up plus the guards in
+    ``send_event_reminder`` repair a missed sync.
+    """
+    if arq is None:
+        logging.getLogger(__name__).warning(
+            "Background job queue unavailable; skipped reminder sync for event %s",
+            event_id,
+        )
+        return
+    try:
+        await sync(arq)
+    except Exception:
+        logging.getLogger(__name__).warning(
+            "Failed to sync reminder for event %s", event_id, exc_info=True
+        )
+
+
 @router.post("/{event_id}/approve", response_model=PendingEventListItem)
 async def approve_event(
-    db: DbDep, event_id: int, current_user: AuthUserDep
+    db: DbDep,
+    event_id: int,
+    current_user: AuthUserDep,
+    totals: EventTotalsDep,
+    detail_cache: EventDetailCacheDep,
+    arq: OptionalArqDep,
 ) -> PendingEventListItem:
     _require_admin(current_user)
     raw = await db["events"].find_one_and_update(
@@ -1690,6 +2231,15 @@ async def approve_event(
     )
     if raw is None:
         raise HTTPException(status_code=404, detail="Pending event not found")
+    totals.invalidate()
+    await detail_cache.invalidate(event_id)
+    await _sync_event_reminder(
+        arq,
+        event_id,
+        lambda client: client.schedule_event_reminder_if_due(
+            event_id, raw["start_time"]
+        ),
+    )
     return PendingEventListItem.from_event(
         Event(**raw).model_copy(update={"status": EventStatus.Pending})
     )
@@ -1697,7 +2247,12 @@ async def approve_event(
 
 @router.post("/{event_id}/reject", response_model=PendingEventListItem)
 async def reject_event(
-    db: DbDep, event_id: int, current_user: AuthUserDep
+    db: DbDep,
+    event_id: int,
+    current_user: AuthUserDep,
+    totals: EventTotalsDep,
+    detail_cache: EventDetailCacheDep,
+    arq: OptionalArqDep,
 ) -> PendingEventListItem:
     _require_admin(current_user)
     raw = await db["events"].find_one_and_update(
@@ -1707,6 +2262,12 @@ async def reject_event(
     )
     if raw is None:
         raise HTTPException(status_code=404, detail="Pending event not found")
+    totals.invalidate()
+    await detail_cache.invalidate(event_id)
+    # Events created before reminders waited for approval may have one queued.
+    await _sync_event_reminder(
+        arq, event_id, lambda client: client.cancel_event_reminder(event_id)
+    )
     return PendingEventListItem.from_event(
         Event(**raw).model_copy(update={"status": EventStatus.Pending})
     )
@@ -1721,7 +2282,10 @@ async def reject_event(
     "/{event_id}/favorites", response_model=FavoriteAddResponse, status_code=201
 )
 async def add_favorite(
-    db: DbDep, event_id: int, current_user: AuthUserDep
+    db: DbDep,
+    event_id: int,
+    current_user: AuthUserDep,
+    detail_cache: EventDetailCacheDep,
 ) -> FavoriteAddResponse:
     """Add an event to a user's favorites (idempotent)."""
     event = await db["events"].find_one(_public_event_visibility_filter(event_id))
@@ -1734,7 +2298,13 @@ async def add_favorite(
         {"event_id": favorite.event_id, "user_id": favorite.user_id}
     )
     if existing is None:
-        await db["event_favorites"].insert_one(favorite.model_dump())
+        await ensure_event_counters_by_id(db, event_id)
+        with suppress(DuplicateKeyError):
+            await db["event_favorites"].insert_one(favorite.model_dump())
+            await db["events"].update_one(
+                {"id": event_id}, {"$inc": {FAVORITES_COUNT_FIELD: 1}}
+            )
+        await detail_cache.invalidate(event_id)
 
     return FavoriteAddResponse(event_id=event_id, user_id=current_user.id)
 
@@ -1748,7 +2318,10 @@ async def add_favorite(
     "/{event_id}/favorites", response_model=FavoriteRemoveResponse, status_code=200
 )
 async def remove_favorite(
-    db: DbDep, event_id: int, current_user: AuthUserDep
+    db: DbDep,
+    event_id: int,
+    current_user: AuthUserDep,
+    detail_cache: EventDetailCacheDep,
 ) -> FavoriteRemoveResponse:
     """Remove an event from a user's favorites."""
     event = await db["events"].find_one(_public_event_visibility_filter(event_id))
@@ -1756,7 +2329,14 @@ async def remove_favorite(
         raise HTTPException(status_code=404, detail="Event not found")
 
     favorite = EventFavorite(event_id=event_id, user_id=current_user.id)
-    await db["event_favorites"].delete_one(
+    await ensure_event_counters_by_id(db, event_id)
+    result = await db["event_favorites"].delete_one(
         {"event_id": favorite.event_id, "user_id": favorite.user_id}
     )
+    if result.deleted_count:
+        await db["events"].update_one(
+            {"id": event_id, FAVORITES_COUNT_FIELD: {"$gt": 0}},
+            {"$inc": {FAVORITES_COUNT_FIELD: -1}},
+        )
+        await detail_cache.invalidate(event_id)
     return FavoriteRemoveResponse(event_id=event_id, user_id=current_user.id)
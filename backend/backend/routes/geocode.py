@@ -7,10 +7,12 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 
 from backend.routes.auth import AuthSessionUser, require_authenticated_user
+from backend.services.http_clients import HttpClients, get_http_clients
 
 router = APIRouter()
 
 AuthUserDep = Annotated[AuthSessionUser, Depends(require_authenticated_user)]
+HttpClientsDep = Annotated[HttpClients, Depends(get_http_clients)]
 
 NOMINATIM_SEARCH_URL = "https://nominatim.openstreetmap.org/search"
 DEFAULT_USER_AGENT = (
@@ -88,7 +90,9 @@ def _geocode_candidates(
     return candidates
 
 
-async def _search_nominatim(params: dict[str, str]) -> list[dict[str, Any]]:
+async def _search_nominatim(
+    params: dict[str, str], *, client: httpx.AsyncClient
+) -> list[dict[str, Any]]:
     user_agent = os.getenv("NOMINATIM_USER_AGENT", DEFAULT_USER_AGENT).strip()
     headers = {
         "Accept": "application/json",
@@ -96,9 +100,10 @@ async def _search_nominatim(params: dict[str, str]) -> list[dict[str, Any]]:
     }
 
     try:
-        async with httpx.AsyncClient(timeout=8.0, headers=headers) as client:
-            response = await client.get(NOMINATIM_SEARCH_URL, params=params)
-            response.raise_for_status()
+        response = await client.get(
+            NOMINATIM_SEARCH_URL, params=params, headers=headers
+        )
+        response.raise_for_status()
     except httpx.HTTPStatusError as exc:
         status_code = exc.response.status_code
         if status_code == 429:
@@ -138,6 +143,7 @@ def _result_from_place(place: dict[str, Any]) -> GeocodeResult | None:
 @router.get("/", response_model=GeocodeResult)
 async def geocode_address(
     _current_user: AuthUserDep,
+    http_clients: HttpClientsDep,
     street: Annotated[str, Query(min_length=1)],
     city: Annotated[str, Query(min_length=1)],
     state: Annotated[str, Query(min_length=1)],
@@ -156,7 +162,7 @@ async def geocode_address(
     for index, params in enumerate(candidates):
         if index > 0:
             await asyncio.sleep(1.05)
-        for place in await _search_nominatim(params):
+        for place in await _search_nominatim(params, client=http_clients.nominatim):
             if result := _result_from_place(place):
                 return result
 
@@ -1,30 +1,65 @@
 from __future__ import annotations
 
-import logging
+import asyncio
 import os
 import uuid
-from datetime import UTC, datetime
+from datetime import datetime
 from typing import Annotated, Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile
-from pydantic import BaseModel, EmailStr, ValidationError
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile
+from pydantic import BaseModel, EmailStr
 from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import DuplicateKeyError
 from starlette.requests import Request
 
 from backend.app_config import get_frontend_settings
 from backend.db import get_db
 from backend.models.attendance import AttendanceStatus
-from backend.models.event import Event
 from backend.models.user import GlobalRole, User, UserProfile
 from backend.routes.auth import (
     AuthSessionUser,
     get_google_calendar_access_token,
+    invalidate_principal,
+    oauth_token_session_id,
     require_authenticated_user,
 )
-from backend.services.calendar_sync import (
-    create_google_calendar_event,
-    delete_google_calendar_event,
-    google_calendar_event_payload,
+from backend.services.calendar_sync_jobs import (
+    CalendarSyncAction,
+    CalendarSyncJobStatus,
+    enqueue_calendar_sync_job,
+    get_calendar_sync_job,
+)
+from backend.services.counters import (
+    REGISTERED_COUNT_FIELD,
+    USER_ATTENDED_COUNT_FIELD,
+    USER_CREATED_COUNT_FIELD,
+    ensure_event_counters,
+    ensure_user_counters,
+)
+from backend.services.http_clients import get_http_clients
+from backend.services.notifications.arq import get_arq
+from backend.services.pagination import InvalidCursorError
+from backend.services.user_activity import (
+    DEFAULT_ACTIVITY_PAGE_SIZE,
+    MAX_ACTIVITY_PAGE_SIZE,
+    ActivityAction,
+    activity_page,
+    decode_activity_cursor,
+)
+from backend.services.user_calendar import (
+    backfill_registered_calendar_entries,
+    calendar_entries_for_user,
+    events_by_id,
+    google_sync_enabled,
+    sync_calendar_to_google,
+    unsync_calendar_from_google,
+)
+from backend.services.user_event_index import (
+    DEFAULT_USER_EVENTS_PAGE_SIZE,
+    MAX_USER_EVENTS_PAGE_SIZE,
+    UserEventKind,
+    decode_user_events_cursor,
+    user_event_page,
 )
 
 router = APIRouter()
@@ -36,8 +71,6 @@ UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "uploads")
 ALLOWED_PHOTO_TYPES = {"image/jpeg", "image/png", "image/gif"}
 ALLOWED_PHOTO_EXTENSIONS = {"jpg", "jpeg", "png", "gif"}
 MAX_PHOTO_SIZE = 5 * 1024 * 1024  # 5 MB
-USER_CALENDAR_COLLECTION = "user_calendar_entries"
-USER_CALENDAR_SYNC_COLLECTION = "user_calendar_syncs"
 
 # ---------------------------------------------------------------------------
 # Response schemas
@@ -107,16 +140,18 @@ class PhotoResponse(BaseModel):
 
 
 class ActivityItem(BaseModel):
+    id: str
     event_id: int
     event_title: str
     event_image_url: str | None
     event_end_time: datetime | None = None
-    action: Literal["attended", "created", "registered"]
+    action: ActivityAction
     date: datetime
 
 
 class ActivityResponse(BaseModel):
     items: list[ActivityItem]
+    next_cursor: str | None = None
 
 
 class MyEventItem(BaseModel):
@@ -131,11 +166,14 @@ class MyEventItem(BaseModel):
     price: float
     status: str | None = None
     attending_count: int = 0
+    attendance_status: AttendanceStatus | None = None
 
 
 class MyEventsResponse(BaseModel):
     created: list[MyEventItem]
     registered: list[MyEventItem]
+    created_next_cursor: str | None = None
+    registered_next_cursor: str | None = None
 
 
 class CalendarItem(BaseModel):
@@ -158,15 +196,52 @@ class GoogleCalendarSyncResponse(BaseModel):
     google_sync_enabled: bool = True
     synced_count: int
     skipped_count: int
+    failed_count: int = 0
+    failed_event_ids: list[int] = []
     status: Literal["enabled"] = "enabled"
 
 
 class GoogleCalendarUnsyncResponse(BaseModel):
     google_sync_enabled: bool = False
     unsynced_count: int
+    failed_count: int = 0
+    failed_event_ids: list[int] = []
     status: Literal["disabled"] = "disabled"
 
 
+class CalendarSyncJobResponse(BaseModel):
+    job_id: str
+    action: CalendarSyncAction
+    status: CalendarSyncJobStatus
+    total: int
+    processed_count: int
+    completed_count: int
+    skipped_count: int
+    failed_count: int
+    failed_event_ids: list[int]
+    error: str | None = None
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_job(cls, job: dict[str, Any]) -> CalendarSyncJobResponse:
+        failed_event_ids = [int(event_id) for event_id in job["failed_event_ids"]]
+        return cls(
+            job_id=job["_id"],
+            action=job["action"],
+            status=job["status"],
+            total=job["total"],
+            processed_count=job["completed"] + len(failed_event_ids),
+            completed_count=job["completed"],
+            skipped_count=job["skipped"],
+            failed_count=len(failed_event_ids),
+            failed_event_ids=failed_event_ids,
+            error=job.get("error"),
+            created_at=job["created_at"],
+            updated_at=job["updated_at"],
+        )
+
+
 # ---------------------------------------------------------------------------
 # Request schemas
 # ---------------------------------------------------------------------------
@@ -214,11 +289,17 @@ _PROFILE_FIELDS = {
 }
 
 
-async def _get_user_or_404(db: AsyncDatabase[dict[str, Any]], user_id: int) -> User:
+async def _find_user_or_404(
+    db: AsyncDatabase[dict[str, Any]], user_id: int
+) -> dict[str, Any]:
     raw = await db["users"].find_one({"id": user_id})
     if raw is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return User(**raw)
+    return raw
+
+
+async def _get_user_or_404(db: AsyncDatabase[dict[str, Any]], user_id: int) -> User:
+    return User(**await _find_user_or_404(db, user_id))
 
 
 async def _ensure_unique_user_fields(
@@ -247,30 +328,24 @@ async def _ensure_unique_user_fields(
 
 
 async def _build_user_detail(
-    db: AsyncDatabase[dict[str, Any]], user: User
+    db: AsyncDatabase[dict[str, Any]], raw_user: dict[str, Any]
 ) -> UserDetail:
-    events_created = await db["events"].count_documents({"organizer_user_id": user.id})
-    events_attended = await db["attendance"].count_documents(
-        {"user_id": user.id, "status": {"$eq": "checked_in"}}
-    )
+    await ensure_user_counters(db, [raw_user])
     return UserDetail.from_user(
-        user,
-        events_created_count=events_created,
-        events_attended_count=events_attended,
+        User(**raw_user),
+        events_created_count=raw_user[USER_CREATED_COUNT_FIELD],
+        events_attended_count=raw_user[USER_ATTENDED_COUNT_FIELD],
     )
 
 
 async def _build_public_user_detail(
-    db: AsyncDatabase[dict[str, Any]], user: User
+    db: AsyncDatabase[dict[str, Any]], raw_user: dict[str, Any]
 ) -> PublicUserDetail:
-    events_created = await db["events"].count_documents({"organizer_user_id": user.id})
-    events_attended = await db["attendance"].count_documents(
-        {"user_id": user.id, "status": {"$eq": "checked_in"}}
-    )
+    await ensure_user_counters(db, [raw_user])
     return PublicUserDetail.from_user(
-        user,
-        events_created_count=events_created,
-        events_attended_count=events_attended,
+        User(**raw_user),
+        events_created_count=raw_user[USER_CREATED_COUNT_FIELD],
+        events_attended_count=raw_user[USER_ATTENDED_COUNT_FIELD],
     )
 
 
@@ -288,162 +363,12 @@ def _string_value(value: object) -> str | None:
     return None
 
 
-def _frontend_event_url(request: Request, event_id: int) -> str | None:
-    frontend_settings = get_frontend_settings(request.app)
-    if frontend_settings.primary_origin:
-        return f"{frontend_settings.primary_origin}/events/{event_id}"
-    if frontend_settings.allowed_origins:
-        return f"{frontend_settings.allowed_origins[0]}/events/{event_id}"
-    return None
-
-
-async def _google_sync_enabled(db: AsyncDatabase[dict[str, Any]], user_id: int) -> bool:
-    raw = await db[USER_CALENDAR_SYNC_COLLECTION].find_one({"user_id": user_id})
-    return raw is not None and raw.get("google_sync_enabled") is True
-
-
-async def _set_google_sync_enabled(
-    db: AsyncDatabase[dict[str, Any]], user_id: int, enabled: bool
-) -> None:
-    await db[USER_CALENDAR_SYNC_COLLECTION].update_one(
-        {"user_id": user_id},
-        {
-            "$set": {
-                "google_sync_enabled": enabled,
-                "updated_at": datetime.now(tz=UTC),
-            }
-        },
-        upsert=True,
-    )
-
-
-async def _update_google_sync_enabled(
-    db: AsyncDatabase[dict[str, Any]], user_id: int, enabled: bool
-) -> None:
-    try:
-        await _set_google_sync_enabled(db, user_id, enabled)
-    except HTTPException:
-        raise
-    except Exception as exc:
-        logging.getLogger(__name__).exception(
-            "Failed to update Google Calendar sync settings for user %s", user_id
-        )
-        raise HTTPException(
-            status_code=502,
-            detail="Could not update your Google Calendar sync settings. Please try again.",
-        ) from exc
-
-
-async def _calendar_entries_for_user(
-    db: AsyncDatabase[dict[str, Any]], user_id: int
-) -> list[dict[str, Any]]:
-    return await (
-        db[USER_CALENDAR_COLLECTION]
-        .find({"user_id": user_id})
-        .sort("added_at", -1)
-        .to_list(length=None)
-    )
-
-
-async def _events_by_id(
-    db: AsyncDatabase[dict[str, Any]], event_ids: list[int]
-) -> dict[int, Event]:
-    events: dict[int, Event] = {}
-    if not event_ids:
-        return events
-
-    async for raw_event in db["events"].find({"id": {"$in": event_ids}}):
-        try:
-            event = Event(**raw_event)
-        except ValidationError:
-            logging.getLogger(__name__).warning(
-                "Skipping invalid event %r while building calendar data",
-                raw_event.get("id"),
-                exc_info=True,
-            )
-            continue
-        events[event.id] = event
-    return events
-
-
-async def _create_google_calendar_event_for_calendar_sync(
-    request: Request,
-    access_token: str,
-    *,
-    user_id: int,
-    event: Event,
-) -> dict[str, object]:
-    try:
-        return await create_google_calendar_event(
-            access_token,
-            google_calendar_event_payload(
-                event,
-                event_url=_frontend_event_url(request, event.id),
-            ),
-        )
-    except HTTPException:
-        raise
-    except Exception as exc:
-        logging.getLogger(__name__).exception(
-            "Unexpected Google Calendar sync failure for user %s event %s",
-            user_id,
-            event.id,
-        )
-        raise HTTPException(
-            status_code=502,
-            detail="Could not sync your calendar to Google Calendar. Please try again.",
-        ) from exc
-
-
-async def _backfill_registered_calendar_entries(
-    db: AsyncDatabase[dict[str, Any]], user_id: int
-) -> None:
-    existing_entries = await _calendar_entries_for_user(db, user_id)
-    existing_event_ids = {
-        int(entry["event_id"])
-        for entry in existing_entries
-        if isinstance(entry.get("event_id"), int)
-    }
-
-    attendance_records = await (
-        db["attendance"].find({"user_id": user_id}).sort("_id", -1).to_list(length=None)
-    )
-    latest_status_by_event: dict[int, str | None] = {}
-    for record in attendance_records:
-        event_id = record.get("event_id")
-        if not isinstance(event_id, int) or event_id in latest_status_by_event:
-            continue
-        latest_status_by_event[event_id] = _string_value(record.get("status"))
-
-    missing_event_ids = [
-        event_id
-        for event_id, status in latest_status_by_event.items()
-        if status is not None
-        and status != AttendanceStatus.Cancelled.value
-        and event_id not in existing_event_ids
-    ]
-    if not missing_event_ids:
-        return
-
-    events = await _events_by_id(db, missing_event_ids)
-    for event_id in missing_event_ids:
-        if event_id not in events:
-            continue
-        await db[USER_CALENDAR_COLLECTION].insert_one(
-            {
-                "user_id": user_id,
-                "event_id": event_id,
-                "added_at": datetime.now(tz=UTC),
-            }
-        )
-
-
 async def _build_calendar_response(
     db: AsyncDatabase[dict[str, Any]], user_id: int
 ) -> CalendarResponse:
-    await _backfill_registered_calendar_entries(db, user_id)
-    entries = await _calendar_entries_for_user(db, user_id)
-    events = await _events_by_id(db, [int(entry["event_id"]) for entry in entries])
+    await backfill_registered_calendar_entries(db, user_id)
+    entries = await calendar_entries_for_user(db, user_id)
+    events = await events_by_id(db, [int(entry["event_id"]) for entry in entries])
 
     items: list[CalendarItem] = []
     for entry in entries:
@@ -476,7 +401,7 @@ async def _build_calendar_response(
     items.sort(key=lambda item: item.start_time)
     return CalendarResponse(
         items=items,
-        google_sync_enabled=await _google_sync_enabled(db, user_id),
+        google_sync_enabled=await google_sync_enabled(db, user_id),
     )
 
 
@@ -488,8 +413,8 @@ async def _build_calendar_response(
 @router.get("/me", response_model=UserDetail)
 async def get_current_user_profile(db: DbDep, current_user: AuthUserDep) -> UserDetail:
     """Retrieve full details for the currently authenticated user."""
-    user = await _get_user_or_404(db, current_user.id)
-    return await _build_user_detail(db, user)
+    raw_user = await _find_user_or_404(db, current_user.id)
+    return await _build_user_detail(db, raw_user)
 
 
 # ---------------------------------------------------------------------------
@@ -498,8 +423,28 @@ async def get_current_user_profile(db: DbDep, current_user: AuthUserDep) -> User
 
 
 @router.get("/me/events", response_model=MyEventsResponse)
-async def get_my_events(db: DbDep, current_user: AuthUserDep) -> MyEventsResponse:
-    """Return events the authenticated user created and events they registered for."""
+async def get_my_events(
+    db: DbDep,
+    current_user: AuthUserDep,
+    kind: Annotated[
+        UserEventKind | None, Query(description="Only return this list.")
+    ] = None,
+    limit: Annotated[
+        int, Query(ge=1, le=MAX_USER_EVENTS_PAGE_SIZE)
+    ] = DEFAULT_USER_EVENTS_PAGE_SIZE,
+    created_cursor: Annotated[
+        str | None, Query(description="Opaque `created_next_cursor`.")
+    ] = None,
+    registered_cursor: Annotated[
+        str | None, Query(description="Opaque `registered_next_cursor`.")
+    ] = None,
+) -> MyEventsResponse:
+    """Return events the authenticated user created and events they registered for.
+
+    Both lists are read from the user's event index one page at a time: created
+    events by start time and registered events by registration time, newest
+    first.
+    """
     user_id = current_user.id
 
     def _location_summary(raw: dict[str, Any]) -> str:
@@ -513,25 +458,37 @@ async def get_my_events(db: DbDep, current_user: AuthUserDep) -> MyEventsRespons
             return f"{venue}, {city}"
         return f"{city}, {state}".strip(", ")
 
-    async def _build_items(
-        raw_events: list[dict[str, Any]],
-    ) -> list[MyEventItem]:
-        event_ids = [r["id"] for r in raw_events]
-        counts: dict[int, int] = {}
-        if event_ids:
-            pipeline: list[dict[str, Any]] = [
-                {
-                    "$match": {
-                        "event_id": {"$in": event_ids},
-                        "status": {"$ne": "cancelled"},
-                    }
-                },
-                {"$group": {"_id": "$event_id", "count": {"$sum": 1}}},
-            ]
-            async for doc in await db["attendance"].aggregate(pipeline):
-                counts[doc["_id"]] = doc["count"]
-
-        return [
+    async def _page(
+        page_kind: UserEventKind, cursor: str | None
+    ) -> tuple[list[MyEventItem], str | None]:
+        if kind is not None and kind != page_kind:
+            return [], None
+        after = None
+        if cursor is not None:
+            try:
+                after = decode_user_events_cursor(cursor)
+            except InvalidCursorError as exc:
+                raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+        entries, next_cursor = await user_event_page(
+            db, user_id, page_kind, limit=limit, after=after
+        )
+        if not entries:
+            return [], next_cursor
+
+        event_ids = [entry["event_id"] for entry in entries]
+        raw_by_id = {
+            raw["id"]: raw
+            async for raw in db["events"].find({"id": {"$in": event_ids}})
+        }
+        raw_events = [
+            raw_by_id[entry["event_id"]]
+            for entry in entries
+            if entry["event_id"] in raw_by_id
+        ]
+        await ensure_event_counters(db, raw_events)
+        statuses = {entry["event_id"]: entry.get("status") for entry in entries}
+
+        items = [
             MyEventItem(
                 id=r["id"],
                 title=r["title"],
@@ -543,45 +500,22 @@ async def get_my_events(db: DbDep, current_user: AuthUserDep) -> MyEventsRespons
                 location_summary=_location_summary(r),
                 price=r.get("price", 0),
                 status=r.get("status"),
-                attending_count=counts.get(r["id"], 0),
+                attending_count=r[REGISTERED_COUNT_FIELD],
+                attendance_status=statuses.get(r["id"]),
             )
             for r in raw_events
         ]
+        return items, next_cursor
 
-    created_raw = await (
-        db["events"]
-        .find({"organizer_user_id": user_id})
-        .sort("start_time", -1)
-        .to_list(length=50)
-    )
-
-    attendance_records = await (
-        db["attendance"].find({"user_id": user_id}).sort("_id", -1).to_list(length=None)
+    (created, created_next), (registered, registered_next) = await asyncio.gather(
+        _page("created", created_cursor),
+        _page("registered", registered_cursor),
     )
-    registered_event_ids: list[int] = []
-    seen: set[int] = set()
-    for rec in attendance_records:
-        eid = rec.get("event_id")
-        if not isinstance(eid, int) or eid in seen:
-            continue
-        seen.add(eid)
-        if rec.get("status") != "cancelled":
-            registered_event_ids.append(eid)
-
-    registered_raw: list[dict[str, Any]] = []
-    if registered_event_ids:
-        id_order = {eid: idx for idx, eid in enumerate(registered_event_ids)}
-        raw_list = await (
-            db["events"]
-            .find({"id": {"$in": registered_event_ids}})
-            .to_list(length=None)
-        )
-        raw_list.sort(key=lambda r: id_order.get(r["id"], 0))
-        registered_raw = raw_list
-
     return MyEventsResponse(
-        created=await _build_items(created_raw),
-        registered=await _build_items(registered_raw),
+        created=created,
+        registered=registered,
+        created_next_cursor=created_next,
+        registered_next_cursor=registered_next,
     )
 
 
@@ -593,8 +527,8 @@ async def get_my_events(db: DbDep, current_user: AuthUserDep) -> MyEventsRespons
 @router.get("/{user_id}", response_model=PublicUserDetail)
 async def get_user(db: DbDep, user_id: int) -> PublicUserDetail:
     """Retrieve public details for a single user."""
-    user = await _get_user_or_404(db, user_id)
-    return await _build_public_user_detail(db, user)
+    raw_user = await _find_user_or_404(db, user_id)
+    return await _build_public_user_detail(db, raw_user)
 
 
 # ---------------------------------------------------------------------------
@@ -618,90 +552,42 @@ async def get_user_calendar(
 
 @router.post(
     "/{user_id}/calendar/sync/google",
-    response_model=GoogleCalendarSyncResponse,
+    response_model=GoogleCalendarSyncResponse | CalendarSyncJobResponse,
 )
 async def sync_user_calendar_to_google(
     db: DbDep,
     request: Request,
+    response: Response,
     user_id: int,
     current_user: AuthUserDep,
-) -> GoogleCalendarSyncResponse:
+    background: bool = False,
+) -> GoogleCalendarSyncResponse | CalendarSyncJobResponse:
+    """Push saved events to Google Calendar and keep future ones in sync.
+
+    With ``background=true`` the sync runs on the worker and this returns
+    ``202`` with a job to poll.
+    """
     _ensure_same_user(current_user, user_id)
     await _get_user_or_404(db, user_id)
 
+    # Fail fast on a missing or revoked token even when syncing in the background.
     access_token = await get_google_calendar_access_token(request)
 
-    try:
-        await _backfill_registered_calendar_entries(db, user_id)
-        entries = await _calendar_entries_for_user(db, user_id)
-        events = await _events_by_id(db, [int(entry["event_id"]) for entry in entries])
-    except HTTPException:
-        raise
-    except Exception as exc:
-        logging.getLogger(__name__).exception(
-            "Database error while preparing calendar sync for user %s", user_id
-        )
-        raise HTTPException(
-            status_code=502,
-            detail="Could not read your calendar data. Please try again.",
-        ) from exc
-
-    synced_count = 0
-    skipped_count = 0
-    for entry in entries:
-        if _string_value(entry.get("google_calendar_event_id")) is not None:
-            skipped_count += 1
-            continue
-
-        event = events.get(int(entry["event_id"]))
-        if event is None:
-            skipped_count += 1
-            continue
-
-        google_event = await _create_google_calendar_event_for_calendar_sync(
-            request,
-            access_token,
-            user_id=user_id,
-            event=event,
-        )
-        google_event_id = _string_value(google_event.get("id"))
-        if google_event_id is None:
-            raise HTTPException(
-                status_code=502,
-                detail="Google Calendar returned an invalid response.",
-            )
-
-        try:
-            await db[USER_CALENDAR_COLLECTION].update_one(
-                {"_id": entry["_id"]},
-                {
-                    "$set": {
-                        "google_calendar_event_id": google_event_id,
-                        "google_calendar_event_url": _string_value(
-                            google_event.get("htmlLink")
-                        ),
-                    }
-                },
-            )
-        except HTTPException:
-            raise
-        except Exception as exc:
-            try:
-                await delete_google_calendar_event(access_token, google_event_id)
-            except Exception:
-                logging.getLogger(__name__).exception(
-                    "Failed to roll back Google Calendar event after calendar sync persistence failure"
-                )
-            raise HTTPException(
-                status_code=502,
-                detail="Could not save Google Calendar sync data. Please try again.",
-            ) from exc
-        synced_count += 1
+    if background:
+        return await _enqueue_calendar_sync(db, request, response, user_id, "sync")
 
-    await _update_google_sync_enabled(db, user_id, True)
+    result = await sync_calendar_to_google(
+        db,
+        user_id,
+        access_token=access_token,
+        client=get_http_clients(request).google_calendar,
+        frontend_settings=get_frontend_settings(request.app),
+    )
     return GoogleCalendarSyncResponse(
-        synced_count=synced_count,
-        skipped_count=skipped_count,
+        synced_count=result.completed,
+        skipped_count=result.skipped,
+        failed_count=result.failed,
+        failed_event_ids=result.failed_event_ids,
     )
 
 
@@ -712,48 +598,73 @@ async def sync_user_calendar_to_google(
 
 @router.delete(
     "/{user_id}/calendar/sync/google",
-    response_model=GoogleCalendarUnsyncResponse,
+    response_model=GoogleCalendarUnsyncResponse | CalendarSyncJobResponse,
 )
 async def unsync_user_calendar_from_google(
     db: DbDep,
     request: Request,
+    response: Response,
     user_id: int,
     current_user: AuthUserDep,
-) -> GoogleCalendarUnsyncResponse:
+    background: bool = False,
+) -> GoogleCalendarUnsyncResponse | CalendarSyncJobResponse:
     _ensure_same_user(current_user, user_id)
     await _get_user_or_404(db, user_id)
 
-    entries = await _calendar_entries_for_user(db, user_id)
-    synced_entries = [
-        entry
-        for entry in entries
-        if _string_value(entry.get("google_calendar_event_id")) is not None
-    ]
+    if background:
+        return await _enqueue_calendar_sync(db, request, response, user_id, "unsync")
 
-    access_token: str | None = None
-    unsynced_count = 0
-    for entry in synced_entries:
-        google_event_id = _string_value(entry.get("google_calendar_event_id"))
-        if google_event_id is None:
-            continue
+    result = await unsync_calendar_from_google(
+        db,
+        user_id,
+        access_token=lambda: get_google_calendar_access_token(request),
+        client=get_http_clients(request).google_calendar,
+    )
+    return GoogleCalendarUnsyncResponse(
+        unsynced_count=result.completed,
+        failed_count=result.failed,
+        failed_event_ids=result.failed_event_ids,
+    )
 
-        if access_token is None:
-            access_token = await get_google_calendar_access_token(request)
-
-        await delete_google_calendar_event(access_token, google_event_id)
-        await db[USER_CALENDAR_COLLECTION].update_one(
-            {"_id": entry["_id"]},
-            {
-                "$set": {
-                    "google_calendar_event_id": None,
-                    "google_calendar_event_url": None,
-                }
-            },
-        )
-        unsynced_count += 1
 
-    await _update_google_sync_enabled(db, user_id, False)
-    return GoogleCalendarUnsyncResponse(unsynced_count=unsynced_count)
+async def _enqueue_calendar_sync(
+    db: AsyncDatabase[dict[str, Any]],
+    request: Request,
+    response: Response,
+    user_id: int,
+    action: CalendarSyncAction,
+) -> CalendarSyncJobResponse:
+    job = await enqueue_calendar_sync_job(
+        db,
+        get_arq(request),
+        user_id=user_id,
+        action=action,
+        oauth_session_id=oauth_token_session_id(request),
+    )
+    response.status_code = 202
+    return CalendarSyncJobResponse.from_job(job)
+
+
+# ---------------------------------------------------------------------------
+# GET /users/{user_id}/calendar/sync/jobs/{job_id} -- Background sync progress
+# ---------------------------------------------------------------------------
+
+
+@router.get(
+    "/{user_id}/calendar/sync/jobs/{job_id}",
+    response_model=CalendarSyncJobResponse,
+)
+async def get_calendar_sync_job_status(
+    db: DbDep,
+    user_id: int,
+    job_id: str,
+    current_user: AuthUserDep,
+) -> CalendarSyncJobResponse:
+    _ensure_same_user(current_user, user_id)
+    job = await get_calendar_sync_job(db, user_id, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Calendar sync job not found")
+    return CalendarSyncJobResponse.from_job(job)
 
 
 # ---------------------------------------------------------------------------
@@ -763,7 +674,11 @@ async def unsync_user_calendar_from_google(
 
 @router.patch("/{user_id}", response_model=UserDetail)
 async def update_user(
-    db: DbDep, user_id: int, body: UserProfileUpdate, current_user: AuthUserDep
+    db: DbDep,
+    request: Request,
+    user_id: int,
+    body: UserProfileUpdate,
+    current_user: AuthUserDep,
 ) -> UserDetail:
     """Update a user's profile information."""
     _ensure_same_user(current_user, user_id)
@@ -781,10 +696,16 @@ async def update_user(
             updates[f"profile.{field}"] = value
 
     if updates:
-        await db["users"].update_one({"id": user_id}, {"$set": updates})
+        try:
+            await db["users"].update_one({"id": user_id}, {"$set": updates})
+        except DuplicateKeyError as exc:
+            raise HTTPException(
+                status_code=409, detail="Email or username is already in use"
+            ) from exc
+        invalidate_principal(request, user_id)
 
-    user = await _get_user_or_404(db, user_id)
-    return await _build_user_detail(db, user)
+    raw_user = await _find_user_or_404(db, user_id)
+    return await _build_user_detail(db, raw_user)
 
 
 # ---------------------------------------------------------------------------
@@ -794,7 +715,11 @@ async def update_user(
 
 @router.post("/{user_id}/photo", response_model=PhotoResponse, status_code=200)
 async def upload_photo(
-    db: DbDep, user_id: int, file: UploadFile, current_user: AuthUserDep
+    db: DbDep,
+    request: Request,
+    user_id: int,
+    file: UploadFile,
+    current_user: AuthUserDep,
 ) -> PhotoResponse:
     """Upload or replace a user's profile photo."""
     _ensure_same_user(current_user, user_id)
@@ -840,6 +765,7 @@ async def upload_photo(
         if os.path.exists(filepath):
             os.remove(filepath)
         raise
+    invalidate_principal(request, user_id)
 
     if old_path and os.path.exists(old_path):
         os.remove(old_path)
@@ -853,7 +779,9 @@ async def upload_photo(
 
 
 @router.delete("/{user_id}/photo", status_code=204)
-async def delete_photo(db: DbDep, user_id: int, current_user: AuthUserDep) -> None:
+async def delete_photo(
+    db: DbDep, request: Request, user_id: int, current_user: AuthUserDep
+) -> None:
     """Remove a user's profile photo."""
     _ensure_same_user(current_user, user_id)
     user = await _get_user_or_404(db, user_id)
@@ -867,6 +795,7 @@ async def delete_photo(db: DbDep, user_id: int, current_user: AuthUserDep) -> No
         await db["users"].update_one(
             {"id": user_id}, {"$set": {"profile_photo_url": None}}
         )
+        invalidate_principal(request, user_id)
 
 
 # ---------------------------------------------------------------------------
@@ -879,80 +808,35 @@ async def get_user_activity(
     db: DbDep,
     user_id: int,
     current_user: AuthUserDep,
-    limit: Annotated[int, Query(ge=1, le=50)] = 10,
+    limit: Annotated[
+        int, Query(ge=1, le=MAX_ACTIVITY_PAGE_SIZE)
+    ] = DEFAULT_ACTIVITY_PAGE_SIZE,
+    cursor: Annotated[
+        str | None, Query(description="Opaque `next_cursor` from a previous page.")
+    ] = None,
 ) -> ActivityResponse:
-    """Return a user's recent activity (events created, attended, registered)."""
+    """Return a page of the user's activity log, newest first."""
     _ensure_same_user(current_user, user_id)
     await _get_user_or_404(db, user_id)
 
-    items: list[ActivityItem] = []
-
-    created_cursor = (
-        db["events"]
-        .find({"organizer_user_id": user_id})
-        .sort("start_time", -1)
-        .limit(limit)
-    )
-    async for raw_event in created_cursor:
-        items.append(
-            ActivityItem(
-                event_id=raw_event["id"],
-                event_title=raw_event["title"],
-                event_image_url=raw_event.get("image_url"),
-                event_end_time=raw_event.get("end_time"),
-                action="created",
-                date=raw_event["start_time"],
-            )
-        )
-
-    attendance_cursor = (
-        db["attendance"]
-        .find({"user_id": user_id})
-        .sort("checked_in_at", -1)
-        .limit(limit)
-    )
-    attendance_records = await attendance_cursor.to_list(length=limit)
-    latest_attendance_records: list[dict[str, Any]] = []
-    seen_event_ids: set[int] = set()
-    for raw_att in reversed(attendance_records):
-        event_id = raw_att["event_id"]
-        if event_id in seen_event_ids:
-            continue
-        seen_event_ids.add(event_id)
-        latest_attendance_records.append(raw_att)
-    latest_attendance_records.reverse()
-
-    event_ids = list({r["event_id"] for r in latest_attendance_records})
-    events_by_id: dict[int, dict[str, Any]] = {}
-    if event_ids:
-        async for ev in db["events"].find({"id": {"$in": event_ids}}):
-            events_by_id[ev["id"]] = ev
-
-    for raw_att in latest_attendance_records:
-        if raw_att["status"] == "cancelled":
-            continue
-
-        event_raw = events_by_id.get(raw_att["event_id"])
-        if event_raw is None:
-            continue
-
-        action: Literal["attended", "registered"] = (
-            "attended" if raw_att["status"] == "checked_in" else "registered"
-        )
-        date = raw_att.get("checked_in_at") or event_raw["start_time"]
-
-        items.append(
-            ActivityItem(
-                event_id=event_raw["id"],
-                event_title=event_raw["title"],
-                event_image_url=event_raw.get("image_url"),
-                event_end_time=event_raw.get("end_time"),
-                action=action,
-                date=date,
-            )
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_activity_cursor(cursor)
+        except InvalidCursorError as exc:
+            raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+    entries, next_cursor = await activity_page(db, user_id, limit=limit, after=after)
+    items = [
+        ActivityItem(
+            id=str(entry["_id"]),
+            event_id=entry["event"]["id"],
+            event_title=entry["event"]["title"],
+            event_image_url=entry["event"].get("image_url"),
+            event_end_time=entry["event"].get("end_time"),
+            action=entry["action"],
+            date=entry["ts"],
         )
-
-    items.sort(key=lambda a: a.date, reverse=True)
-    items = items[:limit]
-
-    return ActivityResponse(items=items)
+        for entry in entries
+    ]
+    return ActivityResponse(items=items, next_cursor=next_cursor)
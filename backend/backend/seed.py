@@ -16,6 +16,10 @@ from typing import Any
 
 from pymongo.asynchronous.mongo_client import AsyncMongoClient
 
+from backend.services.event_search import event_search_fields
+from backend.services.user_activity import backfill_user_activity
+from backend.services.user_event_index import rebuild_user_event_index
+
 logger = logging.getLogger(__name__)
 
 REQUIRED_STARTUP_USERS: list[dict[str, str]] = [
@@ -1143,7 +1147,13 @@ async def seed(*, force: bool = False) -> None:
             )
             return
 
-        for coll_name in ("users", "events", "attendance", "event_favorites"):
+        for coll_name in (
+            "users",
+            "events",
+            "attendance",
+            "event_favorites",
+            "user_activity",
+        ):
             existing = await db[coll_name].count_documents({})
             if existing > 0:
                 logger.info("Dropping %d docs from '%s'...", existing, coll_name)
@@ -1158,12 +1168,15 @@ async def seed(*, force: bool = False) -> None:
                     **evt,
                     "is_online": evt["id"] in ONLINE_EVENT_IDS,
                     "image_url": _seed_event_image_url(evt["id"]),
+                    **event_search_fields(evt["title"], evt["about"]),
                 }
             )
 
         await db["events"].insert_many(enriched)
         await db["attendance"].insert_many(SAMPLE_ATTENDANCE)
         await db["event_favorites"].insert_many(SAMPLE_FAVORITES)
+        await rebuild_user_event_index(db)
+        await backfill_user_activity(db)
 
         us_count = await db["users"].count_documents({})
         ev_count = await db["events"].count_documents({})
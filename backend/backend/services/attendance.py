@@ -0,0 +1,226 @@
+"""Attendance storage: one current-state document per (event, user).
+
+Every read of a user's attendance is a point read on the unique
+``(event_id, user_id)`` index, and listings need no "newest row wins" pass.
+Transitions update that document in place. Earlier versions of the API inserted
+a new row per registration, so older databases can hold several rows per pair;
+``migrate_attendance`` (the ``backend migrate-attendance`` command) keeps the
+newest row, archives the rest in ``attendance_history`` and then builds the
+unique index. The API runs it at startup when that index fails to build, and
+refuses to start if the index still cannot be built.
+
+Every transition is passed to ``record_attendance_transition``, which keeps
+the per-user event index and activity log in step and, optionally, the history.
+``attendance_history`` is append-only. Set ``ATTENDANCE_HISTORY=on`` and every
+transition also appends a record there. It is off by default, so the hot paths
+pay for no extra write.
+"""
+
+import logging
+import os
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from bson import ObjectId
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from backend.db.indexes import INDEX_SPECS, IndexReport, ensure_indexes
+from backend.services.user_activity import log_attendance_activity
+from backend.services.user_event_index import index_attendance
+
+ATTENDANCE_COLLECTION = "attendance"
+ATTENDANCE_HISTORY_COLLECTION = "attendance_history"
+ATTENDANCE_HISTORY_ENV = "ATTENDANCE_HISTORY"
+ATTENDANCE_UNIQUE_INDEX = f"{ATTENDANCE_COLLECTION}.attendance_event_user_unique"
+MIGRATION_BATCH_SIZE = 500
+_DUPLICATE_KEY_ERROR = 11000
+
+_logger = logging.getLogger(__name__)
+
+
+def attendance_history_enabled() -> bool:
+    return os.getenv(ATTENDANCE_HISTORY_ENV, "").strip().lower() in {
+        "1",
+        "true",
+        "on",
+    }
+
+
+def attendance_key(event_id: int, user_id: int) -> dict[str, int]:
+    return {"event_id": event_id, "user_id": user_id}
+
+
+async def find_attendance(
+    db: AsyncDatabase[dict[str, Any]], *, event_id: int, user_id: int
+) -> dict[str, Any] | None:
+    """Return the user's attendance document for the event, if any."""
+    return await db[ATTENDANCE_COLLECTION].find_one(attendance_key(event_id, user_id))
+
+
+def _history_record(row: Mapping[str, Any], recorded_at: datetime) -> dict[str, Any]:
+    return {
+        "attendance_id": row.get("_id"),
+        "event_id": row["event_id"],
+        "user_id": row["user_id"],
+        "status": row["status"],
+        "checked_in_at": row.get("checked_in_at"),
+        "recorded_at": recorded_at,
+    }
+
+
+async def record_attendance_history(
+    db: AsyncDatabase[dict[str, Any]], *rows: Mapping[str, Any]
+) -> None:
+    """Append the new state of each row when history is enabled.
+
+    History is an audit aid, so a failed append is logged and never fails the
+    transition that triggered it.
+    """
+    if not rows or not attendance_history_enabled():
+        return
+    recorded_at = datetime.now(tz=UTC)
+    try:
+        await db[ATTENDANCE_HISTORY_COLLECTION].insert_many(
+            [_history_record(row, recorded_at) for row in rows], ordered=False
+        )
+    except PyMongoError:
+        _logger.warning("Could not append attendance history", exc_info=True)
+
+
+async def record_attendance_transition(
+    db: AsyncDatabase[dict[str, Any]],
+    *rows: Mapping[str, Any],
+    activity: bool = True,
+) -> None:
+    """Propagate new attendance states to history, indexes and the activity log.
+
+    Pass ``activity=False`` for corrections, such as undoing a check-in, that
+    should not appear in the user's activity feed.
+    """
+    await record_attendance_history(db, *rows)
+    await index_attendance(db, *rows)
+    if activity:
+        await log_attendance_activity(db, *rows)
+
+
+@dataclass(slots=True)
+class AttendanceMigrationReport:
+    duplicated_pairs: int = 0
+    archived_rows: int = 0
+    index_ready: bool = False
+
+
+async def _archive_rows(
+    db: AsyncDatabase[dict[str, Any]], kept_by_id: dict[ObjectId, ObjectId]
+) -> int:
+    """Copy superseded rows into history, then delete them from attendance.
+
+    History records reuse the original ``_id``, so re-running after a crash
+    skips rows that were already copied.
+    """
+    rows = await (
+        db[ATTENDANCE_COLLECTION]
+        .find({"_id": {"$in": list(kept_by_id)}})
+        .to_list(length=None)
+    )
+    if not rows:
+        return 0
+    records = [
+        {
+            **_history_record(row, row["_id"].generation_time),
+            "_id": row["_id"],
+            "attendance_id": kept_by_id[row["_id"]],
+            "migrated": True,
+        }
+        for row in rows
+    ]
+    try:
+        await db[ATTENDANCE_HISTORY_COLLECTION].insert_many(records, ordered=False)
+    except BulkWriteError as exc:
+        errors = exc.details.get("writeErrors", [])
+        if any(error.get("code") != _DUPLICATE_KEY_ERROR for error in errors):
+            raise
+    result = await db[ATTENDANCE_COLLECTION].delete_many(
+        {"_id": {"$in": [row["_id"] for row in rows]}}
+    )
+    return result.deleted_count
+
+
+async def migrate_attendance(
+    db: AsyncDatabase[dict[str, Any]],
+    *,
+    dry_run: bool = False,
+    batch_size: int = MIGRATION_BATCH_SIZE,
+) -> AttendanceMigrationReport:
+    """Collapse attendance to one document per (event, user), then index it.
+
+    The newest row (highest ``_id``) of each pair is the current state, as the
+    old "latest row wins" reads assumed. With ``dry_run`` nothing is written.
+    Run it while registrations are quiet: a row written for a pair mid-migration
+    is kept if it is the newest.
+    """
+    report = AttendanceMigrationReport()
+    pipeline: list[dict[str, Any]] = [
+        {"$sort": {"event_id": 1, "user_id": 1, "_id": 1}},
+        {
+            "$group": {
+                "_id": {"event_id": "$event_id", "user_id": "$user_id"},
+                "ids": {"$push": "$_id"},
+            }
+        },
+        {"$match": {"ids.1": {"$exists": True}}},
+    ]
+    pending: dict[ObjectId, ObjectId] = {}
+    cursor = await db[ATTENDANCE_COLLECTION].aggregate(pipeline, allowDiskUse=True)
+    async with cursor:
+        async for group in cursor:
+            report.duplicated_pairs += 1
+            *superseded, kept = group["ids"]
+            if dry_run:
+                report.archived_rows += len(superseded)
+                continue
+            pending.update(dict.fromkeys(superseded, kept))
+            if len(pending) >= batch_size:
+                report.archived_rows += await _archive_rows(db, pending)
+                pending = {}
+    if pending:
+        report.archived_rows += await _archive_rows(db, pending)
+
+    if not dry_run:
+        index_report = await ensure_indexes(
+            db,
+            specs=[
+                spec for spec in INDEX_SPECS if spec.collection == ATTENDANCE_COLLECTION
+            ],
+        )
+        report.index_ready = not index_report.has_drift
+    _logger.info(
+        "Attendance migration%s: %d duplicated pairs, %d rows archived",
+        " (dry run)" if dry_run else "",
+        report.duplicated_pairs,
+        report.archived_rows,
+    )
+    return report
+
+
+async def migrate_attendance_if_unindexed(
+    db: AsyncDatabase[dict[str, Any]], index_report: IndexReport
+) -> AttendanceMigrationReport | None:
+    """Migrate attendance when ``ensure_indexes`` could not build its unique index.
+
+    Without that index, point reads return an arbitrary row of a duplicated
+    pair, so this raises ``RuntimeError`` if the index is still not ready.
+    """
+    if ATTENDANCE_UNIQUE_INDEX not in index_report.failed:
+        return None
+    _logger.warning("Attendance has duplicate rows; migrating before serving")
+    report = await migrate_attendance(db)
+    if not report.index_ready:
+        raise RuntimeError(
+            f"Could not build {ATTENDANCE_UNIQUE_INDEX}; "
+            "run `backend migrate-attendance` and check the index report"
+        )
+    return report
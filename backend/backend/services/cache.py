@@ -0,0 +1,238 @@
+"""Two-tier read-through cache for serialized API responses.
+
+The local tier is a per-process LRU with a short TTL; the optional Redis tier is
+shared by every API process and reuses the arq connection (``REDIS_URL``).
+Invalidation deletes from both tiers, so the process that handled a write
+serves fresh data immediately and other processes converge within the local
+TTL. Redis failures degrade to local-only caching and never fail a request.
+
+Each Redis entry has a generation counter that invalidation bumps. A process
+stores a value it built only if the generation is still the one it read before
+building, so a replica whose build raced another replica's write cannot put
+the stale value back for every process to serve.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import cast
+
+from fastapi import Request
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+LOCAL_TTL_SECONDS = 5.0
+LOCAL_MAX_ENTRIES = 2048
+REDIS_TTL_SECONDS = 60
+
+# KEYS: value, generation. ARGV: generation TTL.
+INVALIDATE_SCRIPT = """
+redis.call('DEL', KEYS[1])
+redis.call('INCR', KEYS[2])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+return 1
+"""
+
+# KEYS: value, generation. ARGV: value, TTL, generation read before the build
+# ('' when there was none). Returns 1 if stored, 0 if invalidated meanwhile.
+SET_IF_GENERATION_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[3] then
+  return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return 1
+"""
+
+_logger = logging.getLogger(__name__)
+
+
+class LocalTTLCache[V]:
+    """Bounded LRU mapping whose entries also expire after ``ttl_seconds``."""
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = LOCAL_TTL_SECONDS,
+        max_entries: int = LOCAL_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: V) -> None:
+        self._entries[key] = (self._clock() + self._ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+@dataclass(slots=True)
+class CacheStats:
+    local_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    redis_errors: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.local_hits + self.redis_hits
+
+    def as_dict(self) -> dict[str, int | float]:
+        lookups = self.hits + self.misses
+        return {
+            **asdict(self),
+            "hits": self.hits,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        namespace: str,
+        *,
+        local: LocalTTLCache[bytes] | None = None,
+        redis: Redis | None = None,
+        redis_ttl_seconds: int = REDIS_TTL_SECONDS,
+    ) -> None:
+        self._namespace = namespace
+        self._local = local if local is not None else LocalTTLCache[bytes]()
+        self._redis = redis
+        self._redis_ttl_seconds = redis_ttl_seconds
+        self._invalidation_seq = 0
+        self.stats = CacheStats()
+
+    @property
+    def has_redis_tier(self) -> bool:
+        return self._redis is not None
+
+    def _key(self, key: str | int) -> str:
+        return f"cache:{self._namespace}:{key}"
+
+    @staticmethod
+    def _generation_key(full_key: str) -> str:
+        return f"{full_key}:gen"
+
+    async def _lookup(self, full_key: str) -> tuple[bytes | None, bytes | None]:
+        """Return ``(value, Redis generation)``; the generation is ``None`` on a
+        local hit, and ``b""`` when Redis has none or could not be read."""
+        if (value := self._local.get(full_key)) is not None:
+            self.stats.local_hits += 1
+            return value, None
+        generation: bytes | None = None
+        if self._redis is not None:
+            try:
+                value, generation = cast(
+                    list[bytes | None],
+                    await self._redis.mget(full_key, self._generation_key(full_key)),
+                )
+            except RedisError:
+                self._redis_failed("read")
+                value = None
+            else:
+                generation = generation or b""
+            if value is not None:
+                self.stats.redis_hits += 1
+                self._local.set(full_key, value)
+                return value, generation
+        self.stats.misses += 1
+        return None, generation
+
+    async def get(self, key: str | int) -> bytes | None:
+        value, _ = await self._lookup(self._key(key))
+        return value
+
+    async def set(self, key: str | int, value: bytes) -> None:
+        full_key = self._key(key)
+        self._local.set(full_key, value)
+        if self._redis is not None:
+            try:
+                await self._redis.set(full_key, value, ex=self._redis_ttl_seconds)
+            except RedisError:
+                self._redis_failed("write")
+
+    async def invalidate(self, key: str | int) -> None:
+        full_key = self._key(key)
+        self._invalidation_seq += 1
+        self.stats.invalidations += 1
+        self._local.delete(full_key)
+        if self._redis is not None:
+            try:
+                # Outlives any build that read the previous generation.
+                await self._redis.register_script(INVALIDATE_SCRIPT)(
+                    keys=[full_key, self._generation_key(full_key)],
+                    args=[self._redis_ttl_seconds * 2],
+                )
+            except RedisError:
+                self._redis_failed("invalidate")
+
+    async def get_or_build(
+        self, key: str | int, build: Callable[[], Awaitable[bytes | None]]
+    ) -> bytes | None:
+        """Return the cached value, or build it and cache it unless ``None``.
+
+        A value built while this process invalidated any key is returned but not
+        stored, since it may have been read before that write. Nor is it stored
+        in Redis if another process invalidated the key meanwhile.
+        """
+        full_key = self._key(key)
+        cached, generation = await self._lookup(full_key)
+        if cached is not None:
+            return cached
+        seq = self._invalidation_seq
+        value = await build()
+        if value is None or seq != self._invalidation_seq:
+            return value
+        if self._redis is not None and generation is not None:
+            try:
+                stored = await self._redis.register_script(SET_IF_GENERATION_SCRIPT)(
+                    keys=[full_key, self._generation_key(full_key)],
+                    args=[value, self._redis_ttl_seconds, generation],
+                )
+            except RedisError:
+                self._redis_failed("write")
+                stored = 1
+            if not stored:
+                return value
+        self._local.set(full_key, value)
+        return value
+
+    def _redis_failed(self, operation: str) -> None:
+        self.stats.redis_errors += 1
+        _logger.warning(
+            "Redis cache %s failed for %s; using local tier only",
+            operation,
+            self._namespace,
+            exc_info=True,
+        )
+
+
+def get_event_detail_cache(request: Request) -> ResponseCache:
+    """FastAPI dependency that returns the shared event detail cache."""
+    cache: ResponseCache | None = getattr(request.app.state, "event_detail_cache", None)
+    if cache is None:
+        cache = ResponseCache("event_detail")
+        request.app.state.event_detail_cache = cache
+    return cache
@@ -51,15 +51,14 @@ def google_calendar_event_payload(
 
 
 async def create_google_calendar_event(
-    access_token: str, payload: dict[str, object]
+    access_token: str, payload: dict[str, object], *, client: httpx.AsyncClient
 ) -> dict[str, Any]:
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(
-                GOOGLE_CALENDAR_EVENTS_URL,
-                headers={"Authorization": f"Bearer {access_token}"},
-                json=payload,
-            )
+        response = await client.post(
+            GOOGLE_CALENDAR_EVENTS_URL,
+            headers={"Authorization": f"Bearer {access_token}"},
+            json=payload,
+        )
     except httpx.HTTPError as exc:
         raise HTTPException(
             status_code=502,
@@ -95,20 +94,22 @@ async def create_google_calendar_event(
     return body
 
 
-async def delete_google_calendar_event(access_token: str, google_event_id: str) -> None:
+async def delete_google_calendar_event(
+    access_token: str, google_event_id: str, *, client: httpx.AsyncClient
+) -> None:
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.delete(
-                f"{GOOGLE_CALENDAR_EVENTS_URL}/{google_event_id}",
-                headers={"Authorization": f"Bearer {access_token}"},
-            )
+        response = await client.delete(
+            f"{GOOGLE_CALENDAR_EVENTS_URL}/{google_event_id}",
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
     except httpx.HTTPError as exc:
         raise HTTPException(
             status_code=502,
             detail="Could not reach Google Calendar.",
         ) from exc
 
-    if response.status_code == 404:
+    # 410 Gone is what a retried DELETE sees when the first attempt succeeded.
+    if response.status_code in {404, 410}:
         return
 
     if response.status_code in {401, 403}:
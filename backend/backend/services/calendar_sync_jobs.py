@@ -0,0 +1,231 @@
+"""Background Google Calendar sync and unsync jobs.
+
+``POST``/``DELETE /users/{id}/calendar/sync/google?background=true`` record a job
+in ``calendar_sync_jobs`` and enqueue ``run_calendar_sync_job`` on arq instead
+of syncing inside the request. The worker writes progress to the job document
+after every persisted batch, and clients poll
+``GET /users/{id}/calendar/sync/jobs/{job_id}``.
+
+A user has at most one queued or running job: the ``active`` flag carries a
+partial unique index, and asking again returns the job already in flight. Jobs
+whose worker died are considered stale after ``CALENDAR_SYNC_JOB_STALE_AFTER``
+and no longer block a new one.
+"""
+
+import logging
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import Any, Literal
+
+from fastapi import HTTPException
+from pymongo import ReturnDocument
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import DuplicateKeyError
+
+from backend.app_config import FrontendSettings
+from backend.services.http_clients import HttpClients
+from backend.services.notifications.arq import ArqClient
+from backend.services.oauth_tokens import get_google_calendar_access_token_for_session
+from backend.services.user_calendar import (
+    CalendarSyncProgress,
+    sync_calendar_to_google,
+    unsync_calendar_from_google,
+)
+
+CALENDAR_SYNC_JOB_COLLECTION = "calendar_sync_jobs"
+CALENDAR_SYNC_JOB_TIMEOUT = timedelta(minutes=15)
+CALENDAR_SYNC_JOB_STALE_AFTER = CALENDAR_SYNC_JOB_TIMEOUT + timedelta(minutes=5)
+
+CalendarSyncAction = Literal["sync", "unsync"]
+CalendarSyncJobStatus = Literal["queued", "running", "completed", "failed"]
+
+_logger = logging.getLogger(__name__)
+
+
+def _progress_fields(progress: CalendarSyncProgress) -> dict[str, Any]:
+    return {
+        "total": progress.total,
+        "completed": progress.completed,
+        "skipped": progress.skipped,
+        "failed_event_ids": list(progress.failed_event_ids),
+        "updated_at": datetime.now(tz=UTC),
+    }
+
+
+async def _finish_job(
+    db: AsyncDatabase[dict[str, Any]],
+    job_id: str,
+    status: CalendarSyncJobStatus,
+    *,
+    progress: CalendarSyncProgress | None = None,
+    error: str | None = None,
+) -> None:
+    fields: dict[str, Any] = {
+        "status": status,
+        "error": error,
+        "finished_at": datetime.now(tz=UTC),
+        "updated_at": datetime.now(tz=UTC),
+    }
+    if progress is not None:
+        fields.update(_progress_fields(progress))
+    await db[CALENDAR_SYNC_JOB_COLLECTION].update_one(
+        {"_id": job_id}, {"$set": fields, "$unset": {"active": ""}}
+    )
+
+
+async def _active_job(
+    db: AsyncDatabase[dict[str, Any]], user_id: int
+) -> dict[str, Any] | None:
+    job = await db[CALENDAR_SYNC_JOB_COLLECTION].find_one(
+        {"user_id": user_id, "active": True}
+    )
+    if job is None:
+        return None
+    updated_at = job.get("updated_at")
+    if isinstance(updated_at, datetime):
+        if updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=UTC)
+        if datetime.now(tz=UTC) - updated_at > CALENDAR_SYNC_JOB_STALE_AFTER:
+            await _finish_job(
+                db, job["_id"], "failed", error="The sync job stopped responding."
+            )
+            return None
+    return job
+
+
+def _same_action(job: dict[str, Any], action: CalendarSyncAction) -> dict[str, Any]:
+    if job["action"] != action:
+        raise HTTPException(
+            status_code=409,
+            detail="A calendar sync job is already running. Please try again later.",
+        )
+    return job
+
+
+async def enqueue_calendar_sync_job(
+    db: AsyncDatabase[dict[str, Any]],
+    arq: ArqClient,
+    *,
+    user_id: int,
+    action: CalendarSyncAction,
+    oauth_session_id: str | None,
+) -> dict[str, Any]:
+    """Record and enqueue a job, or return the user's same job already in flight.
+
+    A job in flight for the other action is refused with a 409 rather than
+    returned, so an unsync is never mistaken for a running sync or vice versa.
+    """
+    if (existing := await _active_job(db, user_id)) is not None:
+        return _same_action(existing, action)
+
+    now = datetime.now(tz=UTC)
+    job: dict[str, Any] = {
+        "_id": uuid.uuid4().hex,
+        "user_id": user_id,
+        "action": action,
+        "status": "queued",
+        "active": True,
+        # The token itself stays encrypted in ``oauth_tokens``; the worker
+        # resolves it by session id.
+        "oauth_session_id": oauth_session_id,
+        "total": 0,
+        "completed": 0,
+        "skipped": 0,
+        "failed_event_ids": [],
+        "error": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+    try:
+        await db[CALENDAR_SYNC_JOB_COLLECTION].insert_one(job)
+    except DuplicateKeyError:
+        existing = await _active_job(db, user_id)
+        if existing is None:
+            raise HTTPException(
+                status_code=409,
+                detail="A calendar sync is already starting. Please try again.",
+            ) from None
+        return _same_action(existing, action)
+
+    try:
+        await arq.enqueue_calendar_sync_job(job["_id"])
+    except Exception as exc:
+        _logger.exception("Failed to enqueue calendar sync job %s", job["_id"])
+        await _finish_job(db, job["_id"], "failed", error="Could not queue the job.")
+        raise HTTPException(
+            status_code=503,
+            detail="Background job queue unavailable. Please try again.",
+        ) from exc
+    return job
+
+
+async def get_calendar_sync_job(
+    db: AsyncDatabase[dict[str, Any]], user_id: int, job_id: str
+) -> dict[str, Any] | None:
+    return await db[CALENDAR_SYNC_JOB_COLLECTION].find_one(
+        {"_id": job_id, "user_id": user_id}
+    )
+
+
+async def process_calendar_sync_job(
+    db: AsyncDatabase[dict[str, Any]],
+    job_id: str,
+    *,
+    http_clients: HttpClients,
+    frontend_settings: FrontendSettings,
+) -> None:
+    """Run a queued job to completion, recording progress and the outcome."""
+    job = await db[CALENDAR_SYNC_JOB_COLLECTION].find_one_and_update(
+        {"_id": job_id, "status": "queued"},
+        {"$set": {"status": "running", "updated_at": datetime.now(tz=UTC)}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if job is None:
+        _logger.warning("Calendar sync job %s is not queued; skipping", job_id)
+        return
+
+    user_id = int(job["user_id"])
+    session_id = job.get("oauth_session_id")
+
+    async def access_token() -> str:
+        if not isinstance(session_id, str):
+            raise HTTPException(
+                status_code=403,
+                detail="Google Calendar access is not available for this session. Please sign in again.",
+            )
+        return await get_google_calendar_access_token_for_session(
+            db, session_id, client=http_clients.google_oauth
+        )
+
+    async def report(progress: CalendarSyncProgress) -> None:
+        await db[CALENDAR_SYNC_JOB_COLLECTION].update_one(
+            {"_id": job_id}, {"$set": _progress_fields(progress)}
+        )
+
+    try:
+        if job["action"] == "sync":
+            progress = await sync_calendar_to_google(
+                db,
+                user_id,
+                access_token=await access_token(),
+                client=http_clients.google_calendar,
+                frontend_settings=frontend_settings,
+                on_progress=report,
+            )
+        else:
+            progress = await unsync_calendar_from_google(
+                db,
+                user_id,
+                access_token=access_token,
+                client=http_clients.google_calendar,
+                on_progress=report,
+            )
+    except HTTPException as exc:
+        await _finish_job(db, job_id, "failed", error=str(exc.detail))
+    except Exception:
+        _logger.exception("Calendar sync job %s failed", job_id)
+        await _finish_job(
+            db, job_id, "failed", error="Calendar sync failed. Please try again."
+        )
+    else:
+        await _finish_job(db, job_id, "completed", progress=progress)
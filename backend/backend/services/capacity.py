@@ -0,0 +1,370 @@
+"""Seat accounting for event registration.
+
+By default a seat is reserved with a conditional ``$inc`` of the event's
+``registered_count``, which serializes every registration for a popular event on
+one MongoDB document. With ``CAPACITY_LEDGER=redis`` the API keeps a per-event
+ledger in Redis (the arq connection) instead: Lua scripts check and adjust the
+remaining seats atomically, and the worker's ``flush_capacity_ledger`` cron
+copies the ledger's counts back to ``registered_count`` every few seconds.
+
+A ledger is seeded from MongoDB the first time an event is touched. A ledger
+with changes MongoDB has not seen never expires, however long the flush cron is
+down; once a flush has written its latest version it expires after
+``LEDGER_IDLE_TTL_SECONDS`` without registrations. While a ledger is held the
+event's ``registered_count`` may lag by up to one flush interval, and
+``reconcile_event_counters`` leaves it alone. Every flushed count carries the
+ledger's version, so a slow flush never overwrites a newer one.
+
+The ledger must be enabled on every API process or on none: a process reserving
+through MongoDB does not see seats held in Redis. Redis errors therefore fail
+the registration with a 503 instead of falling back to MongoDB, and a process
+that cannot reach Redis at startup uses ``UnavailableCapacityLedger``, which
+refuses every seat change the same way.
+"""
+
+import logging
+import os
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from typing import Any, cast
+
+from fastapi import HTTPException, Request
+from pymongo import ReturnDocument
+from pymongo.asynchronous.database import AsyncDatabase
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
+
+from backend.services.counters import (
+    REGISTERED_COUNT_FIELD,
+    ensure_event_counters_by_id,
+)
+
+CAPACITY_LEDGER_ENV = "CAPACITY_LEDGER"
+LEDGER_KEY_PREFIX = "evently:capacity"
+LEDGER_VERSION_FIELD = "capacity_ledger_version"
+LEDGER_IDLE_TTL_SECONDS = 60 * 60
+FLUSH_BATCH_SIZE = 500
+
+# KEYS: ledger hash, dirty set. ARGV: event id.
+# Returns -1 when the ledger is not seeded, 0 when the event is full, 1 when a
+# seat was reserved.
+RESERVE_SCRIPT = """
+local ledger = redis.call('HMGET', KEYS[1], 'capacity', 'registered')
+if not ledger[1] then
+  return -1
+end
+if tonumber(ledger[2]) >= tonumber(ledger[1]) then
+  return 0
+end
+redis.call('HINCRBY', KEYS[1], 'registered', 1)
+redis.call('HINCRBY', KEYS[1], 'version', 1)
+redis.call('PERSIST', KEYS[1])
+redis.call('SADD', KEYS[2], ARGV[1])
+return 1
+"""
+
+# KEYS: ledger hash, dirty set. ARGV: event id, delta.
+# Adds ``delta`` without a capacity check, never going below zero. Returns -1
+# when the ledger is not seeded, otherwise 1.
+ADJUST_SCRIPT = """
+local registered = redis.call('HGET', KEYS[1], 'registered')
+if not registered then
+  return -1
+end
+local updated = math.max(tonumber(registered) + tonumber(ARGV[2]), 0)
+redis.call('HSET', KEYS[1], 'registered', updated)
+redis.call('HINCRBY', KEYS[1], 'version', 1)
+redis.call('PERSIST', KEYS[1])
+redis.call('SADD', KEYS[2], ARGV[1])
+return 1
+"""
+
+# KEYS: ledger hash. ARGV: capacity, registered, version, idle TTL.
+# A ledger seeded concurrently by another request is kept.
+SEED_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+  redis.call('HSET', KEYS[1], 'capacity', ARGV[1], 'registered', ARGV[2],
+    'version', ARGV[3])
+  redis.call('EXPIRE', KEYS[1], ARGV[4])
+end
+return 1
+"""
+
+# KEYS: ledger hash, dirty set. ARGV: event id, flushed version, idle TTL.
+# Lets a flushed ledger expire, unless it changed again since the flush read it.
+REARM_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'version') == ARGV[2]
+    and redis.call('SISMEMBER', KEYS[2], ARGV[1]) == 0 then
+  redis.call('EXPIRE', KEYS[1], ARGV[3])
+  return 1
+end
+return 0
+"""
+
+# KEYS: ledger hash. ARGV: capacity.
+SET_CAPACITY_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+  redis.call('HSET', KEYS[1], 'capacity', ARGV[1])
+end
+return 1
+"""
+
+_logger = logging.getLogger(__name__)
+
+
+def capacity_ledger_enabled() -> bool:
+    return os.getenv(CAPACITY_LEDGER_ENV, "").strip().lower() == "redis"
+
+
+def _ledger_unavailable(exc: RedisError) -> HTTPException:
+    _logger.warning("Capacity ledger unavailable", exc_info=exc)
+    return HTTPException(
+        status_code=503,
+        detail="Registration is temporarily unavailable. Please try again.",
+    )
+
+
+class CapacityLedger:
+    """Reserve and release event seats in Redis when available, else MongoDB."""
+
+    def __init__(
+        self, *, redis: Redis | None = None, key_prefix: str = LEDGER_KEY_PREFIX
+    ) -> None:
+        self._redis = redis
+        self._key_prefix = key_prefix
+        self._scripts: dict[str, AsyncScript] = {}
+
+    @property
+    def uses_redis(self) -> bool:
+        return self._redis is not None
+
+    def _ledger_key(self, event_id: int) -> str:
+        return f"{self._key_prefix}:event:{event_id}"
+
+    @property
+    def _dirty_key(self) -> str:
+        return f"{self._key_prefix}:dirty"
+
+    async def _run(self, redis: Redis, script: str, keys: list[str], *args: Any) -> int:
+        registered = self._scripts.get(script)
+        if registered is None:
+            registered = redis.register_script(script)
+            self._scripts[script] = registered
+        return int(await registered(keys=keys, args=list(args)))
+
+    async def _seed(
+        self, db: AsyncDatabase[dict[str, Any]], redis: Redis, event_id: int
+    ) -> bool:
+        await ensure_event_counters_by_id(db, event_id)
+        raw = await db["events"].find_one(
+            {"id": event_id},
+            {
+                "_id": 0,
+                "total_capacity": 1,
+                REGISTERED_COUNT_FIELD: 1,
+                LEDGER_VERSION_FIELD: 1,
+            },
+        )
+        if raw is None:
+            return False
+        await self._run(
+            redis,
+            SEED_SCRIPT,
+            [self._ledger_key(event_id)],
+            int(raw["total_capacity"]),
+            int(raw.get(REGISTERED_COUNT_FIELD, 0)),
+            int(raw.get(LEDGER_VERSION_FIELD, 0)),
+            LEDGER_IDLE_TTL_SECONDS,
+        )
+        return True
+
+    async def _adjust(
+        self, db: AsyncDatabase[dict[str, Any]], event_id: int, delta: int
+    ) -> None:
+        if self._redis is None:
+            await ensure_event_counters_by_id(db, event_id)
+            query: dict[str, Any] = {"id": event_id}
+            if delta < 0:
+                query[REGISTERED_COUNT_FIELD] = {"$gt": 0}
+            await db["events"].update_one(
+                query, {"$inc": {REGISTERED_COUNT_FIELD: delta}}
+            )
+            return
+
+        keys = [self._ledger_key(event_id), self._dirty_key]
+        try:
+            adjusted = await self._run(
+                self._redis, ADJUST_SCRIPT, keys, event_id, delta
+            )
+            if adjusted < 0 and await self._seed(db, self._redis, event_id):
+                await self._run(self._redis, ADJUST_SCRIPT, keys, event_id, delta)
+        except RedisError as exc:
+            raise _ledger_unavailable(exc) from exc
+
+    async def reserve(self, db: AsyncDatabase[dict[str, Any]], event_id: int) -> bool:
+        """Take one seat; return ``False`` when the event is full or missing."""
+        if self._redis is None:
+            await ensure_event_counters_by_id(db, event_id)
+            reserved = await db["events"].find_one_and_update(
+                {
+                    "id": event_id,
+                    "$expr": {"$lt": [f"${REGISTERED_COUNT_FIELD}", "$total_capacity"]},
+                },
+                {"$inc": {REGISTERED_COUNT_FIELD: 1}},
+                return_document=ReturnDocument.AFTER,
+            )
+            return reserved is not None
+
+        keys = [self._ledger_key(event_id), self._dirty_key]
+        try:
+            result = await self._run(self._redis, RESERVE_SCRIPT, keys, event_id)
+            if result < 0:
+                if not await self._seed(db, self._redis, event_id):
+                    return False
+                result = await self._run(self._redis, RESERVE_SCRIPT, keys, event_id)
+        except RedisError as exc:
+            raise _ledger_unavailable(exc) from exc
+        return result == 1
+
+    async def release(self, db: AsyncDatabase[dict[str, Any]], event_id: int) -> None:
+        """Give back a seat taken by ``reserve``."""
+        await self._adjust(db, event_id, -1)
+
+    async def restore(self, db: AsyncDatabase[dict[str, Any]], event_id: int) -> None:
+        """Undo a ``release`` whose transition was rolled back.
+
+        The seat was held a moment ago, so capacity is not re-checked.
+        """
+        await self._adjust(db, event_id, 1)
+
+    async def set_capacity(self, event_id: int, capacity: int) -> None:
+        """Apply a ``total_capacity`` edit to a ledger that is already seeded."""
+        if self._redis is None:
+            return
+        try:
+            await self._run(
+                self._redis, SET_CAPACITY_SCRIPT, [self._ledger_key(event_id)], capacity
+            )
+        except RedisError as exc:
+            raise _ledger_unavailable(exc) from exc
+
+    async def held_event_ids(self, event_ids: Sequence[int]) -> set[int]:
+        """Return the events whose ``registered_count`` the ledger currently owns."""
+        if self._redis is None or not event_ids:
+            return set()
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for event_id in event_ids:
+                pipe.exists(self._ledger_key(event_id))
+            exists = await pipe.execute()
+        return {
+            event_id for event_id, held in zip(event_ids, exists, strict=True) if held
+        }
+
+    async def _flush_event(
+        self, db: AsyncDatabase[dict[str, Any]], event_id: int
+    ) -> bool:
+        assert self._redis is not None
+        registered, version = cast(
+            list[bytes | None],
+            await self._redis.hmget(  # type: ignore[misc]
+                self._ledger_key(event_id), ["registered", "version"]
+            ),
+        )
+        if registered is None or version is None:
+            return False
+        result = await db["events"].update_one(
+            {
+                "id": event_id,
+                "$or": [
+                    {LEDGER_VERSION_FIELD: {"$exists": False}},
+                    {LEDGER_VERSION_FIELD: {"$lt": int(version)}},
+                ],
+            },
+            {
+                "$set": {
+                    REGISTERED_COUNT_FIELD: int(registered),
+                    LEDGER_VERSION_FIELD: int(version),
+                }
+            },
+        )
+        # MongoDB now holds this version or a newer one.
+        await self._run(
+            self._redis,
+            REARM_SCRIPT,
+            [self._ledger_key(event_id), self._dirty_key],
+            event_id,
+            int(version),
+            LEDGER_IDLE_TTL_SECONDS,
+        )
+        return result.modified_count == 1
+
+    async def flush(
+        self,
+        db: AsyncDatabase[dict[str, Any]],
+        *,
+        batch_size: int = FLUSH_BATCH_SIZE,
+        on_written: Callable[[list[int]], Awaitable[None]] | None = None,
+    ) -> int:
+        """Copy changed ledger counts to MongoDB; return the events written.
+
+        ``on_written`` gets the ids written in each batch, e.g. to drop cached
+        responses built from the old ``registered_count``.
+        """
+        if self._redis is None:
+            return 0
+        written = 0
+        while True:
+            popped = cast(
+                Iterable[bytes | str],
+                await self._redis.spop(self._dirty_key, batch_size),  # type: ignore[misc]
+            )
+            event_ids = [int(member) for member in popped or []]
+            if not event_ids:
+                return written
+            written_ids: list[int] = []
+            try:
+                for index, event_id in enumerate(event_ids):
+                    try:
+                        if await self._flush_event(db, event_id):
+                            written_ids.append(event_id)
+                    except Exception:
+                        # Leave the rest for the next flush rather than losing them.
+                        await self._redis.sadd(self._dirty_key, *event_ids[index:])  # type: ignore[misc]
+                        raise
+            finally:
+                written += len(written_ids)
+                if on_written is not None and written_ids:
+                    await on_written(written_ids)
+            if len(event_ids) < batch_size:
+                return written
+
+
+class UnavailableCapacityLedger(CapacityLedger):
+    """Stands in for the Redis ledger when Redis was unreachable at startup."""
+
+    def __init__(self) -> None:
+        super().__init__()
+
+    @staticmethod
+    def _refuse() -> HTTPException:
+        return _ledger_unavailable(RedisError("Capacity ledger was not connected"))
+
+    async def reserve(self, db: AsyncDatabase[dict[str, Any]], event_id: int) -> bool:
+        raise self._refuse()
+
+    async def _adjust(
+        self, db: AsyncDatabase[dict[str, Any]], event_id: int, delta: int
+    ) -> None:
+        raise self._refuse()
+
+    async def set_capacity(self, event_id: int, capacity: int) -> None:
+        raise self._refuse()
+
+
+def get_capacity_ledger(request: Request) -> CapacityLedger:
+    """FastAPI dependency that returns the shared capacity ledger."""
+    ledger: CapacityLedger | None = getattr(request.app.state, "capacity_ledger", None)
+    if ledger is None:
+        ledger = CapacityLedger()
+        request.app.state.capacity_ledger = ledger
+    return ledger
@@ -0,0 +1,218 @@
+"""Batch check-in for event door staff.
+
+A scanner at a busy door checks in hundreds of attendees a minute, and a
+device that lost its connection uploads its queued scans in one go when it
+comes back. ``check_in_batch`` resolves a batch of user ids or scanned ticket
+ids with two reads, flips every ``going`` row to ``checked_in`` with a single
+unordered ``bulk_write``, and reports an outcome per scan.
+
+Each update is conditional on the row still being ``going``, the same guard
+the single check-in route writes under its event user lock, so a batch needs
+no locks: a registration cancelled concurrently either fails its own
+conditional update or makes the check-in report ``not_registered``.
+
+Re-uploading a batch is idempotent. Rows that are already checked in keep their
+original ``checked_in_at`` and report ``already_checked_in``, as does every
+repeat of a scan within one batch.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any, Literal
+
+from pymongo import UpdateOne
+from pymongo.asynchronous.database import AsyncDatabase
+
+from backend.models.attendance import AttendanceStatus
+from backend.services.attendance import record_attendance_transition
+from backend.services.counters import (
+    USER_ATTENDED_COUNT_FIELD,
+    increment_user_counters,
+)
+
+MAX_CHECK_IN_BATCH_SIZE = 500
+
+type CheckInResult = Literal[
+    "checked_in", "already_checked_in", "not_registered", "unknown_ticket"
+]
+
+
+@dataclass(frozen=True, slots=True)
+class CheckInScan:
+    """One scan: a user id or a ticket id, and when the device recorded it."""
+
+    user_id: int | None = None
+    ticket_id: int | None = None
+    scanned_at: datetime | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class CheckInOutcome:
+    scan: CheckInScan
+    user_id: int | None
+    result: CheckInResult
+    checked_in_at: datetime | None = None
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Normalize to aware UTC at BSON's millisecond precision."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    value = value.astimezone(UTC)
+    return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
+
+def _check_in_time(
+    scan: CheckInScan, now: datetime, *, use_scan_time: bool
+) -> datetime:
+    """Use the device's scan time for offline syncs, never later than now."""
+    if not use_scan_time or scan.scanned_at is None:
+        return now
+    return min(_as_utc(scan.scanned_at), now)
+
+
+def _stored_time(record: dict[str, Any]) -> datetime | None:
+    value = record.get("checked_in_at")
+    return _as_utc(value) if isinstance(value, datetime) else None
+
+
+async def _ticket_holders(
+    db: AsyncDatabase[dict[str, Any]], event_id: int, scans: Sequence[CheckInScan]
+) -> dict[int, int]:
+    ticket_ids = {scan.ticket_id for scan in scans if scan.ticket_id is not None}
+    if not ticket_ids:
+        return {}
+    return {
+        raw["id"]: raw["attendee_id"]
+        async for raw in db["tickets"].find(
+            {"event_id": event_id, "id": {"$in": list(ticket_ids)}},
+            {"id": 1, "attendee_id": 1},
+        )
+    }
+
+
+async def _attendance_by_user(
+    db: AsyncDatabase[dict[str, Any]], event_id: int, user_ids: set[int]
+) -> dict[int, dict[str, Any]]:
+    if not user_ids:
+        return {}
+    return {
+        record["user_id"]: record
+        async for record in db["attendance"].find(
+            {"event_id": event_id, "user_id": {"$in": list(user_ids)}},
+            {"event_id": 1, "user_id": 1, "status": 1, "checked_in_at": 1},
+        )
+    }
+
+
+async def check_in_batch(
+    db: AsyncDatabase[dict[str, Any]],
+    event_id: int,
+    scans: Sequence[CheckInScan],
+    *,
+    use_scan_time: bool = False,
+) -> list[CheckInOutcome]:
+    """Check in every registered user named by ``scans``, in one bulk write.
+
+    With ``use_scan_time`` (offline sync), ``checked_in_at`` records when the
+    device scanned the attendee rather than when the upload arrived.
+    """
+    holders = await _ticket_holders(db, event_id, scans)
+    scan_users = [
+        scan.user_id if scan.ticket_id is None else holders.get(scan.ticket_id)
+        for scan in scans
+    ]
+    records = await _attendance_by_user(
+        db, event_id, {user_id for user_id in scan_users if user_id is not None}
+    )
+
+    now = _as_utc(datetime.now(tz=UTC))
+    planned: dict[int, datetime] = {}
+    operations: list[UpdateOne] = []
+    for scan, user_id in zip(scans, scan_users, strict=True):
+        record = records.get(user_id) if user_id is not None else None
+        if (
+            user_id is None
+            or record is None
+            or record["status"] != AttendanceStatus.Going.value
+            or user_id in planned
+        ):
+            continue
+        checked_in_at = _check_in_time(scan, now, use_scan_time=use_scan_time)
+        planned[user_id] = checked_in_at
+        operations.append(
+            UpdateOne(
+                {"_id": record["_id"], "status": AttendanceStatus.Going.value},
+                {
+                    "$set": {
+                        "status": AttendanceStatus.CheckedIn.value,
+                        "checked_in_at": checked_in_at,
+                    }
+                },
+            )
+        )
+
+    if operations:
+        result = await db["attendance"].bulk_write(operations, ordered=False)
+        if result.modified_count != len(operations):
+            # Some rows changed since they were read; report what they are now.
+            records.update(await _attendance_by_user(db, event_id, set(planned)))
+            planned = {
+                user_id: checked_in_at
+                for user_id, checked_in_at in planned.items()
+                if records[user_id]["status"] == AttendanceStatus.CheckedIn.value
+                and _stored_time(records[user_id]) == checked_in_at
+            }
+        await record_attendance_transition(
+            db,
+            *(
+                {
+                    **records[user_id],
+                    "status": AttendanceStatus.CheckedIn.value,
+                    "checked_in_at": checked_in_at,
+                }
+                for user_id, checked_in_at in planned.items()
+            ),
+        )
+        await increment_user_counters(
+            db, USER_ATTENDED_COUNT_FIELD, dict.fromkeys(planned, 1)
+        )
+
+    outcomes: list[CheckInOutcome] = []
+    reported: set[int] = set()
+    for scan, user_id in zip(scans, scan_users, strict=True):
+        outcomes.append(_outcome(scan, user_id, records, planned, reported))
+        if user_id is not None:
+            reported.add(user_id)
+    return outcomes
+
+
+def _outcome(
+    scan: CheckInScan,
+    user_id: int | None,
+    records: dict[int, dict[str, Any]],
+    planned: dict[int, datetime],
+    reported: set[int],
+) -> CheckInOutcome:
+    if user_id is None:
+        result: CheckInResult = (
+            "unknown_ticket" if scan.ticket_id is not None else "not_registered"
+        )
+        return CheckInOutcome(scan=scan, user_id=None, result=result)
+    if user_id in planned:
+        return CheckInOutcome(
+            scan=scan,
+            user_id=user_id,
+            result="already_checked_in" if user_id in reported else "checked_in",
+            checked_in_at=planned[user_id],
+        )
+    record = records.get(user_id)
+    if record is not None and record["status"] == AttendanceStatus.CheckedIn.value:
+        return CheckInOutcome(
+            scan=scan,
+            user_id=user_id,
+            result="already_checked_in",
+            checked_in_at=_stored_time(record),
+        )
+    return CheckInOutcome(scan=scan, user_id=user_id, result="not_registered")
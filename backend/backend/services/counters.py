@@ -0,0 +1,309 @@
+"""Denormalized per-event and per-user counters.
+
+Event documents carry ``registered_count`` (active registrations, the
+authoritative attending count that also gates capacity) and
+``favorites_count``. Routes ``$inc`` them on every attendance and favorite
+transition so read paths never aggregate. Documents written before a counter
+existed are backfilled the first time they are read or mutated, and
+``reconcile_event_counters`` repairs any drift left by crashed requests.
+
+User documents likewise carry ``events_created_count`` and
+``events_attended_count`` (checked-in attendance) for profile views. These are
+only ``$inc``-ed once present: a user without them is backfilled from the
+source collections on the next profile read, which already sees the change.
+``reconcile_user_counters`` repairs drift.
+"""
+
+import logging
+from collections.abc import Awaitable, Callable, Iterable, Mapping, Sequence
+from typing import Any
+
+from pymongo import UpdateOne
+from pymongo.asynchronous.database import AsyncDatabase
+
+from backend.models.attendance import REGISTERED_ATTENDANCE_STATUSES, AttendanceStatus
+from backend.services.locks import mongo_locked_event_ids
+
+REGISTERED_COUNT_FIELD = "registered_count"
+FAVORITES_COUNT_FIELD = "favorites_count"
+EVENT_COUNTER_FIELDS = (REGISTERED_COUNT_FIELD, FAVORITES_COUNT_FIELD)
+USER_CREATED_COUNT_FIELD = "events_created_count"
+USER_ATTENDED_COUNT_FIELD = "events_attended_count"
+USER_COUNTER_FIELDS = (USER_CREATED_COUNT_FIELD, USER_ATTENDED_COUNT_FIELD)
+RECONCILE_BATCH_SIZE = 500
+
+_logger = logging.getLogger(__name__)
+
+
+async def active_attendance_counts(
+    db: AsyncDatabase[dict[str, Any]], event_ids: Iterable[int]
+) -> dict[int, int]:
+    """Count the attendance documents holding a seat at each event."""
+    ids = list(event_ids)
+    if not ids:
+        return {}
+    pipeline: list[dict[str, Any]] = [
+        {
+            "$match": {
+                "event_id": {"$in": ids},
+                "status": {"$in": list(REGISTERED_ATTENDANCE_STATUSES)},
+            }
+        },
+        {"$group": {"_id": "$event_id", "count": {"$sum": 1}}},
+    ]
+    counts: dict[int, int] = {}
+    async for doc in await db["attendance"].aggregate(pipeline):
+        counts[doc["_id"]] = doc["count"]
+    return counts
+
+
+async def favorite_counts(
+    db: AsyncDatabase[dict[str, Any]], event_ids: Iterable[int]
+) -> dict[int, int]:
+    ids = list(event_ids)
+    if not ids:
+        return {}
+    pipeline: list[dict[str, Any]] = [
+        {"$match": {"event_id": {"$in": ids}}},
+        {"$group": {"_id": "$event_id", "count": {"$sum": 1}}},
+    ]
+    counts: dict[int, int] = {}
+    async for doc in await db["event_favorites"].aggregate(pipeline):
+        counts[doc["_id"]] = doc["count"]
+    return counts
+
+
+async def _actual_counters(
+    db: AsyncDatabase[dict[str, Any]], event_ids: Sequence[int]
+) -> dict[str, dict[int, int]]:
+    return {
+        REGISTERED_COUNT_FIELD: await active_attendance_counts(db, event_ids),
+        FAVORITES_COUNT_FIELD: await favorite_counts(db, event_ids),
+    }
+
+
+async def ensure_event_counters(
+    db: AsyncDatabase[dict[str, Any]], raw_events: Sequence[dict[str, Any]]
+) -> None:
+    """Backfill missing counters, updating both MongoDB and ``raw_events``.
+
+    Each ``$set`` only applies while the field is still missing, so a
+    concurrent backfill or ``$inc`` is never overwritten.
+    """
+    missing_ids = [
+        raw["id"]
+        for raw in raw_events
+        if any(field not in raw for field in EVENT_COUNTER_FIELDS)
+    ]
+    if not missing_ids:
+        return
+
+    actual = await _actual_counters(db, missing_ids)
+    for raw in raw_events:
+        if raw["id"] not in missing_ids:
+            continue
+        for field in EVENT_COUNTER_FIELDS:
+            if field in raw:
+                continue
+            value = actual[field].get(raw["id"], 0)
+            await db["events"].update_one(
+                {"id": raw["id"], field: {"$exists": False}},
+                {"$set": {field: value}},
+            )
+            raw[field] = value
+
+
+async def ensure_event_counters_by_id(
+    db: AsyncDatabase[dict[str, Any]], event_id: int
+) -> None:
+    """Backfill counters on one event before it is ``$inc``-ed."""
+    raw = await db["events"].find_one(
+        {"id": event_id}, {"_id": 0, "id": 1, **dict.fromkeys(EVENT_COUNTER_FIELDS, 1)}
+    )
+    if raw is not None:
+        await ensure_event_counters(db, [raw])
+
+
+async def reconcile_event_counters(
+    db: AsyncDatabase[dict[str, Any]],
+    *,
+    event_ids: Sequence[int] | None = None,
+    batch_size: int = RECONCILE_BATCH_SIZE,
+    held_elsewhere: Callable[[Sequence[int]], Awaitable[set[int]]] | None = None,
+) -> int:
+    """Recompute counters from source collections and repair drift.
+
+    Repairs are compare-and-set on the values that were read, so a request that
+    ``$inc``-s a counter mid-reconcile wins and the next run re-checks it.
+    Events with an attendance transition in flight (slot reserved, row not yet
+    written) are skipped for the same reason, as are events ``held_elsewhere``
+    reports, whose ``registered_count`` is owned by the capacity ledger. Returns
+    the number of events repaired.
+    """
+    query: dict[str, Any] = (
+        {} if event_ids is None else {"id": {"$in": list(event_ids)}}
+    )
+    projection = {"_id": 0, "id": 1, **dict.fromkeys(EVENT_COUNTER_FIELDS, 1)}
+    repaired = 0
+    batch: list[dict[str, Any]] = []
+
+    async def flush(raw_events: list[dict[str, Any]]) -> int:
+        event_ids = [raw["id"] for raw in raw_events]
+        actual = await _actual_counters(db, event_ids)
+        # Locks left in MongoDB are honoured whichever lock backend is active.
+        in_flight = await mongo_locked_event_ids(db, event_ids)
+        if held_elsewhere is not None:
+            in_flight |= await held_elsewhere(event_ids)
+        updates: list[UpdateOne] = []
+        for raw in raw_events:
+            if raw["id"] in in_flight:
+                continue
+            expected = {
+                field: actual[field].get(raw["id"], 0) for field in EVENT_COUNTER_FIELDS
+            }
+            current = {field: raw.get(field) for field in EVENT_COUNTER_FIELDS}
+            if current == expected:
+                continue
+            guard = {
+                field: value if value is not None else {"$exists": False}
+                for field, value in current.items()
+            }
+            updates.append(UpdateOne({"id": raw["id"], **guard}, {"$set": expected}))
+        if not updates:
+            return 0
+        result = await db["events"].bulk_write(updates, ordered=False)
+        return result.modified_count
+
+    async for raw in db["events"].find(query, projection).sort("id", 1):
+        batch.append(raw)
+        if len(batch) >= batch_size:
+            repaired += await flush(batch)
+            batch = []
+    if batch:
+        repaired += await flush(batch)
+
+    if repaired:
+        _logger.warning("Repaired counter drift on %d events", repaired)
+    return repaired
+
+
+async def _grouped_counts(
+    db: AsyncDatabase[dict[str, Any]],
+    collection: str,
+    match: dict[str, Any],
+    key: str,
+) -> dict[int, int]:
+    pipeline: list[dict[str, Any]] = [
+        {"$match": match},
+        {"$group": {"_id": f"${key}", "count": {"$sum": 1}}},
+    ]
+    counts: dict[int, int] = {}
+    async for doc in await db[collection].aggregate(pipeline):
+        counts[doc["_id"]] = doc["count"]
+    return counts
+
+
+async def _actual_user_counters(
+    db: AsyncDatabase[dict[str, Any]], user_ids: Sequence[int]
+) -> dict[str, dict[int, int]]:
+    ids = list(user_ids)
+    return {
+        USER_CREATED_COUNT_FIELD: await _grouped_counts(
+            db, "events", {"organizer_user_id": {"$in": ids}}, "organizer_user_id"
+        ),
+        USER_ATTENDED_COUNT_FIELD: await _grouped_counts(
+            db,
+            "attendance",
+            {"user_id": {"$in": ids}, "status": AttendanceStatus.CheckedIn.value},
+            "user_id",
+        ),
+    }
+
+
+async def ensure_user_counters(
+    db: AsyncDatabase[dict[str, Any]], raw_users: Sequence[dict[str, Any]]
+) -> None:
+    """Backfill missing user counters, updating both MongoDB and ``raw_users``.
+
+    As with events, each ``$set`` only applies while the field is missing.
+    """
+    missing_ids = [
+        raw["id"]
+        for raw in raw_users
+        if any(field not in raw for field in USER_COUNTER_FIELDS)
+    ]
+    if not missing_ids:
+        return
+
+    actual = await _actual_user_counters(db, missing_ids)
+    for raw in raw_users:
+        if raw["id"] not in missing_ids:
+            continue
+        for field in USER_COUNTER_FIELDS:
+            if field in raw:
+                continue
+            value = actual[field].get(raw["id"], 0)
+            await db["users"].update_one(
+                {"id": raw["id"], field: {"$exists": False}},
+                {"$set": {field: value}},
+            )
+            raw[field] = value
+
+
+async def increment_user_counters(
+    db: AsyncDatabase[dict[str, Any]], field: str, deltas: Mapping[int, int]
+) -> None:
+    """``$inc`` one counter for several users, skipping any not yet backfilled."""
+    updates = [
+        UpdateOne({"id": user_id, field: {"$exists": True}}, {"$inc": {field: delta}})
+        for user_id, delta in deltas.items()
+        if delta
+    ]
+    if updates:
+        await db["users"].bulk_write(updates, ordered=False)
+
+
+async def reconcile_user_counters(
+    db: AsyncDatabase[dict[str, Any]], *, batch_size: int = RECONCILE_BATCH_SIZE
+) -> int:
+    """Recompute user counters from events and attendance and repair drift.
+
+    Repairs are compare-and-set on the values that were read, so a concurrent
+    ``$inc`` wins and the next run re-checks that user. Returns the number of
+    users repaired.
+    """
+    projection = {"_id": 0, "id": 1, **dict.fromkeys(USER_COUNTER_FIELDS, 1)}
+    repaired = 0
+    batch: list[dict[str, Any]] = []
+
+    async def flush(raw_users: list[dict[str, Any]]) -> int:
+        actual = await _actual_user_counters(db, [raw["id"] for raw in raw_users])
+        updates: list[UpdateOne] = []
+        for raw in raw_users:
+            expected = {
+                field: actual[field].get(raw["id"], 0) for field in USER_COUNTER_FIELDS
+            }
+            current = {field: raw.get(field) for field in USER_COUNTER_FIELDS}
+            if current == expected:
+                continue
+            guard = {
+                field: value if value is not None else {"$exists": False}
+                for field, value in current.items()
+            }
+            updates.append(UpdateOne({"id": raw["id"], **guard}, {"$set": expected}))
+        if not updates:
+            return 0
+        result = await db["users"].bulk_write(updates, ordered=False)
+        return result.modified_count
+
+    async for raw in db["users"].find({}, projection).sort("id", 1):
+        batch.append(raw)
+        if len(batch) >= batch_size:
+            repaired += await flush(batch)
+            batch = []
+    if batch:
+        repaired += await flush(batch)
+
+    if repaired:
+        _logger.warning("Repaired counter drift on %d users", repaired)
+    return repaired
@@ -0,0 +1,177 @@
+"""Search keys for the event listing.
+
+Events carry two multikey arrays that act as an inverted index inside MongoDB:
+``search_terms`` (title prefixes plus every title/about word and its stem) and
+``search_title_terms`` (title prefixes only, used for ranking). A query is
+tokenized and stemmed the same way and every query term must be present in
+``search_terms``, which MongoDB answers with an index seek instead of scanning
+``title``/``about`` with an unanchored ``$regex``.
+"""
+
+import logging
+import re
+import unicodedata
+from collections.abc import Iterable
+from typing import Any
+
+from pymongo import UpdateOne
+from pymongo.asynchronous.database import AsyncDatabase
+
+SEARCH_TERMS_FIELD = "search_terms"
+SEARCH_TITLE_TERMS_FIELD = "search_title_terms"
+SEARCH_SCORE_FIELD = "search_score"
+SEARCH_FIELDS_PROJECTION = {SEARCH_TERMS_FIELD: 0, SEARCH_TITLE_TERMS_FIELD: 0}
+MAX_TERM_LENGTH = 20
+TITLE_MATCH_WEIGHT = 3
+BACKFILL_BATCH_SIZE = 500
+
+# Trailing "+"/"#" keep names like "C++" and "C#" distinct from "C".
+_WORD_PATTERN = re.compile(r"[0-9a-z]+[+#]*")
+_UNDOUBLED_ENDINGS = ("ll", "ss", "zz")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase ASCII words, folding accents."""
+    folded = unicodedata.normalize("NFKD", text.casefold())
+    ascii_text = folded.encode("ascii", "ignore").decode("ascii")
+    return _WORD_PATTERN.findall(ascii_text)
+
+
+def _strip_verb_suffix(token: str, suffix: str) -> str | None:
+    if not token.endswith(suffix):
+        return None
+    root = token[: -len(suffix)]
+    if len(root) < 3:
+        return None
+    if root[-1] == root[-2] and root[-2:] not in _UNDOUBLED_ENDINGS:
+        root = root[:-1]
+    return root
+
+
+def stem(token: str) -> str:
+    """Light English suffix stripping (plurals, -ing, -ed)."""
+    if len(token) <= 3 or not token.isalpha():
+        return token
+    if token.endswith("ies") and len(token) > 4:
+        return f"{token[:-3]}y"
+    if token.endswith("sses"):
+        return token[:-2]
+    for suffix in ("ing", "ed"):
+        if (root := _strip_verb_suffix(token, suffix)) is not None:
+            return root
+    if token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def _word_terms(tokens: Iterable[str]) -> set[str]:
+    terms: set[str] = set()
+    for token in tokens:
+        terms.add(token[:MAX_TERM_LENGTH])
+        terms.add(stem(token)[:MAX_TERM_LENGTH])
+    return terms
+
+
+def _prefix_terms(tokens: Iterable[str]) -> set[str]:
+    terms: set[str] = set()
+    for word in _word_terms(tokens):
+        terms.update(word[:length] for length in range(1, len(word) + 1))
+    return terms
+
+
+def event_search_fields(title: str, about: str) -> dict[str, list[str]]:
+    """Return the search key fields to store on an event document."""
+    title_tokens = tokenize(title)
+    title_terms = _prefix_terms(title_tokens)
+    return {
+        SEARCH_TERMS_FIELD: sorted(title_terms | _word_terms(tokenize(about))),
+        SEARCH_TITLE_TERMS_FIELD: sorted(title_terms),
+    }
+
+
+def query_terms(q: str) -> list[str]:
+    """Normalize a free-text query into the terms stored by ``event_search_fields``."""
+    terms: list[str] = []
+    for token in tokenize(q):
+        term = stem(token)[:MAX_TERM_LENGTH]
+        if term not in terms:
+            terms.append(term)
+    return terms
+
+
+def search_filter(q: str) -> dict[str, Any]:
+    """Return the listing condition matching every word of ``q``.
+
+    Events written before search keys existed fall back to the old escaped
+    ``$regex`` until ``backfill_event_search_fields`` reaches them, as do
+    queries made only of punctuation.
+    """
+    escaped_q = re.escape(q)
+    regex_match: dict[str, Any] = {
+        "$or": [
+            {"title": {"$regex": escaped_q, "$options": "i"}},
+            {"about": {"$regex": escaped_q, "$options": "i"}},
+        ]
+    }
+    terms = query_terms(q)
+    if not terms:
+        return regex_match
+    return {
+        "$or": [
+            {SEARCH_TERMS_FIELD: {"$all": terms}},
+            {SEARCH_TERMS_FIELD: {"$exists": False}, **regex_match},
+        ]
+    }
+
+
+def relevance_score_expression(q: str) -> dict[str, Any]:
+    """Aggregation expression ranking title hits above about-only hits."""
+    title_terms = {"$ifNull": [f"${SEARCH_TITLE_TERMS_FIELD}", []]}
+    return {
+        "$add": [
+            0,
+            *(
+                {
+                    "$cond": [
+                        {"$in": [term, title_terms]},
+                        TITLE_MATCH_WEIGHT,
+                        1,
+                    ]
+                }
+                for term in query_terms(q)
+            ),
+        ]
+    }
+
+
+async def backfill_event_search_fields(db: AsyncDatabase[dict[str, Any]]) -> int:
+    """Populate search keys on events written before they existed."""
+    updated = 0
+    batch: list[UpdateOne] = []
+    cursor = db["events"].find(
+        {SEARCH_TERMS_FIELD: {"$exists": False}},
+        {"_id": 1, "title": 1, "about": 1},
+    )
+    async for raw in cursor:
+        batch.append(
+            UpdateOne(
+                {"_id": raw["_id"]},
+                {
+                    "$set": event_search_fields(
+                        str(raw.get("title") or ""), str(raw.get("about") or "")
+                    )
+                },
+            )
+        )
+        if len(batch) >= BACKFILL_BATCH_SIZE:
+            await db["events"].bulk_write(batch, ordered=False)
+            updated += len(batch)
+            batch = []
+
+    if batch:
+        await db["events"].bulk_write(batch, ordered=False)
+        updated += len(batch)
+
+    if updated:
+        logging.getLogger(__name__).info("Backfilled search keys on %d events", updated)
+    return updated
@@ -0,0 +1,101 @@
+"""Cached, capped totals for the event listing.
+
+``GET /events/`` reports how many events match its filters. Counting is the
+expensive half of a broad listing, so totals are cached per normalized filter
+for a short TTL and counting stops at ``TOTAL_COUNT_CAP`` (the response then
+flags the total as an estimate, rendered as "1000+"). Any write that can move
+an event in or out of a listing clears the whole cache, since a single event
+can match arbitrarily many cached filters.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import Request
+
+TOTAL_COUNT_CAP = 1000
+TOTALS_TTL_SECONDS = 30.0
+TOTALS_MAX_ENTRIES = 1024
+
+
+@dataclass(frozen=True, slots=True)
+class EventTotal:
+    count: int
+    is_estimate: bool
+
+
+def totals_cache_key(filters: Mapping[str, Any]) -> str:
+    """Stable key for a Mongo filter regardless of dict ordering."""
+    return json.dumps(filters, sort_keys=True, default=str, separators=(",", ":"))
+
+
+class EventTotalsCache:
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = TOTALS_TTL_SECONDS,
+        max_entries: int = TOTALS_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, EventTotal]] = OrderedDict()
+        self._generation = 0
+
+    def get(self, key: str) -> EventTotal | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, total = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return total
+
+    def set(self, key: str, total: EventTotal) -> None:
+        self._entries[key] = (self._clock() + self._ttl_seconds, total)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+
+    async def get_or_count(
+        self,
+        filters: Mapping[str, Any],
+        count: Callable[[int], Awaitable[int]],
+    ) -> EventTotal:
+        """Return the cached total for ``filters`` or count up to the cap.
+
+        ``count`` receives the ``limit`` to pass to ``count_documents``.
+        """
+        key = totals_cache_key(filters)
+        if (cached := self.get(key)) is not None:
+            return cached
+        generation = self._generation
+        counted = await count(TOTAL_COUNT_CAP + 1)
+        total = EventTotal(
+            count=min(counted, TOTAL_COUNT_CAP),
+            is_estimate=counted > TOTAL_COUNT_CAP,
+        )
+        # A write that landed while counting may already be missing from it.
+        if generation == self._generation:
+            self.set(key, total)
+        return total
+
+
+def get_event_totals(request: Request) -> EventTotalsCache:
+    """FastAPI dependency that returns the app's shared listing totals cache."""
+    totals: EventTotalsCache | None = getattr(request.app.state, "event_totals", None)
+    if totals is None:
+        totals = EventTotalsCache()
+        request.app.state.event_totals = totals
+    return totals
@@ -0,0 +1,181 @@
+"""Pooled, app-lifetime HTTP clients for third-party upstreams.
+
+Each upstream (Google Calendar, Google's OAuth token endpoint, Nominatim) gets
+one ``httpx.AsyncClient`` with its own connection limits and timeouts, so
+keep-alive connections are reused across requests instead of paying TCP+TLS
+setup per call. The API creates the registry in its lifespan and the arq
+worker in ``on_startup``; tests pass an ``httpx.MockTransport``.
+
+Transient failures are retried with exponential backoff by ``RetryTransport``:
+connection failures for any method (the request never reached the upstream),
+and timeouts or 429/5xx gateway responses for idempotent methods only, so a
+calendar event is never created twice.
+"""
+
+import asyncio
+import importlib.util
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, fields
+
+import httpx
+from fastapi import Request
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+MAX_RETRY_AFTER_SECONDS = 5.0
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class UpstreamPolicy:
+    timeout_seconds: float
+    max_connections: int
+    max_keepalive_connections: int
+    retries: int = 2
+    backoff_seconds: float = 0.25
+    http2: bool = True
+
+
+UPSTREAM_POLICIES: dict[str, UpstreamPolicy] = {
+    "google_calendar": UpstreamPolicy(
+        timeout_seconds=10.0, max_connections=20, max_keepalive_connections=10
+    ),
+    "google_oauth": UpstreamPolicy(
+        timeout_seconds=10.0, max_connections=5, max_keepalive_connections=2
+    ),
+    # Nominatim's usage policy allows roughly one request per second.
+    "nominatim": UpstreamPolicy(
+        timeout_seconds=8.0,
+        max_connections=2,
+        max_keepalive_connections=1,
+        retries=1,
+        backoff_seconds=1.0,
+        http2=False,
+    ),
+}
+
+
+def http2_available() -> bool:
+    """HTTP/2 needs the optional ``h2`` package (``httpx[http2]``)."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class RetryTransport(httpx.AsyncBaseTransport):
+    """Retry transient upstream failures around another transport."""
+
+    def __init__(
+        self,
+        wrapped: httpx.AsyncBaseTransport,
+        *,
+        retries: int,
+        backoff_seconds: float,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self._wrapped = wrapped
+        self._retries = retries
+        self._backoff_seconds = backoff_seconds
+        self._sleep = sleep
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        idempotent = request.method in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            try:
+                response = await self._wrapped.handle_async_request(request)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                if attempt >= self._retries:
+                    raise
+                delay = self._backoff(attempt)
+            except httpx.TimeoutException:
+                if not idempotent or attempt >= self._retries:
+                    raise
+                delay = self._backoff(attempt)
+            else:
+                if (
+                    not idempotent
+                    or attempt >= self._retries
+                    or response.status_code not in RETRY_STATUS_CODES
+                ):
+                    return response
+                delay = max(self._backoff(attempt), _retry_after(response))
+                await response.aclose()
+            attempt += 1
+            _logger.info(
+                "Retrying %s %s (attempt %d) in %.2fs",
+                request.method,
+                request.url.host,
+                attempt + 1,
+                delay,
+            )
+            await self._sleep(delay)
+
+    def _backoff(self, attempt: int) -> float:
+        return float(self._backoff_seconds * 2**attempt)
+
+    async def aclose(self) -> None:
+        await self._wrapped.aclose()
+
+
+def _retry_after(response: httpx.Response) -> float:
+    try:
+        seconds = float(response.headers.get("Retry-After", "0"))
+    except ValueError:
+        return 0.0
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER_SECONDS)
+
+
+def create_upstream_client(
+    policy: UpstreamPolicy,
+    *,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=policy.max_connections,
+        max_keepalive_connections=policy.max_keepalive_connections,
+    )
+    inner = transport or httpx.AsyncHTTPTransport(
+        http2=policy.http2 and http2_available(), limits=limits
+    )
+    return httpx.AsyncClient(
+        transport=RetryTransport(
+            inner, retries=policy.retries, backoff_seconds=policy.backoff_seconds
+        ),
+        timeout=policy.timeout_seconds,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class HttpClients:
+    google_calendar: httpx.AsyncClient
+    google_oauth: httpx.AsyncClient
+    nominatim: httpx.AsyncClient
+
+    async def aclose(self) -> None:
+        await asyncio.gather(
+            *(getattr(self, field.name).aclose() for field in fields(self))
+        )
+
+
+def create_http_clients(
+    *,
+    transport: httpx.AsyncBaseTransport | None = None,
+    policies: dict[str, UpstreamPolicy] = UPSTREAM_POLICIES,
+) -> HttpClients:
+    """Build one pooled client per upstream; ``transport`` overrides the network."""
+    return HttpClients(
+        **{
+            name: create_upstream_client(policy, transport=transport)
+            for name, policy in policies.items()
+        }
+    )
+
+
+def get_http_clients(request: Request) -> HttpClients:
+    """FastAPI dependency that returns the app's shared upstream clients."""
+    clients: HttpClients | None = getattr(request.app.state, "http_clients", None)
+    if clients is None:
+        clients = create_http_clients()
+        request.app.state.http_clients = clients
+    return clients
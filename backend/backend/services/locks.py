@@ -0,0 +1,326 @@
+"""Per-(event, user) locks around attendance and calendar transitions.
+
+Registration, cancellation, check-in and calendar changes for one user and
+event hold a lock for the whole transition, so a double-click cannot reserve two
+seats or leave a half-written calendar entry. Locks are try-locks: a request
+that finds one held gets a 409 rather than waiting. Every lock expires after
+``EVENT_USER_LOCK_TTL`` so a crashed request cannot block the user for good, and
+release is compare-and-delete on the token, so a request that outlived its lock
+never frees someone else's.
+
+``EVENT_LOCK_BACKEND`` picks the implementation:
+
+- ``mongo`` (default): one document per lock in ``event_user_locks``, removed
+  by a TTL index. Works everywhere MongoDB does.
+- ``redis``: ``SET NX PX`` on the arq connection, one round trip per acquire
+  and release. Falls back to ``mongo`` when Redis is unreachable at startup.
+- ``local``: an in-process table, for single-process deployments only.
+
+All backends report which events have a lock held, which
+``reconcile_event_counters`` uses to skip transitions in flight.
+"""
+
+import logging
+import os
+import time
+import uuid
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any, Protocol
+
+from fastapi import HTTPException, Request
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import DuplicateKeyError
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
+
+EVENT_LOCK_BACKEND_ENV = "EVENT_LOCK_BACKEND"
+EVENT_USER_LOCK_COLLECTION = "event_user_locks"
+EVENT_USER_LOCK_TTL = timedelta(minutes=5)
+LOCK_KEY_PREFIX = "evently:lock"
+
+# KEYS: lock key, event's lock set. ARGV: token, TTL ms, user id, expiry ms.
+ACQUIRE_SCRIPT = """
+if not redis.call('SET', KEYS[1], ARGV[1], 'NX', 'PX', ARGV[2]) then
+  return 0
+end
+redis.call('ZADD', KEYS[2], ARGV[4], ARGV[3])
+redis.call('PEXPIRE', KEYS[2], ARGV[2])
+return 1
+"""
+
+# KEYS: lock key, event's lock set. ARGV: token, user id.
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+  return 0
+end
+redis.call('DEL', KEYS[1])
+redis.call('ZREM', KEYS[2], ARGV[2])
+return 1
+"""
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class HeldLock:
+    event_id: int
+    user_id: int
+    token: str
+
+
+class EventUserLocks(Protocol):
+    async def acquire(
+        self, db: AsyncDatabase[dict[str, Any]], *, event_id: int, user_id: int
+    ) -> HeldLock | None:
+        """Take the lock, or return ``None`` when someone else holds it."""
+        ...
+
+    async def release(
+        self, db: AsyncDatabase[dict[str, Any]], lock: HeldLock
+    ) -> None: ...
+
+    async def held_event_ids(
+        self, db: AsyncDatabase[dict[str, Any]], event_ids: Sequence[int]
+    ) -> set[int]: ...
+
+
+def _new_lock(event_id: int, user_id: int) -> HeldLock:
+    return HeldLock(event_id=event_id, user_id=user_id, token=uuid.uuid4().hex)
+
+
+def _lock_id(event_id: int, user_id: int) -> str:
+    return f"{event_id}:{user_id}"
+
+
+async def mongo_locked_event_ids(
+    db: AsyncDatabase[dict[str, Any]], event_ids: Sequence[int]
+) -> set[int]:
+    """Return events with an unexpired lock document."""
+    if not event_ids:
+        return set()
+    locked = await db[EVENT_USER_LOCK_COLLECTION].distinct(
+        "event_id",
+        {
+            "event_id": {"$in": list(event_ids)},
+            "$or": [
+                {"expires_at": {"$gt": datetime.now(tz=UTC)}},
+                # Locks written before ``expires_at`` existed.
+                {"expires_at": {"$exists": False}},
+            ],
+        },
+    )
+    return set(locked)
+
+
+class MongoEventUserLocks:
+    """Lock documents keyed by ``"{event_id}:{user_id}"``.
+
+    MongoDB's TTL monitor only runs about once a minute, so a contended acquire
+    also deletes the existing lock when it has expired.
+    """
+
+    def __init__(self, *, ttl: timedelta = EVENT_USER_LOCK_TTL) -> None:
+        self._ttl = ttl
+
+    async def acquire(
+        self, db: AsyncDatabase[dict[str, Any]], *, event_id: int, user_id: int
+    ) -> HeldLock | None:
+        lock = _new_lock(event_id, user_id)
+        lock_id = _lock_id(event_id, user_id)
+        now = datetime.now(tz=UTC)
+        document = {
+            "_id": lock_id,
+            "event_id": event_id,
+            "user_id": user_id,
+            "token": lock.token,
+            "acquired_at": now,
+            "expires_at": now + self._ttl,
+        }
+        try:
+            await db[EVENT_USER_LOCK_COLLECTION].insert_one(document)
+        except DuplicateKeyError:
+            expired = await db[EVENT_USER_LOCK_COLLECTION].delete_one(
+                {
+                    "_id": lock_id,
+                    "$or": [
+                        {"expires_at": {"$lte": now}},
+                        {
+                            "expires_at": {"$exists": False},
+                            "acquired_at": {"$lt": now - self._ttl},
+                        },
+                    ],
+                }
+            )
+            if not expired.deleted_count:
+                return None
+            try:
+                await db[EVENT_USER_LOCK_COLLECTION].insert_one(document)
+            except DuplicateKeyError:
+                return None
+        return lock
+
+    async def release(self, db: AsyncDatabase[dict[str, Any]], lock: HeldLock) -> None:
+        await db[EVENT_USER_LOCK_COLLECTION].delete_one(
+            {"_id": _lock_id(lock.event_id, lock.user_id), "token": lock.token}
+        )
+
+    async def held_event_ids(
+        self, db: AsyncDatabase[dict[str, Any]], event_ids: Sequence[int]
+    ) -> set[int]:
+        return await mongo_locked_event_ids(db, event_ids)
+
+
+class RedisEventUserLocks:
+    """``SET NX PX`` locks, plus a per-event sorted set of holders by expiry."""
+
+    def __init__(
+        self,
+        redis: Redis,
+        *,
+        ttl: timedelta = EVENT_USER_LOCK_TTL,
+        key_prefix: str = LOCK_KEY_PREFIX,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._redis = redis
+        self._ttl_ms = int(ttl.total_seconds() * 1000)
+        self._key_prefix = key_prefix
+        self._clock = clock
+        self._acquire_script: AsyncScript = redis.register_script(ACQUIRE_SCRIPT)
+        self._release_script: AsyncScript = redis.register_script(RELEASE_SCRIPT)
+
+    def _keys(self, event_id: int, user_id: int) -> list[str]:
+        return [
+            f"{self._key_prefix}:event_user:{event_id}:{user_id}",
+            self._event_key(event_id),
+        ]
+
+    def _event_key(self, event_id: int) -> str:
+        return f"{self._key_prefix}:event:{event_id}"
+
+    def _now_ms(self) -> int:
+        return int(self._clock() * 1000)
+
+    async def acquire(
+        self, db: AsyncDatabase[dict[str, Any]], *, event_id: int, user_id: int
+    ) -> HeldLock | None:
+        lock = _new_lock(event_id, user_id)
+        try:
+            acquired = await self._acquire_script(
+                keys=self._keys(event_id, user_id),
+                args=[lock.token, self._ttl_ms, user_id, self._now_ms() + self._ttl_ms],
+            )
+        except RedisError as exc:
+            _logger.warning("Event user lock unavailable", exc_info=True)
+            raise HTTPException(
+                status_code=503,
+                detail="This event registration cannot be updated right now. Please try again.",
+            ) from exc
+        return lock if int(acquired) == 1 else None
+
+    async def release(self, db: AsyncDatabase[dict[str, Any]], lock: HeldLock) -> None:
+        try:
+            await self._release_script(
+                keys=self._keys(lock.event_id, lock.user_id),
+                args=[lock.token, lock.user_id],
+            )
+        except RedisError:
+            # The lock expires on its own; never fail a finished request here.
+            _logger.warning(
+                "Could not release event user lock %s:%s",
+                lock.event_id,
+                lock.user_id,
+                exc_info=True,
+            )
+
+    async def held_event_ids(
+        self, db: AsyncDatabase[dict[str, Any]], event_ids: Sequence[int]
+    ) -> set[int]:
+        if not event_ids:
+            return set()
+        now_ms = self._now_ms()
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for event_id in event_ids:
+                pipe.zcount(self._event_key(event_id), f"({now_ms}", "+inf")
+            counts = await pipe.execute()
+        return {
+            event_id
+            for event_id, count in zip(event_ids, counts, strict=True)
+            if int(count)
+        }
+
+
+class LocalEventUserLocks:
+    """In-process locks; only correct when a single API process serves traffic."""
+
+    def __init__(
+        self,
+        *,
+        ttl: timedelta = EVENT_USER_LOCK_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl_seconds = ttl.total_seconds()
+        self._clock = clock
+        self._held: dict[tuple[int, int], tuple[str, float]] = {}
+
+    def _live(self, key: tuple[int, int]) -> tuple[str, float] | None:
+        entry = self._held.get(key)
+        if entry is not None and entry[1] <= self._clock():
+            del self._held[key]
+            return None
+        return entry
+
+    async def acquire(
+        self, db: AsyncDatabase[dict[str, Any]], *, event_id: int, user_id: int
+    ) -> HeldLock | None:
+        key = (event_id, user_id)
+        if self._live(key) is not None:
+            return None
+        lock = _new_lock(event_id, user_id)
+        self._held[key] = (lock.token, self._clock() + self._ttl_seconds)
+        return lock
+
+    async def release(self, db: AsyncDatabase[dict[str, Any]], lock: HeldLock) -> None:
+        key = (lock.event_id, lock.user_id)
+        entry = self._held.get(key)
+        if entry is not None and entry[0] == lock.token:
+            del self._held[key]
+
+    async def held_event_ids(
+        self, db: AsyncDatabase[dict[str, Any]], event_ids: Sequence[int]
+    ) -> set[int]:
+        wanted = set(event_ids)
+        return {
+            event_id
+            for event_id, user_id in list(self._held)
+            if event_id in wanted and self._live((event_id, user_id)) is not None
+        }
+
+
+def create_event_user_locks(
+    backend: str | None = None, *, redis: Redis | None = None
+) -> EventUserLocks:
+    """Build the lock backend named by ``backend`` or ``EVENT_LOCK_BACKEND``."""
+    name = (backend or os.getenv(EVENT_LOCK_BACKEND_ENV) or "mongo").strip().lower()
+    if name == "local":
+        return LocalEventUserLocks()
+    if name == "redis":
+        if redis is not None:
+            return RedisEventUserLocks(redis)
+        _logger.error(
+            "EVENT_LOCK_BACKEND=redis but Redis is not reachable; using MongoDB locks"
+        )
+    elif name != "mongo":
+        _logger.warning("Unknown EVENT_LOCK_BACKEND %r; using MongoDB locks", name)
+    return MongoEventUserLocks()
+
+
+def get_event_user_locks(request: Request) -> EventUserLocks:
+    """FastAPI dependency that returns the configured event user locks."""
+    locks: EventUserLocks | None = getattr(request.app.state, "event_user_locks", None)
+    if locks is None:
+        locks = MongoEventUserLocks()
+        request.app.state.event_user_locks = locks
+    return locks
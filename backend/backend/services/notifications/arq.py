@@ -1,14 +1,81 @@
+"""ARQ client used by the API to enqueue background jobs.
+
+Only approved events get reminders: approving an event enqueues its reminder,
+rejecting it drops the reminder, and moving its start time replaces the queued
+job. Reminder jobs are enqueued a bounded horizon ahead rather than all at once.
+``schedule_all_upcoming_event_reminders`` runs at API startup and from the
+worker's hourly top-up cron; it enqueues reminders due within
+``REMINDER_SCHEDULE_HORIZON`` that are not yet queued, in one Redis round trip
+per ``REMINDER_ENQUEUE_BATCH_SIZE`` events. A Redis lock lets a single replica
+run it at a time. Every run reads the whole horizon, so events written around
+the API (seeds, restores) are picked up by the next run; reminders already
+queued are skipped by the enqueue script.
+"""
+
+import logging
 import os
+import uuid
+from collections.abc import Sequence
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
 from arq import ArqRedis, create_pool
 from arq.connections import RedisSettings
+from arq.constants import in_progress_key_prefix, job_key_prefix, result_key_prefix
+from arq.jobs import serialize_job
+from arq.utils import timestamp_ms, to_unix_ms
 from fastapi import HTTPException, Request
 from pymongo.asynchronous.database import AsyncDatabase
 
+from backend.models.event import EventStatus
+
 from .email import REMINDER_LEAD_TIME_MINUTES
 
+REMINDER_SCHEDULE_HORIZON = timedelta(hours=24)
+REMINDER_ENQUEUE_BATCH_SIZE = 500
+REMINDER_SCHEDULER_LOCK_TTL = timedelta(minutes=5)
+REMINDER_SCHEDULER_KEY_PREFIX = "evently:reminders"
+
+# Enqueues jobs the way ``ArqRedis.enqueue_job`` does, skipping any job that
+# is already queued or has a result, for many jobs in one atomic call.
+# KEYS: queue, then job key and result key per job.
+# ARGV: job id, score, expiry ms and serialized job per job.
+ENQUEUE_JOBS_SCRIPT = """
+local enqueued = 0
+for i = 0, (#KEYS - 1) / 2 - 1 do
+  local job_key, result_key = KEYS[2 + i * 2], KEYS[3 + i * 2]
+  if redis.call('EXISTS', job_key, result_key) == 0 then
+    local job_id, score = ARGV[1 + i * 4], ARGV[2 + i * 4]
+    redis.call('PSETEX', job_key, ARGV[3 + i * 4], ARGV[4 + i * 4])
+    redis.call('ZADD', KEYS[1], score, job_id)
+    enqueued = enqueued + 1
+  end
+end
+return enqueued
+"""
+
+# Drops a job that has not started yet, and its result so the job id can be
+# reused. A running job is left alone; the worker re-checks the event anyway.
+# KEYS: queue, job key, result key, in-progress key. ARGV: job id.
+CANCEL_JOB_SCRIPT = """
+if redis.call('EXISTS', KEYS[4]) == 1 then
+  return 0
+end
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('DEL', KEYS[2], KEYS[3])
+return 1
+"""
+
+# KEYS: lock key. ARGV: token.
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_logger = logging.getLogger(__name__)
+
 
 def utc_naive_datetime(value: datetime) -> datetime:
     """Normalize datetimes to naive UTC for reminder scheduling."""
@@ -17,10 +84,26 @@ def utc_naive_datetime(value: datetime) -> datetime:
     return value.astimezone(UTC).replace(tzinfo=None)
 
 
+def event_reminder_time(start_time: datetime) -> datetime:
+    """When the reminder for an event starting at ``start_time`` is sent."""
+    return utc_naive_datetime(start_time) - timedelta(
+        minutes=REMINDER_LEAD_TIME_MINUTES
+    )
+
+
+def event_reminder_job_id(event_id: int) -> str:
+    return f"event_reminder_{event_id}"
+
+
 class ArqClient:
     def __init__(self, arq_redis: ArqRedis) -> None:
         self._arq_redis = arq_redis
 
+    @property
+    def redis(self) -> ArqRedis:
+        """The underlying Redis connection, shared with other Redis users."""
+        return self._arq_redis
+
     async def close(self) -> None:
         await self._arq_redis.aclose()
 
@@ -30,20 +113,135 @@ class ArqClient:
             "send_event_reminder",
             event_id=event_id,
             _defer_until=run_at,
-            _job_id=f"event_reminder_{event_id}",
+            _job_id=event_reminder_job_id(event_id),
         )
 
-    async def schedule_all_upcoming_event_reminders(
-        self, db: AsyncDatabase[dict[str, Any]]
+    async def schedule_event_reminder_if_due(
+        self, event_id: int, start_time: datetime
     ) -> None:
-        """Schedule background tasks for all upcoming event reminders."""
+        """Enqueue the event's reminder now if it is due within the horizon.
+
+        Reminders further out are left to the worker's hourly top-up.
+        """
+        reminder_time = event_reminder_time(start_time)
         now = datetime.now(UTC).replace(tzinfo=None)
-        async for event_dict in db["events"].find({"start_time": {"$gt": now}}):
-            event_id = event_dict["id"]
-            start_time = utc_naive_datetime(event_dict["start_time"])
-            reminder_time = start_time - timedelta(minutes=REMINDER_LEAD_TIME_MINUTES)
-            if reminder_time > now:
-                await self.schedule_event_reminder(event_id, reminder_time)
+        if now < reminder_time <= now + REMINDER_SCHEDULE_HORIZON:
+            await self.schedule_event_reminder(event_id, reminder_time)
+
+    async def cancel_event_reminder(self, event_id: int) -> bool:
+        """Drop the event's queued reminder; ``False`` if it is already running."""
+        redis = self._arq_redis
+        job_id = event_reminder_job_id(event_id)
+        cancelled = await redis.register_script(CANCEL_JOB_SCRIPT)(
+            keys=[
+                redis.default_queue_name,
+                job_key_prefix + job_id,
+                result_key_prefix + job_id,
+                in_progress_key_prefix + job_id,
+            ],
+            args=[job_id],
+        )
+        return int(cancelled) == 1
+
+    async def replace_event_reminder(self, event_id: int, start_time: datetime) -> None:
+        """Move the event's reminder to match a new start time."""
+        await self.cancel_event_reminder(event_id)
+        await self.schedule_event_reminder_if_due(event_id, start_time)
+
+    async def schedule_event_reminders(
+        self, reminders: Sequence[tuple[int, datetime]]
+    ) -> int:
+        """Enqueue ``(event_id, run_at)`` reminders in bulk; return how many.
+
+        Like ``schedule_event_reminder``, an event whose reminder job already
+        exists keeps it.
+        """
+        redis = self._arq_redis
+        script = redis.register_script(ENQUEUE_JOBS_SCRIPT)
+        enqueued = 0
+        for start in range(0, len(reminders), REMINDER_ENQUEUE_BATCH_SIZE):
+            keys: list[str] = [redis.default_queue_name]
+            args: list[Any] = []
+            enqueue_time_ms = timestamp_ms()
+            for event_id, run_at in reminders[
+                start : start + REMINDER_ENQUEUE_BATCH_SIZE
+            ]:
+                job_id = event_reminder_job_id(event_id)
+                score = to_unix_ms(run_at)
+                keys += [job_key_prefix + job_id, result_key_prefix + job_id]
+                args += [
+                    job_id,
+                    score,
+                    score - enqueue_time_ms + redis.expires_extra_ms,
+                    serialize_job(
+                        "send_event_reminder",
+                        (),
+                        {"event_id": event_id},
+                        None,
+                        enqueue_time_ms,
+                        serializer=redis.job_serializer,
+                    ),
+                ]
+            enqueued += int(await script(keys=keys, args=args))
+        return enqueued
+
+    async def enqueue_calendar_sync_job(self, job_id: str) -> None:
+        """Run a recorded Google Calendar sync/unsync job on the worker."""
+        await self._arq_redis.enqueue_job(
+            "run_calendar_sync_job",
+            job_id=job_id,
+            _job_id=f"calendar_sync_{job_id}",
+        )
+
+    async def schedule_all_upcoming_event_reminders(
+        self, db: AsyncDatabase[dict[str, Any]]
+    ) -> int:
+        """Enqueue reminders due within the schedule horizon; return how many.
+
+        Does nothing while another process holds the scheduler lock.
+        """
+        redis = self._arq_redis
+        lock_key = f"{REMINDER_SCHEDULER_KEY_PREFIX}:scheduler_lock"
+        token = uuid.uuid4().hex
+        if not await redis.set(
+            lock_key,
+            token,
+            nx=True,
+            px=int(REMINDER_SCHEDULER_LOCK_TTL.total_seconds() * 1000),
+        ):
+            _logger.info("Reminder scheduling is already running elsewhere")
+            return 0
+
+        try:
+            now = datetime.now(UTC).replace(tzinfo=None)
+            until = now + REMINDER_SCHEDULE_HORIZON
+            lead_time = timedelta(minutes=REMINDER_LEAD_TIME_MINUTES)
+            events = db["events"].find(
+                {
+                    # Events written before moderation have no status and are
+                    # treated as approved, as on the public event pages.
+                    "$or": [
+                        {"status": EventStatus.Approved.value},
+                        {"status": {"$exists": False}},
+                    ],
+                    "start_time": {"$gt": now + lead_time, "$lte": until + lead_time},
+                },
+                {"_id": 0, "id": 1, "start_time": 1},
+            )
+            reminders = [
+                (event["id"], event_reminder_time(event["start_time"]))
+                async for event in events
+            ]
+            enqueued = await self.schedule_event_reminders(reminders)
+        finally:
+            await redis.register_script(RELEASE_LOCK_SCRIPT)(
+                keys=[lock_key], args=[token]
+            )
+
+        _logger.info(
+            "Enqueued %d event reminders due by %s", enqueued, until.isoformat()
+        )
+        return enqueued
 
 
 def get_redis_settings(url: str | None = None) -> RedisSettings:
@@ -72,3 +270,13 @@ def get_arq(request: Request) -> ArqClient:
             detail="Background job queue unavailable; configure REDIS_URL.",
         )
     return arq_client
+
+
+def get_optional_arq(request: Request) -> ArqClient | None:
+    """FastAPI dependency that returns the shared ArqClient, if configured.
+
+    Routes whose queue work is best-effort (reminder sync on event edits and
+    approvals) use this so they keep working when Redis is not configured.
+    """
+    arq_client: ArqClient | None = getattr(request.app.state, "arq", None)
+    return arq_client
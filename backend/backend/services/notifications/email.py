@@ -1,9 +1,11 @@
+import asyncio
 import json
 import logging
 import os
-from collections.abc import Mapping
+import time
+from collections.abc import Mapping, Sequence
 from html import escape
-from typing import Protocol
+from typing import Literal, Protocol, runtime_checkable
 
 import resend
 from fastapi import Request
@@ -12,8 +14,17 @@ from resend.http_client_async import AsyncHTTPClient
 from resend.version import get_version
 
 from backend.models.event import Event
+from backend.services.notifications.throttle import EmailThrottle
 
 REMINDER_LEAD_TIME_MINUTES = 60
+# Resend accepts at most 100 emails per batch request.
+RESEND_BATCH_SIZE = 100
+REMINDER_SEND_CONCURRENCY = 8
+
+# Emails sent through the outbox; see services/notifications/outbox.py.
+type TransactionalEmailKind = Literal[
+    "event_creation_confirmation", "registration_confirmation", "waitlist_promotion"
+]
 
 
 def _html_text(value: object) -> str:
@@ -27,18 +38,43 @@ def _resolve_from_email(from_email: str | None = None) -> str | None:
     return None
 
 
+def is_transient_send_error(error: ResendError) -> bool:
+    """Whether a retry may succeed: rate limits, provider and transport errors."""
+    try:
+        code = int(error.code)
+    except (TypeError, ValueError):
+        return True
+    return code == 429 or code >= 500
+
+
 class EmailSender(Protocol):
     async def send_async(self, params: Mapping[str, object]) -> None: ...
 
 
+@runtime_checkable
+class IdempotentEmailSender(EmailSender, Protocol):
+    async def send_idempotent_async(
+        self, params: Mapping[str, object], idempotency_key: str
+    ) -> None: ...
+
+
+@runtime_checkable
+class BatchEmailSender(EmailSender, Protocol):
+    async def send_batch_async(
+        self, params: Sequence[Mapping[str, object]]
+    ) -> None: ...
+
+
 class ResendEmailSender:
     def __init__(
         self,
         api_key: str,
         api_url: str | None = None,
         http_client: AsyncHTTPClient | None = None,
+        throttle: EmailThrottle | None = None,
     ) -> None:
         self._api_key = api_key
+        self._throttle = throttle
         self._api_url = (
             api_url or os.environ.get("RESEND_API_URL") or resend.api_url
         ).rstrip("/")
@@ -49,16 +85,47 @@ class ResendEmailSender:
         self._http_client = async_http_client
 
     async def send_async(self, params: Mapping[str, object]) -> None:
+        await self._post("/emails", dict(params))
+
+    async def send_idempotent_async(
+        self, params: Mapping[str, object], idempotency_key: str
+    ) -> None:
+        """Send once per key: Resend ignores repeats of a key for 24 hours."""
+        await self._post(
+            "/emails", dict(params), extra_headers={"Idempotency-Key": idempotency_key}
+        )
+
+    async def send_batch_async(self, params: Sequence[Mapping[str, object]]) -> None:
+        """Send up to ``RESEND_BATCH_SIZE`` emails in one request."""
+        await self._post("/emails/batch", [dict(email) for email in params])
+
+    async def _post(
+        self,
+        path: str,
+        payload: dict[str, object] | list[object],
+        *,
+        extra_headers: Mapping[str, str] | None = None,
+    ) -> None:
+        """POST to Resend, paced and guarded by the throttle when there is one.
+
+        Raises ``EmailCircuitOpenError`` without sending while its circuit is
+        open, and ``ResendError`` when the request fails.
+        """
+        if self._throttle is not None:
+            await self._throttle.before_send()
+        started = time.perf_counter()
+        status_code: int | None = None
         try:
             content, status_code, headers = await self._http_client.request(
                 method="post",
-                url=f"{self._api_url}/emails",
+                url=f"{self._api_url}{path}",
                 headers={
                     "Accept": "application/json",
                     "Authorization": f"Bearer {self._api_key}",
                     "User-Agent": f"resend-python:{get_version()}",
+                    **(extra_headers or {}),
                 },
-                json=dict(params),
+                json=payload,
             )
         except ResendError:
             raise
@@ -69,6 +136,9 @@ class ResendEmailSender:
                 message=str(e),
                 suggested_action="Request failed, please try again.",
             ) from e
+        finally:
+            if self._throttle is not None:
+                self._throttle.after_send(status_code, time.perf_counter() - started)
 
         if status_code >= 400:
             self._raise_for_error_response(content, status_code, headers)
@@ -126,62 +196,167 @@ class EmailNotificationService:
             )
         self.from_email = resolved_from_email
 
-    async def send_event_creation_confirmation(
+    def _event_creation_confirmation_params(
         self, recipient_email: str, event: Event
-    ) -> None:
+    ) -> dict[str, object]:
         event_title = _html_text(event.title)
+        return {
+            "from": self.from_email,
+            "to": [recipient_email],
+            "subject": "Evently - Event Creation Confirmation",
+            "html": f"<h1>Event Created</h1><p>You created '{event_title}'</p>",
+        }
 
+    async def send_event_creation_confirmation(
+        self, recipient_email: str, event: Event
+    ) -> None:
         try:
             await self._email_sender.send_async(
-                {
-                    "from": self.from_email,
-                    "to": [recipient_email],
-                    "subject": "Evently - Event Creation Confirmation",
-                    "html": f"<h1>Event Created</h1><p>You created '{event_title}'</p>",
-                },
+                self._event_creation_confirmation_params(recipient_email, event)
             )
         except ResendError as e:
             logging.getLogger(__name__).exception(
                 "Failed to send event creation confirmation email, error: %s", e
             )
 
-    async def send_registration_confirmation(
+    def _registration_confirmation_params(
         self, recipient_email: str, event: Event
-    ) -> None:
+    ) -> dict[str, object]:
         event_title = _html_text(event.title)
+        return {
+            "from": self.from_email,
+            "to": [recipient_email],
+            "subject": "Evently - Registration Confirmation",
+            "html": f"<h1>Registration Confirmed</h1><p>You registered for {event_title}</p>",
+        }
 
+    async def send_registration_confirmation(
+        self, recipient_email: str, event: Event
+    ) -> None:
         try:
             await self._email_sender.send_async(
-                {
-                    "from": self.from_email,
-                    "to": [recipient_email],
-                    "subject": "Evently - Registration Confirmation",
-                    "html": f"<h1>Registration Confirmed</h1><p>You registered for {event_title}</p>",
-                },
+                self._registration_confirmation_params(recipient_email, event)
             )
         except ResendError as e:
             logging.getLogger(__name__).exception(
                 "Failed to send registration confirmation email, error: %s", e
             )
 
-    async def send_event_reminder(self, recipient_email: str, event: Event) -> None:
+    def _waitlist_promotion_params(
+        self, recipient_email: str, event: Event
+    ) -> dict[str, object]:
+        event_title = _html_text(event.title)
+        return {
+            "from": self.from_email,
+            "to": [recipient_email],
+            "subject": "Evently - You're Off the Waitlist",
+            "html": f"<h1>Spot Confirmed</h1><p>A spot opened up and you are now registered for {event_title}</p>",
+        }
+
+    async def send_waitlist_promotion(self, recipient_email: str, event: Event) -> None:
+        try:
+            await self._email_sender.send_async(
+                self._waitlist_promotion_params(recipient_email, event)
+            )
+        except ResendError as e:
+            logging.getLogger(__name__).exception(
+                "Failed to send waitlist promotion email, error: %s", e
+            )
+
+    async def send_transactional(
+        self,
+        kind: TransactionalEmailKind,
+        recipient_email: str,
+        event: Event,
+        *,
+        idempotency_key: str,
+    ) -> None:
+        """Send one outbox email; raises ``ResendError`` so the outbox can retry."""
+        builders = {
+            "event_creation_confirmation": self._event_creation_confirmation_params,
+            "registration_confirmation": self._registration_confirmation_params,
+            "waitlist_promotion": self._waitlist_promotion_params,
+        }
+        params = builders[kind](recipient_email, event)
+        if isinstance(self._email_sender, IdempotentEmailSender):
+            await self._email_sender.send_idempotent_async(params, idempotency_key)
+        else:
+            await self._email_sender.send_async(params)
+
+    def _event_reminder_params(
+        self, recipient_email: str, event: Event
+    ) -> dict[str, object]:
         event_title = _html_text(event.title)
         start_time = _html_text(event.start_time)
+        return {
+            "from": self.from_email,
+            "to": [recipient_email],
+            "subject": "Evently - Event Reminder",
+            "html": f"<h1>Event Reminder</h1><p>{event_title} starts at {start_time}</p>",
+        }
 
+    async def send_event_reminder(self, recipient_email: str, event: Event) -> None:
         try:
             await self._email_sender.send_async(
-                {
-                    "from": self.from_email,
-                    "to": [recipient_email],
-                    "subject": "Evently - Event Reminder",
-                    "html": f"<h1>Event Reminder</h1><p>{event_title} starts at {start_time}</p>",
-                },
+                self._event_reminder_params(recipient_email, event)
             )
         except ResendError as e:
             logging.getLogger(__name__).exception(
                 "Failed to send event reminder email, error: %s", e
             )
 
+    async def send_event_reminders(
+        self, recipient_emails: Sequence[str], event: Event
+    ) -> None:
+        """Send one reminder per recipient without one request per recipient.
+
+        Uses Resend's batch endpoint when the sender supports it, and otherwise
+        at most ``REMINDER_SEND_CONCURRENCY`` requests at a time. Emails Resend
+        rejects are logged and skipped; rate-limit, provider and transport
+        failures raise ``ResendError`` so the caller can retry the recipients.
+        """
+        logger = logging.getLogger(__name__)
+        params = [
+            self._event_reminder_params(recipient, event)
+            for recipient in recipient_emails
+        ]
+        sender = self._email_sender
+        if isinstance(sender, BatchEmailSender):
+            for start in range(0, len(params), RESEND_BATCH_SIZE):
+                try:
+                    await sender.send_batch_async(
+                        params[start : start + RESEND_BATCH_SIZE]
+                    )
+                except ResendError as e:
+                    if is_transient_send_error(e):
+                        raise
+                    logger.exception(
+                        "Failed to send event reminder email batch, error: %s", e
+                    )
+            return
+
+        semaphore = asyncio.Semaphore(REMINDER_SEND_CONCURRENCY)
+
+        async def send(email: Mapping[str, object]) -> None:
+            async with semaphore:
+                try:
+                    await sender.send_async(email)
+                except ResendError as e:
+                    if is_transient_send_error(e):
+                        raise
+                    logger.exception(
+                        "Failed to send event reminder email, error: %s", e
+                    )
+
+        results = await asyncio.gather(
+            *(send(email) for email in params), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                # A retry also resends the ones that went out; only senders
+                # without a batch endpoint take this path.
+                raise result
+
 
 class DisabledEmailNotificationService(EmailNotificationService):
     def __init__(self) -> None:
@@ -212,16 +387,43 @@ class DisabledEmailNotificationService(EmailNotificationService):
             "registration confirmation", recipient_email, event
         )
 
+    async def send_waitlist_promotion(self, recipient_email: str, event: Event) -> None:
+        await self._log_disabled_send("waitlist promotion", recipient_email, event)
+
     async def send_event_reminder(self, recipient_email: str, event: Event) -> None:
         await self._log_disabled_send("event reminder", recipient_email, event)
 
+    async def send_transactional(
+        self,
+        kind: TransactionalEmailKind,
+        recipient_email: str,
+        event: Event,
+        *,
+        idempotency_key: str,
+    ) -> None:
+        await self._log_disabled_send(kind.replace("_", " "), recipient_email, event)
+
+    async def send_event_reminders(
+        self, recipient_emails: Sequence[str], event: Event
+    ) -> None:
+        self._logger.info(
+            "Email notifications disabled; skipping %d event reminder emails "
+            "for event %s",
+            len(recipient_emails),
+            event.id,
+        )
+
 
 def create_email_notification_service(
     resend_api_key: str | None = None,
     *,
     allow_missing: bool = False,
+    throttle: EmailThrottle | None = None,
 ) -> EmailNotificationService:
-    """Create an EmailNotificationService from Resend environment settings."""
+    """Create an EmailNotificationService from Resend environment settings.
+
+    Sends go through ``throttle`` when given; see ``notifications/throttle.py``.
+    """
     logger = logging.getLogger(__name__)
     api_key = resend_api_key or os.getenv("RESEND_API_KEY")
     if not api_key:
@@ -246,7 +448,9 @@ def create_email_notification_service(
             "EMAIL_FROM environment variable is not set and no sender was provided"
         )
 
-    return EmailNotificationService(api_key)
+    return EmailNotificationService(
+        api_key, email_sender=ResendEmailSender(api_key, throttle=throttle)
+    )
 
 
 def get_email_notif_service(request: Request) -> EmailNotificationService:
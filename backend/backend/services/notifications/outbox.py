@@ -0,0 +1,241 @@
+"""Transactional outbox for confirmation and waitlist emails.
+
+Requests never wait on the email provider. A state change that owes someone an
+email (creating an event, registering, a waitlist promotion) writes one
+document to ``email_outbox`` as part of that change::
+
+    {_id: dedup key, kind, recipient, event_id, status, attempts,
+     next_attempt_at, created_at}
+
+and a worker cron sends it by running ``drain_email_outbox`` every few seconds.
+The dedup key is the document id, so a notification is queued at most once,
+and it is passed to Resend as the idempotency key, so a retry of a send that
+did go through is not delivered twice.
+
+Claiming a document pushes ``next_attempt_at`` out by ``OUTBOX_CLAIM_LEASE``:
+a worker that dies mid-send leaves it to be claimed again once the lease runs
+out. A failed send is retried with exponential backoff, and after
+``OUTBOX_MAX_ATTEMPTS`` attempts the document is marked ``failed`` and kept
+for inspection. Sent documents expire after ``EMAIL_OUTBOX_SENT_TTL`` (see
+``db/indexes.py``).
+
+Pacing is the sender's job (see ``notifications/throttle.py``), but two cases
+park a document rather than count a failed attempt: a recipient over their
+``RECIPIENT_BUCKET`` is sent to later, and while the provider circuit is open
+the drain stops and leaves what it claimed for when the circuit closes.
+"""
+
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import DuplicateKeyError
+from resend.exceptions import ResendError
+
+from backend.models.event import Event
+from backend.services.notifications.email import (
+    EmailNotificationService,
+    TransactionalEmailKind,
+)
+from backend.services.notifications.throttle import (
+    RECIPIENT_BUCKET,
+    EmailCircuitOpenError,
+    EmailRateLimiter,
+)
+
+EMAIL_OUTBOX_COLLECTION = "email_outbox"
+OUTBOX_MAX_ATTEMPTS = 8
+OUTBOX_BASE_BACKOFF = timedelta(seconds=30)
+OUTBOX_MAX_BACKOFF = timedelta(hours=1)
+OUTBOX_CLAIM_LEASE = timedelta(minutes=2)
+OUTBOX_DRAIN_LIMIT = 200
+OUTBOX_DRAIN_CONCURRENCY = 4
+
+_logger = logging.getLogger(__name__)
+
+
+def outbox_dedup_key(kind: TransactionalEmailKind, *parts: object) -> str:
+    """Identify one notification, e.g. ``registration_confirmation:<id>:<time>``.
+
+    Repeated notifications take their parts from stored state, such as the
+    attendance ``_id`` and the time of the transition being announced.
+    """
+    return ":".join([kind, *(str(part) for part in parts)])
+
+
+def outbox_backoff(attempts: int) -> timedelta:
+    """Delay before retrying a send that has failed ``attempts`` times."""
+    return min(OUTBOX_BASE_BACKOFF * (1 << (attempts - 1)), OUTBOX_MAX_BACKOFF)
+
+
+async def enqueue_email(
+    db: AsyncDatabase[dict[str, Any]],
+    kind: TransactionalEmailKind,
+    *,
+    recipient: str,
+    event_id: int,
+    dedup_key: str,
+) -> bool:
+    """Queue an email for the worker; ``False`` if the key was already queued."""
+    now = datetime.now(tz=UTC)
+    try:
+        await db[EMAIL_OUTBOX_COLLECTION].insert_one(
+            {
+                "_id": dedup_key,
+                "kind": kind,
+                "recipient": recipient,
+                "event_id": event_id,
+                "status": "pending",
+                "attempts": 0,
+                "next_attempt_at": now,
+                "created_at": now,
+            }
+        )
+    except DuplicateKeyError:
+        return False
+    return True
+
+
+async def _claim(db: AsyncDatabase[dict[str, Any]]) -> dict[str, Any] | None:
+    now = datetime.now(tz=UTC)
+    return await db[EMAIL_OUTBOX_COLLECTION].find_one_and_update(
+        {"status": "pending", "next_attempt_at": {"$lte": now}},
+        {
+            "$set": {"next_attempt_at": now + OUTBOX_CLAIM_LEASE},
+            "$inc": {"attempts": 1},
+        },
+        sort=[("next_attempt_at", ASCENDING)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+async def _record_failure(
+    db: AsyncDatabase[dict[str, Any]], entry: dict[str, Any], error: str
+) -> None:
+    fields: dict[str, Any] = {"last_error": error}
+    if entry["attempts"] >= OUTBOX_MAX_ATTEMPTS:
+        fields["status"] = "failed"
+        _logger.error(
+            "Giving up on outbox email %s after %d attempts: %s",
+            entry["_id"],
+            entry["attempts"],
+            error,
+        )
+    else:
+        fields["next_attempt_at"] = datetime.now(tz=UTC) + outbox_backoff(
+            entry["attempts"]
+        )
+        _logger.warning("Outbox email %s failed, will retry: %s", entry["_id"], error)
+    await db[EMAIL_OUTBOX_COLLECTION].update_one(
+        {"_id": entry["_id"]}, {"$set": fields}
+    )
+
+
+async def _park(
+    db: AsyncDatabase[dict[str, Any]], entry: dict[str, Any], seconds: float
+) -> None:
+    """Put a claimed email back for ``seconds`` without using up an attempt."""
+    await db[EMAIL_OUTBOX_COLLECTION].update_one(
+        {"_id": entry["_id"]},
+        {
+            "$set": {
+                "next_attempt_at": datetime.now(tz=UTC) + timedelta(seconds=seconds)
+            },
+            "$inc": {"attempts": -1},
+        },
+    )
+
+
+async def outbox_depth(db: AsyncDatabase[dict[str, Any]]) -> dict[str, int | float]:
+    """Count queued emails: pending, due now, failed, and the oldest due's age."""
+    outbox = db[EMAIL_OUTBOX_COLLECTION]
+    now = datetime.now(tz=UTC)
+    due = {"status": "pending", "next_attempt_at": {"$lte": now}}
+    oldest = await outbox.find_one(
+        due, {"_id": 0, "created_at": 1}, sort=[("next_attempt_at", ASCENDING)]
+    )
+    oldest_age = 0.0
+    if oldest is not None:
+        created_at = oldest["created_at"].replace(tzinfo=UTC)
+        oldest_age = max(0.0, (now - created_at).total_seconds())
+    return {
+        "pending": await outbox.count_documents({"status": "pending"}),
+        "due": await outbox.count_documents(due),
+        "failed": await outbox.count_documents({"status": "failed"}),
+        "oldest_due_age_seconds": oldest_age,
+    }
+
+
+async def drain_email_outbox(
+    db: AsyncDatabase[dict[str, Any]],
+    email: EmailNotificationService,
+    *,
+    limit: int = OUTBOX_DRAIN_LIMIT,
+    limiter: EmailRateLimiter | None = None,
+) -> int:
+    """Send up to ``limit`` due outbox emails; return how many were sent.
+
+    With a ``limiter``, each recipient's emails are paced by
+    ``RECIPIENT_BUCKET``.
+    """
+    events: dict[int, Event | None] = {}
+    claimed = sent = 0
+    circuit_open = False
+
+    async def event_for(event_id: int) -> Event | None:
+        if event_id not in events:
+            raw = await db["events"].find_one({"id": event_id})
+            events[event_id] = Event.model_validate(raw) if raw else None
+        return events[event_id]
+
+    async def deliver(entry: dict[str, Any]) -> bool:
+        nonlocal circuit_open
+        event = await event_for(entry["event_id"])
+        if event is None:
+            await db[EMAIL_OUTBOX_COLLECTION].update_one(
+                {"_id": entry["_id"]},
+                {"$set": {"status": "failed", "last_error": "Event not found"}},
+            )
+            return False
+        if limiter is not None:
+            wait = await limiter.take(
+                f"recipient:{entry['recipient']}", RECIPIENT_BUCKET
+            )
+            if wait > 0:
+                await _park(db, entry, wait)
+                return False
+        try:
+            await email.send_transactional(
+                entry["kind"], entry["recipient"], event, idempotency_key=entry["_id"]
+            )
+        except EmailCircuitOpenError as e:
+            circuit_open = True
+            await _park(db, entry, e.retry_after)
+            return False
+        except ResendError as e:
+            await _record_failure(db, entry, str(e))
+            return False
+        await db[EMAIL_OUTBOX_COLLECTION].update_one(
+            {"_id": entry["_id"]},
+            {
+                "$set": {"status": "sent", "sent_at": datetime.now(tz=UTC)},
+                "$unset": {"next_attempt_at": ""},
+            },
+        )
+        return True
+
+    async def run() -> None:
+        nonlocal claimed, sent
+        while claimed < limit and not circuit_open:
+            claimed += 1
+            entry = await _claim(db)
+            if entry is None:
+                return
+            if await deliver(entry):
+                sent += 1
+
+    await asyncio.gather(*(run() for _ in range(OUTBOX_DRAIN_CONCURRENCY)))
+    return sent
@@ -0,0 +1,136 @@
+"""Event reminder fan-out, streamed in chunks and checkpointed.
+
+A reminder for a large event reaches thousands of attendees. Rather than
+loading every attendee and user at once, ``send_event_reminders`` walks the
+event's registrations in ``user_id`` order with a cursor, looks up only the
+emails of one chunk at a time, and hands each chunk to the email service, which
+sends it as a single Resend batch request.
+
+After every chunk the last ``user_id`` sent is saved in ``reminder_progress``
+under the event and its start time. A retried or restarted job resumes after
+that id instead of re-sending, while a rescheduled event starts a fresh run.
+Progress documents expire via a TTL index (see ``db/indexes.py``).
+"""
+
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from typing import Any
+
+from pymongo.asynchronous.database import AsyncDatabase
+
+from backend.models.attendance import REGISTERED_ATTENDANCE_STATUSES
+from backend.models.event import Event
+from backend.services.notifications.arq import utc_naive_datetime
+from backend.services.notifications.email import (
+    RESEND_BATCH_SIZE,
+    EmailNotificationService,
+)
+
+REMINDER_PROGRESS_COLLECTION = "reminder_progress"
+REMINDER_CHUNK_SIZE = RESEND_BATCH_SIZE
+
+
+def reminder_progress_id(event: Event) -> str:
+    return f"{event.id}:{utc_naive_datetime(event.start_time).isoformat()}"
+
+
+async def iter_reminder_recipients(
+    db: AsyncDatabase[dict[str, Any]],
+    event_id: int,
+    *,
+    after_user_id: int | None = None,
+    chunk_size: int = REMINDER_CHUNK_SIZE,
+) -> AsyncIterator[tuple[int, list[str]]]:
+    """Yield the event's registered attendees in chunks of ``chunk_size``.
+
+    Each chunk is ``(last user id, emails)``, in ``user_id`` order starting
+    after ``after_user_id``; users without an email are skipped.
+    """
+    query: dict[str, Any] = {
+        "event_id": event_id,
+        "status": {"$in": list(REGISTERED_ATTENDANCE_STATUSES)},
+    }
+    if after_user_id is not None:
+        query["user_id"] = {"$gt": after_user_id}
+    cursor = (
+        db["attendance"]
+        .find(query, {"_id": 0, "user_id": 1})
+        .sort("user_id", 1)
+        .batch_size(chunk_size)
+    )
+
+    async def chunk(user_ids: list[int]) -> tuple[int, list[str]]:
+        users = await (
+            db["users"]
+            .find({"id": {"$in": user_ids}}, {"_id": 0, "id": 1, "email": 1})
+            .to_list(length=len(user_ids))
+        )
+        email_by_id = {user["id"]: user.get("email") for user in users}
+        emails = [
+            email
+            for user_id in user_ids
+            if isinstance(email := email_by_id.get(user_id), str) and email
+        ]
+        return user_ids[-1], emails
+
+    user_ids: list[int] = []
+    async for row in cursor:
+        user_ids.append(row["user_id"])
+        if len(user_ids) >= chunk_size:
+            yield await chunk(user_ids)
+            user_ids = []
+    if user_ids:
+        yield await chunk(user_ids)
+
+
+async def send_event_reminders(
+    db: AsyncDatabase[dict[str, Any]],
+    email: EmailNotificationService,
+    event: Event,
+    *,
+    chunk_size: int = REMINDER_CHUNK_SIZE,
+) -> int:
+    """Send the event's reminder to every registered attendee; return how many.
+
+    Resumes from the last checkpoint for this event and start time, and does
+    nothing if that run already completed.
+    """
+    progress = db[REMINDER_PROGRESS_COLLECTION]
+    progress_id = reminder_progress_id(event)
+    checkpoint = await progress.find_one({"_id": progress_id})
+    if checkpoint is not None and checkpoint.get("completed_at") is not None:
+        return 0
+
+    after_user_id = checkpoint.get("last_user_id") if checkpoint else None
+    sent = 0
+    async for last_user_id, emails in iter_reminder_recipients(
+        db, event.id, after_user_id=after_user_id, chunk_size=chunk_size
+    ):
+        if emails:
+            await email.send_event_reminders(emails, event)
+            sent += len(emails)
+        await progress.update_one(
+            {"_id": progress_id},
+            {
+                "$set": {
+                    "event_id": event.id,
+                    "last_user_id": last_user_id,
+                    "updated_at": datetime.now(tz=UTC),
+                },
+                "$inc": {"sent": len(emails)},
+            },
+            upsert=True,
+        )
+    completed_at = datetime.now(tz=UTC)
+    await progress.update_one(
+        {"_id": progress_id},
+        {
+            "$set": {
+                "event_id": event.id,
+                "completed_at": completed_at,
+                "updated_at": completed_at,
+            }
+        },
+        upsert=True,
+    )
+    return sent
@@ -0,0 +1,306 @@
+"""Pacing and failure isolation for calls to the email provider.
+
+``EmailThrottle`` wraps every Resend request made by ``ResendEmailSender``:
+
+- ``EmailRateLimiter`` is a token bucket kept in Redis, so all worker
+  processes share one provider budget (``EMAIL_RATE_LIMIT_PER_SECOND``,
+  Resend's default being 2 requests a second). A sender waits for a token
+  rather than collecting 429s. The outbox also keeps one small bucket per
+  recipient, so a burst of notifications to one address is spread out. When
+  Redis is unreachable the buckets fall back to this process.
+- ``CircuitBreaker`` opens after ``failure_threshold`` consecutive 429, 5xx or
+  transport failures. While it is open, sends raise ``EmailCircuitOpenError``
+  without calling the provider: the outbox parks its emails and reminder jobs
+  retry later. After ``cooldown`` a single send is let through as a probe,
+  while other senders keep waiting until it closes or re-opens the circuit. The
+  breaker is per process; each worker learns about an outage from its own
+  requests.
+- ``EmailSendStats`` counts requests, failures and time spent waiting or
+  sending. The worker publishes them with the outbox depth; see
+  ``publish_email_metrics``.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import socket
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import asdict, dataclass, field
+from datetime import timedelta
+from typing import Any, cast
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+EMAIL_KEY_PREFIX = "evently:email"
+EMAIL_METRICS_KEY = f"{EMAIL_KEY_PREFIX}:metrics"
+EMAIL_METRICS_TTL = timedelta(minutes=5)
+DEFAULT_EMAIL_RATE_LIMIT_PER_SECOND = 2.0
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_COOLDOWN = timedelta(seconds=30)
+CIRCUIT_PROBE_WAIT = timedelta(seconds=5)
+
+# KEYS: bucket. ARGV: tokens per ms, burst, idle TTL ms.
+# Returns 0 when a token was taken, else the ms until one is available.
+TOKEN_BUCKET_SCRIPT = """
+local rate, burst = tonumber(ARGV[1]), tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'at')
+local tokens = tonumber(state[1]) or burst
+local at = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - at) * rate)
+local wait = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  wait = math.ceil((1 - tokens) / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'at', now)
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+return wait
+"""
+
+_logger = logging.getLogger(__name__)
+
+
+class EmailCircuitOpenError(Exception):
+    """The provider is failing; nothing was sent. Retry after ``retry_after``."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f"Email circuit open; retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True, slots=True)
+class TokenBucket:
+    rate_per_second: float
+    burst: int
+
+
+# At most 10 transactional emails to one address per hour, in bursts of 5.
+RECIPIENT_BUCKET = TokenBucket(rate_per_second=10 / 3600, burst=5)
+
+
+def provider_bucket() -> TokenBucket:
+    rate = float(
+        os.getenv("EMAIL_RATE_LIMIT_PER_SECOND") or DEFAULT_EMAIL_RATE_LIMIT_PER_SECOND
+    )
+    return TokenBucket(rate_per_second=rate, burst=max(1, math.floor(rate)))
+
+
+@dataclass(slots=True)
+class EmailSendStats:
+    requests: int = 0
+    failures: int = 0
+    throttled: int = 0
+    refused_while_open: int = 0
+    circuit_opens: int = 0
+    rate_limit_wait_seconds: float = 0.0
+    latency_seconds_total: float = 0.0
+    latency_seconds_max: float = 0.0
+
+    def record_latency(self, seconds: float) -> None:
+        self.requests += 1
+        self.latency_seconds_total += seconds
+        self.latency_seconds_max = max(self.latency_seconds_max, seconds)
+
+    def as_dict(self) -> dict[str, int | float]:
+        return {
+            **asdict(self),
+            "latency_seconds_avg": (
+                self.latency_seconds_total / self.requests if self.requests else 0.0
+            ),
+        }
+
+
+class EmailRateLimiter:
+    """Token buckets in Redis when available, else in this process."""
+
+    def __init__(
+        self,
+        *,
+        redis: Redis | None = None,
+        key_prefix: str = EMAIL_KEY_PREFIX,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._redis = redis
+        self._key_prefix = key_prefix
+        self._clock = clock
+        self._local: dict[str, tuple[float, float]] = {}
+
+    def _take_local(self, key: str, bucket: TokenBucket) -> float:
+        now = self._clock()
+        tokens, at = self._local.get(key, (float(bucket.burst), now))
+        tokens = min(bucket.burst, tokens + (now - at) * bucket.rate_per_second)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / bucket.rate_per_second
+        self._local[key] = (tokens, now)
+        return wait
+
+    async def take(self, key: str, bucket: TokenBucket) -> float:
+        """Take a token from ``key``'s bucket; return 0, or seconds to wait."""
+        if self._redis is None:
+            return self._take_local(key, bucket)
+        idle_ms = math.ceil(bucket.burst / bucket.rate_per_second * 1000)
+        try:
+            wait_ms = await self._redis.register_script(TOKEN_BUCKET_SCRIPT)(
+                keys=[f"{self._key_prefix}:bucket:{key}"],
+                args=[bucket.rate_per_second / 1000, bucket.burst, idle_ms],
+            )
+        except RedisError:
+            _logger.warning("Email rate limiter unavailable", exc_info=True)
+            return self._take_local(key, bucket)
+        return int(wait_ms) / 1000
+
+    async def acquire(self, key: str, bucket: TokenBucket) -> float:
+        """Wait for a token; return the seconds spent waiting."""
+        waited = 0.0
+        while (wait := await self.take(key, bucket)) > 0:
+            await asyncio.sleep(wait)
+            waited += wait
+        return waited
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        cooldown: timedelta = CIRCUIT_COOLDOWN,
+        probe_wait: timedelta = CIRCUIT_PROBE_WAIT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._cooldown = cooldown.total_seconds()
+        self._probe_wait = probe_wait.total_seconds()
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probe_started_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.retry_after() > 0
+
+    def retry_after(self) -> float:
+        """Seconds until a send may be tried again; 0 when one may go now."""
+        if self._opened_at is None:
+            return 0.0
+        now = self._clock()
+        cooling = self._opened_at + self._cooldown - now
+        if cooling > 0:
+            return cooling
+        # A probe that never reported back (say, it was cancelled) stops
+        # blocking others after a cooldown.
+        if (
+            self._probe_started_at is not None
+            and now - self._probe_started_at < self._cooldown
+        ):
+            return self._probe_wait
+        return 0.0
+
+    def acquire(self) -> float:
+        """Claim a send; return 0, or the seconds to wait before trying again.
+
+        Once the cooldown is over, only one caller at a time gets 0: its send
+        is the probe that closes or re-opens the circuit.
+        """
+        wait = self.retry_after()
+        if wait == 0 and self._opened_at is not None:
+            self._probe_started_at = self._clock()
+        return wait
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probe_started_at = None
+
+    def record_failure(self) -> bool:
+        """Count a failure; return ``True`` if it opened the circuit."""
+        self._failures += 1
+        if self._probe_started_at is not None:
+            self._probe_started_at = None
+            self._opened_at = self._clock()
+            return True
+        if self._opened_at is not None or self._failures < self._failure_threshold:
+            # Requests sent before the circuit opened do not extend it.
+            return False
+        self._opened_at = self._clock()
+        return True
+
+
+@dataclass(slots=True)
+class EmailThrottle:
+    limiter: EmailRateLimiter
+    breaker: CircuitBreaker = field(default_factory=CircuitBreaker)
+    stats: EmailSendStats = field(default_factory=EmailSendStats)
+    bucket: TokenBucket = field(default_factory=provider_bucket)
+
+    async def before_send(self) -> None:
+        """Raise ``EmailCircuitOpenError`` or wait for a provider token."""
+        retry_after = self.breaker.acquire()
+        if retry_after > 0:
+            self.stats.refused_while_open += 1
+            raise EmailCircuitOpenError(retry_after)
+        self.stats.rate_limit_wait_seconds += await self.limiter.acquire(
+            "provider", self.bucket
+        )
+
+    def after_send(self, status_code: int | None, seconds: float) -> None:
+        """Record a request; ``status_code`` is ``None`` when it never completed."""
+        self.stats.record_latency(seconds)
+        if status_code is not None and status_code < 400:
+            self.breaker.record_success()
+            return
+        self.stats.failures += 1
+        if status_code == 429:
+            self.stats.throttled += 1
+        if status_code is None or status_code == 429 or status_code >= 500:
+            if self.breaker.record_failure():
+                self.stats.circuit_opens += 1
+                _logger.error(
+                    "Email provider failing; pausing sends for %.0fs",
+                    self.breaker.retry_after(),
+                )
+        else:
+            # A rejected message says nothing about the provider's health.
+            self.breaker.record_success()
+
+
+def create_email_throttle(redis: Redis | None = None) -> EmailThrottle:
+    return EmailThrottle(limiter=EmailRateLimiter(redis=redis))
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def publish_email_metrics(
+    redis: Redis,
+    throttle: EmailThrottle,
+    queue: Mapping[str, int | float],
+) -> dict[str, Any]:
+    """Store this worker's email metrics in Redis for ``read_email_metrics``."""
+    snapshot: dict[str, Any] = {
+        "sends": throttle.stats.as_dict(),
+        "circuit_open": throttle.breaker.is_open,
+        "outbox": dict(queue),
+    }
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.hset(EMAIL_METRICS_KEY, worker_id(), json.dumps(snapshot))
+        pipe.pexpire(EMAIL_METRICS_KEY, int(EMAIL_METRICS_TTL.total_seconds() * 1000))
+        await pipe.execute()
+    return snapshot
+
+
+async def read_email_metrics(redis: Redis) -> dict[str, Any]:
+    """Return the latest metrics published by each worker."""
+    raw = await cast(Awaitable[dict[bytes, bytes]], redis.hgetall(EMAIL_METRICS_KEY))
+    return {key.decode(): json.loads(value) for key, value in raw.items()}
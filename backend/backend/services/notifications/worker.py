@@ -1,50 +1,194 @@
-import asyncio
 import logging
-from typing import Any, TypedDict
+import os
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+from typing import Any, TypedDict, cast
 
+from arq.connections import ArqRedis
+from arq.cron import cron
+from arq.typing import WorkerCoroutine
+from arq.worker import Retry, func
 from pymongo.asynchronous.database import AsyncDatabase
 from pymongo.asynchronous.mongo_client import AsyncMongoClient
+from resend.exceptions import ResendError
 
+from backend.app_config import build_frontend_settings
 from backend.db.client import get_mongo_client
-from backend.models.attendance import AttendanceStatus
-from backend.models.event import Event
-from backend.services.notifications.arq import get_redis_settings
+from backend.db.indexes import ensure_indexes
+from backend.models.event import Event, EventStatus
+from backend.services.cache import ResponseCache
+from backend.services.calendar_sync_jobs import (
+    CALENDAR_SYNC_JOB_TIMEOUT,
+    process_calendar_sync_job,
+)
+from backend.services.capacity import CapacityLedger
+from backend.services.counters import reconcile_event_counters, reconcile_user_counters
+from backend.services.http_clients import HttpClients, create_http_clients
+from backend.services.locks import create_event_user_locks
+from backend.services.notifications.arq import (
+    ArqClient,
+    event_reminder_time,
+    get_redis_settings,
+    utc_naive_datetime,
+)
 from backend.services.notifications.email import (
     EmailNotificationService,
     create_email_notification_service,
 )
+from backend.services.notifications.outbox import drain_email_outbox, outbox_depth
+from backend.services.notifications.reminders import send_event_reminders
+from backend.services.notifications.throttle import (
+    EmailCircuitOpenError,
+    EmailThrottle,
+    create_email_throttle,
+    publish_email_metrics,
+)
+from backend.services.user_event_index import reconcile_user_event_index
+
+CAPACITY_FLUSH_INTERVAL_SECONDS = 10
+EMAIL_OUTBOX_DRAIN_INTERVAL_SECONDS = 10
+# A reminder job keeps retrying through a provider outage until its event
+# starts; with at least REMINDER_RETRY_DELAY between tries, this budget covers
+# the reminder lead time with room to spare.
+REMINDER_MAX_TRIES = 200
+REMINDER_RETRY_DELAY = timedelta(seconds=30)
+REMINDER_MAX_RETRY_DELAY = timedelta(minutes=5)
 
 
 class Context(TypedDict):
+    redis: ArqRedis
     client: AsyncMongoClient[dict[str, Any]]
     db: AsyncDatabase[dict[str, Any]]
     email: EmailNotificationService
+    email_throttle: EmailThrottle
+    http: HttpClients
+    job_try: int
 
 
 async def send_event_reminder(ctx: Context, event_id: int) -> None:
-    user_ids = await ctx["db"]["attendance"].distinct(
-        "user_id",
-        {
-            "event_id": event_id,
-            "status": {"$ne": AttendanceStatus.Cancelled.value},
-        },
-    )
-    users = await ctx["db"]["users"].find({"id": {"$in": user_ids}}).to_list(None)
+    logger = logging.getLogger(__name__)
     event_dict = await ctx["db"]["events"].find_one({"id": event_id})
     event = Event.model_validate(event_dict) if event_dict else None
     if event is None:
-        logging.getLogger(__name__).error(
-            "Event with id %s not found for reminder job", event_id
-        )
+        logger.error("Event with id %s not found for reminder job", event_id)
+        return
+    # Rejecting or rescheduling an event drops its queued reminder; these guard
+    # against jobs that were already running or that Redis failed to drop.
+    if event.status != EventStatus.Approved:
+        logger.info("Skipping reminder for event %s: %s", event_id, event.status)
+        return
+    now = datetime.now(UTC).replace(tzinfo=None)
+    if event_reminder_time(event.start_time) > now + timedelta(minutes=1):
+        logger.info("Skipping stale reminder for rescheduled event %s", event_id)
+        return
+    if utc_naive_datetime(event.start_time) <= now:
+        logger.error("Giving up on reminders for event %s: it has started", event_id)
         return
 
-    await asyncio.gather(
-        *[ctx["email"].send_event_reminder(user["email"], event) for user in users]
+    # Retries resume after the last chunk that was sent.
+    try:
+        await send_event_reminders(ctx["db"], ctx["email"], event)
+    except EmailCircuitOpenError as e:
+        logger.warning("Deferring reminders for event %s: %s", event_id, e)
+        delay = max(timedelta(seconds=e.retry_after), REMINDER_RETRY_DELAY)
+        raise Retry(defer=delay) from e
+    except ResendError as e:
+        delay = min(
+            REMINDER_RETRY_DELAY * ctx.get("job_try", 1), REMINDER_MAX_RETRY_DELAY
+        )
+        logger.warning(
+            "Reminders for event %s failed, retrying in %s: %s", event_id, delay, e
+        )
+        raise Retry(defer=delay) from e
+
+
+async def schedule_upcoming_reminders(ctx: Context) -> int:
+    """Top up reminder jobs as events enter the scheduling horizon."""
+    return await ArqClient(ctx["redis"]).schedule_all_upcoming_event_reminders(
+        ctx["db"]
     )
 
 
+async def send_outbox_emails(ctx: Context) -> int:
+    """Send confirmation and waitlist emails queued in the outbox."""
+    return await drain_email_outbox(
+        ctx["db"], ctx["email"], limiter=ctx["email_throttle"].limiter
+    )
+
+
+async def report_email_metrics(ctx: Context) -> None:
+    """Publish send latency, failures and outbox depth for ``/events/email-stats``."""
+    snapshot = await publish_email_metrics(
+        ctx["redis"], ctx["email_throttle"], await outbox_depth(ctx["db"])
+    )
+    logging.getLogger(__name__).info("Email metrics: %s", snapshot)
+
+
+async def run_calendar_sync_job(ctx: Context, job_id: str) -> None:
+    await process_calendar_sync_job(
+        ctx["db"],
+        job_id,
+        http_clients=ctx["http"],
+        frontend_settings=build_frontend_settings(os.getenv("FRONTEND_URL")),
+    )
+
+
+async def flush_capacity_ledger(ctx: Context) -> int:
+    """Copy seat counts held in the Redis capacity ledger back to MongoDB."""
+    # Event pages cached since the registration still show the old count.
+    detail_cache = ResponseCache("event_detail", redis=ctx["redis"])
+
+    async def invalidate(event_ids: list[int]) -> None:
+        for event_id in event_ids:
+            await detail_cache.invalidate(event_id)
+
+    return await CapacityLedger(redis=ctx["redis"]).flush(
+        ctx["db"], on_written=invalidate
+    )
+
+
+async def reconcile_counters(ctx: Context) -> int:
+    """Repair drift in the denormalized counters and the user event index."""
+    ledger = CapacityLedger(redis=ctx["redis"])
+    locks = create_event_user_locks(redis=ctx["redis"])
+
+    async def held_elsewhere(event_ids: Sequence[int]) -> set[int]:
+        # A ``local`` lock backend lives in the API process and is invisible
+        # here; reconcile's compare-and-set repairs still never clobber an $inc.
+        return await ledger.held_event_ids(event_ids) | await locks.held_event_ids(
+            ctx["db"], event_ids
+        )
+
+    repaired = await reconcile_event_counters(ctx["db"], held_elsewhere=held_elsewhere)
+    repaired += await reconcile_user_counters(ctx["db"])
+    return repaired + await reconcile_user_event_index(ctx["db"])
+
+
 class WorkerSettings:
-    functions = [send_event_reminder]
+    functions = [
+        func(cast(WorkerCoroutine, send_event_reminder), max_tries=REMINDER_MAX_TRIES),
+        # Progress is persisted per batch, so a retry would only redo the tail;
+        # instead the user starts a new job, which skips what already synced.
+        func(
+            cast(WorkerCoroutine, run_calendar_sync_job),
+            timeout=CALENDAR_SYNC_JOB_TIMEOUT,
+            max_tries=1,
+        ),
+    ]
+    # arq types cron coroutines as taking a plain dict; Context is a TypedDict.
+    cron_jobs = [
+        cron(
+            cast(WorkerCoroutine, flush_capacity_ledger),
+            second=set(range(0, 60, CAPACITY_FLUSH_INTERVAL_SECONDS)),
+        ),
+        cron(cast(WorkerCoroutine, reconcile_counters), minute={17}),
+        cron(cast(WorkerCoroutine, schedule_upcoming_reminders), minute={5}),
+        cron(
+            cast(WorkerCoroutine, send_outbox_emails),
+            second=set(range(0, 60, EMAIL_OUTBOX_DRAIN_INTERVAL_SECONDS)),
+        ),
+        cron(cast(WorkerCoroutine, report_email_metrics), second={30}),
+    ]
     redis_settings = get_redis_settings()
 
     @staticmethod
@@ -52,11 +196,17 @@ class WorkerSettings:
         client = get_mongo_client()
         ctx["client"] = client
         ctx["db"] = client["evently"]
-        ctx["email"] = create_email_notification_service(allow_missing=True)
+        await ensure_indexes(ctx["db"])
+        ctx["email_throttle"] = create_email_throttle(ctx["redis"])
+        ctx["email"] = create_email_notification_service(
+            allow_missing=True, throttle=ctx["email_throttle"]
+        )
+        ctx["http"] = create_http_clients()
 
     @staticmethod
     async def on_shutdown(ctx: Context) -> None:
         await ctx["client"].close()
+        await ctx["http"].aclose()
 
 
 def run() -> None:
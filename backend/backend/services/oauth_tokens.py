@@ -0,0 +1,295 @@
+"""Google OAuth tokens: encrypted storage and refresh.
+
+Tokens live in ``oauth_tokens``, keyed by an id kept in the user's session and
+encrypted with a key derived from ``SESSION_SECRET_KEY``. The auth routes
+store them at sign-in; ``get_google_calendar_access_token_for_session`` lets
+code outside a request (arq jobs) resolve a session's calendar access token,
+refreshing and re-storing it when it is about to expire.
+"""
+
+import logging
+from base64 import urlsafe_b64encode
+from collections.abc import Mapping
+from datetime import UTC, datetime, timedelta
+from functools import lru_cache
+from hashlib import sha256
+from json import dumps, loads
+from os import getenv
+from time import time
+from typing import Any
+
+import httpx
+from cryptography.fernet import Fernet, InvalidToken
+from fastapi import HTTPException
+from pymongo.asynchronous.database import AsyncDatabase
+
+GOOGLE_CALENDAR_SCOPE = "https://www.googleapis.com/auth/calendar.events"
+GOOGLE_TOKEN_REFRESH_URL = "https://oauth2.googleapis.com/token"
+OAUTH_NOT_CONFIGURED = "Google OAuth is not configured"
+OAUTH_TOKEN_COLLECTION = "oauth_tokens"
+_OAUTH_TOKEN_MAX_AGE = timedelta(days=30)
+
+
+def _string_value(value: object) -> str | None:
+    if isinstance(value, str):
+        normalized = value.strip()
+        return normalized or None
+    return None
+
+
+@lru_cache(maxsize=1)
+def _oauth_token_cipher() -> Fernet:
+    if not (session_secret_key := getenv("SESSION_SECRET_KEY")):
+        raise RuntimeError("SESSION_SECRET_KEY environment variable is not set")
+    digest = sha256(session_secret_key.encode("utf-8")).digest()
+    return Fernet(urlsafe_b64encode(digest))
+
+
+def _utc_datetime_value(value: object) -> datetime | None:
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
+
+
+def serialized_oauth_token(
+    token: Mapping[str, object], *, previous: Mapping[str, object] | None = None
+) -> dict[str, object] | None:
+    access_token = _string_value(token.get("access_token"))
+    if access_token is None:
+        return None
+
+    serialized: dict[str, object] = {"access_token": access_token}
+
+    if previous is None:
+        previous = {}
+
+    if token_type := (
+        _string_value(token.get("token_type"))
+        or _string_value(previous.get("token_type"))
+    ):
+        serialized["token_type"] = token_type
+
+    if scope := _string_value(token.get("scope")) or _string_value(
+        previous.get("scope")
+    ):
+        serialized["scope"] = scope
+
+    if refresh_token := _string_value(token.get("refresh_token")) or _string_value(
+        previous.get("refresh_token")
+    ):
+        serialized["refresh_token"] = refresh_token
+
+    expires_at = token.get("expires_at")
+    if isinstance(expires_at, int | float):
+        serialized["expires_at"] = int(expires_at)
+    else:
+        expires_in = token.get("expires_in")
+        if isinstance(expires_in, int | float):
+            serialized["expires_at"] = int(time()) + int(expires_in)
+        elif isinstance(previous_expires_at := previous.get("expires_at"), int | float):
+            serialized["expires_at"] = int(previous_expires_at)
+
+    return serialized
+
+
+def _stored_oauth_token(value: object) -> Mapping[str, object] | None:
+    if not isinstance(value, Mapping):
+        return None
+    access_token = value.get("access_token")
+    if not isinstance(access_token, str) or not access_token.strip():
+        return None
+    return value
+
+
+def _oauth_token_has_scope(token: Mapping[str, object], required_scope: str) -> bool:
+    scope = _string_value(token.get("scope"))
+    if scope is None:
+        return True
+    return required_scope in scope.split()
+
+
+def _oauth_token_needs_refresh(token: Mapping[str, object]) -> bool:
+    expires_at = token.get("expires_at")
+    if not isinstance(expires_at, int | float):
+        return False
+    return time() >= float(expires_at) - 60
+
+
+async def refresh_oauth_token(
+    token: Mapping[str, object], *, client: httpx.AsyncClient
+) -> dict[str, object]:
+    refresh_token = _string_value(token.get("refresh_token"))
+    if refresh_token is None:
+        raise HTTPException(
+            status_code=403,
+            detail="Google Calendar access has expired. Please sign in again.",
+        )
+
+    client_id = getenv("OAUTH_CLIENT_ID")
+    client_secret = getenv("OAUTH_CLIENT_SECRET")
+    if not client_id or not client_secret:
+        raise HTTPException(status_code=503, detail=OAUTH_NOT_CONFIGURED)
+
+    try:
+        response = await client.post(
+            GOOGLE_TOKEN_REFRESH_URL,
+            data={
+                "client_id": client_id,
+                "client_secret": client_secret,
+                "grant_type": "refresh_token",
+                "refresh_token": refresh_token,
+            },
+        )
+    except httpx.HTTPError as exc:
+        logging.getLogger(__name__).error("Google token refresh failed: %s", exc)
+        raise HTTPException(
+            status_code=502,
+            detail="Could not refresh Google Calendar access.",
+        ) from exc
+
+    if response.status_code in {400, 401}:
+        raise HTTPException(
+            status_code=403,
+            detail="Google Calendar access has expired. Please sign in again.",
+        )
+
+    if not response.is_success:
+        raise HTTPException(
+            status_code=502,
+            detail="Could not refresh Google Calendar access.",
+        )
+
+    try:
+        payload = response.json()
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=502,
+            detail="Could not refresh Google Calendar access.",
+        ) from exc
+
+    if not isinstance(payload, Mapping):
+        raise HTTPException(
+            status_code=502,
+            detail="Could not refresh Google Calendar access.",
+        )
+
+    refreshed = serialized_oauth_token(payload, previous=token)
+    if refreshed is None:
+        raise HTTPException(
+            status_code=502,
+            detail="Could not refresh Google Calendar access.",
+        )
+
+    return refreshed
+
+
+async def write_oauth_token(
+    db: AsyncDatabase[dict[str, Any]],
+    session_id: str,
+    serialized: Mapping[str, object],
+) -> None:
+    encrypted_token = (
+        _oauth_token_cipher()
+        .encrypt(dumps(dict(serialized)).encode("utf-8"))
+        .decode("utf-8")
+    )
+    now = datetime.now(tz=UTC)
+    await db[OAUTH_TOKEN_COLLECTION].update_one(
+        {"_id": session_id},
+        {
+            "$set": {
+                "encrypted_token": encrypted_token,
+                "updated_at": now,
+                "expires_at": serialized.get("expires_at"),
+            }
+        },
+        upsert=True,
+    )
+
+
+def decoded_oauth_token(stored: Mapping[str, Any]) -> Mapping[str, object] | None:
+    updated_at = _utc_datetime_value(stored.get("updated_at"))
+    if (
+        updated_at is not None
+        and updated_at < datetime.now(tz=UTC) - _OAUTH_TOKEN_MAX_AGE
+    ):
+        return None
+
+    encrypted_token = stored.get("encrypted_token")
+    if not isinstance(encrypted_token, str) or not encrypted_token.strip():
+        return None
+
+    try:
+        decrypted = _oauth_token_cipher().decrypt(encrypted_token.encode("utf-8"))
+        payload = loads(decrypted.decode("utf-8"))
+    except (InvalidToken, UnicodeDecodeError, TypeError, ValueError):
+        return None
+
+    if not isinstance(payload, Mapping):
+        return None
+    return _stored_oauth_token(payload)
+
+
+async def _load_oauth_token_for_session(
+    db: AsyncDatabase[dict[str, Any]], session_id: str
+) -> Mapping[str, object] | None:
+    stored = await db[OAUTH_TOKEN_COLLECTION].find_one({"_id": session_id})
+    if not isinstance(stored, Mapping):
+        return None
+    token = decoded_oauth_token(stored)
+    if token is None:
+        await db[OAUTH_TOKEN_COLLECTION].delete_one({"_id": session_id})
+    return token
+
+
+async def google_calendar_access_token(
+    stored_token: Mapping[str, object] | None, *, client: httpx.AsyncClient
+) -> tuple[str, dict[str, object] | None]:
+    """Return a usable access token and, if it had to be refreshed, the new token."""
+    if stored_token is None:
+        raise HTTPException(
+            status_code=403,
+            detail="Google Calendar access is not available for this session. Please sign in again.",
+        )
+
+    if not _oauth_token_has_scope(stored_token, GOOGLE_CALENDAR_SCOPE):
+        raise HTTPException(
+            status_code=403,
+            detail="Google Calendar permission has not been granted. Please sign in again.",
+        )
+
+    refreshed: dict[str, object] | None = None
+    if _oauth_token_needs_refresh(stored_token):
+        refreshed = await refresh_oauth_token(stored_token, client=client)
+        stored_token = refreshed
+
+    access_token = _string_value(stored_token.get("access_token"))
+    if access_token is None:
+        raise HTTPException(
+            status_code=403,
+            detail="Google Calendar access is not available for this session. Please sign in again.",
+        )
+
+    return access_token, refreshed
+
+
+async def get_google_calendar_access_token_for_session(
+    db: AsyncDatabase[dict[str, Any]],
+    session_id: str,
+    *,
+    client: httpx.AsyncClient,
+) -> str:
+    """Resolve a session's calendar access token outside a request (arq jobs)."""
+    stored_token = await _load_oauth_token_for_session(db, session_id)
+    access_token, refreshed = await google_calendar_access_token(
+        stored_token, client=client
+    )
+    if refreshed is not None:
+        serialized = serialized_oauth_token(refreshed, previous=stored_token)
+        if serialized is None:
+            await db[OAUTH_TOKEN_COLLECTION].delete_one({"_id": session_id})
+        else:
+            await write_oauth_token(db, session_id, serialized)
+    return access_token
@@ -0,0 +1,69 @@
+"""Opaque keyset pagination cursors.
+
+A cursor records the sort key and ``id`` of the last row a client received, so
+the next page is a range seek (``key > last`` or ``key == last and id > last``)
+on a ``(key, id)`` index rather than a ``skip`` over every earlier row.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+
+_DATETIME_TAG = "$dt"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor cannot be decoded."""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {_DATETIME_TAG: value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and set(value) == {_DATETIME_TAG}:
+        return datetime.fromisoformat(value[_DATETIME_TAG])
+    return value
+
+
+def encode_cursor(payload: dict[str, Any]) -> str:
+    """Serialize a cursor payload into a URL-safe token."""
+    data = {key: _encode_value(value) for key, value in payload.items()}
+    raw = json.dumps(data, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> dict[str, Any]:
+    """Parse a token produced by ``encode_cursor``."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        data = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError("Malformed cursor") from exc
+    if not isinstance(data, dict):
+        raise InvalidCursorError("Malformed cursor")
+    try:
+        return {key: _decode_value(value) for key, value in data.items()}
+    except (TypeError, ValueError) as exc:
+        raise InvalidCursorError("Malformed cursor") from exc
+
+
+def keyset_filter(
+    sort_key: str, direction: int, last_value: Any, last_id: int
+) -> dict[str, Any]:
+    """Rows strictly after ``(last_value, last_id)`` in ``direction`` order.
+
+    ``id`` breaks ties in the same direction as the sort key so that a single
+    ascending ``(key, id)`` index serves both sort orders.
+    """
+    comparison = "$gt" if direction > 0 else "$lt"
+    return {
+        "$or": [
+            {sort_key: {comparison: last_value}},
+            {sort_key: last_value, "id": {comparison: last_id}},
+        ]
+    }
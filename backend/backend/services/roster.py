@@ -0,0 +1,257 @@
+"""Event attendee rosters, paginated and streamed.
+
+The roster is one aggregation: it matches the event's attendance documents in
+the requested statuses and joins each user with ``$lookup``, so the database
+does the work and the API never holds the whole attendance list. Pages seek on
+a ``(last name, first name, user id)`` keyset cursor. The counts by status come
+from a ``$group`` over ``attendance`` alone, without joining any users.
+Exports run the same pipeline without a limit and stream the aggregation cursor
+row by row; CSV cells that a spreadsheet would run as a formula are escaped.
+"""
+
+import asyncio
+import csv
+import io
+import json
+import re
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any, Literal
+
+from pymongo.asynchronous.database import AsyncDatabase
+
+from backend.models.attendance import REGISTERED_ATTENDANCE_STATUSES, AttendanceStatus
+from backend.services.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+)
+
+DEFAULT_ROSTER_PAGE_SIZE = 100
+MAX_ROSTER_PAGE_SIZE = 500
+ROSTER_EXPORT_BATCH_SIZE = 500
+ROSTER_EXPORT_COLUMNS = (
+    "user_id",
+    "first_name",
+    "last_name",
+    "email",
+    "status",
+    "checked_in_at",
+)
+
+# Characters that make a spreadsheet treat a CSV cell as a formula.
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+type RosterStatus = Literal["going", "checked_in"]
+type RosterFormat = Literal["csv", "ndjson"]
+
+_SORT_KEYS = ("last_key", "first_key", "user_id")
+
+
+def _roster_statuses(status: RosterStatus | None) -> list[str]:
+    return [status] if status is not None else list(REGISTERED_ATTENDANCE_STATUSES)
+
+
+def _roster_base_pipeline(
+    event_id: int, status: RosterStatus | None
+) -> list[dict[str, Any]]:
+    """The event's attendance documents in ``status``, joined to each profile.
+
+    Users without a profile are dropped, as the roster cannot show them.
+    """
+    return [
+        {"$match": {"event_id": event_id, "status": {"$in": _roster_statuses(status)}}},
+        {
+            "$lookup": {
+                "from": "users",
+                "localField": "user_id",
+                "foreignField": "id",
+                "as": "user",
+                "pipeline": [
+                    {
+                        "$project": {
+                            "_id": 0,
+                            "first_name": 1,
+                            "last_name": 1,
+                            "email": 1,
+                            "profile_photo_url": 1,
+                        }
+                    }
+                ],
+            }
+        },
+        {"$unwind": "$user"},
+        {
+            "$project": {
+                "_id": 0,
+                "user_id": 1,
+                "first_name": {"$ifNull": ["$user.first_name", ""]},
+                "last_name": {"$ifNull": ["$user.last_name", ""]},
+                "email": {"$ifNull": ["$user.email", ""]},
+                "profile_photo_url": {"$ifNull": ["$user.profile_photo_url", None]},
+                "status": 1,
+                "checked_in_at": 1,
+                "last_key": {"$toLower": {"$ifNull": ["$user.last_name", ""]}},
+                "first_key": {"$toLower": {"$ifNull": ["$user.first_name", ""]}},
+            }
+        },
+    ]
+
+
+def _roster_filter(search: str | None) -> list[dict[str, Any]]:
+    if not (search and search.strip()):
+        return []
+    pattern = {"$regex": re.escape(search.strip()), "$options": "i"}
+    return [
+        {
+            "$match": {
+                "$or": [
+                    {"first_name": pattern},
+                    {"last_name": pattern},
+                    {"email": pattern},
+                ]
+            }
+        }
+    ]
+
+
+async def roster_counts(
+    db: AsyncDatabase[dict[str, Any]], event_id: int
+) -> dict[str, int]:
+    """Count the event's registered and waitlisted attendance by status."""
+    pipeline: list[dict[str, Any]] = [
+        {
+            "$match": {
+                "event_id": event_id,
+                "status": {
+                    "$in": [
+                        *REGISTERED_ATTENDANCE_STATUSES,
+                        AttendanceStatus.Waitlisted.value,
+                    ]
+                },
+            }
+        },
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+    ]
+    cursor = await db["attendance"].aggregate(pipeline)
+    return {entry["_id"]: entry["count"] async for entry in cursor}
+
+
+def encode_roster_cursor(row: dict[str, Any]) -> str:
+    return encode_cursor(
+        {"last": row["last_key"], "first": row["first_key"], "id": row["user_id"]}
+    )
+
+
+def decode_roster_cursor(token: str) -> dict[str, Any]:
+    """Return a ``$match`` for rows after the cursor; raises ``InvalidCursorError``."""
+    payload = decode_cursor(token)
+    last, first, user_id = payload.get("last"), payload.get("first"), payload.get("id")
+    if not (
+        isinstance(last, str) and isinstance(first, str) and isinstance(user_id, int)
+    ):
+        raise InvalidCursorError("Malformed cursor")
+    return {
+        "$or": [
+            {"last_key": {"$gt": last}},
+            {"last_key": last, "first_key": {"$gt": first}},
+            {"last_key": last, "first_key": first, "user_id": {"$gt": user_id}},
+        ]
+    }
+
+
+async def roster_page(
+    db: AsyncDatabase[dict[str, Any]],
+    event_id: int,
+    *,
+    limit: int = DEFAULT_ROSTER_PAGE_SIZE,
+    after: dict[str, Any] | None = None,
+    status: RosterStatus | None = None,
+    search: str | None = None,
+) -> tuple[list[dict[str, Any]], dict[str, int], str | None]:
+    """Return ``(rows, counts by status, next cursor)`` for one roster page.
+
+    ``after`` is a match from ``decode_roster_cursor``. Counts cover the whole
+    roster, not just the rows that match the filters.
+    """
+    pipeline = [*_roster_base_pipeline(event_id, status), *_roster_filter(search)]
+    if after is not None:
+        pipeline.append({"$match": after})
+    pipeline += [
+        {"$sort": dict.fromkeys(_SORT_KEYS, 1)},
+        {"$limit": limit + 1},
+    ]
+
+    async def page() -> list[dict[str, Any]]:
+        cursor = await db["attendance"].aggregate(pipeline)
+        return await cursor.to_list(length=limit + 1)
+
+    fetched, counts = await asyncio.gather(page(), roster_counts(db, event_id))
+    rows = fetched[:limit]
+    next_cursor = encode_roster_cursor(rows[-1]) if len(fetched) > limit else None
+    return rows, counts, next_cursor
+
+
+async def iter_roster(
+    db: AsyncDatabase[dict[str, Any]],
+    event_id: int,
+    *,
+    status: RosterStatus | None = None,
+    search: str | None = None,
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield every matching roster row in roster order, one batch at a time."""
+    pipeline = [
+        *_roster_base_pipeline(event_id, status),
+        *_roster_filter(search),
+        {"$sort": dict.fromkeys(_SORT_KEYS, 1)},
+    ]
+    cursor = await db["attendance"].aggregate(
+        pipeline, allowDiskUse=True, batchSize=ROSTER_EXPORT_BATCH_SIZE
+    )
+    async with cursor:
+        async for row in cursor:
+            yield row
+
+
+def _export_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _export_record(row: dict[str, Any]) -> dict[str, Any]:
+    return {column: _export_value(row.get(column)) for column in ROSTER_EXPORT_COLUMNS}
+
+
+def _csv_cell(value: Any) -> Any:
+    """Prefix text a spreadsheet would evaluate, so it is shown as typed."""
+    if value is None:
+        return ""
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+async def export_roster(
+    rows: AsyncIterator[dict[str, Any]], fmt: RosterFormat
+) -> AsyncIterator[str]:
+    """Render roster rows as CSV (with a header) or NDJSON, line by line."""
+    if fmt == "ndjson":
+        async for row in rows:
+            yield json.dumps(_export_record(row)) + "\n"
+        return
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=ROSTER_EXPORT_COLUMNS)
+
+    def flush() -> str:
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    writer.writeheader()
+    yield flush()
+    async for row in rows:
+        writer.writerow(
+            {key: _csv_cell(value) for key, value in _export_record(row).items()}
+        )
+        yield flush()
@@ -0,0 +1,237 @@
+"""Append-only per-user activity log behind ``GET /users/{user_id}/activity``.
+
+Every creation, registration, check-in and cancellation appends one document
+to ``user_activity``::
+
+    {user_id, ts, action, event_id}
+
+The feed is then a single range read on the ``(user_id, ts, _id)`` index,
+paginated with a keyset cursor, that joins each entry to its event with
+``$lookup`` before the limit, so entries for deleted events never shorten a page.
+Entries are never updated: undoing a check-in, for instance, leaves the
+"attended" entry in place, as the feed is a history of what the user did.
+
+``backfill_user_activity`` (the ``backend backfill-activity`` command) seeds the
+log from ``events`` and ``attendance`` for databases written before it existed.
+"""
+
+import logging
+from collections.abc import Mapping
+from datetime import UTC, datetime
+from typing import Any, Literal, cast
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import UpdateOne
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import PyMongoError
+
+from backend.models.attendance import REGISTERED_ATTENDANCE_STATUSES, AttendanceStatus
+from backend.services.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+)
+
+USER_ACTIVITY_COLLECTION = "user_activity"
+DEFAULT_ACTIVITY_PAGE_SIZE = 10
+MAX_ACTIVITY_PAGE_SIZE = 50
+BACKFILL_BATCH_SIZE = 500
+
+type ActivityAction = Literal["attended", "cancelled", "created", "registered"]
+
+_ACTION_BY_STATUS: dict[str, ActivityAction] = {
+    AttendanceStatus.Going.value: "registered",
+    AttendanceStatus.CheckedIn.value: "attended",
+    AttendanceStatus.Cancelled.value: "cancelled",
+}
+
+_logger = logging.getLogger(__name__)
+
+
+def _entry(
+    user_id: int, action: ActivityAction, event_id: int, ts: datetime
+) -> dict[str, Any]:
+    return {"user_id": user_id, "ts": ts, "action": action, "event_id": event_id}
+
+
+async def _append(
+    db: AsyncDatabase[dict[str, Any]], entries: list[dict[str, Any]]
+) -> None:
+    if not entries:
+        return
+    try:
+        await db[USER_ACTIVITY_COLLECTION].insert_many(entries, ordered=False)
+    except PyMongoError:
+        _logger.warning("Could not append user activity", exc_info=True)
+
+
+async def log_attendance_activity(
+    db: AsyncDatabase[dict[str, Any]], *rows: Mapping[str, Any]
+) -> None:
+    """Append the activity implied by each row's new attendance status.
+
+    Check-ins are dated by ``checked_in_at``, so synced offline scans land at
+    the time they were made. Waitlist moves are not activity.
+    """
+    now = datetime.now(tz=UTC)
+    entries = [
+        _entry(
+            row["user_id"],
+            action,
+            row["event_id"],
+            (row.get("checked_in_at") if action == "attended" else None) or now,
+        )
+        for row in rows
+        if (action := _ACTION_BY_STATUS.get(row["status"])) is not None
+    ]
+    await _append(db, entries)
+
+
+async def log_event_created(
+    db: AsyncDatabase[dict[str, Any]],
+    *,
+    event_id: int,
+    organizer_user_id: int,
+    created_at: datetime,
+) -> None:
+    """Append a "created" entry dated by the event document's creation time."""
+    await _append(db, [_entry(organizer_user_id, "created", event_id, created_at)])
+
+
+def event_created_at(event: Mapping[str, Any]) -> datetime:
+    """When an event document was inserted, from its ObjectId.
+
+    Events stored with another kind of ``_id`` fall back to their start time.
+    """
+    if isinstance(object_id := event.get("_id"), ObjectId):
+        return object_id.generation_time
+    return cast(datetime, event["start_time"])
+
+
+def encode_activity_cursor(entry: Mapping[str, Any]) -> str:
+    return encode_cursor({"ts": entry["ts"], "id": str(entry["_id"])})
+
+
+def decode_activity_cursor(token: str) -> dict[str, Any]:
+    """Return a ``$match`` for entries after the cursor; raises ``InvalidCursorError``."""
+    payload = decode_cursor(token)
+    ts, raw_id = payload.get("ts"), payload.get("id")
+    if not (isinstance(ts, datetime) and isinstance(raw_id, str)):
+        raise InvalidCursorError("Malformed cursor")
+    try:
+        entry_id = ObjectId(raw_id)
+    except InvalidId as exc:
+        raise InvalidCursorError("Malformed cursor") from exc
+    return {
+        "$or": [
+            {"ts": {"$lt": ts}},
+            {"ts": ts, "_id": {"$lt": entry_id}},
+        ]
+    }
+
+
+async def activity_page(
+    db: AsyncDatabase[dict[str, Any]],
+    user_id: int,
+    *,
+    limit: int = DEFAULT_ACTIVITY_PAGE_SIZE,
+    after: dict[str, Any] | None = None,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Return ``(log entries, next cursor)``, newest first.
+
+    Each entry carries its event as ``event``; entries whose event no longer
+    exists are skipped. ``after`` is a match from ``decode_activity_cursor``.
+    """
+    query: dict[str, Any] = {"user_id": user_id}
+    if after is not None:
+        query.update(after)
+    cursor = await db[USER_ACTIVITY_COLLECTION].aggregate(
+        [
+            {"$match": query},
+            {"$sort": {"ts": -1, "_id": -1}},
+            {
+                "$lookup": {
+                    "from": "events",
+                    "localField": "event_id",
+                    "foreignField": "id",
+                    "as": "event",
+                    "pipeline": [
+                        {
+                            "$project": {
+                                "_id": 0,
+                                "id": 1,
+                                "title": 1,
+                                "image_url": 1,
+                                "end_time": 1,
+                            }
+                        }
+                    ],
+                }
+            },
+            {"$unwind": "$event"},
+            {"$limit": limit + 1},
+        ]
+    )
+    entries = await cursor.to_list(length=limit + 1)
+    next_cursor = (
+        encode_activity_cursor(entries[limit - 1]) if len(entries) > limit else None
+    )
+    return entries[:limit], next_cursor
+
+
+async def backfill_user_activity(
+    db: AsyncDatabase[dict[str, Any]], *, batch_size: int = BACKFILL_BATCH_SIZE
+) -> int:
+    """Seed the log from current events and attendance; return entries added.
+
+    Older data records no history, so each created event and each live
+    registration yields one entry for its current state: created events are
+    dated by the event document's creation time, as live entries are,
+    check-ins by ``checked_in_at`` and other registrations by the attendance
+    document's creation time. Entries are upserted on
+    ``(user_id, action, event_id)``, so a state the log already holds, whether
+    from live logging or an earlier backfill, adds nothing.
+    """
+    collection = db[USER_ACTIVITY_COLLECTION]
+    operations: list[UpdateOne] = []
+    added = 0
+
+    def add(user_id: int, action: ActivityAction, event_id: int, ts: Any) -> None:
+        key = {"user_id": user_id, "action": action, "event_id": event_id}
+        operations.append(
+            UpdateOne(
+                key, {"$setOnInsert": {"ts": ts, "backfilled": True}}, upsert=True
+            )
+        )
+
+    async def flush() -> None:
+        nonlocal operations, added
+        if operations:
+            result = await collection.bulk_write(operations, ordered=False)
+            added += result.upserted_count
+            operations = []
+
+    events = db["events"].find({}, {"id": 1, "organizer_user_id": 1, "start_time": 1})
+    async for event in events:
+        add(event["organizer_user_id"], "created", event["id"], event_created_at(event))
+        if len(operations) >= batch_size:
+            await flush()
+
+    registrations = db["attendance"].find(
+        {"status": {"$in": list(REGISTERED_ATTENDANCE_STATUSES)}},
+        {"event_id": 1, "user_id": 1, "status": 1, "checked_in_at": 1},
+    )
+    async for row in registrations:
+        add(
+            row["user_id"],
+            _ACTION_BY_STATUS[row["status"]],
+            row["event_id"],
+            row.get("checked_in_at") or row["_id"].generation_time,
+        )
+        if len(operations) >= batch_size:
+            await flush()
+    await flush()
+
+    _logger.info("Backfilled %d user activity entries", added)
+    return added
@@ -0,0 +1,414 @@
+"""Saved-calendar state and bulk Google Calendar sync for one user.
+
+These functions take plain values rather than a ``Request`` so the same code
+runs inside ``POST``/``DELETE /users/{id}/calendar/sync/google`` and in the arq
+worker when a sync is run in the background.
+"""
+
+import logging
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+import httpx
+from fastapi import HTTPException
+from pydantic import ValidationError
+from pymongo import UpdateOne
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import DuplicateKeyError
+
+from backend.app_config import FrontendSettings
+from backend.models.attendance import REGISTERED_ATTENDANCE_STATUSES
+from backend.models.event import Event
+from backend.services.calendar_bulk_sync import (
+    BulkSyncOutcome,
+    run_bulk_sync,
+    user_pacer,
+)
+from backend.services.calendar_sync import (
+    create_google_calendar_event,
+    delete_google_calendar_event,
+    google_calendar_event_payload,
+)
+
+USER_CALENDAR_COLLECTION = "user_calendar_entries"
+USER_CALENDAR_SYNC_COLLECTION = "user_calendar_syncs"
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class CalendarSyncProgress:
+    """Running totals for one bulk sync or unsync."""
+
+    total: int = 0
+    completed: int = 0
+    skipped: int = 0
+    failed_event_ids: list[int] = field(default_factory=list)
+
+    @property
+    def failed(self) -> int:
+        return len(self.failed_event_ids)
+
+    @property
+    def processed(self) -> int:
+        return self.completed + self.failed
+
+
+ProgressCallback = Callable[[CalendarSyncProgress], Awaitable[None]]
+
+
+def _string_value(value: object) -> str | None:
+    if isinstance(value, str):
+        normalized = value.strip()
+        return normalized or None
+    return None
+
+
+def frontend_event_url(
+    frontend_settings: FrontendSettings, event_id: int
+) -> str | None:
+    if frontend_settings.primary_origin:
+        return f"{frontend_settings.primary_origin}/events/{event_id}"
+    if frontend_settings.allowed_origins:
+        return f"{frontend_settings.allowed_origins[0]}/events/{event_id}"
+    return None
+
+
+async def google_sync_enabled(db: AsyncDatabase[dict[str, Any]], user_id: int) -> bool:
+    raw = await db[USER_CALENDAR_SYNC_COLLECTION].find_one({"user_id": user_id})
+    return raw is not None and raw.get("google_sync_enabled") is True
+
+
+async def _set_google_sync_enabled(
+    db: AsyncDatabase[dict[str, Any]], user_id: int, enabled: bool
+) -> None:
+    await db[USER_CALENDAR_SYNC_COLLECTION].update_one(
+        {"user_id": user_id},
+        {
+            "$set": {
+                "google_sync_enabled": enabled,
+                "updated_at": datetime.now(tz=UTC),
+            }
+        },
+        upsert=True,
+    )
+
+
+async def update_google_sync_enabled(
+    db: AsyncDatabase[dict[str, Any]], user_id: int, enabled: bool
+) -> None:
+    try:
+        await _set_google_sync_enabled(db, user_id, enabled)
+    except HTTPException:
+        raise
+    except Exception as exc:
+        _logger.exception(
+            "Failed to update Google Calendar sync settings for user %s", user_id
+        )
+        raise HTTPException(
+            status_code=502,
+            detail="Could not update your Google Calendar sync settings. Please try again.",
+        ) from exc
+
+
+async def calendar_entries_for_user(
+    db: AsyncDatabase[dict[str, Any]], user_id: int
+) -> list[dict[str, Any]]:
+    return await (
+        db[USER_CALENDAR_COLLECTION]
+        .find({"user_id": user_id})
+        .sort("added_at", -1)
+        .to_list(length=None)
+    )
+
+
+async def events_by_id(
+    db: AsyncDatabase[dict[str, Any]], event_ids: list[int]
+) -> dict[int, Event]:
+    events: dict[int, Event] = {}
+    if not event_ids:
+        return events
+
+    async for raw_event in db["events"].find({"id": {"$in": event_ids}}):
+        try:
+            event = Event(**raw_event)
+        except ValidationError:
+            _logger.warning(
+                "Skipping invalid event %r while building calendar data",
+                raw_event.get("id"),
+                exc_info=True,
+            )
+            continue
+        events[event.id] = event
+    return events
+
+
+async def add_calendar_entry(
+    db: AsyncDatabase[dict[str, Any]], *, user_id: int, event_id: int
+) -> None:
+    """Save an event to a user's in-app calendar unless it is already there."""
+    with suppress(DuplicateKeyError):
+        await db[USER_CALENDAR_COLLECTION].insert_one(
+            {"user_id": user_id, "event_id": event_id, "added_at": datetime.now(tz=UTC)}
+        )
+
+
+async def backfill_registered_calendar_entries(
+    db: AsyncDatabase[dict[str, Any]], user_id: int
+) -> None:
+    existing_entries = await calendar_entries_for_user(db, user_id)
+    existing_event_ids = {
+        int(entry["event_id"])
+        for entry in existing_entries
+        if isinstance(entry.get("event_id"), int)
+    }
+
+    registered_event_ids = await db["attendance"].distinct(
+        "event_id",
+        {"user_id": user_id, "status": {"$in": list(REGISTERED_ATTENDANCE_STATUSES)}},
+    )
+    missing_event_ids = [
+        event_id
+        for event_id in registered_event_ids
+        if isinstance(event_id, int) and event_id not in existing_event_ids
+    ]
+    if not missing_event_ids:
+        return
+
+    events = await events_by_id(db, missing_event_ids)
+    for event_id in missing_event_ids:
+        if event_id in events:
+            await add_calendar_entry(db, user_id=user_id, event_id=event_id)
+
+
+def _is_fatal_google_sync_error(exc: Exception) -> bool:
+    """Auth and availability errors fail every remaining call the same way."""
+    return isinstance(exc, HTTPException) and exc.status_code in {403, 503}
+
+
+def _raise_if_nothing_synced[T, R](outcome: BulkSyncOutcome[T, R]) -> None:
+    """Surface the error itself when every attempted entry failed.
+
+    Partial failures are reported in the result instead; entries that failed
+    are retried by the next sync.
+    """
+    if outcome.failed and not outcome.completed:
+        raise outcome.failed[0][1]
+
+
+async def _create_google_calendar_event_for_calendar_sync(
+    access_token: str,
+    *,
+    user_id: int,
+    event: Event,
+    client: httpx.AsyncClient,
+    frontend_settings: FrontendSettings,
+) -> dict[str, object]:
+    try:
+        return await create_google_calendar_event(
+            access_token,
+            google_calendar_event_payload(
+                event,
+                event_url=frontend_event_url(frontend_settings, event.id),
+            ),
+            client=client,
+        )
+    except HTTPException:
+        raise
+    except Exception as exc:
+        _logger.exception(
+            "Unexpected Google Calendar sync failure for user %s event %s",
+            user_id,
+            event.id,
+        )
+        raise HTTPException(
+            status_code=502,
+            detail="Could not sync your calendar to Google Calendar. Please try again.",
+        ) from exc
+
+
+async def _report(
+    on_progress: ProgressCallback | None, progress: CalendarSyncProgress
+) -> None:
+    if on_progress is not None:
+        await on_progress(progress)
+
+
+async def sync_calendar_to_google(
+    db: AsyncDatabase[dict[str, Any]],
+    user_id: int,
+    *,
+    access_token: str,
+    client: httpx.AsyncClient,
+    frontend_settings: FrontendSettings,
+    on_progress: ProgressCallback | None = None,
+) -> CalendarSyncProgress:
+    """Push every unsynced saved entry to Google and enable ongoing sync."""
+    try:
+        await backfill_registered_calendar_entries(db, user_id)
+        entries = await calendar_entries_for_user(db, user_id)
+        events = await events_by_id(db, [int(entry["event_id"]) for entry in entries])
+    except HTTPException:
+        raise
+    except Exception as exc:
+        _logger.exception(
+            "Database error while preparing calendar sync for user %s", user_id
+        )
+        raise HTTPException(
+            status_code=502,
+            detail="Could not read your calendar data. Please try again.",
+        ) from exc
+
+    progress = CalendarSyncProgress()
+    pending: list[tuple[dict[str, Any], Event]] = []
+    for entry in entries:
+        if _string_value(entry.get("google_calendar_event_id")) is not None:
+            progress.skipped += 1
+            continue
+
+        event = events.get(int(entry["event_id"]))
+        if event is None:
+            progress.skipped += 1
+            continue
+        pending.append((entry, event))
+    progress.total = len(pending)
+    await _report(on_progress, progress)
+
+    async def create(item: tuple[dict[str, Any], Event]) -> tuple[str, str | None]:
+        _, event = item
+        try:
+            google_event = await _create_google_calendar_event_for_calendar_sync(
+                access_token,
+                user_id=user_id,
+                event=event,
+                client=client,
+                frontend_settings=frontend_settings,
+            )
+            google_event_id = _string_value(google_event.get("id"))
+            if google_event_id is None:
+                raise HTTPException(
+                    status_code=502,
+                    detail="Google Calendar returned an invalid response.",
+                )
+        except Exception:
+            progress.failed_event_ids.append(event.id)
+            raise
+        return google_event_id, _string_value(google_event.get("htmlLink"))
+
+    async def persist(
+        batch: list[tuple[tuple[dict[str, Any], Event], tuple[str, str | None]]],
+    ) -> None:
+        try:
+            await db[USER_CALENDAR_COLLECTION].bulk_write(
+                [
+                    UpdateOne(
+                        {"_id": entry["_id"]},
+                        {
+                            "$set": {
+                                "google_calendar_event_id": google_event_id,
+                                "google_calendar_event_url": google_event_url,
+                            }
+                        },
+                    )
+                    for (entry, _), (google_event_id, google_event_url) in batch
+                ],
+                ordered=False,
+            )
+        except Exception as exc:
+            for _, (google_event_id, _) in batch:
+                try:
+                    await delete_google_calendar_event(
+                        access_token, google_event_id, client=client
+                    )
+                except Exception:
+                    _logger.exception(
+                        "Failed to roll back Google Calendar event after calendar sync persistence failure"
+                    )
+            raise HTTPException(
+                status_code=502,
+                detail="Could not save Google Calendar sync data. Please try again.",
+            ) from exc
+        progress.completed += len(batch)
+        await _report(on_progress, progress)
+
+    outcome = await run_bulk_sync(
+        pending,
+        create,
+        persist=persist,
+        pacer=user_pacer(user_id),
+        is_fatal=_is_fatal_google_sync_error,
+    )
+    _raise_if_nothing_synced(outcome)
+
+    await update_google_sync_enabled(db, user_id, True)
+    return progress
+
+
+async def unsync_calendar_from_google(
+    db: AsyncDatabase[dict[str, Any]],
+    user_id: int,
+    *,
+    access_token: Callable[[], Awaitable[str]],
+    client: httpx.AsyncClient,
+    on_progress: ProgressCallback | None = None,
+) -> CalendarSyncProgress:
+    """Remove synced entries from Google and disable ongoing sync.
+
+    ``access_token`` is only awaited when there is something to remove.
+    """
+    entries = await calendar_entries_for_user(db, user_id)
+    synced_entries = [
+        (entry, google_event_id)
+        for entry in entries
+        if (google_event_id := _string_value(entry.get("google_calendar_event_id")))
+        is not None
+    ]
+    progress = CalendarSyncProgress(total=len(synced_entries))
+    await _report(on_progress, progress)
+
+    if synced_entries:
+        token = await access_token()
+
+        async def delete(item: tuple[dict[str, Any], str]) -> None:
+            entry, google_event_id = item
+            try:
+                await delete_google_calendar_event(
+                    token, google_event_id, client=client
+                )
+            except Exception:
+                progress.failed_event_ids.append(int(entry["event_id"]))
+                raise
+
+        async def persist(batch: list[tuple[tuple[dict[str, Any], str], None]]) -> None:
+            await db[USER_CALENDAR_COLLECTION].bulk_write(
+                [
+                    UpdateOne(
+                        {"_id": entry["_id"]},
+                        {
+                            "$set": {
+                                "google_calendar_event_id": None,
+                                "google_calendar_event_url": None,
+                            }
+                        },
+                    )
+                    for (entry, _), _ in batch
+                ],
+                ordered=False,
+            )
+            progress.completed += len(batch)
+            await _report(on_progress, progress)
+
+        outcome = await run_bulk_sync(
+            synced_entries,
+            delete,
+            persist=persist,
+            pacer=user_pacer(user_id),
+            is_fatal=_is_fatal_google_sync_error,
+        )
+        _raise_if_nothing_synced(outcome)
+
+    await update_google_sync_enabled(db, user_id, False)
+    return progress
@@ -0,0 +1,364 @@
+"""Per-user "my events" index, maintained as events and attendance change.
+
+``GET /users/me/events`` lists the events a user created and the events they
+are registered for. Rather than scanning the user's whole attendance history on
+every request, each membership is one small document in ``user_event_index``::
+
+    {user_id, kind: "created" | "registered", event_id, sort_at, status}
+
+``sort_at`` is the event's start time for created events and the registration
+time for registered ones; ``status`` is the attendance status of a registered
+entry. A page is then a keyset seek on ``(user_id, kind, sort_at, event_id)``
+followed by one ``$in`` read of the page's events, however long the user's
+history is.
+
+Writes go through ``index_attendance`` (called with every attendance transition)
+and ``index_created_event``. The index is derived data: a failed write is logged,
+and the worker's hourly counter reconcile runs ``reconcile_user_event_index`` to
+repair the entries that drifted. ``rebuild_user_event_index`` (the ``backend
+rebuild-user-events`` command) recomputes the whole index from ``events`` and
+``attendance``; the API runs it at startup while the index is empty, so a
+database upgraded from before the index is filled in without a manual step.
+"""
+
+import logging
+from collections.abc import AsyncIterator, Mapping
+from datetime import UTC, datetime
+from typing import Any, Literal
+
+from pymongo import DeleteOne, UpdateOne
+from pymongo.asynchronous.cursor import AsyncCursor
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from backend.models.attendance import REGISTERED_ATTENDANCE_STATUSES
+from backend.services.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+)
+
+USER_EVENT_INDEX_COLLECTION = "user_event_index"
+DEFAULT_USER_EVENTS_PAGE_SIZE = 50
+MAX_USER_EVENTS_PAGE_SIZE = 100
+REBUILD_BATCH_SIZE = 500
+
+type UserEventKind = Literal["created", "registered"]
+
+_logger = logging.getLogger(__name__)
+
+
+def _entry_key(user_id: int, kind: UserEventKind, event_id: int) -> dict[str, Any]:
+    return {"user_id": user_id, "kind": kind, "event_id": event_id}
+
+
+def _now() -> datetime:
+    """The current time at MongoDB's millisecond precision."""
+    now = datetime.now(tz=UTC)
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+
+def _attendance_operation(
+    row: Mapping[str, Any], now: datetime
+) -> UpdateOne | DeleteOne:
+    key = _entry_key(row["user_id"], "registered", row["event_id"])
+    if row["status"] not in REGISTERED_ATTENDANCE_STATUSES:
+        return DeleteOne(key)
+    return UpdateOne(
+        key,
+        {
+            "$set": {"status": row["status"], "indexed_at": now},
+            "$setOnInsert": {"sort_at": now},
+        },
+        upsert=True,
+    )
+
+
+async def index_attendance(
+    db: AsyncDatabase[dict[str, Any]], *rows: Mapping[str, Any]
+) -> None:
+    """Reflect the new state of each attendance row in its user's index.
+
+    Registered rows keep the time they were first indexed as their sort key, so
+    checking in does not move an event up the list; any other status removes
+    the entry.
+    """
+    if not rows:
+        return
+    now = _now()
+    try:
+        await db[USER_EVENT_INDEX_COLLECTION].bulk_write(
+            [_attendance_operation(row, now) for row in rows], ordered=False
+        )
+    except PyMongoError:
+        _logger.warning("Could not update the user event index", exc_info=True)
+
+
+async def index_created_event(
+    db: AsyncDatabase[dict[str, Any]],
+    *,
+    event_id: int,
+    organizer_user_id: int,
+    start_time: datetime,
+) -> None:
+    """Add an event to its organizer's index, or move it after a reschedule."""
+    try:
+        await db[USER_EVENT_INDEX_COLLECTION].update_one(
+            _entry_key(organizer_user_id, "created", event_id),
+            {"$set": {"sort_at": start_time, "indexed_at": _now()}},
+            upsert=True,
+        )
+    except PyMongoError:
+        _logger.warning("Could not update the user event index", exc_info=True)
+
+
+def encode_user_events_cursor(entry: Mapping[str, Any]) -> str:
+    return encode_cursor({"at": entry["sort_at"], "id": entry["event_id"]})
+
+
+def decode_user_events_cursor(token: str) -> dict[str, Any]:
+    """Return a ``$match`` for entries after the cursor; raises ``InvalidCursorError``."""
+    payload = decode_cursor(token)
+    sort_at, event_id = payload.get("at"), payload.get("id")
+    if not (isinstance(sort_at, datetime) and isinstance(event_id, int)):
+        raise InvalidCursorError("Malformed cursor")
+    return {
+        "$or": [
+            {"sort_at": {"$lt": sort_at}},
+            {"sort_at": sort_at, "event_id": {"$lt": event_id}},
+        ]
+    }
+
+
+async def user_event_page(
+    db: AsyncDatabase[dict[str, Any]],
+    user_id: int,
+    kind: UserEventKind,
+    *,
+    limit: int = DEFAULT_USER_EVENTS_PAGE_SIZE,
+    after: dict[str, Any] | None = None,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Return ``(index entries, next cursor)``, newest ``sort_at`` first.
+
+    ``after`` is a match from ``decode_user_events_cursor``.
+    """
+    query: dict[str, Any] = {"user_id": user_id, "kind": kind}
+    if after is not None:
+        query.update(after)
+    entries = await (
+        db[USER_EVENT_INDEX_COLLECTION]
+        .find(query, {"_id": 0, "event_id": 1, "sort_at": 1, "status": 1})
+        .sort([("sort_at", -1), ("event_id", -1)])
+        .to_list(length=limit + 1)
+    )
+    next_cursor = (
+        encode_user_events_cursor(entries[limit - 1]) if len(entries) > limit else None
+    )
+    return entries[:limit], next_cursor
+
+
+async def rebuild_user_event_index(
+    db: AsyncDatabase[dict[str, Any]], *, batch_size: int = REBUILD_BATCH_SIZE
+) -> int:
+    """Recompute the whole index from events and attendance; return its size.
+
+    Registered entries take the attendance document's creation time as their
+    sort key, matching the order in which the old listing showed them. Entries
+    not rewritten by this pass or by a live transition since it started no
+    longer match an event or registration and are removed.
+    """
+    collection = db[USER_EVENT_INDEX_COLLECTION]
+    started_at = _now()
+    operations: list[UpdateOne] = []
+    written = 0
+
+    async def flush() -> None:
+        nonlocal operations, written
+        if operations:
+            await collection.bulk_write(operations, ordered=False)
+            written += len(operations)
+            operations = []
+
+    events = db["events"].find(
+        {}, {"_id": 0, "id": 1, "organizer_user_id": 1, "start_time": 1}
+    )
+    async for event in events:
+        operations.append(
+            UpdateOne(
+                _entry_key(event["organizer_user_id"], "created", event["id"]),
+                {"$set": {"sort_at": event["start_time"], "indexed_at": started_at}},
+                upsert=True,
+            )
+        )
+        if len(operations) >= batch_size:
+            await flush()
+
+    registrations = db["attendance"].find(
+        {"status": {"$in": list(REGISTERED_ATTENDANCE_STATUSES)}},
+        {"event_id": 1, "user_id": 1, "status": 1},
+    )
+    async for row in registrations:
+        operations.append(
+            UpdateOne(
+                _entry_key(row["user_id"], "registered", row["event_id"]),
+                {
+                    "$set": {
+                        "status": row["status"],
+                        "sort_at": row["_id"].generation_time,
+                        "indexed_at": started_at,
+                    }
+                },
+                upsert=True,
+            )
+        )
+        if len(operations) >= batch_size:
+            await flush()
+    await flush()
+
+    stale = await collection.delete_many({"indexed_at": {"$lt": started_at}})
+    _logger.info(
+        "Rebuilt user event index: %d entries, %d stale entries removed",
+        written,
+        stale.deleted_count,
+    )
+    return written
+
+
+async def _batches(
+    cursor: AsyncCursor[dict[str, Any]], size: int
+) -> AsyncIterator[list[dict[str, Any]]]:
+    batch: list[dict[str, Any]] = []
+    async for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def reconcile_user_event_index(
+    db: AsyncDatabase[dict[str, Any]], *, batch_size: int = REBUILD_BATCH_SIZE
+) -> int:
+    """Repair index entries that drifted from events and attendance.
+
+    Unlike ``rebuild_user_event_index`` this writes only the entries that are
+    missing, out of date or orphaned, so correct entries keep their ``sort_at``.
+    A transition that races a repair is re-checked on the next run. Returns the
+    number of entries repaired.
+    """
+    collection = db[USER_EVENT_INDEX_COLLECTION]
+    repaired = 0
+
+    async def apply(operations: list[UpdateOne | DeleteOne]) -> None:
+        nonlocal repaired
+        if not operations:
+            return
+        try:
+            result = await collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as exc:
+            # A live write inserted the same entry first; the next run re-checks.
+            _logger.warning("Some user event index repairs failed", exc_info=True)
+            details = exc.details
+            repaired += details["nUpserted"] + details["nModified"]
+            repaired += details["nRemoved"]
+            return
+        repaired += result.upserted_count + result.modified_count + result.deleted_count
+
+    events = db["events"].find(
+        {}, {"_id": 0, "id": 1, "organizer_user_id": 1, "start_time": 1}
+    )
+    async for batch in _batches(events, batch_size):
+        indexed = {
+            (entry["user_id"], entry["event_id"]): entry.get("sort_at")
+            async for entry in collection.find(
+                {"kind": "created", "event_id": {"$in": [e["id"] for e in batch]}},
+                {"_id": 0, "user_id": 1, "event_id": 1, "sort_at": 1},
+            )
+        }
+        now = _now()
+        await apply(
+            [
+                UpdateOne(
+                    _entry_key(event["organizer_user_id"], "created", event["id"]),
+                    {"$set": {"sort_at": event["start_time"], "indexed_at": now}},
+                    upsert=True,
+                )
+                for event in batch
+                if indexed.get((event["organizer_user_id"], event["id"]))
+                != event["start_time"]
+            ]
+        )
+
+    registrations = db["attendance"].find(
+        {"status": {"$in": list(REGISTERED_ATTENDANCE_STATUSES)}},
+        {"event_id": 1, "user_id": 1, "status": 1},
+    )
+    async for batch in _batches(registrations, batch_size):
+        indexed = {
+            (entry["user_id"], entry["event_id"]): entry.get("status")
+            async for entry in collection.find(
+                {
+                    "kind": "registered",
+                    "event_id": {"$in": list({row["event_id"] for row in batch})},
+                    "user_id": {"$in": list({row["user_id"] for row in batch})},
+                },
+                {"_id": 0, "user_id": 1, "event_id": 1, "status": 1},
+            )
+        }
+        now = _now()
+        await apply(
+            [
+                UpdateOne(
+                    _entry_key(row["user_id"], "registered", row["event_id"]),
+                    {
+                        "$set": {"status": row["status"], "indexed_at": now},
+                        "$setOnInsert": {"sort_at": row["_id"].generation_time},
+                    },
+                    upsert=True,
+                )
+                for row in batch
+                if indexed.get((row["user_id"], row["event_id"])) != row["status"]
+            ]
+        )
+
+    entries = collection.find({}, {"user_id": 1, "kind": 1, "event_id": 1})
+    async for batch in _batches(entries, batch_size):
+        event_ids = list({entry["event_id"] for entry in batch})
+        user_ids = list({entry["user_id"] for entry in batch})
+        organizers = {
+            (event["organizer_user_id"], event["id"])
+            async for event in db["events"].find(
+                {"id": {"$in": event_ids}}, {"_id": 0, "id": 1, "organizer_user_id": 1}
+            )
+        }
+        registered = {
+            (row["user_id"], row["event_id"])
+            async for row in db["attendance"].find(
+                {
+                    "event_id": {"$in": event_ids},
+                    "user_id": {"$in": user_ids},
+                    "status": {"$in": list(REGISTERED_ATTENDANCE_STATUSES)},
+                },
+                {"_id": 0, "user_id": 1, "event_id": 1},
+            )
+        }
+        await apply(
+            [
+                DeleteOne({"_id": entry["_id"]})
+                for entry in batch
+                if (entry["user_id"], entry["event_id"])
+                not in (organizers if entry["kind"] == "created" else registered)
+            ]
+        )
+
+    if repaired:
+        _logger.info("Repaired %d user event index entries", repaired)
+    return repaired
+
+
+async def backfill_user_event_index(db: AsyncDatabase[dict[str, Any]]) -> int:
+    """Build the index if it has no entries yet; return the entries written."""
+    if await db[USER_EVENT_INDEX_COLLECTION].find_one({}, {"_id": 1}) is not None:
+        return 0
+    return await rebuild_user_event_index(db)
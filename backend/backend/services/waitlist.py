@@ -0,0 +1,187 @@
+"""FIFO waitlists for sold-out events.
+
+``POST /events/{id}/attendance?waitlist=true`` on a full event records a
+``waitlisted`` attendance row stamped with ``waitlisted_at`` instead of failing,
+so a user waits in line once rather than retrying. Waitlisted rows hold no seat
+and are invisible to attendee counts, rosters and reminders.
+
+When a registered attendee leaves, their seat passes straight to the head of
+the queue: the head row flips to ``going`` with one conditional update, so the
+seat is never observable as free and cannot be taken by a new registrant in
+between. When seats open any other way (a capacity increase), ``fill_open_seats``
+reserves them one at a time and promotes into each.
+
+A promoted user gets the in-app calendar entry a direct registration adds.
+Promotion runs in someone else's request, without the promoted user's Google
+session, so the entry reaches Google Calendar on that user's next sync.
+"""
+
+import logging
+from datetime import UTC, datetime
+from typing import Any
+
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+from backend.models.attendance import AttendanceStatus
+from backend.models.event import Event
+from backend.services.attendance import record_attendance_transition
+from backend.services.capacity import CapacityLedger
+from backend.services.notifications.outbox import enqueue_email, outbox_dedup_key
+from backend.services.user_calendar import add_calendar_entry
+
+WAITLIST_ORDER = [("waitlisted_at", ASCENDING), ("_id", ASCENDING)]
+
+_logger = logging.getLogger(__name__)
+
+
+async def waitlist_position(
+    db: AsyncDatabase[dict[str, Any]], attendance: dict[str, Any]
+) -> int:
+    """Return the 1-based place in line of a ``waitlisted`` attendance row."""
+    waitlisted_at = attendance["waitlisted_at"]
+    ahead = await db["attendance"].count_documents(
+        {
+            "event_id": attendance["event_id"],
+            "status": AttendanceStatus.Waitlisted.value,
+            "$or": [
+                {"waitlisted_at": {"$lt": waitlisted_at}},
+                {"waitlisted_at": waitlisted_at, "_id": {"$lt": attendance["_id"]}},
+            ],
+        }
+    )
+    return ahead + 1
+
+
+async def waitlist_length(db: AsyncDatabase[dict[str, Any]], event_id: int) -> int:
+    return await db["attendance"].count_documents(
+        {"event_id": event_id, "status": AttendanceStatus.Waitlisted.value}
+    )
+
+
+async def promote_next(
+    db: AsyncDatabase[dict[str, Any]], event_id: int
+) -> dict[str, Any] | None:
+    """Move the head of the waitlist into a seat the caller already holds.
+
+    Returns the promoted attendance row, or ``None`` when nobody is waiting.
+    """
+    promoted = await db["attendance"].find_one_and_update(
+        {"event_id": event_id, "status": AttendanceStatus.Waitlisted.value},
+        {
+            "$set": {
+                "status": AttendanceStatus.Going.value,
+                "checked_in_at": None,
+                "promoted_at": datetime.now(tz=UTC),
+            },
+            "$unset": {"waitlisted_at": ""},
+        },
+        sort=WAITLIST_ORDER,
+        return_document=ReturnDocument.AFTER,
+    )
+    if promoted is not None:
+        await record_attendance_transition(db, promoted)
+        try:
+            await add_calendar_entry(db, user_id=promoted["user_id"], event_id=event_id)
+        except PyMongoError:
+            # Reading the calendar backfills registered events, so this heals.
+            _logger.warning(
+                "Could not add event %s to promoted user %s's calendar",
+                event_id,
+                promoted["user_id"],
+                exc_info=True,
+            )
+    return promoted
+
+
+async def join_waitlist(
+    db: AsyncDatabase[dict[str, Any]],
+    *,
+    event_id: int,
+    user_id: int,
+    existing: dict[str, Any] | None,
+) -> dict[str, Any] | None:
+    """Queue a user, reusing their cancelled row; ``None`` if the row changed."""
+    fields = {
+        "status": AttendanceStatus.Waitlisted.value,
+        "checked_in_at": None,
+        "waitlisted_at": datetime.now(tz=UTC),
+    }
+    queued: dict[str, Any] | None
+    if existing is None:
+        row = {"event_id": event_id, "user_id": user_id, **fields}
+        try:
+            result = await db["attendance"].insert_one(row)
+        except DuplicateKeyError:
+            return None
+        queued = {**row, "_id": result.inserted_id}
+    else:
+        queued = await db["attendance"].find_one_and_update(
+            {"_id": existing["_id"], "status": AttendanceStatus.Cancelled.value},
+            {"$set": fields},
+            return_document=ReturnDocument.AFTER,
+        )
+    if queued is not None:
+        await record_attendance_transition(db, queued)
+    return queued
+
+
+async def release_seat_to_waitlist(
+    db: AsyncDatabase[dict[str, Any]], capacity: CapacityLedger, event_id: int
+) -> dict[str, Any] | None:
+    """Give a freed seat to the head of the waitlist, or back to the event.
+
+    Returns the promoted attendance row, if any.
+    """
+    promoted = await promote_next(db, event_id)
+    if promoted is None:
+        await capacity.release(db, event_id)
+    return promoted
+
+
+async def notify_promoted(
+    db: AsyncDatabase[dict[str, Any]], event: Event, promoted: dict[str, Any]
+) -> None:
+    """Queue a promoted user's email; a failure here never undoes the promotion."""
+    try:
+        user = await db["users"].find_one({"id": promoted["user_id"]}, {"email": 1})
+        if user is None or not user.get("email"):
+            return
+        await enqueue_email(
+            db,
+            "waitlist_promotion",
+            recipient=user["email"],
+            event_id=event.id,
+            dedup_key=outbox_dedup_key(
+                "waitlist_promotion",
+                event.id,
+                promoted["user_id"],
+                promoted["promoted_at"].isoformat(),
+            ),
+        )
+    except Exception:
+        _logger.exception(
+            "Failed to notify user %s of waitlist promotion for event %s",
+            promoted["user_id"],
+            event.id,
+        )
+
+
+async def fill_open_seats(
+    db: AsyncDatabase[dict[str, Any]],
+    capacity: CapacityLedger,
+    event: Event,
+) -> int:
+    """Promote waiting users into seats that are free; return how many moved."""
+    promoted_count = 0
+    if not await waitlist_length(db, event.id):
+        return promoted_count
+    while await capacity.reserve(db, event.id):
+        promoted = await promote_next(db, event.id)
+        if promoted is None:
+            await capacity.release(db, event.id)
+            break
+        promoted_count += 1
+        await notify_promoted(db, event, promoted)
+    return promoted_count
@@ -8,6 +8,8 @@ import pytest_asyncio
 from pymongo.asynchronous.database import AsyncDatabase
 from pymongo.asynchronous.mongo_client import AsyncMongoClient
 from pymongo.errors import PyMongoError
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
 
 from backend.db import get_database
 
@@ -117,3 +119,27 @@ async def db() -> AsyncIterator[AsyncDatabase[dict[str, Any]]]:
 
     async with get_database(url, db_name="evently_test") as database:
         yield database
+
+
+@pytest_asyncio.fixture
+async def redis() -> AsyncIterator[Redis]:
+    """Yield a client for the Redis at ``REDIS_URL``.
+
+    Skips the test when REDIS_URL is not set or not reachable. Tests must use
+    their own key prefix; nothing is flushed.
+    """
+    url = os.getenv("REDIS_URL")
+    if not url:
+        pytest.skip("REDIS_URL is not set; skipping Redis tests")
+
+    client = Redis.from_url(url, socket_connect_timeout=1)
+    try:
+        await client.ping()
+    except RedisError as exc:
+        await client.aclose()
+        pytest.skip(f"REDIS_URL is not reachable; skipping Redis tests: {exc}")
+
+    try:
+        yield client
+    finally:
+        await client.aclose()
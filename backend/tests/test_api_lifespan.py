@@ -4,6 +4,7 @@ import pytest
 from fastapi import FastAPI
 
 import backend.api as api_module
+from backend.services.capacity import UnavailableCapacityLedger
 
 
 class _FakeMongoClient:
@@ -23,6 +24,7 @@ class _FakeMongoClient:
 class _FakeArq:
     def __init__(self) -> None:
         self.closed = False
+        self.redis = Mock()
         self.schedule_all_upcoming_event_reminders = AsyncMock()
 
     async def close(self) -> None:
@@ -39,11 +41,22 @@ async def test_lifespan_wires_database_arq_and_email_services(
     email_service = object()
 
     get_mongo_client = Mock(return_value=mongo_client)
+    ensure_indexes = AsyncMock()
+    backfill_event_search_fields = AsyncMock()
+    backfill_user_event_index = AsyncMock()
     ensure_required_startup_users = AsyncMock()
     create_arq_client = AsyncMock(return_value=arq)
     create_email_notification_service = Mock(return_value=email_service)
 
+    monkeypatch.setenv("CAPACITY_LEDGER", "redis")
     monkeypatch.setattr(api_module, "get_mongo_client", get_mongo_client)
+    monkeypatch.setattr(api_module, "ensure_indexes", ensure_indexes)
+    monkeypatch.setattr(
+        api_module, "backfill_event_search_fields", backfill_event_search_fields
+    )
+    monkeypatch.setattr(
+        api_module, "backfill_user_event_index", backfill_user_event_index
+    )
     monkeypatch.setattr(
         api_module,
         "ensure_required_startup_users",
@@ -60,17 +73,24 @@ async def test_lifespan_wires_database_arq_and_email_services(
         assert app.state.db_client is mongo_client
         assert app.state.db is mongo_client.databases["evently"]
         assert app.state.arq is arq
+        assert app.state.event_detail_cache.has_redis_tier
+        assert app.state.capacity_ledger.uses_redis
         assert app.state.email_notification_service is email_service
         assert mongo_client.closed is False
         assert arq.closed is False
+        assert not app.state.http_clients.google_calendar.is_closed
 
     get_mongo_client.assert_called_once_with()
+    ensure_indexes.assert_awaited_once_with(app.state.db)
+    backfill_event_search_fields.assert_awaited_once_with(app.state.db)
+    backfill_user_event_index.assert_awaited_once_with(app.state.db)
     ensure_required_startup_users.assert_awaited_once_with(app.state.db)
     create_arq_client.assert_awaited_once_with()
     create_email_notification_service.assert_called_once_with(allow_missing=True)
     arq.schedule_all_upcoming_event_reminders.assert_awaited_once_with(app.state.db)
     assert mongo_client.closed is True
     assert arq.closed is True
+    assert app.state.http_clients.google_calendar.is_closed
 
 
 @pytest.mark.asyncio
@@ -83,6 +103,7 @@ async def test_lifespan_closes_started_resources_when_startup_fails(
     email_service = object()
 
     get_mongo_client = Mock(return_value=mongo_client)
+    ensure_indexes = AsyncMock()
     ensure_required_startup_users = AsyncMock()
     create_arq_client = AsyncMock(return_value=arq)
     create_email_notification_service = Mock(return_value=email_service)
@@ -91,6 +112,9 @@ async def test_lifespan_closes_started_resources_when_startup_fails(
     )
 
     monkeypatch.setattr(api_module, "get_mongo_client", get_mongo_client)
+    monkeypatch.setattr(api_module, "ensure_indexes", ensure_indexes)
+    monkeypatch.setattr(api_module, "backfill_event_search_fields", AsyncMock())
+    monkeypatch.setattr(api_module, "backfill_user_event_index", AsyncMock())
     monkeypatch.setattr(
         api_module,
         "ensure_required_startup_users",
@@ -121,11 +145,16 @@ async def test_lifespan_starts_without_arq_when_redis_unavailable(
     email_service = object()
 
     get_mongo_client = Mock(return_value=mongo_client)
+    ensure_indexes = AsyncMock()
     ensure_required_startup_users = AsyncMock()
     create_arq_client = AsyncMock(side_effect=ConnectionError("no redis"))
     create_email_notification_service = Mock(return_value=email_service)
 
+    monkeypatch.setenv("CAPACITY_LEDGER", "redis")
     monkeypatch.setattr(api_module, "get_mongo_client", get_mongo_client)
+    monkeypatch.setattr(api_module, "ensure_indexes", ensure_indexes)
+    monkeypatch.setattr(api_module, "backfill_event_search_fields", AsyncMock())
+    monkeypatch.setattr(api_module, "backfill_user_event_index", AsyncMock())
     monkeypatch.setattr(
         api_module,
         "ensure_required_startup_users",
@@ -141,6 +170,8 @@ async def test_lifespan_starts_without_arq_when_redis_unavailable(
     async with api_module.lifespan(app):
         assert app.state.arq is None
         assert app.state.email_notification_service is email_service
+        # Reserving in MongoDB would oversell against processes using Redis.
+        assert isinstance(app.state.capacity_ledger, UnavailableCapacityLedger)
 
     create_arq_client.assert_awaited_once_with()
     create_email_notification_service.assert_called_once_with(allow_missing=True)
@@ -0,0 +1,124 @@
+from typing import Any, cast
+
+import pytest
+from pymongo.asynchronous.database import AsyncDatabase
+
+from backend.db.indexes import IndexReport
+from backend.services import attendance as attendance_module
+from backend.services.attendance import (
+    ATTENDANCE_HISTORY_ENV,
+    ATTENDANCE_UNIQUE_INDEX,
+    AttendanceMigrationReport,
+    migrate_attendance,
+    migrate_attendance_if_unindexed,
+    record_attendance_history,
+)
+
+
+class _RecordingCollection:
+    def __init__(self) -> None:
+        self.inserted: list[dict[str, Any]] = []
+
+    async def insert_many(
+        self, documents: list[dict[str, Any]], *, ordered: bool = True
+    ) -> None:
+        self.inserted.extend(documents)
+
+
+class _RecordingDb:
+    def __init__(self) -> None:
+        self.history = _RecordingCollection()
+
+    def __getitem__(self, name: str) -> _RecordingCollection:
+        assert name == "attendance_history"
+        return self.history
+
+
+@pytest.mark.asyncio
+async def test_attendance_history_is_only_recorded_when_enabled(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fake = _RecordingDb()
+    db = cast(AsyncDatabase[dict[str, Any]], fake)
+    row = {"_id": "a1", "event_id": 1, "user_id": 7, "status": "going"}
+
+    monkeypatch.delenv(ATTENDANCE_HISTORY_ENV, raising=False)
+    await record_attendance_history(db, row)
+    assert fake.history.inserted == []
+
+    monkeypatch.setenv(ATTENDANCE_HISTORY_ENV, "on")
+    await record_attendance_history(db, row)
+    assert len(fake.history.inserted) == 1
+    record = fake.history.inserted[0]
+    assert record["attendance_id"] == "a1"
+    assert (record["event_id"], record["user_id"], record["status"]) == (
+        1,
+        7,
+        "going",
+    )
+    assert record["checked_in_at"] is None
+
+
+@pytest.mark.asyncio
+async def test_migrate_attendance_keeps_newest_row_and_archives_the_rest(
+    db: AsyncDatabase[dict[str, Any]],
+) -> None:
+    for name in ("attendance", "attendance_history"):
+        await db[name].drop()
+    await db["attendance"].insert_many(
+        [
+            {"event_id": 1, "user_id": 7, "status": "going"},
+            {"event_id": 1, "user_id": 7, "status": "cancelled"},
+            {"event_id": 1, "user_id": 7, "status": "going"},
+            {"event_id": 1, "user_id": 8, "status": "checked_in"},
+            {"event_id": 2, "user_id": 7, "status": "going"},
+        ]
+    )
+
+    dry_run = await migrate_attendance(db, dry_run=True)
+    assert (dry_run.duplicated_pairs, dry_run.archived_rows) == (1, 2)
+    assert await db["attendance"].count_documents({}) == 5
+
+    report = await migrate_attendance(db, batch_size=1)
+
+    assert (report.duplicated_pairs, report.archived_rows) == (1, 2)
+    assert report.index_ready
+    kept = await db["attendance"].find({"event_id": 1, "user_id": 7}).to_list(5)
+    assert len(kept) == 1
+    history = await db["attendance_history"].find({}).sort("_id", 1).to_list(5)
+    assert [record["status"] for record in history] == ["going", "cancelled"]
+    assert {record["attendance_id"] for record in history} == {kept[0]["_id"]}
+    assert await db["attendance"].count_documents({}) == 3
+
+    again = await migrate_attendance(db)
+    assert (again.duplicated_pairs, again.archived_rows) == (0, 0)
+    assert again.index_ready
+
+
+@pytest.mark.asyncio
+async def test_startup_migrates_attendance_only_when_its_index_failed(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    db = cast(AsyncDatabase[dict[str, Any]], object())
+    results = [AttendanceMigrationReport(duplicated_pairs=2, index_ready=True)]
+    runs: list[object] = []
+
+    async def fake_migrate(
+        migrated_db: AsyncDatabase[dict[str, Any]],
+    ) -> AttendanceMigrationReport:
+        runs.append(migrated_db)
+        return results.pop(0)
+
+    monkeypatch.setattr(attendance_module, "migrate_attendance", fake_migrate)
+
+    assert await migrate_attendance_if_unindexed(db, IndexReport()) is None
+    assert runs == []
+
+    failed = IndexReport(failed=[ATTENDANCE_UNIQUE_INDEX])
+    report = await migrate_attendance_if_unindexed(db, failed)
+    assert report is not None and report.duplicated_pairs == 2
+    assert runs == [db]
+
+    results.append(AttendanceMigrationReport(index_ready=False))
+    with pytest.raises(RuntimeError, match="attendance_event_user_unique"):
+        await migrate_attendance_if_unindexed(db, failed)
@@ -15,6 +15,7 @@ from backend.app_config import build_frontend_settings
 from backend.db import get_db
 from backend.models.user import User
 from backend.routes import auth as auth_routes
+from backend.services import oauth_tokens
 
 
 class _FakeCollection:
@@ -190,7 +191,7 @@ def _make_client(base_url: str = "http://test") -> tuple[FastAPI, AsyncClient]:
         session_id = request.session.get(auth_routes._OAUTH_TOKEN_SESSION_ID_KEY)
         if not isinstance(session_id, str):
             return {"stored": None}
-        stored = await fake_db[auth_routes._OAUTH_TOKEN_COLLECTION].find_one(
+        stored = await fake_db[oauth_tokens.OAUTH_TOKEN_COLLECTION].find_one(
             {"_id": session_id}
         )
         return {"stored": stored}
@@ -205,7 +206,7 @@ def _make_client(base_url: str = "http://test") -> tuple[FastAPI, AsyncClient]:
             return {"token": None}
         request.session[auth_routes._OAUTH_TOKEN_SESSION_ID_KEY] = session_id
         if token is None:
-            await fake_db[auth_routes._OAUTH_TOKEN_COLLECTION].delete_one(
+            await fake_db[oauth_tokens.OAUTH_TOKEN_COLLECTION].delete_one(
                 {"_id": session_id}
             )
             return {"token": None}
@@ -239,7 +240,7 @@ async def test_login_returns_503_when_oauth_not_configured(
         resp = await client.get("/auth/login")
 
     assert resp.status_code == 503
-    assert resp.json() == {"detail": auth_routes.OAUTH_NOT_CONFIGURED}
+    assert resp.json() == {"detail": oauth_tokens.OAUTH_NOT_CONFIGURED}
 
 
 @pytest.mark.asyncio
@@ -375,8 +376,8 @@ async def test_google_calendar_access_token_refreshes_when_session_token_is_expi
     }
 
     with patch.object(
-        auth_routes,
-        "_refresh_oauth_token",
+        oauth_tokens,
+        "refresh_oauth_token",
         AsyncMock(return_value=refreshed_token),
     ) as refresh_oauth_token:
         async with client:
@@ -422,7 +423,7 @@ async def test_google_calendar_access_token_accepts_naive_token_timestamp_from_m
             "/_test/session",
             json=_session_state(oauth_token_session_id="token-session-1"),
         )
-        stored = await app.state.db[auth_routes._OAUTH_TOKEN_COLLECTION].find_one(
+        stored = await app.state.db[oauth_tokens.OAUTH_TOKEN_COLLECTION].find_one(
             {"_id": "token-session-1"}
         )
         assert stored is not None
@@ -1170,3 +1171,35 @@ async def test_auth_session_updates_existing_user_roles_from_admin_email_allowli
     }
     assert updated is not None
     assert updated["roles"] == ["admin", "user"]
+
+
+@pytest.mark.asyncio
+async def test_auth_session_serves_cached_principal_until_invalidated() -> None:
+    app, client = _make_client()
+    stored_user = User(
+        id=7,
+        username="cached",
+        first_name="Cached",
+        last_name="User",
+        email="cached@example.com",
+    )
+    await app.state.db["users"].insert_one(stored_user.model_dump(mode="json"))
+
+    async with client:
+        await client.post(
+            "/_test/session",
+            json={auth_routes._EVENTLY_USER_SESSION_KEY: 7},
+        )
+        first = await client.get("/auth/session")
+        stored = await app.state.db["users"].find_one({"id": 7})
+        assert stored is not None
+        stored["first_name"] = "Renamed"
+        cached = await client.get("/auth/session")
+        auth_routes.invalidate_principal(
+            cast(Request, SimpleNamespace(app=app)), user_id=7
+        )
+        refreshed = await client.get("/auth/session")
+
+    assert first.json()["user"]["first_name"] == "Cached"
+    assert cached.json()["user"]["first_name"] == "Cached"
+    assert refreshed.json()["user"]["first_name"] == "Renamed"
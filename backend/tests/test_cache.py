@@ -0,0 +1,171 @@
+from typing import Any, cast
+
+import pytest
+from redis.asyncio import Redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from backend.services.cache import (
+    INVALIDATE_SCRIPT,
+    SET_IF_GENERATION_SCRIPT,
+    LocalTTLCache,
+    ResponseCache,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, bytes] = {}
+        self.fail = False
+
+    async def get(self, key: str) -> bytes | None:
+        if self.fail:
+            raise RedisConnectionError("down")
+        return self.values.get(key)
+
+    async def set(self, key: str, value: bytes, ex: int | None = None) -> None:
+        if self.fail:
+            raise RedisConnectionError("down")
+        self.values[key] = value
+
+    async def delete(self, key: str) -> None:
+        if self.fail:
+            raise RedisConnectionError("down")
+        self.values.pop(key, None)
+
+    async def mget(self, *keys: str) -> list[bytes | None]:
+        if self.fail:
+            raise RedisConnectionError("down")
+        return [self.values.get(key) for key in keys]
+
+    def register_script(self, source: str) -> Any:
+        async def run(keys: list[str], args: list[Any]) -> int:
+            if self.fail:
+                raise RedisConnectionError("down")
+            value_key, generation_key = keys
+            if source == INVALIDATE_SCRIPT:
+                self.values.pop(value_key, None)
+                generation = int(self.values.get(generation_key, b"0")) + 1
+                self.values[generation_key] = str(generation).encode()
+                return 1
+            assert source == SET_IF_GENERATION_SCRIPT
+            if self.values.get(generation_key, b"") != args[2]:
+                return 0
+            self.values[value_key] = args[0]
+            return 1
+
+        return run
+
+
+def _as_redis(redis: _FakeRedis) -> Redis:
+    return cast(Redis, redis)
+
+
+def test_local_cache_expires_and_evicts() -> None:
+    clock = _Clock()
+    cache = LocalTTLCache[bytes](ttl_seconds=5, max_entries=2, clock=clock)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    cache.get("a")
+    cache.set("c", b"3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    clock.now = 6
+    assert cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_get_or_build_caches_and_counts_hits() -> None:
+    cache = ResponseCache("test")
+    builds: list[int] = []
+
+    async def build() -> bytes:
+        builds.append(1)
+        return b"{}"
+
+    assert await cache.get_or_build(1, build) == b"{}"
+    assert await cache.get_or_build(1, build) == b"{}"
+
+    assert len(builds) == 1
+    assert cache.stats.as_dict()["local_hits"] == 1
+    assert cache.stats.as_dict()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_or_build_does_not_cache_missing_values() -> None:
+    cache = ResponseCache("test")
+
+    async def build() -> None:
+        return None
+
+    assert await cache.get_or_build(1, build) is None
+    assert await cache.get(1) is None
+
+
+@pytest.mark.asyncio
+async def test_value_built_across_an_invalidation_is_not_stored() -> None:
+    cache = ResponseCache("test")
+
+    async def build() -> bytes:
+        await cache.invalidate(1)
+        return b"stale"
+
+    assert await cache.get_or_build(1, build) == b"stale"
+    assert await cache.get(1) is None
+
+
+@pytest.mark.asyncio
+async def test_redis_tier_is_shared_and_invalidated() -> None:
+    redis = _FakeRedis()
+    writer = ResponseCache("test", redis=_as_redis(redis))
+    reader = ResponseCache("test", redis=_as_redis(redis))
+
+    await writer.set(1, b"v1")
+    assert await reader.get(1) == b"v1"
+    assert reader.stats.redis_hits == 1
+
+    await writer.invalidate(1)
+    assert "cache:test:1" not in redis.values
+    assert redis.values["cache:test:1:gen"] == b"1"
+
+
+@pytest.mark.asyncio
+async def test_build_racing_another_replicas_invalidation_is_not_shared() -> None:
+    redis = _FakeRedis()
+    builder = ResponseCache("test", redis=_as_redis(redis))
+    writer = ResponseCache("test", redis=_as_redis(redis))
+
+    async def build() -> bytes:
+        await writer.invalidate(1)
+        return b"stale"
+
+    assert await builder.get_or_build(1, build) == b"stale"
+    assert "cache:test:1" not in redis.values
+    assert await builder.get(1) is None
+
+    async def rebuild() -> bytes:
+        return b"fresh"
+
+    assert await builder.get_or_build(1, rebuild) == b"fresh"
+    assert await writer.get(1) == b"fresh"
+
+
+@pytest.mark.asyncio
+async def test_redis_failures_fall_back_to_local_tier() -> None:
+    redis = _FakeRedis()
+    redis.fail = True
+    cache = ResponseCache("test", redis=_as_redis(redis))
+
+    await cache.set(1, b"v1")
+    stats: dict[str, Any] = cache.stats.as_dict()
+
+    assert await cache.get(1) == b"v1"
+    assert stats["redis_errors"] == 1
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from backend.services.calendar_bulk_sync import RatePacer, run_bulk_sync
+
+
+def _unpaced() -> RatePacer:
+    return RatePacer(1_000_000.0)
+
+
+@pytest.mark.asyncio
+async def test_run_bulk_sync_bounds_concurrency_and_persists_in_batches() -> None:
+    in_flight = 0
+    peak = 0
+    batches: list[list[int]] = []
+
+    async def operation(item: int) -> int:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return item * 10
+
+    async def persist(batch: list[tuple[int, int]]) -> None:
+        batches.append([item for item, _ in batch])
+
+    outcome = await run_bulk_sync(
+        list(range(10)),
+        operation,
+        persist=persist,
+        pacer=_unpaced(),
+        concurrency=3,
+        batch_size=4,
+    )
+
+    assert peak == 3
+    assert sorted(item for batch in batches for item in batch) == list(range(10))
+    assert all(len(batch) <= 4 for batch in batches)
+    assert sorted(outcome.completed) == [(item, item * 10) for item in range(10)]
+    assert outcome.failed == []
+
+
+@pytest.mark.asyncio
+async def test_run_bulk_sync_collects_failures_and_keeps_going() -> None:
+    async def operation(item: int) -> int:
+        if item % 2:
+            raise RuntimeError(f"item {item}")
+        return item
+
+    async def persist(_batch: list[tuple[int, int]]) -> None:
+        return None
+
+    outcome = await run_bulk_sync(
+        [1, 2, 3, 4], operation, persist=persist, pacer=_unpaced()
+    )
+
+    assert sorted(item for item, _ in outcome.completed) == [2, 4]
+    assert sorted(item for item, _ in outcome.failed) == [1, 3]
+
+
+@pytest.mark.asyncio
+async def test_run_bulk_sync_stops_on_fatal_error_after_persisting_progress() -> None:
+    persisted: list[int] = []
+    attempted: list[int] = []
+
+    async def operation(item: int) -> int:
+        attempted.append(item)
+        if item == 2:
+            raise PermissionError("token expired")
+        return item
+
+    async def persist(batch: list[tuple[int, int]]) -> None:
+        persisted.extend(item for item, _ in batch)
+
+    with pytest.raises(PermissionError):
+        await run_bulk_sync(
+            [1, 2, 3, 4],
+            operation,
+            persist=persist,
+            pacer=_unpaced(),
+            concurrency=1,
+            is_fatal=lambda exc: isinstance(exc, PermissionError),
+        )
+
+    assert attempted == [1, 2]
+    assert persisted == [1]
+
+
+@pytest.mark.asyncio
+async def test_rate_pacer_spaces_call_starts() -> None:
+    now = 100.0
+    sleeps: list[float] = []
+
+    async def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+
+    pacer = RatePacer(4.0, clock=lambda: now, sleep=sleep)
+    for _ in range(3):
+        await pacer.wait()
+
+    assert sleeps == [0.25, 0.5]
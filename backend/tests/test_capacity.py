@@ -0,0 +1,350 @@
+import asyncio
+import uuid
+from collections.abc import Sequence
+from typing import Any, cast
+
+import pytest
+from fastapi import HTTPException
+from pymongo.asynchronous.database import AsyncDatabase
+from redis.asyncio import Redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from backend.services.capacity import (
+    ADJUST_SCRIPT,
+    LEDGER_IDLE_TTL_SECONDS,
+    LEDGER_VERSION_FIELD,
+    REARM_SCRIPT,
+    RESERVE_SCRIPT,
+    SEED_SCRIPT,
+    SET_CAPACITY_SCRIPT,
+    CapacityLedger,
+    UnavailableCapacityLedger,
+)
+
+
+class _FakeRedis:
+    """Runs the ledger scripts in Python; like Lua, each call is atomic."""
+
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[str, int]] = {}
+        self.sets: dict[str, set[str]] = {}
+        self.ttls: dict[str, int] = {}
+        self.fail = False
+
+    def _check(self) -> None:
+        if self.fail:
+            raise RedisConnectionError("down")
+
+    def register_script(self, source: str) -> Any:
+        async def run(keys: list[str], args: list[Any]) -> int:
+            self._check()
+            ledger = self.hashes.get(keys[0])
+            if source == SEED_SCRIPT:
+                if ledger is None:
+                    self.hashes[keys[0]] = {
+                        "capacity": int(args[0]),
+                        "registered": int(args[1]),
+                        "version": int(args[2]),
+                    }
+                    self.ttls[keys[0]] = int(args[3])
+                return 1
+            if source == SET_CAPACITY_SCRIPT:
+                if ledger is not None:
+                    ledger["capacity"] = int(args[0])
+                return 1
+            if source == REARM_SCRIPT:
+                if (
+                    ledger is not None
+                    and ledger["version"] == int(args[1])
+                    and str(args[0]) not in self.sets.get(keys[1], set())
+                ):
+                    self.ttls[keys[0]] = int(args[2])
+                    return 1
+                return 0
+            if ledger is None:
+                return -1
+            if source == RESERVE_SCRIPT:
+                if ledger["registered"] >= ledger["capacity"]:
+                    return 0
+                ledger["registered"] += 1
+            else:
+                assert source == ADJUST_SCRIPT
+                ledger["registered"] = max(ledger["registered"] + int(args[1]), 0)
+            ledger["version"] += 1
+            self.ttls.pop(keys[0], None)
+            self.sets.setdefault(keys[1], set()).add(str(args[0]))
+            return 1
+
+        return run
+
+    async def hmget(self, key: str, fields: list[str]) -> list[bytes | None]:
+        self._check()
+        ledger = self.hashes.get(key, {})
+        return [
+            str(ledger[field]).encode() if field in ledger else None for field in fields
+        ]
+
+    async def spop(self, key: str, count: int) -> list[bytes]:
+        self._check()
+        members = self.sets.get(key, set())
+        return [members.pop().encode() for _ in range(min(count, len(members)))]
+
+    async def sadd(self, key: str, *members: object) -> int:
+        self.sets.setdefault(key, set()).update(str(member) for member in members)
+        return len(members)
+
+
+class _FakeEvents:
+    def __init__(self, docs: list[dict[str, Any]]) -> None:
+        self.docs = {doc["id"]: doc for doc in docs}
+        self.fail_updates = False
+
+    async def find_one(
+        self, query: dict[str, Any], projection: dict[str, int] | None = None
+    ) -> dict[str, Any] | None:
+        # Yield so concurrent seeds interleave the way real round trips do.
+        await asyncio.sleep(0)
+        doc = self.docs.get(query["id"])
+        return None if doc is None else dict(doc)
+
+    async def update_one(self, query: dict[str, Any], update: dict[str, Any]) -> Any:
+        if self.fail_updates:
+            raise RuntimeError("mongo down")
+        doc = self.docs.get(query["id"])
+        stored_version = None if doc is None else doc.get(LEDGER_VERSION_FIELD)
+        new_version = update["$set"][LEDGER_VERSION_FIELD]
+        modified = doc is not None and (
+            stored_version is None or stored_version < new_version
+        )
+        if modified:
+            assert doc is not None
+            doc.update(update["$set"])
+        return type("Result", (), {"modified_count": int(modified)})()
+
+
+def _event(event_id: int, *, capacity: int, registered: int = 0) -> dict[str, Any]:
+    return {
+        "id": event_id,
+        "total_capacity": capacity,
+        "registered_count": registered,
+        "favorites_count": 0,
+    }
+
+
+def _fake_db(
+    *docs: dict[str, Any],
+) -> tuple[AsyncDatabase[dict[str, Any]], _FakeEvents]:
+    events = _FakeEvents(list(docs))
+    return cast(AsyncDatabase[dict[str, Any]], {"events": events}), events
+
+
+def _ledger(redis: _FakeRedis) -> CapacityLedger:
+    return CapacityLedger(redis=cast(Redis, redis))
+
+
+async def _reserve_concurrently(
+    ledger: CapacityLedger, db: AsyncDatabase[dict[str, Any]], attempts: int
+) -> list[bool]:
+    return await asyncio.gather(*(ledger.reserve(db, 1) for _ in range(attempts)))
+
+
+@pytest.mark.asyncio
+async def test_redis_ledger_never_oversells_under_contention() -> None:
+    db, events = _fake_db(_event(1, capacity=100, registered=10))
+    ledger = _ledger(_FakeRedis())
+
+    results = await _reserve_concurrently(ledger, db, 500)
+
+    assert results.count(True) == 90
+    assert await ledger.flush(db) == 1
+    assert events.docs[1]["registered_count"] == 100
+    # The reservations reached MongoDB in a single flush.
+    assert events.docs[1][LEDGER_VERSION_FIELD] == 90
+
+
+@pytest.mark.asyncio
+async def test_redis_ledger_release_and_restore_reach_mongo_on_flush() -> None:
+    db, events = _fake_db(_event(1, capacity=2))
+    ledger = _ledger(_FakeRedis())
+
+    assert await ledger.reserve(db, 1)
+    assert await ledger.reserve(db, 1)
+    assert not await ledger.reserve(db, 1)
+    await ledger.release(db, 1)
+    await ledger.restore(db, 1)
+    await ledger.release(db, 1)
+    await ledger.flush(db)
+
+    assert events.docs[1]["registered_count"] == 1
+    assert await ledger.reserve(db, 1)
+
+
+@pytest.mark.asyncio
+async def test_redis_ledger_applies_capacity_edits() -> None:
+    db, _ = _fake_db(_event(1, capacity=1))
+    ledger = _ledger(_FakeRedis())
+
+    assert await ledger.reserve(db, 1)
+    await ledger.set_capacity(1, 2)
+
+    assert await ledger.reserve(db, 1)
+    assert not await ledger.reserve(db, 1)
+
+
+@pytest.mark.asyncio
+async def test_redis_ledger_reports_missing_events_as_full() -> None:
+    db, _ = _fake_db()
+
+    assert not await _ledger(_FakeRedis()).reserve(db, 1)
+
+
+@pytest.mark.asyncio
+async def test_flush_reports_written_events_for_cache_invalidation() -> None:
+    db, events = _fake_db(_event(1, capacity=5), _event(2, capacity=5))
+    ledger = _ledger(_FakeRedis())
+    await ledger.reserve(db, 1)
+    await ledger.reserve(db, 2)
+    events.docs[2][LEDGER_VERSION_FIELD] = 9
+    written: list[list[int]] = []
+
+    async def on_written(event_ids: list[int]) -> None:
+        written.append(event_ids)
+
+    assert await ledger.flush(db, on_written=on_written) == 1
+    assert written == [[1]]
+
+
+@pytest.mark.asyncio
+async def test_flush_never_overwrites_a_newer_count() -> None:
+    db, events = _fake_db(_event(1, capacity=5))
+    redis = _FakeRedis()
+    ledger = _ledger(redis)
+    await ledger.reserve(db, 1)
+    events.docs[1].update({"registered_count": 3, LEDGER_VERSION_FIELD: 7})
+
+    assert await ledger.flush(db) == 0
+    assert events.docs[1]["registered_count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_flush_keeps_events_dirty_when_mongo_write_fails() -> None:
+    db, events = _fake_db(_event(1, capacity=5))
+    ledger = _ledger(_FakeRedis())
+    await ledger.reserve(db, 1)
+    events.fail_updates = True
+
+    with pytest.raises(RuntimeError):
+        await ledger.flush(db)
+
+    events.fail_updates = False
+    assert await ledger.flush(db) == 1
+    assert events.docs[1]["registered_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_ledgers_with_unflushed_changes_never_expire() -> None:
+    db, events = _fake_db(_event(1, capacity=5))
+    redis = _FakeRedis()
+    ledger = _ledger(redis)
+    key = "evently:capacity:event:1"
+
+    await ledger.reserve(db, 1)
+    assert key not in redis.ttls
+
+    # A change after the flush popped the event keeps the ledger alive.
+    redis.sets["evently:capacity:dirty"].clear()
+    await ledger.reserve(db, 1)
+    assert await ledger._flush_event(db, 1)
+    assert key not in redis.ttls
+    assert events.docs[1]["registered_count"] == 2
+
+    assert await ledger.flush(db) == 0
+    assert redis.ttls[key] == LEDGER_IDLE_TTL_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_unconnected_ledger_refuses_seat_changes() -> None:
+    db, events = _fake_db(_event(1, capacity=5))
+    ledger = UnavailableCapacityLedger()
+
+    for change in (ledger.reserve, ledger.release, ledger.restore):
+        with pytest.raises(HTTPException) as exc_info:
+            await change(db, 1)
+        assert exc_info.value.status_code == 503
+    assert events.docs[1]["registered_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fail_closed() -> None:
+    db, _ = _fake_db(_event(1, capacity=5))
+    redis = _FakeRedis()
+    redis.fail = True
+
+    with pytest.raises(HTTPException) as exc_info:
+        await _ledger(redis).reserve(db, 1)
+
+    assert exc_info.value.status_code == 503
+
+
+async def _insert_event(
+    db: AsyncDatabase[dict[str, Any]],
+    event_data: dict[str, Any],
+    *,
+    capacity: int,
+) -> None:
+    await db["events"].delete_many({"id": event_data["id"]})
+    await db["attendance"].delete_many({"event_id": event_data["id"]})
+    await db["events"].insert_one(
+        {
+            **event_data,
+            "total_capacity": capacity,
+            "registered_count": 0,
+            "favorites_count": 0,
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_mongo_path_never_oversells_under_contention(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _insert_event(db, event_data, capacity=50)
+    ledger = CapacityLedger()
+
+    results = await _reserve_concurrently(ledger, db, 200)
+
+    assert results.count(True) == 50
+    stored = await db["events"].find_one({"id": 1})
+    assert stored is not None
+    assert stored["registered_count"] == 50
+
+
+@pytest.mark.asyncio
+async def test_redis_ledger_load_never_oversells(
+    db: AsyncDatabase[dict[str, Any]], redis: Redis, event_data: dict[str, Any]
+) -> None:
+    await _insert_event(db, event_data, capacity=150)
+    prefix = f"evently-test:{uuid.uuid4().hex}"
+    # Independent ledgers stand in for separate API processes.
+    ledgers: Sequence[CapacityLedger] = [
+        CapacityLedger(redis=redis, key_prefix=prefix) for _ in range(4)
+    ]
+    try:
+        results = await asyncio.gather(
+            *(ledgers[attempt % 4].reserve(db, 1) for attempt in range(1000))
+        )
+        assert results.count(True) == 150
+
+        await ledgers[0].release(db, 1)
+        assert await ledgers[1].reserve(db, 1)
+        assert not await ledgers[2].reserve(db, 1)
+
+        await ledgers[3].flush(db)
+        stored = await db["events"].find_one({"id": 1})
+        assert stored is not None
+        assert stored["registered_count"] == 150
+        assert await ledgers[0].held_event_ids([1, 2]) == {1}
+    finally:
+        keys = [key async for key in redis.scan_iter(f"{prefix}:*")]
+        if keys:
+            await redis.delete(*keys)
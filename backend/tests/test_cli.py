@@ -55,3 +55,142 @@ def test_cli_sets_database_url_before_starting_server(
         "reload": False,
         "database_url": "mongodb://cli-db",
     }
+
+
+def test_parse_args_defaults_to_serve_command(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("DATABASE_URL", "mongodb://from-env")
+
+    parsed = parse_args([])
+
+    assert parsed.command == "serve"
+    assert parsed.check_only is False
+
+
+def test_parse_args_accepts_indexes_check_command(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("DATABASE_URL", "mongodb://from-env")
+
+    parsed = parse_args(["indexes", "--check"])
+
+    assert parsed.command == "indexes"
+    assert parsed.check_only is True
+
+
+def test_cli_indexes_command_exits_with_drift_status(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    recorded: dict[str, object] = {}
+
+    async def fake_bootstrap(database_url: str, *, check_only: bool) -> int:
+        recorded["database_url"] = database_url
+        recorded["check_only"] = check_only
+        return 1
+
+    def fail_run(*args: object, **kwargs: object) -> None:
+        raise AssertionError("the indexes command must not start the server")
+
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setattr("backend.main._run_index_bootstrap", fake_bootstrap)
+    monkeypatch.setattr("backend.main.uvicorn.run", fail_run)
+
+    with pytest.raises(SystemExit) as exc_info:
+        cli(["--database-url", "mongodb://cli-db", "indexes", "--check"])
+
+    assert exc_info.value.code == 1
+    assert recorded == {"database_url": "mongodb://cli-db", "check_only": True}
+
+
+def test_cli_reconcile_counters_command_runs_without_starting_server(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    recorded: list[str] = []
+
+    async def fake_reconcile(database_url: str) -> int:
+        recorded.append(database_url)
+        return 0
+
+    def fail_run(*args: object, **kwargs: object) -> None:
+        raise AssertionError("reconcile-counters must not start the server")
+
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setattr("backend.main._run_counter_reconcile", fake_reconcile)
+    monkeypatch.setattr("backend.main.uvicorn.run", fail_run)
+
+    with pytest.raises(SystemExit) as exc_info:
+        cli(["--database-url", "mongodb://cli-db", "reconcile-counters"])
+
+    assert exc_info.value.code == 0
+    assert recorded == ["mongodb://cli-db"]
+
+
+def test_cli_migrate_attendance_command_passes_dry_run(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    recorded: dict[str, object] = {}
+
+    async def fake_migration(database_url: str, *, dry_run: bool) -> int:
+        recorded["database_url"] = database_url
+        recorded["dry_run"] = dry_run
+        return 0
+
+    def fail_run(*args: object, **kwargs: object) -> None:
+        raise AssertionError("migrate-attendance must not start the server")
+
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setattr("backend.main._run_attendance_migration", fake_migration)
+    monkeypatch.setattr("backend.main.uvicorn.run", fail_run)
+
+    with pytest.raises(SystemExit) as exc_info:
+        cli(["--database-url", "mongodb://cli-db", "migrate-attendance", "--dry-run"])
+
+    assert exc_info.value.code == 0
+    assert recorded == {"database_url": "mongodb://cli-db", "dry_run": True}
+
+
+def test_cli_rebuild_user_events_command_runs_without_starting_server(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    recorded: list[str] = []
+
+    async def fake_rebuild(database_url: str) -> int:
+        recorded.append(database_url)
+        return 0
+
+    def fail_run(*args: object, **kwargs: object) -> None:
+        raise AssertionError("rebuild-user-events must not start the server")
+
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setattr("backend.main._run_user_event_index_rebuild", fake_rebuild)
+    monkeypatch.setattr("backend.main.uvicorn.run", fail_run)
+
+    with pytest.raises(SystemExit) as exc_info:
+        cli(["--database-url", "mongodb://cli-db", "rebuild-user-events"])
+
+    assert exc_info.value.code == 0
+    assert recorded == ["mongodb://cli-db"]
+
+
+def test_cli_backfill_activity_command_runs_without_starting_server(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    recorded: list[str] = []
+
+    async def fake_backfill(database_url: str) -> int:
+        recorded.append(database_url)
+        return 0
+
+    def fail_run(*args: object, **kwargs: object) -> None:
+        raise AssertionError("backfill-activity must not start the server")
+
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setattr("backend.main._run_activity_backfill", fake_backfill)
+    monkeypatch.setattr("backend.main.uvicorn.run", fail_run)
+
+    with pytest.raises(SystemExit) as exc_info:
+        cli(["--database-url", "mongodb://cli-db", "backfill-activity"])
+
+    assert exc_info.value.code == 0
+    assert recorded == ["mongodb://cli-db"]
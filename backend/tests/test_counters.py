@@ -0,0 +1,162 @@
+from typing import Any
+
+import pytest
+from pymongo.asynchronous.database import AsyncDatabase
+
+from backend.services.counters import (
+    USER_ATTENDED_COUNT_FIELD,
+    USER_CREATED_COUNT_FIELD,
+    ensure_event_counters,
+    ensure_user_counters,
+    increment_user_counters,
+    reconcile_event_counters,
+    reconcile_user_counters,
+)
+
+
+async def _clean(db: AsyncDatabase[dict[str, Any]]) -> None:
+    for coll in (
+        "events",
+        "attendance",
+        "event_favorites",
+        "event_user_locks",
+        "users",
+    ):
+        await db[coll].delete_many({})
+
+
+@pytest.mark.asyncio
+async def test_ensure_event_counters_backfills_missing_fields(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _clean(db)
+    await db["events"].insert_one(dict(event_data))
+    await db["attendance"].insert_many(
+        [
+            {"event_id": 1, "user_id": 1, "status": "going"},
+            {"event_id": 1, "user_id": 2, "status": "cancelled"},
+            {"event_id": 1, "user_id": 3, "status": "checked_in"},
+        ]
+    )
+    await db["event_favorites"].insert_one({"event_id": 1, "user_id": 5})
+
+    raw = await db["events"].find_one({"id": 1})
+    assert raw is not None
+    await ensure_event_counters(db, [raw])
+
+    assert raw["registered_count"] == 2
+    assert raw["favorites_count"] == 1
+    stored = await db["events"].find_one({"id": 1})
+    assert stored is not None
+    assert stored["registered_count"] == 2
+    assert stored["favorites_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_reconcile_event_counters_repairs_drift(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _clean(db)
+    await db["events"].insert_many(
+        [
+            {**event_data, "id": 1, "registered_count": 9, "favorites_count": 0},
+            {**event_data, "id": 2, "registered_count": 1, "favorites_count": 1},
+            {**event_data, "id": 3, "registered_count": 4, "favorites_count": 4},
+        ]
+    )
+    await db["attendance"].insert_many(
+        [
+            {"event_id": 1, "user_id": 1, "status": "going"},
+            {"event_id": 2, "user_id": 1, "status": "going"},
+        ]
+    )
+    await db["event_favorites"].insert_many(
+        [{"event_id": 1, "user_id": 1}, {"event_id": 2, "user_id": 1}]
+    )
+    # Event 3 has a registration in flight and must be left alone.
+    await db["event_user_locks"].insert_one({"_id": "3:1", "event_id": 3, "user_id": 1})
+
+    repaired = await reconcile_event_counters(db)
+
+    assert repaired == 1
+    stored = {
+        raw["id"]: (raw["registered_count"], raw["favorites_count"])
+        async for raw in db["events"].find({})
+    }
+    assert stored == {1: (1, 1), 2: (1, 1), 3: (4, 4)}
+
+
+@pytest.mark.asyncio
+async def test_user_counters_backfill_before_they_are_incremented(
+    db: AsyncDatabase[dict[str, Any]],
+    user_data: dict[str, Any],
+    event_data: dict[str, Any],
+) -> None:
+    await _clean(db)
+    await db["users"].insert_one(dict(user_data))
+    await db["events"].insert_many(
+        [{**event_data, "id": 1}, {**event_data, "id": 2, "organizer_user_id": 2}]
+    )
+    await db["attendance"].insert_many(
+        [
+            {"event_id": 2, "user_id": 1, "status": "checked_in"},
+            {"event_id": 3, "user_id": 1, "status": "going"},
+        ]
+    )
+
+    # Not backfilled yet, so the increment is left to the backfill.
+    await increment_user_counters(db, USER_CREATED_COUNT_FIELD, {1: 1})
+    raw = await db["users"].find_one({"id": 1})
+    assert raw is not None
+    assert USER_CREATED_COUNT_FIELD not in raw
+
+    await ensure_user_counters(db, [raw])
+    assert (raw[USER_CREATED_COUNT_FIELD], raw[USER_ATTENDED_COUNT_FIELD]) == (1, 1)
+
+    await increment_user_counters(db, USER_ATTENDED_COUNT_FIELD, {1: -1})
+    stored = await db["users"].find_one({"id": 1})
+    assert stored is not None
+    assert (stored[USER_CREATED_COUNT_FIELD], stored[USER_ATTENDED_COUNT_FIELD]) == (
+        1,
+        0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_reconcile_user_counters_repairs_drift(
+    db: AsyncDatabase[dict[str, Any]],
+    user_data: dict[str, Any],
+    event_data: dict[str, Any],
+) -> None:
+    await _clean(db)
+    await db["users"].insert_many(
+        [
+            {
+                **user_data,
+                USER_CREATED_COUNT_FIELD: 5,
+                USER_ATTENDED_COUNT_FIELD: 0,
+            },
+            {
+                **user_data,
+                "id": 2,
+                "email": "other@example.com",
+                "username": "other",
+                USER_CREATED_COUNT_FIELD: 1,
+                USER_ATTENDED_COUNT_FIELD: 0,
+            },
+        ]
+    )
+    await db["events"].insert_many(
+        [{**event_data, "id": 1}, {**event_data, "id": 2, "organizer_user_id": 2}]
+    )
+    await db["attendance"].insert_one(
+        {"event_id": 2, "user_id": 1, "status": "checked_in"}
+    )
+
+    assert await reconcile_user_counters(db) == 1
+
+    stored = {
+        raw["id"]: (raw[USER_CREATED_COUNT_FIELD], raw[USER_ATTENDED_COUNT_FIELD])
+        async for raw in db["users"].find({})
+    }
+    assert stored == {1: (1, 1), 2: (1, 0)}
@@ -0,0 +1,155 @@
+from typing import Any, cast
+
+import pytest
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import OperationFailure
+
+from backend.db.indexes import INDEX_SPECS, IndexSpec, ensure_indexes
+
+
+class _FakeCollection:
+    def __init__(self, existing: dict[str, dict[str, Any]] | None = None) -> None:
+        self.indexes: dict[str, dict[str, Any]] = {
+            "_id_": {"key": [("_id", 1)], "v": 2},
+            **(existing or {}),
+        }
+        self.created: list[tuple[list[tuple[str, int | str]], dict[str, Any]]] = []
+        self.fail_with: OperationFailure | None = None
+
+    async def index_information(self) -> dict[str, dict[str, Any]]:
+        return dict(self.indexes)
+
+    async def create_index(
+        self, keys: list[tuple[str, int | str]], **kwargs: Any
+    ) -> str:
+        if self.fail_with is not None:
+            raise self.fail_with
+        self.created.append((keys, kwargs))
+        info: dict[str, Any] = {"key": keys, "v": 2}
+        if kwargs.get("unique"):
+            info["unique"] = True
+        if "partialFilterExpression" in kwargs:
+            info["partialFilterExpression"] = kwargs["partialFilterExpression"]
+        if "expireAfterSeconds" in kwargs:
+            info["expireAfterSeconds"] = kwargs["expireAfterSeconds"]
+        self.indexes[str(kwargs["name"])] = info
+        return str(kwargs["name"])
+
+
+class _FakeDb:
+    def __init__(self) -> None:
+        self.collections: dict[str, _FakeCollection] = {}
+
+    def __getitem__(self, name: str) -> _FakeCollection:
+        return self.collections.setdefault(name, _FakeCollection())
+
+
+def _as_db(db: _FakeDb) -> AsyncDatabase[dict[str, Any]]:
+    return cast(AsyncDatabase[dict[str, Any]], db)
+
+
+_CALENDAR_SPEC = IndexSpec(
+    "user_calendar_entries",
+    "user_calendar_entries_user_event_unique",
+    (("user_id", 1), ("event_id", 1)),
+    unique=True,
+)
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_creates_every_registered_index() -> None:
+    db = _FakeDb()
+
+    report = await ensure_indexes(_as_db(db))
+
+    assert len(report.created) == len(INDEX_SPECS)
+    assert not report.has_drift
+    calendar = db["user_calendar_entries"]
+    assert (
+        [("user_id", 1), ("event_id", 1)],
+        {"name": "user_calendar_entries_user_event_unique", "unique": True},
+    ) in calendar.created
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_is_idempotent() -> None:
+    db = _FakeDb()
+    await ensure_indexes(_as_db(db))
+
+    report = await ensure_indexes(_as_db(db))
+
+    assert report.created == []
+    assert not report.has_drift
+    assert report.unmanaged == []
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_reports_conflicting_and_unmanaged_indexes() -> None:
+    db = _FakeDb()
+    db.collections["user_calendar_entries"] = _FakeCollection(
+        {
+            "user_calendar_entries_user_event_unique": {
+                "key": [("user_id", 1), ("event_id", 1)],
+                "v": 2,
+            },
+            "legacy_added_at": {"key": [("added_at", 1)], "v": 2},
+        }
+    )
+
+    report = await ensure_indexes(_as_db(db), specs=[_CALENDAR_SPEC])
+
+    assert report.conflicting == [
+        "user_calendar_entries.user_calendar_entries_user_event_unique"
+    ]
+    assert report.unmanaged == ["user_calendar_entries.legacy_added_at"]
+    assert report.created == []
+    assert report.has_drift
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_check_mode_reports_missing_without_creating() -> None:
+    db = _FakeDb()
+
+    report = await ensure_indexes(_as_db(db), create=False, specs=[_CALENDAR_SPEC])
+
+    assert report.missing == [
+        "user_calendar_entries.user_calendar_entries_user_event_unique"
+    ]
+    assert db["user_calendar_entries"].created == []
+    assert report.has_drift
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_records_creation_failures() -> None:
+    db = _FakeDb()
+    db["user_calendar_entries"].fail_with = OperationFailure(
+        "E11000 duplicate key error", code=11000
+    )
+
+    report = await ensure_indexes(_as_db(db), specs=[_CALENDAR_SPEC])
+
+    assert report.failed == [
+        "user_calendar_entries.user_calendar_entries_user_event_unique"
+    ]
+    assert report.has_drift
+
+
+def test_index_spec_matches_partial_and_ttl_options() -> None:
+    google_sub = next(
+        spec for spec in INDEX_SPECS if spec.name == "users_google_sub_unique"
+    )
+    assert google_sub.matches(
+        {
+            "key": [("google_sub", 1)],
+            "unique": True,
+            "partialFilterExpression": {"google_sub": {"$type": "string"}},
+        }
+    )
+    assert not google_sub.matches({"key": [("google_sub", 1)], "unique": True})
+
+    oauth_ttl = next(
+        spec for spec in INDEX_SPECS if spec.name == "oauth_tokens_updated_at_ttl"
+    )
+    assert oauth_ttl.matches(
+        {"key": [("updated_at", 1)], "expireAfterSeconds": 2592000.0}
+    )
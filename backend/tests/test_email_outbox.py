@@ -0,0 +1,233 @@
+from datetime import UTC, datetime, timedelta
+from typing import Any, cast
+
+import pytest
+from pymongo.asynchronous.database import AsyncDatabase
+from resend.exceptions import ResendError
+
+from backend.models.event import Event
+from backend.services.notifications.email import EmailNotificationService
+from backend.services.notifications.outbox import (
+    OUTBOX_BASE_BACKOFF,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_MAX_BACKOFF,
+    drain_email_outbox,
+    enqueue_email,
+    outbox_backoff,
+    outbox_dedup_key,
+    outbox_depth,
+)
+from backend.services.notifications.throttle import (
+    RECIPIENT_BUCKET,
+    EmailCircuitOpenError,
+    EmailRateLimiter,
+)
+
+
+class _RecordingEmail:
+    def __init__(self, failures: int = 0, circuit_open: bool = False) -> None:
+        self.sent: list[tuple[str, str, int, str]] = []
+        self.failures = failures
+        self.circuit_open = circuit_open
+        self.refused = 0
+
+    async def send_transactional(
+        self, kind: str, recipient_email: str, event: Event, *, idempotency_key: str
+    ) -> None:
+        if self.circuit_open:
+            self.refused += 1
+            raise EmailCircuitOpenError(30)
+        if self.failures:
+            self.failures -= 1
+            raise ResendError("500", "server_error", "boom", "retry")
+        self.sent.append((kind, recipient_email, event.id, idempotency_key))
+
+
+def _as_service(email: _RecordingEmail) -> EmailNotificationService:
+    return cast(EmailNotificationService, email)
+
+
+def test_outbox_backoff_doubles_up_to_the_cap() -> None:
+    assert outbox_backoff(1) == OUTBOX_BASE_BACKOFF
+    assert outbox_backoff(3) == OUTBOX_BASE_BACKOFF * 4
+    assert outbox_backoff(OUTBOX_MAX_ATTEMPTS + 10) == OUTBOX_MAX_BACKOFF
+    assert outbox_dedup_key("registration_confirmation", 4, 7) == (
+        "registration_confirmation:4:7"
+    )
+
+
+async def _seed(db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]) -> None:
+    for name in ("events", "email_outbox"):
+        await db[name].delete_many({})
+    await db["events"].insert_one({**event_data, "id": 1})
+
+
+@pytest.mark.asyncio
+async def test_drain_sends_each_queued_email_once(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _seed(db, event_data)
+    assert await enqueue_email(
+        db,
+        "event_creation_confirmation",
+        recipient="organizer@example.com",
+        event_id=1,
+        dedup_key="event_creation_confirmation:1",
+    )
+    assert not await enqueue_email(
+        db,
+        "event_creation_confirmation",
+        recipient="organizer@example.com",
+        event_id=1,
+        dedup_key="event_creation_confirmation:1",
+    )
+    await enqueue_email(
+        db,
+        "registration_confirmation",
+        recipient="attendee@example.com",
+        event_id=1,
+        dedup_key="registration_confirmation:1:7:t",
+    )
+    await enqueue_email(
+        db,
+        "waitlist_promotion",
+        recipient="gone@example.com",
+        event_id=99,
+        dedup_key="waitlist_promotion:99:8:t",
+    )
+    email = _RecordingEmail()
+
+    assert await drain_email_outbox(db, _as_service(email)) == 2
+    assert await drain_email_outbox(db, _as_service(email)) == 0
+
+    assert sorted(email.sent) == [
+        (
+            "event_creation_confirmation",
+            "organizer@example.com",
+            1,
+            "event_creation_confirmation:1",
+        ),
+        (
+            "registration_confirmation",
+            "attendee@example.com",
+            1,
+            "registration_confirmation:1:7:t",
+        ),
+    ]
+    statuses = {
+        entry["_id"]: entry["status"]
+        async for entry in db["email_outbox"].find({}, {"status": 1})
+    }
+    assert statuses == {
+        "event_creation_confirmation:1": "sent",
+        "registration_confirmation:1:7:t": "sent",
+        "waitlist_promotion:99:8:t": "failed",
+    }
+
+
+@pytest.mark.asyncio
+async def test_drain_backs_off_after_a_failure_and_gives_up_eventually(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _seed(db, event_data)
+    await enqueue_email(
+        db,
+        "registration_confirmation",
+        recipient="attendee@example.com",
+        event_id=1,
+        dedup_key="registration_confirmation:1:7:t",
+    )
+    email = _RecordingEmail(failures=1)
+
+    before = datetime.now(tz=UTC)
+    assert await drain_email_outbox(db, _as_service(email)) == 0
+    entry = await db["email_outbox"].find_one({})
+    assert entry is not None
+    assert entry["status"] == "pending"
+    assert entry["attempts"] == 1
+    retry_at = entry["next_attempt_at"].replace(tzinfo=UTC)
+    assert retry_at >= before + OUTBOX_BASE_BACKOFF - timedelta(seconds=1)
+    # Not due yet.
+    assert await drain_email_outbox(db, _as_service(email)) == 0
+
+    await db["email_outbox"].update_one(
+        {}, {"$set": {"next_attempt_at": datetime.now(tz=UTC)}}
+    )
+    assert await drain_email_outbox(db, _as_service(email)) == 1
+    assert email.sent[0][3] == "registration_confirmation:1:7:t"
+
+    await db["email_outbox"].update_one(
+        {},
+        {
+            "$set": {
+                "status": "pending",
+                "attempts": OUTBOX_MAX_ATTEMPTS - 1,
+                "next_attempt_at": datetime.now(tz=UTC),
+            }
+        },
+    )
+    assert await drain_email_outbox(db, _as_service(_RecordingEmail(failures=1))) == 0
+    entry = await db["email_outbox"].find_one({})
+    assert entry is not None
+    assert entry["status"] == "failed"
+    assert "boom" in entry["last_error"]
+
+
+@pytest.mark.asyncio
+async def test_drain_parks_emails_while_the_circuit_is_open(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _seed(db, event_data)
+    for user_id in range(1, 11):
+        await enqueue_email(
+            db,
+            "registration_confirmation",
+            recipient=f"user{user_id}@example.com",
+            event_id=1,
+            dedup_key=f"registration_confirmation:1:{user_id}:t",
+        )
+    email = _RecordingEmail(circuit_open=True)
+
+    before = datetime.now(tz=UTC)
+    assert await drain_email_outbox(db, _as_service(email)) == 0
+
+    # Each runner stops at its first refusal rather than claiming the rest.
+    assert 1 <= email.refused <= 4
+    entries = await db["email_outbox"].find({}).to_list()
+    assert all(
+        entry["status"] == "pending" and entry["attempts"] == 0 for entry in entries
+    )
+    parked = [
+        entry
+        for entry in entries
+        if entry["next_attempt_at"].replace(tzinfo=UTC)
+        >= before + timedelta(seconds=29)
+    ]
+    assert len(parked) == email.refused
+    depth = await outbox_depth(db)
+    assert depth["pending"] == 10
+    assert depth["due"] == 10 - email.refused
+
+
+@pytest.mark.asyncio
+async def test_drain_paces_each_recipient(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _seed(db, event_data)
+    for user_id in range(RECIPIENT_BUCKET.burst + 2):
+        await enqueue_email(
+            db,
+            "waitlist_promotion",
+            recipient="busy@example.com",
+            event_id=1,
+            dedup_key=f"waitlist_promotion:1:7:{user_id}",
+        )
+    email = _RecordingEmail()
+
+    sent = await drain_email_outbox(db, _as_service(email), limiter=EmailRateLimiter())
+
+    assert sent == RECIPIENT_BUCKET.burst
+    waiting = await db["email_outbox"].find({"status": "pending"}).to_list()
+    assert len(waiting) == 2
+    assert all(entry["attempts"] == 0 for entry in waiting)
+    assert (await outbox_depth(db))["due"] == 0
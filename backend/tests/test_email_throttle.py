@@ -0,0 +1,281 @@
+import json
+import math
+from collections.abc import Mapping
+from datetime import timedelta
+from typing import Any, cast
+
+import pytest
+from redis.asyncio import Redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+from resend.exceptions import ResendError
+from resend.http_client_async import AsyncHTTPClient
+
+from backend.services.notifications.email import ResendEmailSender
+from backend.services.notifications.throttle import (
+    EMAIL_METRICS_KEY,
+    TOKEN_BUCKET_SCRIPT,
+    CircuitBreaker,
+    EmailCircuitOpenError,
+    EmailRateLimiter,
+    EmailThrottle,
+    TokenBucket,
+    publish_email_metrics,
+    read_email_metrics,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _BucketRedis:
+    """Runs the token bucket script in Python against a fake clock."""
+
+    def __init__(self, clock: _Clock) -> None:
+        self.clock = clock
+        self.hashes: dict[str, dict[str, float]] = {}
+        self.ttls: dict[str, int] = {}
+        self.fail = False
+
+    def register_script(self, source: str) -> Any:
+        assert source == TOKEN_BUCKET_SCRIPT
+
+        async def run(keys: list[str], args: list[Any]) -> int:
+            if self.fail:
+                raise RedisConnectionError("down")
+            rate, burst = float(args[0]), float(args[1])
+            now = math.floor(self.clock.now * 1000)
+            state = self.hashes.get(keys[0], {"tokens": burst, "at": now})
+            tokens = min(burst, state["tokens"] + max(0, now - state["at"]) * rate)
+            wait = 0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = math.ceil((1 - tokens) / rate)
+            self.hashes[keys[0]] = {"tokens": tokens, "at": now}
+            self.ttls[keys[0]] = int(args[2])
+            return wait
+
+        return run
+
+
+class _MetricsRedis:
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[bytes, bytes]] = {}
+        self.ttls: dict[str, int] = {}
+
+    def pipeline(self, transaction: bool = True) -> "_MetricsPipeline":
+        return _MetricsPipeline(self)
+
+    async def hgetall(self, key: str) -> dict[bytes, bytes]:
+        return dict(self.hashes.get(key, {}))
+
+
+class _MetricsPipeline:
+    def __init__(self, redis: _MetricsRedis) -> None:
+        self.redis = redis
+
+    async def __aenter__(self) -> "_MetricsPipeline":
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        return None
+
+    def hset(self, key: str, field: str, value: str) -> None:
+        self.redis.hashes.setdefault(key, {})[field.encode()] = value.encode()
+
+    def pexpire(self, key: str, ms: int) -> None:
+        self.redis.ttls[key] = ms
+
+    async def execute(self) -> list[Any]:
+        return []
+
+
+class _StatusHTTPClient(AsyncHTTPClient):
+    def __init__(self, *statuses: int) -> None:
+        self.statuses = list(statuses)
+        self.calls = 0
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str],
+        json: dict[str, object] | list[object] | None = None,
+        files: dict[str, Any] | None = None,
+        data: dict[str, str] | None = None,
+    ) -> tuple[bytes, int, Mapping[str, str]]:
+        self.calls += 1
+        status = self.statuses.pop(0) if self.statuses else 200
+        body = b'{"id":"email-id"}' if status < 400 else b'{"message":"nope"}'
+        return body, status, {"content-type": "application/json"}
+
+
+_BUCKET = TokenBucket(rate_per_second=2, burst=2)
+
+
+@pytest.mark.asyncio
+async def test_redis_token_bucket_is_shared_and_refills() -> None:
+    clock = _Clock()
+    redis = _BucketRedis(clock)
+    first = EmailRateLimiter(redis=cast(Redis, redis))
+    second = EmailRateLimiter(redis=cast(Redis, redis))
+
+    assert await first.take("provider", _BUCKET) == 0
+    assert await second.take("provider", _BUCKET) == 0
+    # Both processes drew from one bucket, so the third send must wait.
+    assert await first.take("provider", _BUCKET) == 0.5
+    assert list(redis.hashes) == ["evently:email:bucket:provider"]
+    assert redis.ttls["evently:email:bucket:provider"] == 1000
+
+    clock.now += 1
+    assert await second.take("provider", _BUCKET) == 0
+    assert await second.take("recipient:a@example.com", _BUCKET) == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_falls_back_to_a_local_bucket_without_redis() -> None:
+    clock = _Clock()
+    redis = _BucketRedis(clock)
+    redis.fail = True
+    limiter = EmailRateLimiter(redis=cast(Redis, redis), clock=clock)
+
+    assert await limiter.take("provider", _BUCKET) == 0
+    assert await limiter.take("provider", _BUCKET) == 0
+    assert await limiter.take("provider", _BUCKET) == pytest.approx(0.5)
+    clock.now += 0.5
+    assert await limiter.take("provider", _BUCKET) == 0
+
+    local = EmailRateLimiter()
+    assert await local.acquire("provider", TokenBucket(1000, 1)) == 0
+    assert await local.acquire("provider", TokenBucket(1000, 1)) > 0
+
+
+def test_circuit_opens_after_sustained_failures_and_probes_after_cooldown() -> None:
+    clock = _Clock()
+    breaker = CircuitBreaker(
+        failure_threshold=3, cooldown=timedelta(seconds=30), clock=clock
+    )
+
+    assert not breaker.record_failure()
+    breaker.record_success()
+    assert not breaker.record_failure()
+    assert not breaker.record_failure()
+    assert breaker.record_failure()
+    assert breaker.is_open
+    assert breaker.acquire() == 30
+    # A request that was already in flight does not extend the cooldown.
+    assert not breaker.record_failure()
+
+    clock.now += 30
+    assert breaker.acquire() == 0
+    # Only the probe goes through; everyone else waits for its outcome.
+    assert breaker.acquire() == 5
+    assert breaker.acquire() == 5
+    assert breaker.record_failure()
+    assert breaker.acquire() == 30
+
+    clock.now += 30
+    assert breaker.acquire() == 0
+    breaker.record_success()
+    assert breaker.acquire() == 0
+    assert breaker.acquire() == 0
+    assert not breaker.record_failure()
+
+
+def test_a_lost_probe_stops_blocking_after_a_cooldown() -> None:
+    clock = _Clock()
+    breaker = CircuitBreaker(
+        failure_threshold=1, cooldown=timedelta(seconds=30), clock=clock
+    )
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.acquire() == 0
+
+    clock.now += 29
+    assert breaker.acquire() == 5
+    clock.now += 1
+    assert breaker.acquire() == 0
+
+
+@pytest.mark.asyncio
+async def test_resend_sender_stops_calling_the_provider_while_the_circuit_is_open() -> (
+    None
+):
+    clock = _Clock()
+    throttle = EmailThrottle(
+        limiter=EmailRateLimiter(clock=clock),
+        breaker=CircuitBreaker(failure_threshold=2, clock=clock),
+        bucket=TokenBucket(rate_per_second=1000, burst=1000),
+    )
+    http_client = _StatusHTTPClient(429, 503, 200)
+    sender = ResendEmailSender(
+        api_key="re_test_key",
+        api_url="https://resend.test",
+        http_client=http_client,
+        throttle=throttle,
+    )
+    params = {"to": ["attendee@example.com"], "subject": "Hi"}
+
+    for _ in range(2):
+        with pytest.raises(ResendError):
+            await sender.send_async(params)
+    with pytest.raises(EmailCircuitOpenError) as exc_info:
+        await sender.send_async(params)
+
+    assert exc_info.value.retry_after == 30
+    assert not isinstance(exc_info.value, ResendError)
+    assert http_client.calls == 2
+    stats = throttle.stats.as_dict()
+    assert stats["requests"] == 2
+    assert stats["failures"] == 2
+    assert stats["throttled"] == 1
+    assert stats["circuit_opens"] == 1
+    assert stats["refused_while_open"] == 1
+
+    clock.now += 30
+    await sender.send_async(params)
+    assert http_client.calls == 3
+    assert not throttle.breaker.is_open
+
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_open_the_circuit() -> None:
+    throttle = EmailThrottle(
+        limiter=EmailRateLimiter(), breaker=CircuitBreaker(failure_threshold=1)
+    )
+    sender = ResendEmailSender(
+        api_key="re_test_key",
+        api_url="https://resend.test",
+        http_client=_StatusHTTPClient(422),
+        throttle=throttle,
+    )
+
+    with pytest.raises(ResendError):
+        await sender.send_async({"to": ["not-an-email"]})
+
+    assert not throttle.breaker.is_open
+    assert throttle.stats.failures == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_metrics_round_trip_through_redis() -> None:
+    redis = _MetricsRedis()
+    throttle = EmailThrottle(limiter=EmailRateLimiter())
+    throttle.stats.record_latency(0.2)
+    throttle.stats.record_latency(0.4)
+
+    snapshot = await publish_email_metrics(
+        cast(Redis, redis), throttle, {"pending": 3, "due": 1}
+    )
+
+    assert snapshot["sends"]["latency_seconds_avg"] == pytest.approx(0.3)
+    assert snapshot["sends"]["latency_seconds_max"] == 0.4
+    assert redis.ttls[EMAIL_METRICS_KEY] == 300_000
+    workers = await read_email_metrics(cast(Redis, redis))
+    assert list(workers.values()) == [json.loads(json.dumps(snapshot))]
+    assert next(iter(workers.values()))["outbox"] == {"pending": 3, "due": 1}
@@ -1,4 +1,5 @@
-from datetime import datetime, timedelta
+from collections.abc import Callable
+from datetime import datetime
 from typing import Any
 from unittest.mock import AsyncMock
 
@@ -8,24 +9,15 @@ from pymongo.asynchronous.database import AsyncDatabase
 
 from backend.api import create_app
 from backend.db import get_db
-from backend.models.event import Event
 from backend.routes.auth import AuthSessionUser, require_authenticated_user
-from backend.services.notifications.arq import get_arq
-from backend.services.notifications.email import (
-    REMINDER_LEAD_TIME_MINUTES,
-    get_email_notif_service,
-)
+from backend.services.notifications.arq import get_arq, get_optional_arq
 
 
 class _MockArq:
     def __init__(self) -> None:
-        self.schedule_event_reminder = AsyncMock()
-
-
-class _MockEmailNotificationService:
-    def __init__(self) -> None:
-        self.send_event_creation_confirmation = AsyncMock()
-        self.send_registration_confirmation = AsyncMock()
+        self.schedule_event_reminder_if_due = AsyncMock()
+        self.replace_event_reminder = AsyncMock()
+        self.cancel_event_reminder = AsyncMock()
 
 
 def _auth_user() -> AuthSessionUser:
@@ -39,6 +31,10 @@ def _auth_user() -> AuthSessionUser:
     )
 
 
+def _admin_user() -> AuthSessionUser:
+    return _auth_user().model_copy(update={"roles": ["admin"]})
+
+
 def _valid_payload(**overrides: Any) -> dict[str, Any]:
     payload: dict[str, Any] = {
         "title": "Notification Event",
@@ -100,83 +96,183 @@ async def _clean(db: AsyncDatabase[dict[str, Any]]) -> None:
         "counters",
         "user_calendar_entries",
         "user_calendar_syncs",
+        "email_outbox",
     ):
         await db[coll].delete_many({})
 
 
+async def _queued(db: AsyncDatabase[dict[str, Any]]) -> list[tuple[str, str, int]]:
+    entries = await db["email_outbox"].find({}).to_list(length=None)
+    return [(entry["kind"], entry["recipient"], entry["event_id"]) for entry in entries]
+
+
 def _make_client(
     db: AsyncDatabase[dict[str, Any]],
     *,
-    arq: _MockArq,
-    email_notifs: _MockEmailNotificationService,
+    arq: _MockArq | None,
+    user: Callable[[], AuthSessionUser] = _auth_user,
 ) -> AsyncClient:
     app = create_app()
     app.dependency_overrides[get_db] = lambda: db
-    app.dependency_overrides[get_arq] = lambda: arq
-    app.dependency_overrides[get_email_notif_service] = lambda: email_notifs
-    app.dependency_overrides[require_authenticated_user] = _auth_user
+    if arq is not None:
+        app.dependency_overrides[get_arq] = lambda: arq
+    app.dependency_overrides[get_optional_arq] = lambda: arq
+    app.dependency_overrides[require_authenticated_user] = user
     transport = ASGITransport(app=app)
     return AsyncClient(transport=transport, base_url="http://test")
 
 
 @pytest.mark.asyncio
-async def test_create_event_enqueues_reminder_and_sends_confirmation(
+async def test_create_event_sends_confirmation_and_waits_for_approval_to_remind(
     db: AsyncDatabase[dict[str, Any]],
 ) -> None:
     await _clean(db)
     arq = _MockArq()
-    email_notifs = _MockEmailNotificationService()
     payload = _valid_payload()
 
-    client = _make_client(db, arq=arq, email_notifs=email_notifs)
+    client = _make_client(db, arq=arq)
     async with client:
         resp = await client.post("/events/", json=payload)
 
     assert resp.status_code == 201
     body = resp.json()
     assert body["id"] == 1
+    arq.schedule_event_reminder_if_due.assert_not_awaited()
 
-    arq.schedule_event_reminder.assert_awaited_once()
-    reminder_call = arq.schedule_event_reminder.await_args
-    assert reminder_call is not None
-    assert reminder_call.args == (
-        1,
-        datetime(2026, 8, 1, 10, 0, 0) - timedelta(minutes=REMINDER_LEAD_TIME_MINUTES),
-    )
-
-    email_notifs.send_event_creation_confirmation.assert_awaited_once()
-    confirmation_call = email_notifs.send_event_creation_confirmation.await_args
-    assert confirmation_call is not None
-    assert confirmation_call.args[0] == "organizer@example.com"
-    event = confirmation_call.args[1]
-    assert isinstance(event, Event)
-    assert event.id == 1
-    assert event.title == payload["title"]
-    assert event.organizer_user_id == 7
+    queued = await db["email_outbox"].find({}).to_list(length=None)
+    assert [
+        (entry["_id"], entry["recipient"], entry["event_id"], entry["status"])
+        for entry in queued
+    ] == [("event_creation_confirmation:1", "organizer@example.com", 1, "pending")]
 
 
 @pytest.mark.asyncio
-async def test_create_event_normalizes_aware_start_time_for_reminder(
+async def test_approve_event_schedules_reminder(
     db: AsyncDatabase[dict[str, Any]],
 ) -> None:
     await _clean(db)
+    await db["events"].insert_one(_event_doc(status="pending"))
     arq = _MockArq()
-    email_notifs = _MockEmailNotificationService()
-    payload = _valid_payload(
-        start_time="2026-08-01T10:00:00+02:00",
-        end_time="2026-08-01T12:00:00+02:00",
+
+    client = _make_client(db, arq=arq, user=_admin_user)
+    async with client:
+        resp = await client.post("/events/1/approve")
+
+    assert resp.status_code == 200
+    arq.schedule_event_reminder_if_due.assert_awaited_once_with(
+        1, datetime(2026, 8, 1, 10, 0, 0)
     )
+    arq.cancel_event_reminder.assert_not_awaited()
 
-    client = _make_client(db, arq=arq, email_notifs=email_notifs)
+
+@pytest.mark.asyncio
+async def test_reject_event_drops_reminder(
+    db: AsyncDatabase[dict[str, Any]],
+) -> None:
+    await _clean(db)
+    await db["events"].insert_one(_event_doc(status="pending"))
+    arq = _MockArq()
+
+    client = _make_client(db, arq=arq, user=_admin_user)
     async with client:
-        resp = await client.post("/events/", json=payload)
+        resp = await client.post("/events/1/reject")
 
-    assert resp.status_code == 201
-    arq.schedule_event_reminder.assert_awaited_once_with(
-        1,
-        datetime(2026, 8, 1, 8, 0, 0) - timedelta(minutes=REMINDER_LEAD_TIME_MINUTES),
+    assert resp.status_code == 200
+    arq.cancel_event_reminder.assert_awaited_once_with(1)
+    arq.schedule_event_reminder_if_due.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_review_and_edit_succeed_without_the_job_queue(
+    db: AsyncDatabase[dict[str, Any]],
+) -> None:
+    await _clean(db)
+    await db["events"].insert_many(
+        [
+            _event_doc(id=1, status="pending", organizer_user_id=7),
+            _event_doc(id=2, status="pending", organizer_user_id=7),
+        ]
     )
 
+    client = _make_client(db, arq=None, user=_admin_user)
+    async with client:
+        approved = await client.post("/events/1/approve")
+        rejected = await client.post("/events/2/reject")
+        moved = await client.patch(
+            "/events/1",
+            json={
+                "start_time": "2026-08-02T10:00:00",
+                "end_time": "2026-08-02T12:00:00",
+            },
+        )
+
+    assert approved.status_code == 200
+    assert rejected.status_code == 200
+    assert moved.status_code == 200
+    statuses = {
+        doc["id"]: doc["status"] async for doc in db["events"].find({}, {"_id": 0})
+    }
+    assert statuses == {1: "approved", 2: "rejected"}
+
+
+@pytest.mark.asyncio
+async def test_reminder_sync_failure_does_not_fail_a_saved_change(
+    db: AsyncDatabase[dict[str, Any]],
+) -> None:
+    await _clean(db)
+    await db["events"].insert_one(_event_doc(status="pending", organizer_user_id=7))
+    arq = _MockArq()
+    arq.schedule_event_reminder_if_due.side_effect = ConnectionError("redis down")
+    arq.replace_event_reminder.side_effect = ConnectionError("redis down")
+
+    client = _make_client(db, arq=arq, user=_admin_user)
+    async with client:
+        approved = await client.post("/events/1/approve")
+        moved = await client.patch(
+            "/events/1",
+            json={
+                "start_time": "2026-08-02T10:00:00",
+                "end_time": "2026-08-02T12:00:00",
+            },
+        )
+        detail = await client.get("/events/1")
+
+    assert approved.status_code == 200
+    assert moved.status_code == 200
+    assert detail.json()["start_time"].startswith("2026-08-02T10:00:00")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("status", "replaced"), [("approved", True), ("pending", False)]
+)
+async def test_update_start_time_replaces_reminder_of_approved_event(
+    db: AsyncDatabase[dict[str, Any]], status: str, replaced: bool
+) -> None:
+    await _clean(db)
+    await db["events"].insert_one(_event_doc(status=status, organizer_user_id=7))
+    arq = _MockArq()
+
+    client = _make_client(db, arq=arq)
+    async with client:
+        resp = await client.patch(
+            "/events/1",
+            json={
+                "start_time": "2026-08-02T10:00:00+02:00",
+                "end_time": "2026-08-02T12:00:00+02:00",
+            },
+        )
+        title_resp = await client.patch("/events/1", json={"title": "Renamed"})
+
+    assert resp.status_code == 200
+    assert title_resp.status_code == 200
+    if replaced:
+        arq.replace_event_reminder.assert_awaited_once_with(
+            1, datetime(2026, 8, 2, 8, 0, 0)
+        )
+    else:
+        arq.replace_event_reminder.assert_not_awaited()
+
 
 @pytest.mark.asyncio
 async def test_register_event_sends_registration_confirmation(
@@ -185,22 +281,15 @@ async def test_register_event_sends_registration_confirmation(
     await _clean(db)
     await db["events"].insert_one(_event_doc())
     arq = _MockArq()
-    email_notifs = _MockEmailNotificationService()
 
-    client = _make_client(db, arq=arq, email_notifs=email_notifs)
+    client = _make_client(db, arq=arq)
     async with client:
         resp = await client.post("/events/1/attendance")
 
     assert resp.status_code == 200
-    email_notifs.send_registration_confirmation.assert_awaited_once()
-    confirmation_call = email_notifs.send_registration_confirmation.await_args
-    assert confirmation_call is not None
-    assert confirmation_call.args[0] == "organizer@example.com"
-    event = confirmation_call.args[1]
-    assert isinstance(event, Event)
-    assert event.id == 1
-    assert event.title == "Registration Event"
-    email_notifs.send_event_creation_confirmation.assert_not_awaited()
+    assert await _queued(db) == [
+        ("registration_confirmation", "organizer@example.com", 1)
+    ]
 
 
 @pytest.mark.asyncio
@@ -213,14 +302,15 @@ async def test_register_event_restored_cancelled_registration_sends_confirmation
         {"event_id": 1, "user_id": 7, "status": "cancelled", "checked_in_at": None}
     )
     arq = _MockArq()
-    email_notifs = _MockEmailNotificationService()
 
-    client = _make_client(db, arq=arq, email_notifs=email_notifs)
+    client = _make_client(db, arq=arq)
     async with client:
         resp = await client.post("/events/1/attendance")
 
     assert resp.status_code == 200
-    email_notifs.send_registration_confirmation.assert_awaited_once()
+    assert await _queued(db) == [
+        ("registration_confirmation", "organizer@example.com", 1)
+    ]
 
 
 @pytest.mark.asyncio
@@ -233,14 +323,13 @@ async def test_register_event_existing_active_registration_does_not_confirm_agai
         {"event_id": 1, "user_id": 7, "status": "going", "checked_in_at": None}
     )
     arq = _MockArq()
-    email_notifs = _MockEmailNotificationService()
 
-    client = _make_client(db, arq=arq, email_notifs=email_notifs)
+    client = _make_client(db, arq=arq)
     async with client:
         resp = await client.post("/events/1/attendance")
 
     assert resp.status_code == 200
-    email_notifs.send_registration_confirmation.assert_not_awaited()
+    assert await _queued(db) == []
 
 
 @pytest.mark.asyncio
@@ -253,14 +342,13 @@ async def test_register_event_rejection_does_not_send_registration_confirmation(
         {"event_id": 1, "user_id": 5, "status": "going", "checked_in_at": None}
     )
     arq = _MockArq()
-    email_notifs = _MockEmailNotificationService()
 
-    client = _make_client(db, arq=arq, email_notifs=email_notifs)
+    client = _make_client(db, arq=arq)
     async with client:
         resp = await client.post("/events/1/attendance")
 
     assert resp.status_code == 400
-    email_notifs.send_registration_confirmation.assert_not_awaited()
+    assert await _queued(db) == []
 
 
 @pytest.mark.asyncio
@@ -269,13 +357,11 @@ async def test_create_event_validation_error_does_not_notify(
 ) -> None:
     await _clean(db)
     arq = _MockArq()
-    email_notifs = _MockEmailNotificationService()
 
-    client = _make_client(db, arq=arq, email_notifs=email_notifs)
+    client = _make_client(db, arq=arq)
     async with client:
         resp = await client.post("/events/", json={"title": "incomplete"})
 
     assert resp.status_code == 422
-    arq.schedule_event_reminder.assert_not_awaited()
-    email_notifs.send_event_creation_confirmation.assert_not_awaited()
-    email_notifs.send_registration_confirmation.assert_not_awaited()
+    arq.schedule_event_reminder_if_due.assert_not_awaited()
+    assert await _queued(db) == []
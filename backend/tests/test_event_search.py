@@ -0,0 +1,53 @@
+from backend.services.event_search import (
+    event_search_fields,
+    query_terms,
+    search_filter,
+    stem,
+    tokenize,
+)
+
+
+def test_tokenize_folds_case_and_accents() -> None:
+    assert tokenize("Café Jazz, NIGHT!") == ["cafe", "jazz", "night"]
+    assert tokenize("C++ and C# Workshop") == ["c++", "and", "c#", "workshop"]
+
+
+def test_stem_strips_common_suffixes() -> None:
+    assert stem("festivals") == "festival"
+    assert stem("parties") == "party"
+    assert stem("classes") == "class"
+    assert stem("running") == "run"
+    assert stem("painted") == "paint"
+    assert stem("campus") == "campus"
+    assert stem("2026") == "2026"
+
+
+def test_event_search_fields_index_title_prefixes_and_about_words() -> None:
+    fields = event_search_fields("Summer Festivals", "Live bands playing")
+
+    assert {"s", "su", "summer", "festival", "festivals"} <= set(
+        fields["search_title_terms"]
+    )
+    assert {"summer", "live", "band", "play", "playing"} <= set(fields["search_terms"])
+    # About words are matched whole, never by prefix.
+    assert "ban" not in fields["search_terms"]
+    assert "band" not in fields["search_title_terms"]
+
+
+def test_query_terms_match_stored_terms() -> None:
+    fields = event_search_fields("Running Club", "Weekly group runs")
+
+    terms = query_terms("runs weekly")
+
+    assert terms == ["run", "weekly"]
+    assert set(terms) <= set(fields["search_terms"])
+
+
+def test_search_filter_falls_back_to_regex_for_punctuation_only_queries() -> None:
+    assert search_filter("!!") == {
+        "$or": [
+            {"title": {"$regex": "!!", "$options": "i"}},
+            {"about": {"$regex": "!!", "$options": "i"}},
+        ]
+    }
+    assert search_filter("Jazz")["$or"][0] == {"search_terms": {"$all": ["jazz"]}}
@@ -0,0 +1,83 @@
+import pytest
+
+from backend.services.event_totals import (
+    TOTAL_COUNT_CAP,
+    EventTotal,
+    EventTotalsCache,
+    totals_cache_key,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Counter:
+    def __init__(self, result: int) -> None:
+        self.result = result
+        self.limits: list[int] = []
+
+    async def __call__(self, limit: int) -> int:
+        self.limits.append(limit)
+        return min(self.result, limit)
+
+
+def test_totals_cache_key_ignores_dict_order() -> None:
+    assert totals_cache_key({"a": 1, "b": {"c": 2, "d": 3}}) == totals_cache_key(
+        {"b": {"d": 3, "c": 2}, "a": 1}
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_or_count_caches_until_ttl_expires() -> None:
+    clock = _Clock()
+    totals = EventTotalsCache(ttl_seconds=10, clock=clock)
+    counter = _Counter(5)
+
+    first = await totals.get_or_count({"category": "Music"}, counter)
+    second = await totals.get_or_count({"category": "Music"}, counter)
+    clock.now = 11
+    third = await totals.get_or_count({"category": "Music"}, counter)
+
+    assert first == second == third == EventTotal(count=5, is_estimate=False)
+    assert counter.limits == [TOTAL_COUNT_CAP + 1, TOTAL_COUNT_CAP + 1]
+
+
+@pytest.mark.asyncio
+async def test_get_or_count_caps_broad_queries() -> None:
+    totals = EventTotalsCache()
+
+    total = await totals.get_or_count({}, _Counter(50_000))
+
+    assert total == EventTotal(count=TOTAL_COUNT_CAP, is_estimate=True)
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_cached_and_in_flight_totals() -> None:
+    totals = EventTotalsCache()
+    await totals.get_or_count({}, _Counter(1))
+
+    totals.invalidate()
+
+    async def count_during_write(limit: int) -> int:
+        totals.invalidate()
+        return 2
+
+    assert await totals.get_or_count({}, count_during_write) == EventTotal(2, False)
+    assert totals.get(totals_cache_key({})) is None
+
+
+def test_cache_evicts_least_recently_used_entries() -> None:
+    totals = EventTotalsCache(max_entries=2)
+    totals.set("a", EventTotal(1, False))
+    totals.set("b", EventTotal(2, False))
+    assert totals.get("a") is not None
+
+    totals.set("c", EventTotal(3, False))
+
+    assert totals.get("b") is None
+    assert totals.get("a") == EventTotal(1, False)
@@ -118,3 +118,20 @@ async def test_reject_event_updates_status(
     saved = await db["events"].find_one({"id": 1})
     assert saved is not None
     assert saved["status"] == "rejected"
+
+
+@pytest.mark.asyncio
+async def test_approve_event_refreshes_cached_listing_total(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _clean(db)
+    await db["events"].insert_one({**event_data, "status": "pending"})
+
+    _, client = _make_client(db, _auth_user(roles=["user", "admin"]))
+    async with client:
+        before = await client.get("/events/")
+        await client.post("/events/1/approve")
+        after = await client.get("/events/")
+
+    assert before.json()["total"] == 0
+    assert after.json()["total"] == 1
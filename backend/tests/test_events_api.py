@@ -1,10 +1,12 @@
+import json
 from datetime import datetime
 from io import BytesIO
 from pathlib import Path
 from typing import Any
-from unittest.mock import AsyncMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
+from fastapi import HTTPException
 from httpx import ASGITransport, AsyncClient
 from pymongo.asynchronous.database import AsyncDatabase
 
@@ -12,8 +14,12 @@ from backend.api import create_app
 from backend.db import get_db
 from backend.routes import events as events_route
 from backend.routes.auth import AuthSessionUser, require_authenticated_user
+from backend.services.event_search import event_search_fields
 from backend.services.notifications.arq import get_arq
 from backend.services.notifications.email import get_email_notif_service
+from backend.services.notifications.outbox import enqueue_email
+from backend.services.notifications.throttle import EMAIL_METRICS_KEY
+from backend.services.pagination import encode_cursor
 
 
 def _make_client(
@@ -208,6 +214,32 @@ async def test_register_event_attendance_creates_registration(
     assert calendar_entry is not None
 
 
+@pytest.mark.asyncio
+async def test_registration_confirmations_are_keyed_by_the_stored_transition(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _clean(db)
+    await db["email_outbox"].delete_many({})
+    await db["events"].insert_one({**event_data, "registered_count": 0})
+
+    _, client = _make_client(db, _auth_user(7))
+    async with client:
+        await client.post("/events/1/attendance")
+        await client.delete("/events/1/attendance")
+        await client.post("/events/1/attendance")
+
+    saved = await db["attendance"].find_one({"event_id": 1, "user_id": 7})
+    assert saved is not None
+    keys = [
+        doc["_id"]
+        async for doc in db["email_outbox"].find({"kind": "registration_confirmation"})
+    ]
+    assert len(keys) == 2
+    assert all(
+        key.startswith(f"registration_confirmation:{saved['_id']}:") for key in keys
+    )
+
+
 @pytest.mark.asyncio
 async def test_register_event_attendance_restores_cancelled_registration(
     db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
@@ -437,6 +469,7 @@ async def test_cancel_event_attendance_removes_google_calendar_event_when_synced
     delete_google_calendar_event.assert_awaited_once_with(
         "google-access-token",
         "google-event-1",
+        client=ANY,
     )
 
 
@@ -542,6 +575,7 @@ async def test_remove_attendee_removes_calendar_and_google_calendar_event(
     delete_google_calendar_event.assert_awaited_once_with(
         "google-access-token",
         "google-event-1",
+        client=ANY,
     )
 
 
@@ -573,7 +607,6 @@ async def test_get_event_attendees_returns_latest_active_attendees_for_organizer
                 "status": "checked_in",
                 "checked_in_at": checked_in_at,
             },
-            {"event_id": 1, "user_id": 9, "status": "going", "checked_in_at": None},
             {
                 "event_id": 1,
                 "user_id": 9,
@@ -593,7 +626,9 @@ async def test_get_event_attendees_returns_latest_active_attendees_for_organizer
     assert body["event_id"] == 1
     assert body["event_title"] == "Test Concert"
     assert body["total_capacity"] == 500
-    assert body["going_count"] == 1
+    # Counts come from attendance alone, so they include user 10, whose profile
+    # is missing and who is therefore not listed.
+    assert body["going_count"] == 2
     assert body["checked_in_count"] == 1
     assert [attendee["user_id"] for attendee in body["attendees"]] == [8, 7]
     assert body["attendees"][0]["status"] == "checked_in"
@@ -601,6 +636,98 @@ async def test_get_event_attendees_returns_latest_active_attendees_for_organizer
     assert body["attendees"][1]["status"] == "going"
 
 
+@pytest.mark.asyncio
+async def test_get_event_attendees_pages_and_searches_by_name(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _clean(db)
+    await db["events"].insert_one(event_data)
+    names = [("Ann", "Adams"), ("Bea", "adams"), ("Cal", "Brown"), ("Dee", "Cole")]
+    await db["users"].insert_many(
+        [
+            _user_doc(10 + i, first_name=first, last_name=last)
+            for i, (first, last) in enumerate(names)
+        ]
+    )
+    await db["attendance"].insert_many(
+        [
+            {
+                "event_id": 1,
+                "user_id": 10 + i,
+                "status": "checked_in" if i == 2 else "going",
+                "checked_in_at": datetime(2026, 6, 15, 19, 30) if i == 2 else None,
+            }
+            for i in range(len(names))
+        ]
+    )
+
+    _, client = _make_client(db, _auth_user(1))
+    async with client:
+        first = await client.get("/events/1/attendees", params={"limit": 3})
+        rest = await client.get(
+            "/events/1/attendees",
+            params={"limit": 3, "cursor": first.json()["next_cursor"]},
+        )
+        searched = await client.get("/events/1/attendees", params={"search": "ADA"})
+        checked_in = await client.get(
+            "/events/1/attendees", params={"status": "checked_in"}
+        )
+        bad_cursor = await client.get("/events/1/attendees", params={"cursor": "x"})
+
+    assert [a["user_id"] for a in first.json()["attendees"]] == [10, 11, 12]
+    assert [a["user_id"] for a in rest.json()["attendees"]] == [13]
+    assert rest.json()["next_cursor"] is None
+    assert rest.json()["going_count"] == 3
+    assert rest.json()["checked_in_count"] == 1
+    assert [a["user_id"] for a in searched.json()["attendees"]] == [10, 11]
+    assert [a["user_id"] for a in checked_in.json()["attendees"]] == [12]
+    assert checked_in.json()["going_count"] == 3
+    assert bad_cursor.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_export_event_attendees_streams_csv_and_ndjson(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _clean(db)
+    await db["events"].insert_one(event_data)
+    await db["users"].insert_many(
+        [
+            _user_doc(7, first_name="Avery", last_name="Zephyr"),
+            _user_doc(8, first_name="Blake", last_name="Yellow"),
+        ]
+    )
+    await db["attendance"].insert_many(
+        [
+            {"event_id": 1, "user_id": 7, "status": "going", "checked_in_at": None},
+            {"event_id": 1, "user_id": 8, "status": "cancelled"},
+        ]
+    )
+
+    _, client = _make_client(db, _auth_user(1))
+    async with client:
+        csv_resp = await client.get("/events/1/attendees/export")
+        ndjson_resp = await client.get(
+            "/events/1/attendees/export", params={"format": "ndjson"}
+        )
+    _, outsider = _make_client(db, _auth_user(7))
+    async with outsider:
+        forbidden = await outsider.get("/events/1/attendees/export")
+
+    assert csv_resp.status_code == 200
+    assert csv_resp.headers["content-type"].startswith("text/csv")
+    assert "attachment" in csv_resp.headers["content-disposition"]
+    assert csv_resp.text.splitlines() == [
+        "user_id,first_name,last_name,email,status,checked_in_at",
+        "7,Avery,Zephyr,user7@example.com,going,",
+    ]
+    assert ndjson_resp.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line)["user_id"] for line in ndjson_resp.text.splitlines()] == [
+        7
+    ]
+    assert forbidden.status_code == 403
+
+
 @pytest.mark.asyncio
 async def test_get_event_attendees_allows_admin(
     db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
@@ -675,6 +802,121 @@ async def test_check_in_attendee_rejects_non_organizer(
     assert saved["status"] == "going"
 
 
+@pytest.mark.asyncio
+async def test_batch_check_in_reports_a_result_per_scan(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _clean(db)
+    await db["tickets"].delete_many({})
+    earlier = datetime(2026, 6, 15, 19, 5, 0)
+    await db["events"].insert_one(event_data)
+    await db["attendance"].insert_many(
+        [
+            {"event_id": 1, "user_id": 7, "status": "going", "checked_in_at": None},
+            {"event_id": 1, "user_id": 8, "status": "going", "checked_in_at": None},
+            {
+                "event_id": 1,
+                "user_id": 9,
+                "status": "checked_in",
+                "checked_in_at": earlier,
+            },
+            {"event_id": 1, "user_id": 10, "status": "cancelled"},
+        ]
+    )
+    await db["tickets"].insert_one(
+        {
+            "id": 55,
+            "event_id": 1,
+            "attendee_id": 8,
+            "price": 50.0,
+            "purchase_time": datetime(2026, 6, 1, 12, 0, 0),
+        }
+    )
+
+    _, client = _make_client(db, _auth_user(1))
+    async with client:
+        resp = await client.post(
+            "/events/1/attendees/check-in:batch",
+            json={
+                "items": [
+                    {"user_id": 7},
+                    {"ticket_id": 55},
+                    {"user_id": 9},
+                    {"user_id": 10},
+                    {"ticket_id": 404},
+                    {"user_id": 7},
+                ]
+            },
+        )
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["checked_in_count"] == 2
+    assert [(r["user_id"], r["result"]) for r in body["results"]] == [
+        (7, "checked_in"),
+        (8, "checked_in"),
+        (9, "already_checked_in"),
+        (10, "not_registered"),
+        (None, "unknown_ticket"),
+        (7, "already_checked_in"),
+    ]
+    assert body["results"][2]["checked_in_at"].startswith("2026-06-15T19:05:00")
+    for user_id in (7, 8):
+        saved = await db["attendance"].find_one({"event_id": 1, "user_id": user_id})
+        assert saved is not None
+        assert saved["status"] == "checked_in"
+    await db["tickets"].delete_many({})
+
+
+@pytest.mark.asyncio
+async def test_batch_check_in_sync_keeps_scan_times_and_is_idempotent(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _clean(db)
+    scanned_at = datetime(2026, 6, 15, 19, 10, 0)
+    await db["events"].insert_one(event_data)
+    await db["attendance"].insert_one(
+        {"event_id": 1, "user_id": 7, "status": "going", "checked_in_at": None}
+    )
+    payload = {
+        "sync": True,
+        "items": [{"user_id": 7, "scanned_at": scanned_at.isoformat()}],
+    }
+
+    _, client = _make_client(db, _auth_user(1))
+    async with client:
+        first = await client.post("/events/1/attendees/check-in:batch", json=payload)
+        again = await client.post("/events/1/attendees/check-in:batch", json=payload)
+
+    assert first.json()["results"][0]["result"] == "checked_in"
+    assert again.status_code == 200
+    assert again.json()["results"][0]["result"] == "already_checked_in"
+    saved = await db["attendance"].find_one({"event_id": 1, "user_id": 7})
+    assert saved is not None
+    assert saved["checked_in_at"] == scanned_at
+
+
+@pytest.mark.asyncio
+async def test_batch_check_in_rejects_non_organizer_and_bad_items(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _clean(db)
+    await db["events"].insert_one(event_data)
+
+    _, client = _make_client(db, _auth_user(7))
+    async with client:
+        forbidden = await client.post(
+            "/events/1/attendees/check-in:batch", json={"items": [{"user_id": 7}]}
+        )
+        invalid = await client.post(
+            "/events/1/attendees/check-in:batch",
+            json={"items": [{"user_id": 7, "ticket_id": 1}]},
+        )
+
+    assert forbidden.status_code == 403
+    assert invalid.status_code == 422
+
+
 @pytest.mark.asyncio
 async def test_undo_check_in_attendee_updates_attendance_for_admin(
     db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
@@ -807,6 +1049,81 @@ async def test_search_by_about(
     assert body["items"][0]["about"] == "A wonderful jazz evening"
 
 
+@pytest.mark.asyncio
+async def test_search_matches_title_prefixes_and_stems(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _clean(db)
+    await db["events"].insert_many(
+        [
+            {
+                **event_data,
+                "id": 1,
+                "title": "Photography Workshop",
+                "about": "Bring cameras",
+                **event_search_fields("Photography Workshop", "Bring cameras"),
+            },
+            {
+                **event_data,
+                "id": 2,
+                "title": "Tech Conference",
+                "about": "Keynotes and talks",
+                **event_search_fields("Tech Conference", "Keynotes and talks"),
+            },
+        ]
+    )
+
+    _, client = _make_client(db)
+    async with client:
+        prefix_resp = await client.get("/events/", params={"q": "photo"})
+        stem_resp = await client.get("/events/", params={"q": "camera"})
+        miss_resp = await client.get("/events/", params={"q": "photo keynote"})
+
+    assert [item["id"] for item in prefix_resp.json()["items"]] == [1]
+    assert [item["id"] for item in stem_resp.json()["items"]] == [1]
+    assert miss_resp.json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_sort_by_relevance_ranks_title_matches_first(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _clean(db)
+    await db["events"].insert_many(
+        [
+            {
+                **event_data,
+                "id": 1,
+                "title": "Park Picnic",
+                "about": "Live jazz all afternoon",
+                "start_time": datetime(2026, 6, 1, 12, 0),
+                "end_time": datetime(2026, 6, 1, 14, 0),
+                **event_search_fields("Park Picnic", "Live jazz all afternoon"),
+            },
+            {
+                **event_data,
+                "id": 2,
+                "title": "Jazz Night",
+                "about": "Smooth standards",
+                "start_time": datetime(2026, 7, 1, 19, 0),
+                "end_time": datetime(2026, 7, 1, 22, 0),
+                **event_search_fields("Jazz Night", "Smooth standards"),
+            },
+        ]
+    )
+
+    _, client = _make_client(db)
+    async with client:
+        resp = await client.get(
+            "/events/", params={"q": "jazz", "sort_by": "relevance"}
+        )
+
+    body = resp.json()
+    assert resp.status_code == 200
+    assert body["total"] == 2
+    assert [item["id"] for item in body["items"]] == [2, 1]
+
+
 # -----------------------------------------------------------------------
 # Filters
 # -----------------------------------------------------------------------
@@ -1044,6 +1361,106 @@ async def test_paginate_events(
     assert body["items"][0]["title"] == "Event 06"
 
 
+@pytest.mark.asyncio
+async def test_cursor_pagination_walks_every_event_once(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _clean(db)
+    docs = [
+        {
+            **event_data,
+            "id": i,
+            "title": f"Event {i:02d}",
+            "price": float(i % 3),
+            "start_time": datetime(2026, 1, 1, 10, 0),
+            "end_time": datetime(2026, 1, 1, 12, 0),
+        }
+        for i in range(1, 12)
+    ]
+    await db["events"].insert_many(docs)
+
+    _, client = _make_client(db)
+    seen: list[int] = []
+    params: dict[str, Any] = {"page_size": 4, "sort_by": "price", "sort_order": "desc"}
+    async with client:
+        while True:
+            resp = await client.get("/events/", params=params)
+            body = resp.json()
+            assert body["total"] == 11
+            seen.extend(item["id"] for item in body["items"])
+            if body["next_cursor"] is None:
+                break
+            params = {**params, "cursor": body["next_cursor"]}
+
+    assert seen == [11, 8, 5, 2, 10, 7, 4, 1, 9, 6, 3]
+
+
+@pytest.mark.asyncio
+async def test_invalid_or_mismatched_cursor_returns_400(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _clean(db)
+    await db["events"].insert_many(
+        [{**event_data, "id": i, "title": f"Event {i}"} for i in range(1, 4)]
+    )
+
+    _, client = _make_client(db)
+    async with client:
+        first = await client.get(
+            "/events/", params={"page_size": 1, "sort_by": "title"}
+        )
+        cursor = first.json()["next_cursor"]
+        garbage = await client.get("/events/", params={"cursor": "???"})
+        mismatched = await client.get(
+            "/events/", params={"cursor": cursor, "sort_by": "price"}
+        )
+        relevance = await client.get(
+            "/events/",
+            params={"cursor": cursor, "q": "event", "sort_by": "relevance"},
+        )
+
+    assert cursor is not None
+    assert garbage.status_code == 400
+    assert mismatched.status_code == 400
+    assert relevance.status_code == 400
+
+
+@pytest.mark.parametrize(
+    ("sort_key", "value"),
+    [
+        ("start_time", {"$ne": None}),
+        ("start_time", "2026-08-01T10:00:00"),
+        ("price", {"$gt": 0}),
+        ("price", True),
+        ("title", {"$ne": None}),
+        ("title", 3),
+    ],
+)
+def test_event_list_cursor_rejects_values_of_the_wrong_type(
+    sort_key: str, value: Any
+) -> None:
+    cursor = encode_cursor(
+        {"sort_by": sort_key, "sort_order": "asc", "id": 1, "value": value}
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        events_route._decode_event_list_cursor(
+            cursor, sort_key=sort_key, sort_order="asc"
+        )
+    assert exc_info.value.status_code == 400
+
+
+def test_event_list_cursor_accepts_values_of_the_sort_type() -> None:
+    start = datetime(2026, 8, 1, 10, 0, 0)
+    for sort_key, value in (("start_time", start), ("price", 0), ("title", "A")):
+        cursor = encode_cursor(
+            {"sort_by": sort_key, "sort_order": "desc", "id": 4, "value": value}
+        )
+        assert events_route._decode_event_list_cursor(
+            cursor, sort_key=sort_key, sort_order="desc"
+        ) == (value, 4)
+
+
 @pytest.mark.asyncio
 async def test_invalid_page_returns_422(
     db: AsyncDatabase[dict[str, Any]],
@@ -1295,6 +1712,32 @@ async def test_update_event_rejects_non_organizer(
     assert resp.json()["detail"] == "Organizer or administrator access required"
 
 
+@pytest.mark.asyncio
+async def test_create_event_survives_a_failed_confirmation_email(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _clean(db)
+    payload = {
+        key: event_data[key]
+        for key in ("title", "about", "price", "total_capacity", "category")
+    } | {
+        "start_time": "2026-09-01T10:00:00",
+        "end_time": "2026-09-01T12:00:00",
+        "schedule": [],
+        "location": event_data["location"],
+    }
+
+    _, client = _make_client(db, auth_user=_auth_user())
+    with patch.object(
+        events_route, "enqueue_email", AsyncMock(side_effect=RuntimeError("down"))
+    ):
+        async with client:
+            resp = await client.post("/events/", json=payload)
+
+    assert resp.status_code == 201
+    assert await db["events"].count_documents({"id": resp.json()["id"]}) == 1
+
+
 @pytest.mark.asyncio
 async def test_create_event_auto_increments_id(
     db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
@@ -1421,6 +1864,98 @@ async def test_favorite_idempotent(
     assert count == 1
 
 
+@pytest.mark.asyncio
+async def test_favorite_mutations_maintain_event_favorites_count(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _clean(db)
+    await db["events"].insert_one(event_data)
+    await db["event_favorites"].insert_one({"event_id": 1, "user_id": 7})
+
+    _, client = _make_client(db, auth_user=_auth_user())
+    async with client:
+        await client.post("/events/1/favorites")
+        await client.post("/events/1/favorites")
+        after_add = await client.get("/events/1")
+        await client.request("DELETE", "/events/1/favorites")
+        await client.request("DELETE", "/events/1/favorites")
+        after_remove = await client.get("/events/1")
+
+    assert after_add.json()["favorites_count"] == 2
+    assert after_remove.json()["favorites_count"] == 1
+    stored = await db["events"].find_one({"id": 1})
+    assert stored is not None
+    assert stored["favorites_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_event_detail_cache_is_invalidated_by_attendance_changes(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _clean(db)
+    await db["events"].insert_one({**event_data, "registered_count": 0})
+
+    _, client = _make_client(db, auth_user=_auth_user(42))
+    async with client:
+        before = await client.get("/events/1")
+        cached = await client.get("/events/1")
+        await client.post("/events/1/attendance")
+        after = await client.get("/events/1")
+
+    assert before.json() == cached.json()
+    assert before.json()["attending_count"] == 0
+    assert after.json()["attending_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_event_cache_stats_requires_admin(
+    db: AsyncDatabase[dict[str, Any]],
+) -> None:
+    _, user_client = _make_client(db, auth_user=_auth_user())
+    _, admin_client = _make_client(db, auth_user=_auth_user(roles=["user", "admin"]))
+    async with user_client, admin_client:
+        forbidden = await user_client.get("/events/cache-stats")
+        allowed = await admin_client.get("/events/cache-stats")
+
+    assert forbidden.status_code == 403
+    assert allowed.status_code == 200
+    assert allowed.json()["event_detail"]["misses"] == 0
+
+
+@pytest.mark.asyncio
+async def test_email_stats_report_outbox_depth_and_worker_metrics(
+    db: AsyncDatabase[dict[str, Any]],
+) -> None:
+    await db["email_outbox"].delete_many({})
+    await enqueue_email(
+        db,
+        "registration_confirmation",
+        recipient="attendee@example.com",
+        event_id=1,
+        dedup_key="registration_confirmation:1:7:t",
+    )
+    redis = MagicMock()
+    redis.hgetall = AsyncMock(
+        return_value={b"host:1": json.dumps({"sends": {"requests": 3}}).encode()}
+    )
+    _, user_client = _make_client(db, auth_user=_auth_user())
+    admin_app, admin_client = _make_client(
+        db, auth_user=_auth_user(roles=["user", "admin"])
+    )
+    admin_app.dependency_overrides[get_arq] = lambda: MagicMock(redis=redis)
+    async with user_client, admin_client:
+        forbidden = await user_client.get("/events/email-stats")
+        allowed = await admin_client.get("/events/email-stats")
+
+    assert forbidden.status_code == 403
+    assert allowed.status_code == 200
+    body = allowed.json()
+    assert body["outbox"]["pending"] == 1
+    assert body["outbox"]["due"] == 1
+    assert body["workers"] == {"host:1": {"sends": {"requests": 3}}}
+    redis.hgetall.assert_awaited_once_with(EMAIL_METRICS_KEY)
+
+
 @pytest.mark.asyncio
 async def test_favorite_nonexistent_event(
     db: AsyncDatabase[dict[str, Any]],
@@ -10,6 +10,7 @@ from backend.api import create_app
 from backend.db import get_db
 from backend.routes import events as events_route
 from backend.routes.auth import AuthSessionUser, require_authenticated_user
+from backend.services.attendance import migrate_attendance
 from backend.services.notifications.arq import get_arq
 from backend.services.notifications.email import get_email_notif_service
 
@@ -52,10 +53,11 @@ async def _clean(db: AsyncDatabase[dict[str, Any]]) -> None:
 
 
 @pytest.mark.asyncio
-async def test_cancel_attendance_only_updates_latest_record(
+async def test_cancel_attendance_after_migration_keeps_superseded_history(
     db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
 ) -> None:
     await _clean(db)
+    await db["attendance_history"].delete_many({})
     await db["events"].insert_one({**event_data, "registered_count": 1})
     await db["attendance"].insert_many(
         [
@@ -74,18 +76,19 @@ async def test_cancel_attendance_only_updates_latest_record(
         ]
     )
 
+    await migrate_attendance(db)
+
     _, client = _make_client(db, _auth_user())
     async with client:
         resp = await client.delete("/events/1/attendance")
 
     assert resp.status_code == 200
 
-    records = await (
-        db["attendance"].find({"event_id": 1, "user_id": 7}).sort("_id", 1).to_list(10)
-    )
-    assert records[0]["status"] == "checked_in"
-    assert records[0]["checked_in_at"] is not None
-    assert records[1]["status"] == "cancelled"
+    records = await db["attendance"].find({"event_id": 1, "user_id": 7}).to_list(10)
+    assert [record["status"] for record in records] == ["cancelled"]
+    history = await db["attendance_history"].find({"user_id": 7}).to_list(10)
+    assert [record["status"] for record in history] == ["checked_in"]
+    assert history[0]["checked_in_at"] is not None
 
 
 @pytest.mark.asyncio
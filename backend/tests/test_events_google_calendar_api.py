@@ -1,20 +1,24 @@
 import os
 from datetime import UTC, datetime
 from types import SimpleNamespace
-from typing import cast
-from unittest.mock import AsyncMock, patch
+from typing import Any, cast
+from unittest.mock import ANY, AsyncMock, patch
 
 import pytest
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from httpx import ASGITransport, AsyncClient
+from pymongo import UpdateOne
 
 os.environ.setdefault("SESSION_SECRET_KEY", "test-secret")
 
 from backend.api import create_app
+from backend.app_config import build_frontend_settings
 from backend.db import get_db
 from backend.routes import events as events_routes
 from backend.routes import users as users_routes
 from backend.routes.auth import AuthSessionUser, require_authenticated_user
+from backend.services import calendar_sync_jobs, user_calendar
+from backend.services.http_clients import create_http_clients
 from backend.services.notifications.arq import get_arq
 from backend.services.notifications.email import get_email_notif_service
 
@@ -117,6 +121,15 @@ class _FakeCollection:
         query = query or {}
         return _FakeCursor([doc for doc in self._docs if self._matches(doc, query)])
 
+    async def distinct(
+        self, field: str, query: dict[str, object] | None = None
+    ) -> list[object]:
+        values: list[object] = []
+        for doc in self.find(query)._docs:
+            if field in doc and doc[field] not in values:
+                values.append(doc[field])
+        return values
+
     async def insert_one(self, doc: dict[str, object]) -> None:
         stored = dict(doc)
         stored.setdefault("_id", self._next_id)
@@ -141,9 +154,34 @@ class _FakeCollection:
 
         for key, value in update.get("$set", {}).items():
             doc[key] = value
+        for key in update.get("$unset", {}):
+            doc.pop(key, None)
 
         return SimpleNamespace(matched_count=1)
 
+    async def find_one_and_update(
+        self,
+        query: dict[str, object],
+        update: dict[str, dict[str, object]],
+        **_kwargs: object,
+    ) -> dict[str, object] | None:
+        result = await self.update_one(query, update)
+        if result.matched_count == 0:
+            return None
+        return await self.find_one({"_id": query["_id"]})
+
+    async def bulk_write(
+        self, operations: list[UpdateOne], *, ordered: bool = True
+    ) -> SimpleNamespace:
+        modified = 0
+        for operation in operations:
+            result = await self.update_one(
+                dict(operation._filter),
+                cast(dict[str, dict[str, object]], operation._doc),
+            )
+            modified += result.matched_count
+        return SimpleNamespace(modified_count=modified)
+
     async def delete_one(self, query: dict[str, object]) -> SimpleNamespace:
         for index, doc in enumerate(self._docs):
             if self._matches(doc, query):
@@ -335,6 +373,66 @@ async def test_get_event_calendar_status_backfills_existing_registration() -> No
     assert saved is not None
 
 
+@pytest.mark.asyncio
+async def test_viewer_state_combines_event_attendance_calendar_and_favorite() -> None:
+    db = _FakeDb()
+    await db["users"].insert_one(_user_doc(7))
+    await db["events"].insert_one(
+        {**_event_doc(), "registered_count": 1, "favorites_count": 1}
+    )
+    await db["attendance"].insert_one(
+        {"event_id": 1, "user_id": 7, "status": "going", "checked_in_at": None}
+    )
+    await db["event_favorites"].insert_one({"event_id": 1, "user_id": 7})
+    await db["user_calendar_syncs"].insert_one(
+        {"user_id": 7, "google_sync_enabled": True}
+    )
+
+    _, client = _make_client(db, _auth_user(7))
+    async with client:
+        resp = await client.get("/events/1/viewer-state")
+        other = await client.get("/events/2/viewer-state")
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["event"]["id"] == 1
+    assert body["event"]["attending_count"] == 1
+    assert body["event"]["favorites_count"] == 1
+    assert {key: value for key, value in body.items() if key != "event"} == {
+        "attendance_status": "going",
+        "waitlist_position": None,
+        "in_calendar": True,
+        "google_sync_enabled": True,
+        "favorited": True,
+    }
+    # A registration missing from the calendar is backfilled, as on /calendar.
+    saved = await db["user_calendar_entries"].find_one({"user_id": 7, "event_id": 1})
+    assert saved is not None
+    assert other.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_viewer_state_for_a_visitor_without_any_state() -> None:
+    db = _FakeDb()
+    await db["events"].insert_one(
+        {**_event_doc(), "registered_count": 0, "favorites_count": 0}
+    )
+
+    _, client = _make_client(db, _auth_user(8))
+    async with client:
+        resp = await client.get("/events/1/viewer-state")
+
+    assert resp.status_code == 200
+    assert {key: value for key, value in resp.json().items() if key != "event"} == {
+        "attendance_status": None,
+        "waitlist_position": None,
+        "in_calendar": False,
+        "google_sync_enabled": False,
+        "favorited": False,
+    }
+    assert await db["user_calendar_entries"].find_one({"user_id": 8}) is None
+
+
 @pytest.mark.asyncio
 async def test_sync_saved_calendar_to_google_backfills_existing_entries(
     monkeypatch: pytest.MonkeyPatch,
@@ -362,7 +460,7 @@ async def test_sync_saved_calendar_to_google_backfills_existing_entries(
             AsyncMock(return_value="google-access-token"),
         ),
         patch.object(
-            users_routes,
+            user_calendar,
             "create_google_calendar_event",
             create_google_calendar_event,
         ),
@@ -375,6 +473,8 @@ async def test_sync_saved_calendar_to_google_backfills_existing_entries(
         "google_sync_enabled": True,
         "synced_count": 1,
         "skipped_count": 0,
+        "failed_count": 0,
+        "failed_event_ids": [],
         "status": "enabled",
     }
 
@@ -428,7 +528,7 @@ async def test_sync_saved_calendar_to_google_backfills_existing_registration_fir
             AsyncMock(return_value="google-access-token"),
         ),
         patch.object(
-            users_routes,
+            user_calendar,
             "create_google_calendar_event",
             create_google_calendar_event,
         ),
@@ -441,6 +541,8 @@ async def test_sync_saved_calendar_to_google_backfills_existing_registration_fir
         "google_sync_enabled": True,
         "synced_count": 1,
         "skipped_count": 0,
+        "failed_count": 0,
+        "failed_event_ids": [],
         "status": "enabled",
     }
     saved = await db["user_calendar_entries"].find_one({"user_id": 7, "event_id": 1})
@@ -478,7 +580,7 @@ async def test_sync_saved_calendar_to_google_skips_invalid_event_records() -> No
             AsyncMock(return_value="google-access-token"),
         ),
         patch.object(
-            users_routes,
+            user_calendar,
             "create_google_calendar_event",
             create_google_calendar_event,
         ),
@@ -491,6 +593,8 @@ async def test_sync_saved_calendar_to_google_skips_invalid_event_records() -> No
         "google_sync_enabled": True,
         "synced_count": 1,
         "skipped_count": 1,
+        "failed_count": 0,
+        "failed_event_ids": [],
         "status": "enabled",
     }
     create_google_calendar_event.assert_awaited_once()
@@ -524,7 +628,7 @@ async def test_unsync_google_calendar_removes_synced_events_and_disables_sync()
             AsyncMock(return_value="google-access-token"),
         ),
         patch.object(
-            users_routes,
+            user_calendar,
             "delete_google_calendar_event",
             delete_google_calendar_event,
         ),
@@ -536,6 +640,8 @@ async def test_unsync_google_calendar_removes_synced_events_and_disables_sync()
     assert resp.json() == {
         "google_sync_enabled": False,
         "unsynced_count": 1,
+        "failed_count": 0,
+        "failed_event_ids": [],
         "status": "disabled",
     }
     saved = await db["user_calendar_entries"].find_one({"user_id": 7, "event_id": 1})
@@ -548,6 +654,7 @@ async def test_unsync_google_calendar_removes_synced_events_and_disables_sync()
     delete_google_calendar_event.assert_awaited_once_with(
         "google-access-token",
         "google-event-1",
+        client=ANY,
     )
 
 
@@ -573,6 +680,8 @@ async def test_unsync_google_calendar_disables_sync_when_no_google_events_exist(
     assert resp.json() == {
         "google_sync_enabled": False,
         "unsynced_count": 0,
+        "failed_count": 0,
+        "failed_event_ids": [],
         "status": "disabled",
     }
     sync_state = await db["user_calendar_syncs"].find_one({"user_id": 7})
@@ -661,6 +770,7 @@ async def test_add_event_to_app_calendar_rolls_back_google_event_on_local_insert
     delete_google_calendar_event.assert_awaited_once_with(
         "google-access-token",
         "google-event-1",
+        client=ANY,
     )
 
 
@@ -745,6 +855,7 @@ async def test_remove_event_from_app_calendar_removes_google_event_when_synced()
     delete_google_calendar_event.assert_awaited_once_with(
         "google-access-token",
         "google-event-1",
+        client=ANY,
     )
 
 
@@ -769,7 +880,7 @@ async def test_sync_saved_calendar_to_google_rolls_back_google_event_on_local_up
             AsyncMock(return_value="google-access-token"),
         ),
         patch.object(
-            users_routes,
+            user_calendar,
             "create_google_calendar_event",
             AsyncMock(
                 return_value={
@@ -779,13 +890,13 @@ async def test_sync_saved_calendar_to_google_rolls_back_google_event_on_local_up
             ),
         ),
         patch.object(
-            users_routes,
+            user_calendar,
             "delete_google_calendar_event",
             delete_google_calendar_event,
         ),
         patch.object(
             db["user_calendar_entries"],
-            "update_one",
+            "bulk_write",
             AsyncMock(side_effect=RuntimeError("db update failed")),
         ),
     ):
@@ -796,6 +907,7 @@ async def test_sync_saved_calendar_to_google_rolls_back_google_event_on_local_up
     delete_google_calendar_event.assert_awaited_once_with(
         "google-access-token",
         "google-event-1",
+        client=ANY,
     )
 
 
@@ -819,7 +931,7 @@ async def test_sync_saved_calendar_to_google_returns_502_on_unexpected_google_er
             AsyncMock(return_value="google-access-token"),
         ),
         patch.object(
-            users_routes,
+            user_calendar,
             "create_google_calendar_event",
             AsyncMock(side_effect=RuntimeError("unexpected boom")),
         ),
@@ -834,3 +946,231 @@ async def test_sync_saved_calendar_to_google_returns_502_on_unexpected_google_er
     assert response.json() == {
         "detail": "Could not sync your calendar to Google Calendar. Please try again."
     }
+
+
+@pytest.mark.asyncio
+async def test_sync_saved_calendar_to_google_reports_partial_failures() -> None:
+    db = _FakeDb()
+    await db["users"].insert_one(_user_doc(7))
+    for event_id in (1, 2, 3):
+        await db["events"].insert_one(
+            {**_event_doc(), "id": event_id, "title": f"Event {event_id}"}
+        )
+        await db["user_calendar_entries"].insert_one(
+            {"user_id": 7, "event_id": event_id, "added_at": datetime.now(tz=UTC)}
+        )
+
+    async def create_google_calendar_event(
+        _access_token: str, payload: dict[str, object], **_kwargs: object
+    ) -> dict[str, object]:
+        if payload["summary"] == "Event 2":
+            raise HTTPException(status_code=502, detail="boom")
+        return {"id": f"google-{payload['summary']}"}
+
+    _, client = _make_client(db, _auth_user(7))
+
+    with (
+        patch.object(
+            users_routes,
+            "get_google_calendar_access_token",
+            AsyncMock(return_value="google-access-token"),
+        ),
+        patch.object(
+            user_calendar,
+            "create_google_calendar_event",
+            create_google_calendar_event,
+        ),
+    ):
+        async with client:
+            resp = await client.post("/users/7/calendar/sync/google")
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["synced_count"] == 2
+    assert body["failed_count"] == 1
+    assert body["failed_event_ids"] == [2]
+    failed = await db["user_calendar_entries"].find_one({"user_id": 7, "event_id": 2})
+    assert failed is not None
+    assert "google_calendar_event_id" not in failed
+    synced = await db["user_calendar_entries"].find_one({"user_id": 7, "event_id": 3})
+    assert synced is not None
+    assert synced["google_calendar_event_id"] is not None
+
+
+@pytest.mark.asyncio
+async def test_unsync_google_calendar_stops_on_rejected_token() -> None:
+    db = _FakeDb()
+    await db["users"].insert_one(_user_doc(7))
+    await db["user_calendar_entries"].insert_one(
+        {
+            "user_id": 7,
+            "event_id": 1,
+            "added_at": datetime.now(tz=UTC),
+            "google_calendar_event_id": "google-event-1",
+        }
+    )
+    await db["user_calendar_syncs"].insert_one(
+        {"user_id": 7, "google_sync_enabled": True}
+    )
+
+    _, client = _make_client(db, _auth_user(7))
+
+    with (
+        patch.object(
+            users_routes,
+            "get_google_calendar_access_token",
+            AsyncMock(return_value="google-access-token"),
+        ),
+        patch.object(
+            user_calendar,
+            "delete_google_calendar_event",
+            AsyncMock(side_effect=HTTPException(status_code=403, detail="expired")),
+        ),
+    ):
+        async with client:
+            resp = await client.delete("/users/7/calendar/sync/google")
+
+    assert resp.status_code == 403
+    saved = await db["user_calendar_entries"].find_one({"user_id": 7, "event_id": 1})
+    assert saved is not None
+    assert saved["google_calendar_event_id"] == "google-event-1"
+    sync_state = await db["user_calendar_syncs"].find_one({"user_id": 7})
+    assert sync_state is not None
+    assert sync_state["google_sync_enabled"] is True
+
+
+@pytest.mark.asyncio
+async def test_sync_saved_calendar_to_google_in_background_reports_job_progress() -> (
+    None
+):
+    db = _FakeDb()
+    await db["users"].insert_one(_user_doc(7))
+    await db["events"].insert_one(_event_doc())
+    await db["user_calendar_entries"].insert_one(
+        {"user_id": 7, "event_id": 1, "added_at": datetime.now(tz=UTC)}
+    )
+
+    app, client = _make_client(db, _auth_user(7))
+    arq = AsyncMock()
+    app.state.arq = arq
+    create_google_calendar_event = AsyncMock(return_value={"id": "google-event-1"})
+
+    with (
+        patch.object(
+            users_routes,
+            "get_google_calendar_access_token",
+            AsyncMock(return_value="google-access-token"),
+        ),
+        patch.object(
+            users_routes, "oauth_token_session_id", return_value="token-session-1"
+        ),
+        patch.object(
+            calendar_sync_jobs,
+            "get_google_calendar_access_token_for_session",
+            AsyncMock(return_value="worker-access-token"),
+        ) as worker_access_token,
+        patch.object(
+            user_calendar,
+            "create_google_calendar_event",
+            create_google_calendar_event,
+        ),
+    ):
+        async with client:
+            resp = await client.post("/users/7/calendar/sync/google?background=true")
+            assert resp.status_code == 202
+            job = resp.json()
+            assert job["status"] == "queued"
+            assert job["action"] == "sync"
+
+            # A second request while the first is in flight returns the same job.
+            again = await client.post("/users/7/calendar/sync/google?background=true")
+            assert again.json()["job_id"] == job["job_id"]
+            arq.enqueue_calendar_sync_job.assert_awaited_once_with(job["job_id"])
+
+            await calendar_sync_jobs.process_calendar_sync_job(
+                cast(Any, db),
+                job["job_id"],
+                http_clients=create_http_clients(),
+                frontend_settings=build_frontend_settings(None),
+            )
+            status_resp = await client.get(
+                f"/users/7/calendar/sync/jobs/{job['job_id']}"
+            )
+
+    assert worker_access_token.await_args is not None
+    assert worker_access_token.await_args.args[1] == "token-session-1"
+    assert create_google_calendar_event.await_args is not None
+    assert create_google_calendar_event.await_args.args[0] == "worker-access-token"
+    assert status_resp.status_code == 200
+    status = status_resp.json()
+    assert status["status"] == "completed"
+    assert status["total"] == 1
+    assert status["processed_count"] == 1
+    assert status["completed_count"] == 1
+    assert status["failed_count"] == 0
+    saved = await db["user_calendar_entries"].find_one({"user_id": 7, "event_id": 1})
+    assert saved is not None
+    assert saved["google_calendar_event_id"] == "google-event-1"
+    sync_state = await db["user_calendar_syncs"].find_one({"user_id": 7})
+    assert sync_state is not None
+    assert sync_state["google_sync_enabled"] is True
+
+
+@pytest.mark.asyncio
+async def test_background_unsync_is_refused_while_a_sync_job_runs() -> None:
+    db = _FakeDb()
+    await db["users"].insert_one(_user_doc(7))
+    await db["calendar_sync_jobs"].insert_one(
+        {
+            "_id": "job-1",
+            "user_id": 7,
+            "action": "sync",
+            "status": "running",
+            "active": True,
+            "total": 0,
+            "completed": 0,
+            "skipped": 0,
+            "failed_event_ids": [],
+            "created_at": datetime.now(tz=UTC),
+            "updated_at": datetime.now(tz=UTC),
+        }
+    )
+
+    app, client = _make_client(db, _auth_user(7))
+    arq = AsyncMock()
+    app.state.arq = arq
+    async with client:
+        resp = await client.delete("/users/7/calendar/sync/google?background=true")
+
+    assert resp.status_code == 409
+    assert resp.json()["detail"].startswith("A calendar sync job is already running")
+    arq.enqueue_calendar_sync_job.assert_not_awaited()
+    assert await db["calendar_sync_jobs"].find_one({"action": "unsync"}) is None
+
+
+@pytest.mark.asyncio
+async def test_calendar_sync_job_status_is_private_to_its_user() -> None:
+    db = _FakeDb()
+    await db["users"].insert_one(_user_doc(7))
+    await db["calendar_sync_jobs"].insert_one(
+        {
+            "_id": "job-1",
+            "user_id": 8,
+            "action": "sync",
+            "status": "queued",
+            "total": 0,
+            "completed": 0,
+            "skipped": 0,
+            "failed_event_ids": [],
+            "created_at": datetime.now(tz=UTC),
+            "updated_at": datetime.now(tz=UTC),
+        }
+    )
+
+    _, client = _make_client(db, _auth_user(7))
+    async with client:
+        other_user = await client.get("/users/8/calendar/sync/jobs/job-1")
+        own_user = await client.get("/users/7/calendar/sync/jobs/job-1")
+
+    assert other_user.status_code == 403
+    assert own_user.status_code == 404
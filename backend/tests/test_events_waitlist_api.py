@@ -0,0 +1,239 @@
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from pymongo.asynchronous.database import AsyncDatabase
+
+from backend.api import create_app
+from backend.db import get_db
+from backend.routes import events as events_route
+from backend.routes.auth import AuthSessionUser, require_authenticated_user
+from backend.services.capacity import (
+    CapacityLedger,
+    UnavailableCapacityLedger,
+    get_capacity_ledger,
+)
+from backend.services.notifications.arq import get_arq
+
+
+def _make_client(
+    db: AsyncDatabase[dict[str, Any]],
+    auth_user: AuthSessionUser,
+    *,
+    capacity: CapacityLedger | None = None,
+) -> AsyncClient:
+    app = create_app()
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_arq] = lambda: AsyncMock()
+    if capacity is not None:
+        app.dependency_overrides[get_capacity_ledger] = lambda: capacity
+    app.dependency_overrides[require_authenticated_user] = lambda: auth_user
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+def _auth_user(user_id: int, roles: list[str] | None = None) -> AuthSessionUser:
+    return AuthSessionUser(
+        id=user_id,
+        email=f"user{user_id}@example.com",
+        first_name="Test",
+        last_name="User",
+        name="Test User",
+        roles=roles or ["user"],
+    )
+
+
+async def _clean(db: AsyncDatabase[dict[str, Any]]) -> None:
+    for coll in (
+        "users",
+        "events",
+        "attendance",
+        "user_calendar_entries",
+        "event_user_locks",
+        "email_outbox",
+    ):
+        await db[coll].delete_many({})
+
+
+async def _sold_out_event(
+    db: AsyncDatabase[dict[str, Any]],
+    event_data: dict[str, Any],
+    *,
+    waiting_user_ids: tuple[int, ...] = (),
+) -> None:
+    """Event 1 holds one seat, taken by user 5; listed users wait in order."""
+    await _clean(db)
+    await db["events"].insert_one(
+        {
+            **event_data,
+            "status": "approved",
+            "total_capacity": 1,
+            "registered_count": 1,
+            "favorites_count": 0,
+        }
+    )
+    await db["attendance"].insert_one(
+        {"event_id": 1, "user_id": 5, "status": "going", "checked_in_at": None}
+    )
+    joined = datetime.now(tz=UTC)
+    for offset, user_id in enumerate(waiting_user_ids):
+        await db["users"].insert_one(
+            {"id": user_id, "email": f"user{user_id}@example.com"}
+        )
+        await db["attendance"].insert_one(
+            {
+                "event_id": 1,
+                "user_id": user_id,
+                "status": "waitlisted",
+                "checked_in_at": None,
+                "waitlisted_at": joined + timedelta(seconds=offset),
+            }
+        )
+
+
+async def _status(db: AsyncDatabase[dict[str, Any]], user_id: int) -> str | None:
+    row = await db["attendance"].find_one({"event_id": 1, "user_id": user_id})
+    return None if row is None else row["status"]
+
+
+async def _registered_count(db: AsyncDatabase[dict[str, Any]]) -> int:
+    event = await db["events"].find_one({"id": 1})
+    assert event is not None
+    return int(event["registered_count"])
+
+
+@pytest.mark.asyncio
+async def test_sold_out_registration_joins_waitlist_once(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _sold_out_event(db, event_data, waiting_user_ids=(8,))
+
+    async with _make_client(db, _auth_user(7)) as client:
+        first = await client.post("/events/1/attendance?waitlist=true")
+        again = await client.post("/events/1/attendance?waitlist=true")
+        status = await client.get("/events/1/attendance")
+
+    assert first.status_code == 200
+    assert first.json()["status"] == "waitlisted"
+    assert first.json()["in_calendar"] is False
+    assert first.json()["waitlist_position"] == 2
+    assert again.json()["waitlist_position"] == 2
+    assert status.json()["status"] == "waitlisted"
+    assert await db["attendance"].count_documents({"user_id": 7}) == 1
+    assert await _registered_count(db) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_registration_hands_its_seat_to_the_waitlist(
+    db: AsyncDatabase[dict[str, Any]],
+    event_data: dict[str, Any],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    await _sold_out_event(db, event_data, waiting_user_ids=(8,))
+    # A seat opened without promoting anyone, e.g. while user 8 was joining.
+    await db["events"].update_one({"id": 1}, {"$set": {"total_capacity": 2}})
+    monkeypatch.setattr(
+        events_route, "enqueue_email", AsyncMock(side_effect=RuntimeError("down"))
+    )
+
+    with pytest.raises(RuntimeError):
+        async with _make_client(db, _auth_user(7)) as client:
+            await client.post("/events/1/attendance")
+
+    assert await _status(db, 7) is None
+    assert await _status(db, 8) == "going"
+    assert await _registered_count(db) == 2
+
+
+@pytest.mark.asyncio
+async def test_sold_out_registration_without_waitlist_still_fails(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _sold_out_event(db, event_data)
+
+    async with _make_client(db, _auth_user(7)) as client:
+        resp = await client.post("/events/1/attendance")
+
+    assert resp.status_code == 400
+    assert await _status(db, 7) is None
+
+
+@pytest.mark.asyncio
+async def test_cancellation_promotes_head_of_waitlist(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _sold_out_event(db, event_data, waiting_user_ids=(8, 9))
+
+    async with _make_client(db, _auth_user(5)) as client:
+        resp = await client.delete("/events/1/attendance")
+
+    assert resp.status_code == 200
+    assert await _status(db, 5) == "cancelled"
+    assert await _status(db, 8) == "going"
+    assert await _status(db, 9) == "waitlisted"
+    # The seat moved straight to user 8, along with the calendar entry.
+    assert await _registered_count(db) == 1
+    assert await db["user_calendar_entries"].count_documents({"user_id": 8}) == 1
+    assert await db["user_calendar_entries"].count_documents({"user_id": 9}) == 0
+    queued = await db["email_outbox"].find({}).to_list(length=None)
+    assert [(entry["kind"], entry["recipient"]) for entry in queued] == [
+        ("waitlist_promotion", "user8@example.com")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_removing_attendee_promotes_and_leaving_waitlist_frees_nothing(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _sold_out_event(db, event_data, waiting_user_ids=(8, 9))
+    admin = _auth_user(1, roles=["admin"])
+
+    async with _make_client(db, _auth_user(9)) as client:
+        left = await client.delete("/events/1/attendance")
+    async with _make_client(db, admin) as client:
+        removed = await client.delete("/events/1/attendees/5")
+        roster = await client.get("/events/1/attendees")
+
+    assert left.status_code == 200
+    assert removed.status_code == 200
+    assert await _status(db, 8) == "going"
+    assert await _status(db, 9) == "cancelled"
+    assert await _registered_count(db) == 1
+    assert [a["user_id"] for a in roster.json()["attendees"]] == [8]
+    assert roster.json()["waitlist_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_capacity_increase_promotes_waiting_users(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _sold_out_event(db, event_data, waiting_user_ids=(8, 9, 10))
+    organizer = _auth_user(event_data["organizer_user_id"])
+
+    async with _make_client(db, organizer) as client:
+        resp = await client.patch("/events/1", json={"total_capacity": 3})
+
+    assert resp.status_code == 200
+    assert [await _status(db, user_id) for user_id in (8, 9, 10)] == [
+        "going",
+        "going",
+        "waitlisted",
+    ]
+    assert await _registered_count(db) == 3
+
+
+@pytest.mark.asyncio
+async def test_capacity_edit_is_saved_when_the_ledger_is_unavailable(
+    db: AsyncDatabase[dict[str, Any]], event_data: dict[str, Any]
+) -> None:
+    await _sold_out_event(db, event_data, waiting_user_ids=(8,))
+    organizer = _auth_user(event_data["organizer_user_id"])
+
+    client = _make_client(db, organizer, capacity=UnavailableCapacityLedger())
+    async with client:
+        resp = await client.patch("/events/1", json={"total_capacity": 3})
+
+    assert resp.status_code == 200
+    assert resp.json()["total_capacity"] == 3
+    assert await _status(db, 8) == "waitlisted"
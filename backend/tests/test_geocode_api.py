@@ -1,6 +1,8 @@
 import os
+from dataclasses import replace
 from typing import Any
 
+import httpx
 import pytest
 from httpx import ASGITransport, AsyncClient
 
@@ -9,6 +11,10 @@ os.environ.setdefault("SESSION_SECRET_KEY", "test-secret")
 from backend.api import create_app
 from backend.routes import geocode as geocode_routes
 from backend.routes.auth import AuthSessionUser, require_authenticated_user
+from backend.services.http_clients import (
+    UPSTREAM_POLICIES,
+    create_http_clients,
+)
 
 
 def _auth_user() -> AuthSessionUser:
@@ -22,8 +28,16 @@ def _auth_user() -> AuthSessionUser:
     )
 
 
-def _make_client() -> AsyncClient:
+def _make_client(http_transport: httpx.MockTransport | None = None) -> AsyncClient:
     app = create_app()
+    if http_transport is not None:
+        app.state.http_clients = create_http_clients(
+            transport=http_transport,
+            policies={
+                name: replace(policy, backoff_seconds=0.0)
+                for name, policy in UPSTREAM_POLICIES.items()
+            },
+        )
     app.dependency_overrides[require_authenticated_user] = _auth_user
     transport = ASGITransport(app=app)
     return AsyncClient(transport=transport, base_url="http://test")
@@ -35,7 +49,9 @@ async def test_geocode_address_returns_first_nominatim_match(
 ) -> None:
     captured_params: dict[str, str] = {}
 
-    async def fake_search_nominatim(params: dict[str, str]) -> list[dict[str, Any]]:
+    async def fake_search_nominatim(
+        params: dict[str, str], *, client: AsyncClient
+    ) -> list[dict[str, Any]]:
         captured_params.update(params)
         return [
             {
@@ -83,7 +99,9 @@ async def test_geocode_address_prefers_venue_query_when_provided(
 ) -> None:
     captured_params: dict[str, str] = {}
 
-    async def fake_search_nominatim(params: dict[str, str]) -> list[dict[str, Any]]:
+    async def fake_search_nominatim(
+        params: dict[str, str], *, client: AsyncClient
+    ) -> list[dict[str, Any]]:
         captured_params.update(params)
         return [
             {
@@ -126,7 +144,9 @@ async def test_geocode_address_prefers_venue_query_when_provided(
 async def test_geocode_address_returns_404_when_address_cannot_be_resolved(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    async def fake_search_nominatim(_params: dict[str, str]) -> list[dict[str, Any]]:
+    async def fake_search_nominatim(
+        _params: dict[str, str], *, client: AsyncClient
+    ) -> list[dict[str, Any]]:
         return []
 
     monkeypatch.setattr(geocode_routes, "_search_nominatim", fake_search_nominatim)
@@ -146,3 +166,28 @@ async def test_geocode_address_returns_404_when_address_cannot_be_resolved(
     assert (
         resp.json()["detail"] == "Address not found. Please check the location details."
     )
+
+
+@pytest.mark.asyncio
+async def test_geocode_address_maps_nominatim_rate_limit_to_503_after_retry() -> None:
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(429)
+
+    async with _make_client(httpx.MockTransport(handler)) as client:
+        resp = await client.get(
+            "/geocode/",
+            params={
+                "street": "1 Washington Sq",
+                "city": "San Jose",
+                "state": "CA",
+                "postalcode": "95192",
+            },
+        )
+
+    assert resp.status_code == 503
+    assert len(requests) == 1 + UPSTREAM_POLICIES["nominatim"].retries
+    assert requests[0].url.host == "nominatim.openstreetmap.org"
+    assert requests[0].headers["User-Agent"] == geocode_routes.DEFAULT_USER_AGENT
@@ -0,0 +1,127 @@
+import httpx
+import pytest
+
+from backend.services.http_clients import (
+    MAX_RETRY_AFTER_SECONDS,
+    RetryTransport,
+    create_http_clients,
+)
+
+
+def _retrying_client(
+    handler: httpx.MockTransport, delays: list[float], *, retries: int = 2
+) -> httpx.AsyncClient:
+    async def record_sleep(seconds: float) -> None:
+        delays.append(seconds)
+
+    return httpx.AsyncClient(
+        transport=RetryTransport(
+            handler, retries=retries, backoff_seconds=0.5, sleep=record_sleep
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_retry_transport_retries_idempotent_requests_with_backoff() -> None:
+    statuses = iter([503, 502, 200])
+    delays: list[float] = []
+    transport = httpx.MockTransport(lambda _request: httpx.Response(next(statuses)))
+
+    async with _retrying_client(transport, delays) as client:
+        response = await client.delete("https://example.test/events/1")
+
+    assert response.status_code == 200
+    assert delays == [0.5, 1.0]
+
+
+@pytest.mark.asyncio
+async def test_retry_transport_returns_last_response_when_retries_run_out() -> None:
+    calls = 0
+    delays: list[float] = []
+
+    def handler(_request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(503)
+
+    async with _retrying_client(httpx.MockTransport(handler), delays) as client:
+        response = await client.get("https://example.test/search")
+
+    assert response.status_code == 503
+    assert calls == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_transport_does_not_resend_non_idempotent_requests() -> None:
+    calls = 0
+    delays: list[float] = []
+
+    def handler(_request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(503)
+
+    async with _retrying_client(httpx.MockTransport(handler), delays) as client:
+        response = await client.post("https://example.test/events", json={})
+
+    assert response.status_code == 503
+    assert calls == 1
+    assert delays == []
+
+
+@pytest.mark.asyncio
+async def test_retry_transport_retries_any_method_after_connect_error() -> None:
+    calls = 0
+    delays: list[float] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(201, json={"id": "created"})
+
+    async with _retrying_client(httpx.MockTransport(handler), delays) as client:
+        response = await client.post("https://example.test/events", json={})
+
+    assert response.json() == {"id": "created"}
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_transport_honours_capped_retry_after() -> None:
+    responses = iter(
+        [httpx.Response(429, headers={"Retry-After": "120"}), httpx.Response(200)]
+    )
+    delays: list[float] = []
+    transport = httpx.MockTransport(lambda _request: next(responses))
+
+    async with _retrying_client(transport, delays) as client:
+        response = await client.get("https://example.test/search")
+
+    assert response.status_code == 200
+    assert delays == [MAX_RETRY_AFTER_SECONDS]
+
+
+@pytest.mark.asyncio
+async def test_create_http_clients_routes_every_upstream_through_transport() -> None:
+    hosts: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        hosts.append(request.url.host)
+        return httpx.Response(200)
+
+    clients = create_http_clients(transport=httpx.MockTransport(handler))
+    try:
+        await clients.google_calendar.get("https://www.googleapis.com/calendar")
+        await clients.google_oauth.post("https://oauth2.googleapis.com/token")
+        await clients.nominatim.get("https://nominatim.openstreetmap.org/search")
+    finally:
+        await clients.aclose()
+
+    assert hosts == [
+        "www.googleapis.com",
+        "oauth2.googleapis.com",
+        "nominatim.openstreetmap.org",
+    ]
+    assert clients.google_calendar.is_closed
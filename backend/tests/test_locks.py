@@ -0,0 +1,128 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import Any, cast
+
+import pytest
+from fastapi import HTTPException
+from pymongo.asynchronous.database import AsyncDatabase
+from redis.asyncio import Redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from backend.services.locks import (
+    EVENT_USER_LOCK_COLLECTION,
+    LocalEventUserLocks,
+    MongoEventUserLocks,
+    RedisEventUserLocks,
+    create_event_user_locks,
+)
+
+_NO_DB = cast(AsyncDatabase[dict[str, Any]], None)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_local_locks_exclude_release_by_token_and_expire() -> None:
+    clock = _Clock()
+    locks = LocalEventUserLocks(ttl=timedelta(seconds=10), clock=clock)
+
+    first = await locks.acquire(_NO_DB, event_id=1, user_id=7)
+    assert first is not None
+    assert await locks.acquire(_NO_DB, event_id=1, user_id=7) is None
+    assert await locks.acquire(_NO_DB, event_id=1, user_id=8) is not None
+    assert await locks.held_event_ids(_NO_DB, [1, 2]) == {1}
+
+    clock.now = 11
+    second = await locks.acquire(_NO_DB, event_id=1, user_id=7)
+    assert second is not None
+    # The expired holder must not free the lock it lost.
+    await locks.release(_NO_DB, first)
+    assert await locks.acquire(_NO_DB, event_id=1, user_id=7) is None
+
+    await locks.release(_NO_DB, second)
+    assert await locks.acquire(_NO_DB, event_id=1, user_id=7) is not None
+
+
+class _FailingRedis:
+    def register_script(self, _source: str) -> Any:
+        async def run(keys: list[str], args: list[Any]) -> int:
+            raise RedisConnectionError("down")
+
+        return run
+
+
+@pytest.mark.asyncio
+async def test_redis_locks_fail_closed_on_acquire_and_quietly_on_release() -> None:
+    locks = RedisEventUserLocks(cast(Redis, _FailingRedis()))
+
+    with pytest.raises(HTTPException) as exc_info:
+        await locks.acquire(_NO_DB, event_id=1, user_id=7)
+    assert exc_info.value.status_code == 503
+
+    stale = await LocalEventUserLocks().acquire(_NO_DB, event_id=1, user_id=7)
+    assert stale is not None
+    await locks.release(_NO_DB, stale)
+
+
+def test_create_event_user_locks_selects_backend(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    redis = Redis()
+    assert isinstance(create_event_user_locks("local"), LocalEventUserLocks)
+    assert isinstance(
+        create_event_user_locks("redis", redis=redis), RedisEventUserLocks
+    )
+    assert isinstance(create_event_user_locks("redis"), MongoEventUserLocks)
+
+    monkeypatch.setenv("EVENT_LOCK_BACKEND", "local")
+    assert isinstance(create_event_user_locks(), LocalEventUserLocks)
+    monkeypatch.delenv("EVENT_LOCK_BACKEND")
+    assert isinstance(create_event_user_locks(), MongoEventUserLocks)
+
+
+@pytest.mark.asyncio
+async def test_mongo_locks_take_over_expired_locks_only(
+    db: AsyncDatabase[dict[str, Any]],
+) -> None:
+    await db[EVENT_USER_LOCK_COLLECTION].delete_many({})
+    locks = MongoEventUserLocks()
+
+    held = await locks.acquire(db, event_id=1, user_id=7)
+    assert held is not None
+    assert await locks.acquire(db, event_id=1, user_id=7) is None
+    assert await locks.held_event_ids(db, [1, 2]) == {1}
+
+    await db[EVENT_USER_LOCK_COLLECTION].update_one(
+        {"_id": "1:7"},
+        {"$set": {"expires_at": datetime.now(tz=UTC) - timedelta(seconds=1)}},
+    )
+    assert await locks.held_event_ids(db, [1]) == set()
+    taken_over = await locks.acquire(db, event_id=1, user_id=7)
+    assert taken_over is not None
+
+    await locks.release(db, held)
+    assert await db[EVENT_USER_LOCK_COLLECTION].count_documents({}) == 1
+    await locks.release(db, taken_over)
+    assert await db[EVENT_USER_LOCK_COLLECTION].count_documents({}) == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_locks_exclude_and_report_held_events(redis: Redis) -> None:
+    locks = RedisEventUserLocks(redis, key_prefix=f"evently-test:{uuid.uuid4().hex}")
+
+    held = await locks.acquire(_NO_DB, event_id=1, user_id=7)
+    assert held is not None
+    assert await locks.acquire(_NO_DB, event_id=1, user_id=7) is None
+    assert await locks.held_event_ids(_NO_DB, [1, 2]) == {1}
+
+    await locks.release(_NO_DB, held)
+    assert await locks.held_event_ids(_NO_DB, [1]) == set()
+    again = await locks.acquire(_NO_DB, event_id=1, user_id=7)
+    assert again is not None
+    await locks.release(_NO_DB, again)
@@ -1,19 +1,44 @@
-from collections.abc import AsyncIterator
-from datetime import UTC, datetime, timedelta
+from collections.abc import AsyncIterator, Sequence
+from datetime import UTC, datetime, timedelta, timezone
 from typing import Any, cast
 from unittest.mock import AsyncMock
 
 import pytest
 from arq import ArqRedis
+from arq.jobs import deserialize_job
+from arq.utils import ms_to_datetime, to_unix_ms
+from arq.worker import Retry
+from arq.worker import func as arq_func
 from pymongo.asynchronous.database import AsyncDatabase
+from resend.exceptions import ResendError
 
 from backend.models.attendance import AttendanceStatus
 from backend.models.event import Event
-from backend.services.notifications.arq import ArqClient
-from backend.services.notifications.email import REMINDER_LEAD_TIME_MINUTES
-from backend.services.notifications.worker import Context, send_event_reminder
+from backend.services.notifications import arq as arq_module
+from backend.services.notifications.arq import (
+    CANCEL_JOB_SCRIPT,
+    ENQUEUE_JOBS_SCRIPT,
+    RELEASE_LOCK_SCRIPT,
+    REMINDER_SCHEDULE_HORIZON,
+    ArqClient,
+)
+from backend.services.notifications.email import (
+    REMINDER_LEAD_TIME_MINUTES,
+    EmailNotificationService,
+)
+from backend.services.notifications.reminders import send_event_reminders
+from backend.services.notifications.throttle import EmailCircuitOpenError
+from backend.services.notifications.worker import (
+    REMINDER_MAX_TRIES,
+    Context,
+    WorkerSettings,
+    send_event_reminder,
+)
 
 _DEFAULT_EVENT = object()
+# Reminder jobs run during the hour before their event starts.
+_START = (datetime.now(UTC) + timedelta(minutes=30)).replace(tzinfo=None, microsecond=0)
+_PROGRESS_ID = f"11:{_START.isoformat()}"
 
 
 class _ToListCursor:
@@ -24,23 +49,45 @@ class _ToListCursor:
         return self._docs
 
 
-class _AttendanceCollection:
+class _AttendanceCursor:
     def __init__(self, docs: list[dict[str, Any]]) -> None:
         self._docs = docs
-        self.distinct_key: str | None = None
-        self.distinct_filter: dict[str, Any] | None = None
+        self.batch: int | None = None
+
+    def sort(self, key: str, direction: int) -> "_AttendanceCursor":
+        self._docs.sort(key=lambda doc: doc[key], reverse=direction < 0)
+        return self
+
+    def batch_size(self, size: int) -> "_AttendanceCursor":
+        self.batch = size
+        return self
+
+    def __aiter__(self) -> AsyncIterator[dict[str, Any]]:
+        return self._iterate()
 
-    async def distinct(self, key: str, filter: dict[str, Any]) -> list[int]:
-        self.distinct_key = key
-        self.distinct_filter = filter
-        values: list[int] = []
+    async def _iterate(self) -> AsyncIterator[dict[str, Any]]:
         for doc in self._docs:
-            if not _matches_filter(doc, filter):
-                continue
-            value = doc[key]
-            if value not in values:
-                values.append(value)
-        return values
+            yield doc
+
+
+class _AttendanceCollection:
+    def __init__(self, docs: list[dict[str, Any]]) -> None:
+        self._docs = docs
+        self.find_filter: dict[str, Any] | None = None
+        self.find_projection: dict[str, Any] | None = None
+
+    def find(
+        self, filter: dict[str, Any], projection: dict[str, Any]
+    ) -> _AttendanceCursor:
+        self.find_filter = filter
+        self.find_projection = projection
+        return _AttendanceCursor(
+            [
+                {"user_id": doc["user_id"]}
+                for doc in self._docs
+                if _matches_filter(doc, filter)
+            ]
+        )
 
 
 def _matches_filter(doc: dict[str, Any], filter: dict[str, Any]) -> bool:
@@ -50,6 +97,8 @@ def _matches_filter(doc: dict[str, Any], filter: dict[str, Any]) -> bool:
                 return False
             if "$in" in expected and doc.get(key) not in expected["$in"]:
                 return False
+            if "$gt" in expected and not doc.get(key, 0) > expected["$gt"]:
+                return False
         elif doc.get(key) != expected:
             return False
     return True
@@ -58,15 +107,33 @@ def _matches_filter(doc: dict[str, Any], filter: dict[str, Any]) -> bool:
 class _UsersCollection:
     def __init__(self, users: list[dict[str, Any]]) -> None:
         self._users = users
-        self.find_filter: dict[str, Any] | None = None
+        self.find_filters: list[dict[str, Any]] = []
+        self.find_projection: dict[str, Any] | None = None
 
-    def find(self, filter: dict[str, Any]) -> _ToListCursor:
-        self.find_filter = filter
+    def find(self, filter: dict[str, Any], projection: dict[str, Any]) -> _ToListCursor:
+        self.find_filters.append(filter)
+        self.find_projection = projection
         return _ToListCursor(
             [user for user in self._users if _matches_filter(user, filter)]
         )
 
 
+class _ProgressCollection:
+    def __init__(self) -> None:
+        self.docs: dict[str, dict[str, Any]] = {}
+
+    async def find_one(self, filter: dict[str, Any]) -> dict[str, Any] | None:
+        return self.docs.get(filter["_id"])
+
+    async def update_one(
+        self, filter: dict[str, Any], update: dict[str, Any], upsert: bool
+    ) -> None:
+        doc = self.docs.setdefault(filter["_id"], {"_id": filter["_id"]})
+        doc.update(update.get("$set", {}))
+        for key, amount in update.get("$inc", {}).items():
+            doc[key] = doc.get(key, 0) + amount
+
+
 class _EventsCollection:
     def __init__(self, event: dict[str, Any] | None) -> None:
         self._event = event
@@ -117,8 +184,8 @@ class _ReminderDb:
                 "organizer_user_id": 1,
                 "price": 0.0,
                 "total_capacity": 100,
-                "start_time": datetime(2026, 8, 1, 10, 0, 0),
-                "end_time": datetime(2026, 8, 1, 12, 0, 0),
+                "start_time": _START,
+                "end_time": _START + timedelta(hours=2),
                 "category": "Workshop",
                 "status": "approved",
                 "is_online": False,
@@ -137,12 +204,14 @@ class _ReminderDb:
             else event
         )
         self.events = _EventsCollection(cast(dict[str, Any] | None, event_doc))
+        self.reminder_progress = _ProgressCollection()
 
     def __getitem__(self, name: str) -> object:
         collections: dict[str, object] = {
             "attendance": self.attendance,
             "users": self.users,
             "events": self.events,
+            "reminder_progress": self.reminder_progress,
         }
         return collections[name]
 
@@ -150,9 +219,13 @@ class _ReminderDb:
 class _ReminderEmail:
     def __init__(self) -> None:
         self.sent: list[tuple[str, Event]] = []
+        self.batches: list[list[str]] = []
 
-    async def send_event_reminder(self, recipient_email: str, event: Event) -> None:
-        self.sent.append((recipient_email, event))
+    async def send_event_reminders(
+        self, recipient_emails: Sequence[str], event: Event
+    ) -> None:
+        self.batches.append(list(recipient_emails))
+        self.sent.extend((recipient, event) for recipient in recipient_emails)
 
 
 @pytest.mark.asyncio
@@ -163,12 +236,13 @@ async def test_reminder_worker_uses_evently_ids_for_event_and_recipients() -> No
 
     await send_event_reminder(ctx, 11)
 
-    assert db.attendance.distinct_key == "user_id"
-    assert db.attendance.distinct_filter == {
+    assert db.attendance.find_filter == {
         "event_id": 11,
-        "status": {"$ne": AttendanceStatus.Cancelled.value},
+        "status": {"$in": ["going", "checked_in"]},
     }
-    assert db.users.find_filter == {"id": {"$in": [7, 8]}}
+    assert db.attendance.find_projection == {"_id": 0, "user_id": 1}
+    assert db.users.find_filters == [{"id": {"$in": [7, 8]}}]
+    assert db.users.find_projection == {"_id": 0, "id": 1, "email": 1}
     assert db.events.find_one_filter == {"id": 11}
     assert [(recipient, event.id) for recipient, event in email.sent] == [
         ("first@example.com", 11),
@@ -205,7 +279,7 @@ async def test_reminder_worker_excludes_cancelled_attendance() -> None:
 
     await send_event_reminder(ctx, 11)
 
-    assert db.users.find_filter == {"id": {"$in": [7, 8]}}
+    assert db.users.find_filters == [{"id": {"$in": [7, 8]}}]
     assert [recipient for recipient, _ in email.sent] == [
         "first@example.com",
         "second@example.com",
@@ -227,6 +301,148 @@ async def test_reminder_worker_logs_and_skips_when_event_missing(
     assert email.sent == []
 
 
+@pytest.mark.asyncio
+async def test_reminder_fan_out_sends_in_chunks_and_checkpoints() -> None:
+    db = _ReminderDb(
+        attendance_docs=[
+            {"event_id": 11, "user_id": user_id, "status": "going"}
+            for user_id in (9, 8, 7)
+        ]
+    )
+    email = _ReminderEmail()
+    event = Event.model_validate(db.events._event)
+
+    sent = await send_event_reminders(
+        cast(AsyncDatabase[dict[str, Any]], db),
+        cast(EmailNotificationService, email),
+        event,
+        chunk_size=2,
+    )
+
+    assert sent == 3
+    assert email.batches == [
+        ["first@example.com", "second@example.com"],
+        ["cancelled@example.com"],
+    ]
+    assert db.users.find_filters == [{"id": {"$in": [7, 8]}}, {"id": {"$in": [9]}}]
+    progress = db.reminder_progress.docs[_PROGRESS_ID]
+    assert progress["last_user_id"] == 9
+    assert progress["sent"] == 3
+    assert progress["completed_at"] is not None
+
+    assert (
+        await send_event_reminders(
+            cast(AsyncDatabase[dict[str, Any]], db),
+            cast(EmailNotificationService, email),
+            event,
+        )
+        == 0
+    )
+    assert len(email.batches) == 2
+
+
+@pytest.mark.asyncio
+async def test_reminder_fan_out_resumes_after_checkpoint() -> None:
+    db = _ReminderDb()
+    db.reminder_progress.docs[_PROGRESS_ID] = {
+        "_id": _PROGRESS_ID,
+        "last_user_id": 7,
+        "sent": 1,
+    }
+    email = _ReminderEmail()
+    ctx = cast(Context, {"db": db, "email": email})
+
+    await send_event_reminder(ctx, 11)
+
+    assert db.attendance.find_filter == {
+        "event_id": 11,
+        "status": {"$in": ["going", "checked_in"]},
+        "user_id": {"$gt": 7},
+    }
+    assert [recipient for recipient, _ in email.sent] == ["second@example.com"]
+    assert db.reminder_progress.docs[_PROGRESS_ID]["sent"] == 2
+
+
+class _OpenCircuitEmail(_ReminderEmail):
+    async def send_event_reminders(
+        self, recipient_emails: Sequence[str], event: Event
+    ) -> None:
+        raise EmailCircuitOpenError(45)
+
+
+@pytest.mark.asyncio
+async def test_reminder_worker_defers_while_the_email_circuit_is_open() -> None:
+    db = _ReminderDb()
+    email = _OpenCircuitEmail()
+    ctx = cast(Context, {"db": db, "email": email})
+
+    with pytest.raises(Retry) as exc_info:
+        await send_event_reminder(ctx, 11)
+
+    assert exc_info.value.defer_score == 45_000
+    # Nothing was checkpointed, so the retry starts from the first attendee.
+    assert db.reminder_progress.docs == {}
+
+
+class _FailingProviderEmail(_ReminderEmail):
+    async def send_event_reminders(
+        self, recipient_emails: Sequence[str], event: Event
+    ) -> None:
+        raise ResendError("503", "server_error", "down", "retry")
+
+
+@pytest.mark.asyncio
+async def test_reminder_worker_retries_provider_failures_until_the_event_starts(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    db = _ReminderDb()
+    ctx = cast(Context, {"db": db, "email": _FailingProviderEmail(), "job_try": 3})
+
+    with pytest.raises(Retry) as exc_info:
+        await send_event_reminder(ctx, 11)
+
+    assert exc_info.value.defer_score == 90_000
+    assert db.reminder_progress.docs == {}
+    settings = {fn.name: fn for fn in map(arq_func, WorkerSettings.functions)}
+    assert settings["send_event_reminder"].max_tries == REMINDER_MAX_TRIES
+
+    assert isinstance(db.events._event, dict)
+    db.events._event["start_time"] = datetime.now(UTC).replace(tzinfo=None)
+    with caplog.at_level("ERROR"):
+        await send_event_reminder(ctx, 11)
+    assert "Giving up on reminders for event 11" in caplog.text
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("overrides", "log"),
+    [
+        ({"status": "rejected"}, "Skipping reminder for event 11"),
+        (
+            {"start_time": datetime.now(UTC).replace(tzinfo=None) + timedelta(days=2)},
+            "Skipping stale reminder for rescheduled event 11",
+        ),
+    ],
+)
+async def test_reminder_worker_skips_rejected_and_rescheduled_events(
+    caplog: pytest.LogCaptureFixture, overrides: dict[str, Any], log: str
+) -> None:
+    db = _ReminderDb()
+    assert isinstance(db.events._event, dict)
+    db.events._event.update(overrides)
+    if "start_time" in overrides:
+        db.events._event["end_time"] = overrides["start_time"] + timedelta(hours=2)
+    email = _ReminderEmail()
+    ctx = cast(Context, {"db": db, "email": email})
+
+    with caplog.at_level("INFO"):
+        await send_event_reminder(ctx, 11)
+
+    assert log in caplog.text
+    assert db.attendance.find_filter is None
+    assert email.sent == []
+
+
 class _UpcomingEventsCursor:
     def __init__(self, docs: list[dict[str, Any]]) -> None:
         self._docs = docs
@@ -239,14 +455,30 @@ class _UpcomingEventsCursor:
             yield doc
 
 
+def _utc_naive(value: datetime) -> datetime:
+    return value.astimezone(UTC).replace(tzinfo=None) if value.tzinfo else value
+
+
 class _UpcomingEventsCollection:
     def __init__(self, docs: list[dict[str, Any]]) -> None:
         self._docs = docs
-        self.find_filter: dict[str, Any] | None = None
-
-    def find(self, filter: dict[str, Any]) -> _UpcomingEventsCursor:
-        self.find_filter = filter
-        return _UpcomingEventsCursor(self._docs)
+        self.find_filters: list[dict[str, Any]] = []
+        self.find_projection: dict[str, Any] | None = None
+
+    def find(
+        self, filter: dict[str, Any], projection: dict[str, Any]
+    ) -> _UpcomingEventsCursor:
+        self.find_filters.append(filter)
+        self.find_projection = projection
+        bounds = filter["start_time"]
+        return _UpcomingEventsCursor(
+            [
+                doc
+                for doc in self._docs
+                if bounds["$gt"] < _utc_naive(doc["start_time"]) <= bounds["$lte"]
+                and doc.get("status", "approved") == "approved"
+            ]
+        )
 
 
 class _UpcomingEventsDb:
@@ -259,12 +491,77 @@ class _UpcomingEventsDb:
         return self.events
 
 
-class _RecordingArqClient(ArqClient):
-    def __init__(self) -> None:
-        self.scheduled: list[tuple[int, datetime]] = []
+class _SchedulerRedis:
+    """Keeps keys in memory and runs the scheduler's scripts in Python."""
 
-    async def schedule_event_reminder(self, event_id: int, run_at: datetime) -> None:
-        self.scheduled.append((event_id, run_at))
+    default_queue_name = "arq:queue"
+    expires_extra_ms = 86_400_000
+    job_serializer = None
+
+    def __init__(self) -> None:
+        self.values: dict[str, Any] = {}
+        self.queue: dict[str, float] = {}
+        self.script_calls = 0
+
+    async def set(
+        self, key: str, value: str, *, nx: bool = False, px: int | None = None
+    ) -> bool:
+        if nx and key in self.values:
+            return False
+        self.values[key] = value
+        return True
+
+    async def get(self, key: str) -> bytes | None:
+        value = self.values.get(key)
+        return value.encode() if isinstance(value, str) else value
+
+    def register_script(self, source: str) -> Any:
+        async def run(keys: list[str], args: list[Any]) -> int:
+            self.script_calls += 1
+            if source == CANCEL_JOB_SCRIPT:
+                if keys[3] in self.values:
+                    return 0
+                self.queue.pop(args[0], None)
+                self.values.pop(keys[1], None)
+                self.values.pop(keys[2], None)
+                return 1
+            if source == RELEASE_LOCK_SCRIPT:
+                if self.values.get(keys[0]) == args[0]:
+                    del self.values[keys[0]]
+                    return 1
+                return 0
+            assert source == ENQUEUE_JOBS_SCRIPT
+            enqueued = 0
+            for index in range((len(keys) - 1) // 2):
+                job_key, result_key = keys[1 + index * 2], keys[2 + index * 2]
+                job_id, score, _, job = args[index * 4 : index * 4 + 4]
+                if job_key in self.values or result_key in self.values:
+                    continue
+                self.values[job_key] = job
+                self.queue[job_id] = score
+                enqueued += 1
+            return enqueued
+
+        return run
+
+
+def _scheduler(redis: _SchedulerRedis) -> ArqClient:
+    return ArqClient(cast(ArqRedis, redis))
+
+
+def _scheduled(redis: _SchedulerRedis) -> list[tuple[int, datetime]]:
+    scheduled: list[tuple[int, datetime]] = []
+    for job_id, score in sorted(redis.queue.items(), key=lambda item: item[1]):
+        job = deserialize_job(redis.values[f"arq:job:{job_id}"])
+        assert job.function == "send_event_reminder"
+        assert job_id == f"event_reminder_{job.kwargs['event_id']}"
+        scheduled.append((job.kwargs["event_id"], ms_to_datetime(int(score))))
+    return scheduled
+
+
+def _local_naive(value: datetime) -> datetime:
+    # arq reads naive datetimes as local time, as ``enqueue_job`` does.
+    return ms_to_datetime(to_unix_ms(value))
 
 
 class _FakeArqRedis:
@@ -290,65 +587,156 @@ async def test_schedule_event_reminder_enqueues_arq_job() -> None:
 
 
 @pytest.mark.asyncio
-async def test_startup_reschedules_reminders_with_evently_event_id() -> None:
-    start_time = datetime.now(UTC).replace(tzinfo=None) + timedelta(hours=2)
+async def test_startup_enqueues_reminders_within_the_horizon_in_bulk() -> None:
+    now = datetime.now(UTC).replace(tzinfo=None)
+    soon = now + timedelta(hours=2)
+    aware = (now + timedelta(hours=3)).replace(tzinfo=UTC)
     events = _UpcomingEventsCollection(
-        [{"_id": "mongo-event-id", "id": 42, "start_time": start_time}]
+        [
+            {"_id": "mongo-event-id", "id": 42, "start_time": soon},
+            {"_id": "aware-mongo-id", "id": 43, "start_time": aware},
+            {
+                "_id": "near-mongo-id",
+                "id": 41,
+                "start_time": now + timedelta(minutes=30),
+            },
+            {
+                "_id": "later-mongo-id",
+                "id": 44,
+                "start_time": now + REMINDER_SCHEDULE_HORIZON + timedelta(hours=2),
+            },
+        ]
     )
-    db = _UpcomingEventsDb(events)
-    arq = _RecordingArqClient()
+    redis = _SchedulerRedis()
+    lead_time = timedelta(minutes=REMINDER_LEAD_TIME_MINUTES)
 
-    await arq.schedule_all_upcoming_event_reminders(
-        cast(AsyncDatabase[dict[str, Any]], db)
+    enqueued = await _scheduler(redis).schedule_all_upcoming_event_reminders(
+        cast(AsyncDatabase[dict[str, Any]], _UpcomingEventsDb(events))
     )
 
-    assert events.find_filter is not None
-    assert events.find_filter.keys() == {"start_time"}
-    assert arq.scheduled == [
-        (42, start_time - timedelta(minutes=REMINDER_LEAD_TIME_MINUTES))
+    assert enqueued == 2
+    assert events.find_filters[0]["$or"] == [
+        {"status": "approved"},
+        {"status": {"$exists": False}},
+    ]
+    assert events.find_projection == {"_id": 0, "id": 1, "start_time": 1}
+    assert _scheduled(redis) == [
+        (42, _local_naive(soon - lead_time)),
+        (43, _local_naive(aware.replace(tzinfo=None) - lead_time)),
     ]
+    assert "evently:reminders:scheduler_lock" not in redis.values
 
 
 @pytest.mark.asyncio
-async def test_startup_rescheduling_normalizes_aware_datetimes_to_utc() -> None:
-    start_time = datetime.now(UTC) + timedelta(hours=2)
+async def test_top_up_includes_events_without_a_status_but_not_pending_ones() -> None:
+    now = datetime.now(UTC).replace(tzinfo=None)
+    start = now + timedelta(hours=2)
     events = _UpcomingEventsCollection(
-        [{"_id": "mongo-event-id", "id": 42, "start_time": start_time}]
+        [
+            {"_id": "seeded-mongo-id", "id": 1, "start_time": start},
+            {"_id": "pending-id", "id": 2, "start_time": start, "status": "pending"},
+            {"_id": "approved-id", "id": 3, "start_time": start, "status": "approved"},
+        ]
     )
-    db = _UpcomingEventsDb(events)
-    arq = _RecordingArqClient()
+    redis = _SchedulerRedis()
 
-    await arq.schedule_all_upcoming_event_reminders(
-        cast(AsyncDatabase[dict[str, Any]], db)
+    enqueued = await _scheduler(redis).schedule_all_upcoming_event_reminders(
+        cast(AsyncDatabase[dict[str, Any]], _UpcomingEventsDb(events))
     )
 
-    assert arq.scheduled == [
-        (
-            42,
-            start_time.astimezone(UTC).replace(tzinfo=None)
-            - timedelta(minutes=REMINDER_LEAD_TIME_MINUTES),
-        )
-    ]
+    assert enqueued == 2
+    assert sorted(event_id for event_id, _ in _scheduled(redis)) == [1, 3]
 
 
 @pytest.mark.asyncio
-async def test_startup_rescheduling_skips_events_inside_reminder_window() -> None:
+async def test_top_up_rescans_the_horizon_and_keeps_queued_jobs() -> None:
     now = datetime.now(UTC).replace(tzinfo=None)
-    near_start_time = now + timedelta(minutes=30)
-    later_start_time = now + timedelta(hours=2)
     events = _UpcomingEventsCollection(
-        [
-            {"_id": "near-mongo-id", "id": 41, "start_time": near_start_time},
-            {"_id": "later-mongo-id", "id": 42, "start_time": later_start_time},
-        ]
+        [{"_id": "mongo-event-id", "id": 42, "start_time": now + timedelta(hours=2)}]
     )
-    db = _UpcomingEventsDb(events)
-    arq = _RecordingArqClient()
+    db = cast(AsyncDatabase[dict[str, Any]], _UpcomingEventsDb(events))
+    redis = _SchedulerRedis()
+    scheduler = _scheduler(redis)
+
+    assert await scheduler.schedule_all_upcoming_event_reminders(db) == 1
+    assert await scheduler.schedule_all_upcoming_event_reminders(db) == 0
 
-    await arq.schedule_all_upcoming_event_reminders(
-        cast(AsyncDatabase[dict[str, Any]], db)
+    # Written around the API (e.g. a seed), due sooner than the last run reached.
+    events._docs.append(
+        {"_id": "seeded-id", "id": 43, "start_time": now + timedelta(hours=3)}
     )
+    assert await scheduler.schedule_all_upcoming_event_reminders(db) == 1
+    assert sorted(event_id for event_id, _ in _scheduled(redis)) == [42, 43]
 
-    assert arq.scheduled == [
-        (42, later_start_time - timedelta(minutes=REMINDER_LEAD_TIME_MINUTES))
-    ]
+
+@pytest.mark.asyncio
+async def test_top_up_skips_while_another_replica_holds_the_lock() -> None:
+    events = _UpcomingEventsCollection([])
+    redis = _SchedulerRedis()
+    redis.values["evently:reminders:scheduler_lock"] = "other-replica"
+
+    enqueued = await _scheduler(redis).schedule_all_upcoming_event_reminders(
+        cast(AsyncDatabase[dict[str, Any]], _UpcomingEventsDb(events))
+    )
+
+    assert enqueued == 0
+    assert events.find_filters == []
+    assert redis.values["evently:reminders:scheduler_lock"] == "other-replica"
+
+
+@pytest.mark.asyncio
+async def test_bulk_enqueue_sends_one_script_call_per_batch(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(arq_module, "REMINDER_ENQUEUE_BATCH_SIZE", 2)
+    redis = _SchedulerRedis()
+    run_at = datetime(2026, 8, 1, 9, 0, 0)
+
+    enqueued = await _scheduler(redis).schedule_event_reminders(
+        [(event_id, run_at) for event_id in (1, 2, 3)]
+    )
+
+    assert enqueued == 3
+    assert redis.script_calls == 2
+    assert [event_id for event_id, _ in _scheduled(redis)] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_cancel_event_reminder_drops_queued_job_but_not_a_running_one() -> None:
+    redis = _SchedulerRedis()
+    scheduler = _scheduler(redis)
+    run_at = datetime(2026, 8, 1, 9, 0, 0)
+    await scheduler.schedule_event_reminders([(41, run_at), (42, run_at)])
+    redis.values["arq:result:event_reminder_41"] = b"done"
+    redis.values["arq:in-progress:event_reminder_42"] = b"1"
+
+    assert await scheduler.cancel_event_reminder(41) is True
+    assert await scheduler.cancel_event_reminder(42) is False
+
+    assert list(redis.queue) == ["event_reminder_42"]
+    assert "arq:job:event_reminder_41" not in redis.values
+    assert "arq:result:event_reminder_41" not in redis.values
+
+
+@pytest.mark.asyncio
+async def test_schedule_event_reminder_if_due_enqueues_only_within_the_horizon() -> (
+    None
+):
+    redis = _FakeArqRedis()
+    scheduler = ArqClient(cast(ArqRedis, redis))
+    now = datetime.now(UTC)
+    lead_time = timedelta(minutes=REMINDER_LEAD_TIME_MINUTES)
+    soon = (now + timedelta(hours=3)).astimezone(timezone(timedelta(hours=2)))
+
+    await scheduler.schedule_event_reminder_if_due(42, soon)
+    await scheduler.schedule_event_reminder_if_due(43, now + timedelta(minutes=30))
+    await scheduler.schedule_event_reminder_if_due(
+        44, now + REMINDER_SCHEDULE_HORIZON + timedelta(hours=2)
+    )
+
+    redis.enqueue_job.assert_awaited_once_with(
+        "send_event_reminder",
+        event_id=42,
+        _defer_until=(now + timedelta(hours=3)).replace(tzinfo=None) - lead_time,
+        _job_id="event_reminder_42",
+    )
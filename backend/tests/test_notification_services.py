@@ -11,10 +11,16 @@ from resend.http_client_async import AsyncHTTPClient
 from starlette.requests import Request
 
 from backend.models.event import Event, EventCategory, Location
-from backend.services.notifications.arq import get_arq, get_redis_settings
+from backend.services.notifications.arq import (
+    get_arq,
+    get_optional_arq,
+    get_redis_settings,
+)
 from backend.services.notifications.email import (
+    RESEND_BATCH_SIZE,
     DisabledEmailNotificationService,
     EmailNotificationService,
+    ResendEmailSender,
     create_email_notification_service,
     get_email_notif_service,
 )
@@ -217,12 +223,14 @@ async def test_create_email_notification_service_can_disable_email_when_key_miss
         await service.send_event_creation_confirmation("organizer@example.com", event)
         await service.send_registration_confirmation("attendee@example.com", event)
         await service.send_event_reminder("attendee@example.com", event)
+        await service.send_waitlist_promotion("attendee@example.com", event)
 
     assert isinstance(service, DisabledEmailNotificationService)
     assert "RESEND_API_KEY is not set; email notifications are disabled" in caplog.text
     assert "skipping event creation confirmation email" in caplog.text
     assert "skipping registration confirmation email" in caplog.text
     assert "skipping event reminder email" in caplog.text
+    assert "skipping waitlist promotion email" in caplog.text
 
 
 @pytest.mark.asyncio
@@ -299,6 +307,137 @@ async def test_send_event_reminder_payload() -> None:
     assert "2026-08-01 10:00:00" in payload["html"]
 
 
+@pytest.mark.asyncio
+async def test_send_event_reminders_uses_resend_batch_endpoint() -> None:
+    http_client = _RecordingAsyncHTTPClient()
+    service = EmailNotificationService(
+        "test-key",
+        from_email="Evently <events@example.com>",
+        email_sender=ResendEmailSender(
+            "test-key", api_url="https://resend.test", http_client=http_client
+        ),
+    )
+    recipients = [f"attendee{i}@example.com" for i in range(RESEND_BATCH_SIZE + 1)]
+
+    await service.send_event_reminders(recipients, _event())
+
+    assert [(method, url) for method, url, _, _ in http_client.requests] == [
+        ("post", "https://resend.test/emails/batch"),
+        ("post", "https://resend.test/emails/batch"),
+    ]
+    batches = [
+        cast(list[dict[str, Any]], body) for _, _, _, body in http_client.requests
+    ]
+    assert [len(batch) for batch in batches] == [RESEND_BATCH_SIZE, 1]
+    assert batches[1][0]["to"] == [f"attendee{RESEND_BATCH_SIZE}@example.com"]
+    assert batches[1][0]["subject"] == "Evently - Event Reminder"
+
+
+@pytest.mark.asyncio
+async def test_send_event_reminders_falls_back_to_single_sends() -> None:
+    email_sender = _RecordingEmailSender()
+    service = EmailNotificationService(
+        "test-key",
+        from_email="Evently <events@example.com>",
+        email_sender=email_sender,
+    )
+
+    await service.send_event_reminders(
+        ["first@example.com", "second@example.com"], _event()
+    )
+
+    assert [payload["to"] for payload in email_sender.payloads] == [
+        ["first@example.com"],
+        ["second@example.com"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_send_event_reminders_raises_only_errors_worth_retrying() -> None:
+    recipients = ["first@example.com", "second@example.com"]
+    rejected = _RecordingEmailSender(
+        side_effect=ResendError("422", "validation_error", "bad address", "fix it")
+    )
+    unavailable = _RecordingEmailSender(
+        side_effect=ResendError("503", "server_error", "down", "retry")
+    )
+
+    await EmailNotificationService(
+        "test-key", from_email="events@example.com", email_sender=rejected
+    ).send_event_reminders(recipients, _event())
+    with pytest.raises(ResendError, match="down"):
+        await EmailNotificationService(
+            "test-key", from_email="events@example.com", email_sender=unavailable
+        ).send_event_reminders(recipients, _event())
+
+    assert len(unavailable.payloads) == 2
+
+
+@pytest.mark.asyncio
+async def test_send_transactional_passes_idempotency_key_to_resend() -> None:
+    http_client = _RecordingAsyncHTTPClient()
+    service = EmailNotificationService(
+        "test-key",
+        from_email="Evently <events@example.com>",
+        email_sender=ResendEmailSender(
+            "test-key", api_url="https://resend.test", http_client=http_client
+        ),
+    )
+
+    await service.send_transactional(
+        "registration_confirmation",
+        "attendee@example.com",
+        _event(),
+        idempotency_key="registration_confirmation:11:7:t",
+    )
+
+    [(method, url, headers, body)] = http_client.requests
+    assert (method, url) == ("post", "https://resend.test/emails")
+    assert headers["Idempotency-Key"] == "registration_confirmation:11:7:t"
+    payload = cast(dict[str, Any], body)
+    assert payload["to"] == ["attendee@example.com"]
+    assert payload["subject"] == "Evently - Registration Confirmation"
+
+
+@pytest.mark.asyncio
+async def test_send_transactional_raises_resend_errors_for_retry() -> None:
+    email_sender = _RecordingEmailSender(
+        ResendError("500", "server_error", "boom", "retry")
+    )
+    service = EmailNotificationService(
+        "test-key",
+        from_email="Evently <events@example.com>",
+        email_sender=email_sender,
+    )
+
+    with pytest.raises(ResendError):
+        await service.send_transactional(
+            "waitlist_promotion",
+            "attendee@example.com",
+            _event(),
+            idempotency_key="waitlist_promotion:11:7:t",
+        )
+
+    assert _sent_payload(email_sender)["subject"] == "Evently - You're Off the Waitlist"
+
+
+@pytest.mark.asyncio
+async def test_send_waitlist_promotion_payload() -> None:
+    email_sender = _RecordingEmailSender()
+    service = EmailNotificationService(
+        "test-key",
+        from_email="Evently <events@example.com>",
+        email_sender=email_sender,
+    )
+
+    await service.send_waitlist_promotion("attendee@example.com", _event())
+
+    payload = _sent_payload(email_sender)
+    assert payload["to"] == ["attendee@example.com"]
+    assert payload["subject"] == "Evently - You're Off the Waitlist"
+    assert "Notification Test Event" in payload["html"]
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "method_name",
@@ -306,6 +445,7 @@ async def test_send_event_reminder_payload() -> None:
         "send_event_creation_confirmation",
         "send_registration_confirmation",
         "send_event_reminder",
+        "send_waitlist_promotion",
     ],
 )
 async def test_email_html_escapes_event_title(method_name: str) -> None:
@@ -374,6 +514,15 @@ def test_get_arq_raises_when_missing() -> None:
     assert exc_info.value.status_code == 503
 
 
+def test_get_optional_arq_returns_none_when_missing() -> None:
+    app = FastAPI()
+    assert get_optional_arq(_request_for_app(app)) is None
+
+    arq = object()
+    app.state.arq = arq
+    assert get_optional_arq(_request_for_app(app)) is arq
+
+
 def test_get_email_notif_service_returns_app_state_object() -> None:
     app = FastAPI()
     service = EmailNotificationService(
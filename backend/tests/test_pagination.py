@@ -0,0 +1,39 @@
+from datetime import datetime
+
+import pytest
+
+from backend.services.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    keyset_filter,
+)
+
+
+def test_cursor_round_trips_datetimes_and_scalars() -> None:
+    payload = {
+        "sort_by": "start_time",
+        "sort_order": "asc",
+        "value": datetime(2026, 6, 15, 19, 0),
+        "id": 7,
+    }
+
+    token = encode_cursor(payload)
+
+    assert "=" not in token
+    assert decode_cursor(token) == payload
+
+
+@pytest.mark.parametrize("token", ["not base64!", "bnVsbA", "W10"])
+def test_decode_cursor_rejects_malformed_tokens(token: str) -> None:
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(token)
+
+
+def test_keyset_filter_follows_sort_direction() -> None:
+    assert keyset_filter("price", -1, 10.0, 3) == {
+        "$or": [
+            {"price": {"$lt": 10.0}},
+            {"price": 10.0, "id": {"$lt": 3}},
+        ]
+    }
@@ -0,0 +1,109 @@
+import json
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any
+
+import pytest
+
+from backend.services.pagination import InvalidCursorError, encode_cursor
+from backend.services.roster import (
+    decode_roster_cursor,
+    encode_roster_cursor,
+    export_roster,
+)
+
+_ROWS = [
+    {
+        "user_id": 8,
+        "first_name": "Blake",
+        "last_name": "Yellow, Jr.",
+        "email": "user8@example.com",
+        "status": "checked_in",
+        "checked_in_at": datetime(2026, 6, 15, 19, 30, 0),
+        "last_key": "yellow, jr.",
+        "first_key": "blake",
+    },
+    {
+        "user_id": 7,
+        "first_name": "Avery",
+        "last_name": "Zephyr",
+        "email": "user7@example.com",
+        "status": "going",
+        "checked_in_at": None,
+        "last_key": "zephyr",
+        "first_key": "avery",
+    },
+]
+
+
+async def _rows() -> AsyncIterator[dict[str, Any]]:
+    for row in _ROWS:
+        yield row
+
+
+async def _render(fmt: Any) -> str:
+    return "".join([chunk async for chunk in export_roster(_rows(), fmt)])
+
+
+@pytest.mark.asyncio
+async def test_export_roster_renders_csv_with_header_and_quoting() -> None:
+    assert (await _render("csv")).splitlines() == [
+        "user_id,first_name,last_name,email,status,checked_in_at",
+        '8,Blake,"Yellow, Jr.",user8@example.com,checked_in,2026-06-15T19:30:00',
+        "7,Avery,Zephyr,user7@example.com,going,",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_export_roster_escapes_cells_that_spreadsheets_would_evaluate() -> None:
+    async def rows() -> AsyncIterator[dict[str, Any]]:
+        yield {
+            **_ROWS[1],
+            "first_name": '=HYPERLINK("http://x")',
+            "last_name": "-1+2",
+            "email": "@evil",
+        }
+
+    lines = "".join([chunk async for chunk in export_roster(rows(), "csv")])
+
+    assert lines.splitlines()[1] == (
+        '7,"\'=HYPERLINK(""http://x"")",\'-1+2,\'@evil,going,'
+    )
+
+
+@pytest.mark.asyncio
+async def test_export_roster_renders_one_json_object_per_line() -> None:
+    lines = (await _render("ndjson")).splitlines()
+
+    assert [json.loads(line) for line in lines] == [
+        {
+            "user_id": 8,
+            "first_name": "Blake",
+            "last_name": "Yellow, Jr.",
+            "email": "user8@example.com",
+            "status": "checked_in",
+            "checked_in_at": "2026-06-15T19:30:00",
+        },
+        {
+            "user_id": 7,
+            "first_name": "Avery",
+            "last_name": "Zephyr",
+            "email": "user7@example.com",
+            "status": "going",
+            "checked_in_at": None,
+        },
+    ]
+
+
+def test_roster_cursor_seeks_past_the_last_row() -> None:
+    after = decode_roster_cursor(encode_roster_cursor(_ROWS[0]))
+
+    assert after == {
+        "$or": [
+            {"last_key": {"$gt": "yellow, jr."}},
+            {"last_key": "yellow, jr.", "first_key": {"$gt": "blake"}},
+            {"last_key": "yellow, jr.", "first_key": "blake", "user_id": {"$gt": 8}},
+        ]
+    }
+    with pytest.raises(InvalidCursorError):
+        decode_roster_cursor(encode_cursor({"last": "a", "id": 1}))
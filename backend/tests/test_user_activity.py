@@ -0,0 +1,128 @@
+from datetime import datetime
+from typing import Any
+
+import pytest
+from bson import ObjectId
+from pymongo.asynchronous.database import AsyncDatabase
+
+from backend.services.attendance import record_attendance_transition
+from backend.services.pagination import InvalidCursorError, encode_cursor
+from backend.services.user_activity import (
+    activity_page,
+    backfill_user_activity,
+    decode_activity_cursor,
+    encode_activity_cursor,
+    log_event_created,
+)
+
+
+def test_activity_cursor_seeks_past_the_last_entry() -> None:
+    entry_id = ObjectId()
+    entry = {"ts": datetime(2026, 6, 15, 19, 0), "_id": entry_id}
+
+    assert decode_activity_cursor(encode_activity_cursor(entry)) == {
+        "$or": [
+            {"ts": {"$lt": datetime(2026, 6, 15, 19, 0)}},
+            {"ts": datetime(2026, 6, 15, 19, 0), "_id": {"$lt": entry_id}},
+        ]
+    }
+    with pytest.raises(InvalidCursorError):
+        decode_activity_cursor(
+            encode_cursor({"ts": datetime(2026, 6, 15), "id": "not-an-id"})
+        )
+
+
+@pytest.mark.asyncio
+async def test_transitions_append_activity_newest_first(
+    db: AsyncDatabase[dict[str, Any]],
+) -> None:
+    for name in ("events", "user_activity"):
+        await db[name].drop()
+    await db["events"].insert_many(
+        [{"id": event_id, "title": f"Event {event_id}"} for event_id in (1, 2)]
+    )
+    row = {"event_id": 1, "user_id": 7, "checked_in_at": None}
+
+    await log_event_created(
+        db, event_id=2, organizer_user_id=7, created_at=datetime(2026, 1, 1)
+    )
+    # Event 3 was deleted; its entry is skipped without shortening a page.
+    await log_event_created(
+        db, event_id=3, organizer_user_id=7, created_at=datetime(2026, 1, 2)
+    )
+    await record_attendance_transition(db, {**row, "status": "waitlisted"})
+    await record_attendance_transition(db, {**row, "status": "going"})
+    await record_attendance_transition(
+        db,
+        {**row, "status": "checked_in", "checked_in_at": datetime(2030, 1, 1)},
+    )
+    await record_attendance_transition(db, {**row, "status": "going"}, activity=False)
+    await record_attendance_transition(db, {**row, "status": "cancelled"})
+
+    entries, cursor = await activity_page(db, 7)
+    assert [(entry["action"], entry["event_id"]) for entry in entries] == [
+        ("attended", 1),
+        ("cancelled", 1),
+        ("registered", 1),
+        ("created", 2),
+    ]
+    assert cursor is None
+    assert entries[-1]["event"] == {"id": 2, "title": "Event 2"}
+
+    first, cursor = await activity_page(db, 7, limit=3)
+    assert len(first) == 3
+    assert cursor is not None
+    rest, cursor = await activity_page(
+        db, 7, limit=3, after=decode_activity_cursor(cursor)
+    )
+    assert [entry["action"] for entry in first + rest] == [
+        "attended",
+        "cancelled",
+        "registered",
+        "created",
+    ]
+    assert cursor is None
+
+
+@pytest.mark.asyncio
+async def test_backfill_adds_one_entry_per_event_and_registration_once(
+    db: AsyncDatabase[dict[str, Any]],
+) -> None:
+    for name in ("events", "attendance", "user_activity"):
+        await db[name].drop()
+    await db["events"].insert_one(
+        {
+            "_id": ObjectId.from_datetime(datetime(2026, 5, 1)),
+            "id": 1,
+            "organizer_user_id": 2,
+            "start_time": datetime(2026, 6, 1),
+        }
+    )
+    await db["attendance"].insert_many(
+        [
+            {
+                "event_id": 1,
+                "user_id": 7,
+                "status": "checked_in",
+                "checked_in_at": None,
+            },
+            {"event_id": 1, "user_id": 8, "status": "cancelled"},
+            {"event_id": 1, "user_id": 9, "status": "going"},
+        ]
+    )
+    # User 9 registered after live logging started.
+    await record_attendance_transition(
+        db, {"event_id": 1, "user_id": 9, "status": "going"}
+    )
+
+    assert await backfill_user_activity(db) == 2
+    assert await backfill_user_activity(db) == 0
+
+    created, _ = await activity_page(db, 2)
+    assert [(entry["action"], entry["ts"]) for entry in created] == [
+        ("created", datetime(2026, 5, 1))
+    ]
+    attended, _ = await activity_page(db, 7)
+    assert [entry["action"] for entry in attended] == ["attended"]
+    assert await db["user_activity"].count_documents({"user_id": 8}) == 0
+    assert await db["user_activity"].count_documents({"user_id": 9}) == 1
@@ -0,0 +1,186 @@
+from datetime import datetime
+from typing import Any
+
+import pytest
+from pymongo.asynchronous.database import AsyncDatabase
+
+from backend.services.pagination import InvalidCursorError, encode_cursor
+from backend.services.user_event_index import (
+    backfill_user_event_index,
+    decode_user_events_cursor,
+    encode_user_events_cursor,
+    index_attendance,
+    index_created_event,
+    rebuild_user_event_index,
+    reconcile_user_event_index,
+    user_event_page,
+)
+
+
+def test_user_events_cursor_seeks_past_the_last_entry() -> None:
+    entry = {"sort_at": datetime(2026, 6, 15, 19, 0), "event_id": 4}
+
+    assert decode_user_events_cursor(encode_user_events_cursor(entry)) == {
+        "$or": [
+            {"sort_at": {"$lt": datetime(2026, 6, 15, 19, 0)}},
+            {"sort_at": datetime(2026, 6, 15, 19, 0), "event_id": {"$lt": 4}},
+        ]
+    }
+    with pytest.raises(InvalidCursorError):
+        decode_user_events_cursor(encode_cursor({"at": "yesterday", "id": 4}))
+
+
+async def _event_ids(
+    db: AsyncDatabase[dict[str, Any]], user_id: int, kind: Any
+) -> list[int]:
+    entries, _ = await user_event_page(db, user_id, kind)
+    return [entry["event_id"] for entry in entries]
+
+
+@pytest.mark.asyncio
+async def test_rebuild_indexes_created_and_registered_events(
+    db: AsyncDatabase[dict[str, Any]],
+) -> None:
+    for name in ("events", "attendance", "user_event_index"):
+        await db[name].drop()
+    await db["events"].insert_many(
+        [
+            {"id": 1, "organizer_user_id": 1, "start_time": datetime(2026, 6, 1)},
+            {"id": 2, "organizer_user_id": 1, "start_time": datetime(2026, 7, 1)},
+            {"id": 3, "organizer_user_id": 2, "start_time": datetime(2026, 8, 1)},
+        ]
+    )
+    await db["attendance"].insert_many(
+        [
+            {"event_id": 3, "user_id": 1, "status": "going"},
+            {"event_id": 2, "user_id": 2, "status": "checked_in"},
+            {"event_id": 1, "user_id": 2, "status": "cancelled"},
+        ]
+    )
+    await db["user_event_index"].insert_one(
+        {
+            "user_id": 1,
+            "kind": "registered",
+            "event_id": 99,
+            "sort_at": datetime(2020, 1, 1),
+            "indexed_at": datetime(2020, 1, 1),
+        }
+    )
+
+    assert await rebuild_user_event_index(db, batch_size=2) == 5
+
+    assert await _event_ids(db, 1, "created") == [2, 1]
+    assert await _event_ids(db, 1, "registered") == [3]
+    assert await _event_ids(db, 2, "created") == [3]
+    assert await _event_ids(db, 2, "registered") == [2]
+
+    first, cursor = await user_event_page(db, 1, "created", limit=1)
+    assert [entry["event_id"] for entry in first] == [2]
+    assert cursor is not None
+    rest, cursor = await user_event_page(
+        db, 1, "created", limit=1, after=decode_user_events_cursor(cursor)
+    )
+    assert [entry["event_id"] for entry in rest] == [1]
+    assert cursor is None
+
+
+@pytest.mark.asyncio
+async def test_startup_backfill_only_builds_an_empty_index(
+    db: AsyncDatabase[dict[str, Any]],
+) -> None:
+    for name in ("events", "attendance", "user_event_index"):
+        await db[name].drop()
+    await db["events"].insert_one(
+        {"id": 1, "organizer_user_id": 1, "start_time": datetime(2026, 6, 1)}
+    )
+    await db["attendance"].insert_one({"event_id": 1, "user_id": 2, "status": "going"})
+
+    assert await backfill_user_event_index(db) == 2
+    assert await _event_ids(db, 2, "registered") == [1]
+
+    await db["attendance"].insert_one({"event_id": 1, "user_id": 3, "status": "going"})
+    assert await backfill_user_event_index(db) == 0
+    assert await _event_ids(db, 3, "registered") == []
+
+
+@pytest.mark.asyncio
+async def test_reconcile_repairs_only_drifted_entries(
+    db: AsyncDatabase[dict[str, Any]],
+) -> None:
+    for name in ("events", "attendance", "user_event_index"):
+        await db[name].drop()
+    await db["events"].insert_many(
+        [
+            {"id": 1, "organizer_user_id": 1, "start_time": datetime(2026, 6, 1)},
+            {"id": 2, "organizer_user_id": 1, "start_time": datetime(2026, 7, 1)},
+        ]
+    )
+    await db["attendance"].insert_many(
+        [
+            {"event_id": 1, "user_id": 2, "status": "going"},
+            {"event_id": 2, "user_id": 2, "status": "checked_in"},
+            {"event_id": 2, "user_id": 3, "status": "cancelled"},
+        ]
+    )
+    # Event 1 and the first registration are indexed correctly; the reschedule
+    # of event 2, the check-in, the cancellation and a deleted event were not.
+    await index_created_event(
+        db, event_id=1, organizer_user_id=1, start_time=datetime(2026, 6, 1)
+    )
+    await index_created_event(
+        db, event_id=2, organizer_user_id=1, start_time=datetime(2026, 5, 1)
+    )
+    await index_created_event(
+        db, event_id=9, organizer_user_id=1, start_time=datetime(2026, 9, 1)
+    )
+    await index_attendance(
+        db,
+        {"event_id": 1, "user_id": 2, "status": "going"},
+        {"event_id": 2, "user_id": 3, "status": "going"},
+    )
+    kept = await db["user_event_index"].find_one(
+        {"user_id": 2, "kind": "registered", "event_id": 1}
+    )
+    assert kept is not None
+
+    assert await reconcile_user_event_index(db, batch_size=2) == 4
+
+    assert await _event_ids(db, 1, "created") == [2, 1]
+    entries, _ = await user_event_page(db, 2, "registered")
+    assert {entry["event_id"]: entry["status"] for entry in entries} == {
+        1: "going",
+        2: "checked_in",
+    }
+    assert await _event_ids(db, 3, "registered") == []
+    after = await db["user_event_index"].find_one({"_id": kept["_id"]})
+    assert after == kept
+    assert await reconcile_user_event_index(db) == 0
+
+
+@pytest.mark.asyncio
+async def test_index_tracks_registrations_and_reschedules(
+    db: AsyncDatabase[dict[str, Any]],
+) -> None:
+    await db["user_event_index"].drop()
+
+    await index_attendance(db, {"event_id": 1, "user_id": 7, "status": "going"})
+    await index_attendance(db, {"event_id": 2, "user_id": 7, "status": "going"})
+    await index_attendance(db, {"event_id": 1, "user_id": 7, "status": "checked_in"})
+    assert await _event_ids(db, 7, "registered") == [2, 1]
+    entries, _ = await user_event_page(db, 7, "registered")
+    assert [entry["status"] for entry in entries] == ["going", "checked_in"]
+
+    await index_attendance(db, {"event_id": 2, "user_id": 7, "status": "cancelled"})
+    await index_attendance(db, {"event_id": 3, "user_id": 7, "status": "waitlisted"})
+    assert await _event_ids(db, 7, "registered") == [1]
+
+    await index_created_event(
+        db, event_id=5, organizer_user_id=7, start_time=datetime(2026, 6, 1)
+    )
+    await index_created_event(
+        db, event_id=6, organizer_user_id=7, start_time=datetime(2026, 7, 1)
+    )
+    await index_created_event(
+        db, event_id=5, organizer_user_id=7, start_time=datetime(2026, 8, 1)
+    )
+    assert await _event_ids(db, 7, "created") == [5, 6]
@@ -11,6 +11,7 @@ from backend.db import get_db
 from backend.models.attendance import AttendanceStatus, EventAttendance
 from backend.models.user import GlobalRole, User, UserProfile
 from backend.routes.auth import AuthSessionUser, require_authenticated_user
+from backend.services.user_activity import backfill_user_activity
 
 
 def _role_set_to_string_list(roles: set[GlobalRole]) -> list[str]:
@@ -43,7 +44,7 @@ def _auth_user(user_id: int = 1) -> AuthSessionUser:
 
 
 async def _clean(db: AsyncDatabase[dict[str, Any]]) -> None:
-    for coll in ("users", "events", "attendance"):
+    for coll in ("users", "events", "attendance", "user_activity"):
         await db[coll].delete_many({})
 
 
@@ -547,6 +548,8 @@ async def test_get_user_activity(
         }
     )
 
+    await backfill_user_activity(db)
+
     _, client = _make_client(db, auth_user=_auth_user())
     async with client:
         resp = await client.get("/users/1/activity")
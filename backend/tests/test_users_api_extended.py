@@ -4,6 +4,7 @@ from pathlib import Path
 from typing import Any
 
 import pytest
+from bson import ObjectId
 from httpx import ASGITransport, AsyncClient
 from pymongo.asynchronous.database import AsyncDatabase
 
@@ -11,6 +12,9 @@ from backend.api import create_app
 from backend.db import get_db
 from backend.routes import users as user_routes
 from backend.routes.auth import AuthSessionUser, require_authenticated_user
+from backend.services.attendance import migrate_attendance
+from backend.services.user_activity import backfill_user_activity
+from backend.services.user_event_index import rebuild_user_event_index
 
 
 def _make_client(
@@ -38,7 +42,7 @@ def _auth_user(user_id: int = 1) -> AuthSessionUser:
 
 
 async def _clean(db: AsyncDatabase[dict[str, Any]]) -> None:
-    for coll in ("users", "events", "attendance"):
+    for coll in ("users", "events", "attendance", "user_activity"):
         await db[coll].delete_many({})
 
 
@@ -366,6 +370,8 @@ async def test_activity_custom_limit(
     ]
     await db["events"].insert_many(events)
 
+    await backfill_user_activity(db)
+
     _, client = _make_client(db, auth_user=_auth_user())
     async with client:
         resp = await client.get("/users/1/activity", params={"limit": 3})
@@ -438,6 +444,8 @@ async def test_activity_with_registered_and_attended(
         ]
     )
 
+    await backfill_user_activity(db)
+
     _, client = _make_client(db, auth_user=_auth_user())
     async with client:
         resp = await client.get("/users/1/activity")
@@ -463,6 +471,7 @@ async def test_activity_sorts_by_date_desc(
                 **event_data,
                 "id": 1,
                 "organizer_user_id": 1,
+                "_id": ObjectId.from_datetime(datetime(2025, 1, 1)),
                 "title": "Old Event",
                 "start_time": datetime(2026, 1, 1, 10, 0),
                 "end_time": datetime(2026, 1, 1, 12, 0),
@@ -471,6 +480,7 @@ async def test_activity_sorts_by_date_desc(
                 **event_data,
                 "id": 2,
                 "organizer_user_id": 1,
+                "_id": ObjectId.from_datetime(datetime(2025, 2, 1)),
                 "title": "New Event",
                 "start_time": datetime(2026, 12, 1, 10, 0),
                 "end_time": datetime(2026, 12, 1, 12, 0),
@@ -478,6 +488,8 @@ async def test_activity_sorts_by_date_desc(
         ]
     )
 
+    await backfill_user_activity(db)
+
     _, client = _make_client(db, auth_user=_auth_user())
     async with client:
         resp = await client.get("/users/1/activity")
@@ -504,6 +516,8 @@ async def test_activity_orphaned_attendance_skipped(
         }
     )
 
+    await backfill_user_activity(db)
+
     _, client = _make_client(db, auth_user=_auth_user())
     async with client:
         resp = await client.get("/users/1/activity")
@@ -532,6 +546,8 @@ async def test_activity_cancelled_attendance_skipped(
         }
     )
 
+    await backfill_user_activity(db)
+
     _, client = _make_client(db, auth_user=_auth_user())
     async with client:
         resp = await client.get("/users/1/activity")
@@ -541,12 +557,13 @@ async def test_activity_cancelled_attendance_skipped(
 
 
 @pytest.mark.asyncio
-async def test_activity_uses_latest_attendance_per_event(
+async def test_activity_uses_latest_attendance_per_event_after_migration(
     db: AsyncDatabase[dict[str, Any]],
     user_data: dict[str, Any],
     event_data: dict[str, Any],
 ) -> None:
     await _clean(db)
+    await db["attendance_history"].delete_many({})
     await db["users"].insert_one(user_data)
     await db["events"].insert_one(
         {**event_data, "id": 1, "organizer_user_id": 2, "title": "Repeated Event"}
@@ -568,9 +585,124 @@ async def test_activity_uses_latest_attendance_per_event(
         ]
     )
 
+    await migrate_attendance(db)
+    await backfill_user_activity(db)
+
     _, client = _make_client(db, auth_user=_auth_user())
     async with client:
         resp = await client.get("/users/1/activity")
 
     assert resp.status_code == 200
     assert resp.json()["items"] == []
+
+
+# ---------------------------------------------------------------------------
+# GET /users/me/events -- Pagination over the user event index
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_my_events_pages_each_list_with_its_own_cursor(
+    db: AsyncDatabase[dict[str, Any]],
+    user_data: dict[str, Any],
+    event_data: dict[str, Any],
+) -> None:
+    await _clean(db)
+    await db["user_event_index"].delete_many({})
+    await db["users"].insert_one(user_data)
+    await db["events"].insert_many(
+        [
+            {
+                **event_data,
+                "id": event_id,
+                "organizer_user_id": 1,
+                "title": f"Created {event_id}",
+                "start_time": datetime(2026, 6, event_id, 19, 0),
+                "registered_count": 0,
+                "favorites_count": 0,
+            }
+            for event_id in (1, 2, 3)
+        ]
+        + [
+            {
+                **event_data,
+                "id": 4,
+                "organizer_user_id": 2,
+                "title": "Registered",
+                "registered_count": 1,
+                "favorites_count": 0,
+            }
+        ]
+    )
+    await db["attendance"].insert_one(
+        {"event_id": 4, "user_id": 1, "status": "checked_in", "checked_in_at": None}
+    )
+    await rebuild_user_event_index(db)
+
+    _, client = _make_client(db, auth_user=_auth_user())
+    async with client:
+        first = await client.get("/users/me/events", params={"limit": 2})
+        rest = await client.get(
+            "/users/me/events",
+            params={
+                "kind": "created",
+                "limit": 2,
+                "created_cursor": first.json()["created_next_cursor"],
+            },
+        )
+        invalid = await client.get(
+            "/users/me/events", params={"registered_cursor": "not-a-cursor"}
+        )
+
+    assert first.status_code == 200
+    body = first.json()
+    assert [item["id"] for item in body["created"]] == [3, 2]
+    assert [item["id"] for item in body["registered"]] == [4]
+    assert body["registered"][0]["attendance_status"] == "checked_in"
+    assert body["registered"][0]["attending_count"] == 1
+    assert body["registered_next_cursor"] is None
+
+    assert rest.status_code == 200
+    assert [item["id"] for item in rest.json()["created"]] == [1]
+    assert rest.json()["registered"] == []
+    assert rest.json()["created_next_cursor"] is None
+
+    assert invalid.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_activity_pages_with_a_cursor(
+    db: AsyncDatabase[dict[str, Any]],
+    user_data: dict[str, Any],
+    event_data: dict[str, Any],
+) -> None:
+    await _clean(db)
+    await db["users"].insert_one(user_data)
+    await db["events"].insert_many(
+        [
+            {
+                **event_data,
+                "_id": ObjectId.from_datetime(datetime(2025, 6, event_id)),
+                "id": event_id,
+                "organizer_user_id": 1,
+                "title": f"Event {event_id}",
+                "start_time": datetime(2026, 6, event_id, 19, 0),
+            }
+            for event_id in (1, 2, 3)
+        ]
+    )
+    await backfill_user_activity(db)
+
+    _, client = _make_client(db, auth_user=_auth_user())
+    async with client:
+        first = await client.get("/users/1/activity", params={"limit": 2})
+        rest = await client.get(
+            "/users/1/activity",
+            params={"limit": 2, "cursor": first.json()["next_cursor"]},
+        )
+        invalid = await client.get("/users/1/activity", params={"cursor": "bogus"})
+
+    assert [item["event_id"] for item in first.json()["items"]] == [3, 2]
+    assert [item["event_id"] for item in rest.json()["items"]] == [1]
+    assert rest.json()["next_cursor"] is None
+    assert invalid.status_code == 400
@@ -45,18 +45,10 @@ function getApiErrorMessage(err: unknown, fallback: string): string {
   return fallback;
 }
 
-function downloadCsv(attendees: EventAttendeeItem[], eventTitle: string): void {
-  const header = ["First Name", "Last Name", "Email", "Status", "Checked In At"];
-  const rows = attendees.map((a) => [
-    a.first_name,
-    a.last_name,
-    a.email,
-    a.status === "checked_in" ? "Checked In" : "Going",
-    a.checked_in_at ? formatDate(a.checked_in_at) + " " + formatTime(a.checked_in_at) : "",
-  ]);
-  const csv = [header, ...rows]
-    .map((row) => row.map((cell) => `"${String(cell).replace(/"/g, '""')}"`).join(","))
-    .join("\n");
+async function downloadRosterCsv(eventId: string, eventTitle: string): Promise<void> {
+  // The server streams the whole roster and escapes cells that spreadsheets
+  // would run as formulas.
+  const csv = await apiFetch<string>(`/events/${eventId}/attendees/export?format=csv`);
   const blob = new Blob([csv], { type: "text/csv" });
   const url = URL.createObjectURL(blob);
   const a = document.createElement("a");
@@ -304,6 +296,9 @@ function ToastList({ toasts }: { toasts: Toast[] }) {
 
 type StatusFilter = "all" | "going" | "checked_in";
 
+const PAGE_SIZE = 100;
+const SEARCH_DEBOUNCE_MS = 300;
+
 export default function AttendeesPage() {
   const params = useParams<{ eventId: string }>();
   const eventId = params?.eventId ?? "";
@@ -315,7 +310,10 @@ export default function AttendeesPage() {
   const [error, setError] = useState<string | null>(null);
   const [busyUsers, setBusyUsers] = useState<Set<number>>(new Set());
   const [search, setSearch] = useState("");
+  const [debouncedSearch, setDebouncedSearch] = useState("");
   const [statusFilter, setStatusFilter] = useState<StatusFilter>("all");
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [exporting, setExporting] = useState(false);
   const [toasts, setToasts] = useState<Toast[]>([]);
 
   const showToast = useCallback((message: string, type: Toast["type"]) => {
@@ -324,40 +322,78 @@ export default function AttendeesPage() {
     setTimeout(() => setToasts((prev) => prev.filter((t) => t.id !== id)), 3500);
   }, []);
 
+  useEffect(() => {
+    const timer = setTimeout(() => setDebouncedSearch(search.trim()), SEARCH_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [search]);
+
+  // Search and status filtering happen on the server, one page at a time.
+  const rosterPath = useCallback(
+    (cursor?: string) => {
+      const query = new URLSearchParams({ limit: String(PAGE_SIZE) });
+      if (statusFilter !== "all") query.set("status", statusFilter);
+      if (debouncedSearch) query.set("search", debouncedSearch);
+      if (cursor) query.set("cursor", cursor);
+      return `/events/${eventId}/attendees?${query.toString()}`;
+    },
+    [eventId, statusFilter, debouncedSearch],
+  );
+
   const fetchAttendees = useCallback(async () => {
     if (!eventId) return;
     setLoading(true);
     setError(null);
     try {
-      const res = await apiFetch<EventAttendeesResponse>(`/events/${eventId}/attendees`);
-      setData(res);
+      setData(await apiFetch<EventAttendeesResponse>(rosterPath()));
     } catch (err) {
       setError(getApiErrorMessage(err, "Could not load attendees."));
     } finally {
       setLoading(false);
     }
-  }, [eventId]);
+  }, [eventId, rosterPath]);
 
   useEffect(() => {
     if (!user) return;
     void fetchAttendees();
   }, [user, fetchAttendees]);
 
-  const filteredAttendees = useMemo(() => {
-    if (!data) return [];
-    let list = data.attendees;
-    if (statusFilter !== "all") list = list.filter((a) => a.status === statusFilter);
-    if (search.trim()) {
-      const q = search.trim().toLowerCase();
-      list = list.filter(
-        (a) =>
-          a.first_name.toLowerCase().includes(q) ||
-          a.last_name.toLowerCase().includes(q) ||
-          a.email.toLowerCase().includes(q),
+  async function loadMore() {
+    if (!data?.next_cursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await apiFetch<EventAttendeesResponse>(rosterPath(data.next_cursor));
+      setData((prev) =>
+        prev
+          ? {
+              ...page,
+              attendees: [...prev.attendees, ...page.attendees],
+            }
+          : page,
       );
+    } catch (err) {
+      showToast(getApiErrorMessage(err, "Could not load more attendees."), "error");
+    } finally {
+      setLoadingMore(false);
     }
-    return list;
-  }, [data, search, statusFilter]);
+  }
+
+  async function handleExport(eventTitle: string) {
+    setExporting(true);
+    try {
+      await downloadRosterCsv(eventId, eventTitle);
+    } catch (err) {
+      showToast(getApiErrorMessage(err, "Could not export attendees."), "error");
+    } finally {
+      setExporting(false);
+    }
+  }
+
+  // Rows checked in or undone since loading can leave the active filter.
+  const filteredAttendees = useMemo(() => {
+    if (!data) return [];
+    if (statusFilter === "all") return data.attendees;
+    return data.attendees.filter((a) => a.status === statusFilter);
+  }, [data, statusFilter]);
 
   function setBusy(userId: number, busy: boolean) {
     setBusyUsers((prev) => {
@@ -462,6 +498,13 @@ export default function AttendeesPage() {
   const isLoading = authLoading || loading;
   const totalRegistered = data ? data.going_count + data.checked_in_count : 0;
   const spotsRemaining = data ? Math.max(0, data.total_capacity - totalRegistered) : 0;
+  const filterTotal = !data
+    ? 0
+    : statusFilter === "going"
+    ? data.going_count
+    : statusFilter === "checked_in"
+    ? data.checked_in_count
+    : totalRegistered;
 
   return (
     <div className="min-h-screen bg-gray-50 font-sans antialiased">
@@ -495,14 +538,15 @@ export default function AttendeesPage() {
               Manage RSVPs and check in guests for your event.
             </p>
           </div>
-          {data && data.attendees.length > 0 && (
+          {data && totalRegistered > 0 && (
             <button
               type="button"
-              onClick={() => downloadCsv(data.attendees, data.event_title)}
-              className="inline-flex items-center gap-2 rounded-lg border border-gray-300 bg-white px-4 py-2 text-sm font-medium text-gray-700 shadow-sm transition hover:bg-gray-50"
+              onClick={() => void handleExport(data.event_title)}
+              disabled={exporting}
+              className="inline-flex items-center gap-2 rounded-lg border border-gray-300 bg-white px-4 py-2 text-sm font-medium text-gray-700 shadow-sm transition hover:bg-gray-50 disabled:opacity-50"
             >
               <DownloadIcon className="h-4 w-4" />
-              Export CSV
+              {exporting ? "Exporting…" : "Export CSV"}
             </button>
           )}
         </div>
@@ -617,14 +661,25 @@ export default function AttendeesPage() {
                 busy={busyUsers.has(attendee.user_id)}
               />
             ))}
+            {data?.next_cursor && (
+              <button
+                type="button"
+                onClick={() => void loadMore()}
+                disabled={loadingMore}
+                className="w-full rounded-lg border border-gray-200 py-2.5 text-sm font-medium text-gray-700 transition hover:bg-gray-50 disabled:opacity-50"
+              >
+                {loadingMore ? "Loading..." : "Load more"}
+              </button>
+            )}
           </div>
         )}
 
         {/* Results count */}
         {!isLoading && data && filteredAttendees.length > 0 && (
           <p className="mt-4 text-center text-xs text-gray-400">
-            Showing {filteredAttendees.length} of {totalRegistered} attendee
-            {totalRegistered !== 1 ? "s" : ""}
+            {debouncedSearch
+              ? `Showing ${filteredAttendees.length} matching attendee${filteredAttendees.length !== 1 ? "s" : ""}`
+              : `Showing ${filteredAttendees.length} of ${filterTotal} attendee${filterTotal !== 1 ? "s" : ""}`}
           </p>
         )}
       </main>
@@ -16,7 +16,7 @@ interface RegistrationCardProps {
 interface AttendanceStatusResponse {
   event_id: number;
   user_id: number;
-  status: "going" | "checked_in" | "cancelled" | null;
+  status: "going" | "checked_in" | "cancelled" | "waitlisted" | null;
 }
 
 interface AttendanceMutationResponse {
@@ -27,10 +27,12 @@ interface AttendanceMutationResponse {
   google_synced: boolean;
 }
 
-interface AppCalendarStatusResponse {
-  event_id: number;
+interface ViewerStateResponse {
+  attendance_status: AttendanceStatusResponse["status"];
+  waitlist_position: number | null;
   in_calendar: boolean;
   google_sync_enabled: boolean;
+  favorited: boolean;
 }
 
 function formatPrice(price: number): string {
@@ -69,16 +71,23 @@ export function RegistrationCard({
       setStatus(null);
       setError(null);
       setStatusLoading(false);
+      setInCalendar(false);
+      setGoogleSyncEnabled(false);
+      setCalendarMessage(null);
+      setCalendarStatusLoading(false);
       return;
     }
 
     let cancelled = false;
     setStatusLoading(true);
+    setCalendarStatusLoading(true);
 
-    void apiFetch<AttendanceStatusResponse>(`/events/${eventId}/attendance`)
+    void apiFetch<ViewerStateResponse>(`/events/${eventId}/viewer-state`)
       .then((response) => {
         if (!cancelled) {
-          setStatus(response.status);
+          setStatus(response.attendance_status);
+          setInCalendar(response.in_calendar);
+          setGoogleSyncEnabled(response.google_sync_enabled);
           setError(null);
         }
       })
@@ -89,9 +98,7 @@ export function RegistrationCard({
             setError(null);
           } else {
             setError(
-              nextError instanceof Error
-                ? nextError.message
-                : "Could not load your registration status.",
+              getErrorMessage(nextError, "Could not load your registration status."),
             );
           }
         }
@@ -99,43 +106,6 @@ export function RegistrationCard({
       .finally(() => {
         if (!cancelled) {
           setStatusLoading(false);
-        }
-      });
-
-    return () => {
-      cancelled = true;
-    };
-  }, [eventId, user]);
-
-  useEffect(() => {
-    if (!user) {
-      setInCalendar(false);
-      setGoogleSyncEnabled(false);
-      setCalendarMessage(null);
-      setCalendarStatusLoading(false);
-      return;
-    }
-
-    let cancelled = false;
-    setCalendarStatusLoading(true);
-
-    void apiFetch<AppCalendarStatusResponse>(`/events/${eventId}/calendar`)
-      .then((response) => {
-        if (!cancelled) {
-          setInCalendar(response.in_calendar);
-          setGoogleSyncEnabled(response.google_sync_enabled);
-          setError(null);
-        }
-      })
-      .catch((nextError: unknown) => {
-        if (!cancelled) {
-          setError(
-            getErrorMessage(nextError, "Could not load your calendar status."),
-          );
-        }
-      })
-      .finally(() => {
-        if (!cancelled) {
           setCalendarStatusLoading(false);
         }
       });
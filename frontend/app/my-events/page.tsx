@@ -227,6 +227,7 @@ export default function MyEventsPage() {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [tab, setTab] = useState<Tab>("registered");
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     function syncTabFromUrl() {
@@ -266,6 +267,8 @@ export default function MyEventsPage() {
   }, [user]);
 
   const events = tab === "created" ? data?.created ?? [] : data?.registered ?? [];
+  const nextCursor =
+    tab === "created" ? data?.created_next_cursor : data?.registered_next_cursor;
   const isLoading = authLoading || loading;
 
   function handleTabChange(nextTab: Tab) {
@@ -280,6 +283,35 @@ export default function MyEventsPage() {
     window.history.replaceState(null, "", `${url.pathname}${url.search}${url.hash}`);
   }
 
+  async function loadMore() {
+    if (!nextCursor) return;
+    const kind = tab;
+    const params = new URLSearchParams({ kind, [`${kind}_cursor`]: nextCursor });
+
+    setLoadingMore(true);
+    try {
+      const page = await apiFetch<MyEventsResponse>(`/users/me/events?${params.toString()}`);
+      setData((current) => {
+        if (!current) return current;
+        return kind === "created"
+          ? {
+              ...current,
+              created: [...current.created, ...page.created],
+              created_next_cursor: page.created_next_cursor,
+            }
+          : {
+              ...current,
+              registered: [...current.registered, ...page.registered],
+              registered_next_cursor: page.registered_next_cursor,
+            };
+      });
+    } catch (err: unknown) {
+      setError(err instanceof Error ? err.message : "Failed to load events.");
+    } finally {
+      setLoadingMore(false);
+    }
+  }
+
   function updateEventImage(eventId: number, imageUrl: string) {
     setData((current) => {
       if (!current) return current;
@@ -288,6 +320,7 @@ export default function MyEventsPage() {
         event.id === eventId ? { ...event, image_url: imageUrl } : event;
 
       return {
+        ...current,
         created: current.created.map(update),
         registered: current.registered.map(update),
       };
@@ -385,6 +418,16 @@ export default function MyEventsPage() {
                 onImageUploaded={(imageUrl) => updateEventImage(event.id, imageUrl)}
               />
             ))}
+            {nextCursor && (
+              <button
+                type="button"
+                onClick={() => void loadMore()}
+                disabled={loadingMore}
+                className="w-full rounded-lg border border-gray-200 py-2.5 text-sm font-medium text-gray-700 transition hover:bg-gray-50 disabled:opacity-50"
+              >
+                {loadingMore ? "Loading..." : "Load more"}
+              </button>
+            )}
           </div>
         )}
       </main>
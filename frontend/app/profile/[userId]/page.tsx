@@ -266,7 +266,7 @@ export default function PublicProfilePage() {
                     <div className="mt-4 space-y-4">
                       {visibleActivity.map((item) => (
                         <Link
-                          key={`${item.event_id}-${item.action}`}
+                          key={item.id}
                           href={`/events/${item.event_id}`}
                           className="flex items-center gap-4 rounded-lg p-2 transition hover:bg-gray-50"
                         >
@@ -369,7 +369,7 @@ export default function ProfilePage() {
                   <div className="mt-4 space-y-4">
                     {activity.map((item) => (
                       <Link
-                        key={`${item.event_id}-${item.action}`}
+                        key={item.id}
                         href={`/events/${item.event_id}`}
                         className="flex items-center gap-4 rounded-lg p-2 transition hover:bg-gray-50"
                       >
@@ -30,6 +30,8 @@ export function activityLabel(action: ActivityItem["action"]): string {
   switch (action) {
     case "attended":
       return "Attended";
+    case "cancelled":
+      return "Cancelled registration for";
     case "created":
       return "Created";
     case "registered":
@@ -56,16 +56,18 @@ export interface FullUserDetail extends UserDetail {
 }
 
 export interface ActivityItem {
+  id: string;
   event_id: number;
   event_title: string;
   event_image_url: string | null;
   event_end_time: string | null;
-  action: "attended" | "created" | "registered";
+  action: "attended" | "cancelled" | "created" | "registered";
   date: string;
 }
 
 export interface ActivityResponse {
   items: ActivityItem[];
+  next_cursor: string | null;
 }
 
 export interface EventDetail {
@@ -133,11 +135,14 @@ export interface MyEventItem {
   price: number;
   status: string | null;
   attending_count: number;
+  attendance_status?: "going" | "checked_in" | null;
 }
 
 export interface MyEventsResponse {
   created: MyEventItem[];
   registered: MyEventItem[];
+  created_next_cursor: string | null;
+  registered_next_cursor: string | null;
 }
 
 export interface EventCreatePayload {
@@ -172,7 +177,9 @@ export interface EventAttendeesResponse {
   total_capacity: number;
   going_count: number;
   checked_in_count: number;
+  waitlist_count: number;
   attendees: EventAttendeeItem[];
+  next_cursor: string | null;
 }
 
 export interface CheckInResponse {